@@ -0,0 +1,280 @@
+"""
+Analytics Result Cache for CADReport
+
+Process-local cache of analytics dashboard results, keyed by (tenant
+database, endpoint, params, date window).
+
+The analytics pages and station TV dashboards re-ran the same aggregate
+queries for every viewer on every refresh — the v2 summary / patterns /
+year-over-year endpoints and the predictions panel (2-5 years of
+incidents per call). Most of those windows are history that no longer
+changes.
+
+Invalidation depends on the window the result covers:
+- Closed: the window ends on or before the first day of the previous
+  month. Late run sheet edits land within a few weeks, so anything older
+  is treated as final and never expires (entries are only dropped by the
+  size bound, clear(), or a metrics rebuild).
+- Open: the window reaches into last month or the current one. The entry
+  stores a fingerprint of the window taken from incident_metrics
+  (COUNT(*), SUM(change_seq) - an index-only scan on migration 059's
+  index) and is recomputed when the fingerprint moves. Every metrics row
+  write takes a new change_seq from a sequence, and the incident_metrics
+  triggers rewrite the row on every incident / attendance write, so CAD
+  ingest, run sheet saves, closes and deletes from any worker all
+  invalidate without extra plumbing - whatever order their transactions
+  commit in.
+
+Writes that reach closed windows (full reparse jobs, ADI log imports of
+old incidents, metrics rebuilds) call cache_cleared() when they finish.
+
+Fingerprints are themselves reused for _FINGERPRINT_TTL seconds per
+window, so a wall of dashboards polling every minute costs one small
+query per window instead of the full aggregate set — at the price of up
+to _FINGERPRINT_TTL seconds of staleness after an incident change.
+
+Usage:
+    @router.get("/summary")
+    @analytics_cache.cached("v2.summary", lambda days, **_: (date.today() - timedelta(days=days), date.today()))
+    def get_analytics_summary(days: int = Query(30), ..., db: Session = Depends(get_db)):
+
+    data = analytics_cache.get_or_compute(db, "predictions", {}, start, end, compute)
+
+Windows are [start, end) dates; None means unbounded on that side.
+Cached results are shared between callers - don't mutate them.
+
+Hit/miss counters are per worker — see get_cache_stats().
+"""
+
+import os
+import time
+import json
+import inspect
+import logging
+import functools
+import threading
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY event type used for cross-worker clears
+ANALYTICS_CACHE_EVENT = "analytics_cache"
+
+# How long a window fingerprint is trusted before re-querying
+_FINGERPRINT_TTL = 15
+
+# Size bound (LRU) - entries are small JSON-able dicts
+_MAX_ENTRIES = 2000
+
+Window = Tuple[Optional[date], Optional[date]]
+
+# (db_name, endpoint, params, start, end) -> (result, fingerprint or None when closed)
+_entries: "OrderedDict[tuple, Tuple[Any, Optional[tuple]]]" = OrderedDict()
+
+# (db_name, start, end) -> (fingerprint, checked_at)
+_fingerprints: Dict[tuple, Tuple[tuple, float]] = {}
+
+_lock = threading.Lock()
+
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "stale": 0,
+    "fingerprint_queries": 0,
+    "evictions": 0,
+    "clears": 0,
+}
+
+
+def _db_name(db) -> str:
+    return db.get_bind().url.database
+
+
+def _closed_before(today: Optional[date] = None) -> date:
+    """First day of the previous month - windows ending by then are closed."""
+    today = today or date.today()
+    if today.month == 1:
+        return date(today.year - 1, 12, 1)
+    return date(today.year, today.month - 1, 1)
+
+
+def is_closed(start: Optional[date], end: Optional[date]) -> bool:
+    return end is not None and end <= _closed_before()
+
+
+def _fingerprint(db, db_name: str, start: Optional[date], end: Optional[date]) -> tuple:
+    """(row count, sum of change_seq) of incident_metrics rows in the window."""
+    from sqlalchemy import text
+
+    key = (db_name, start, end)
+    now = time.time()
+    cached = _fingerprints.get(key)
+    if cached and now - cached[1] < _FINGERPRINT_TTL:
+        return cached[0]
+
+    where = []
+    params = {}
+    if start is not None:
+        where.append("incident_date >= :start_date")
+        params["start_date"] = start
+    if end is not None:
+        where.append("incident_date < :end_date")
+        params["end_date"] = end
+    where_sql = f"WHERE {' AND '.join(where)}" if where else ""
+
+    row = db.execute(text(f"""
+        SELECT COUNT(*), SUM(change_seq) FROM incident_metrics {where_sql}
+    """), params).fetchone()
+    fingerprint = (row[0], int(row[1]) if row[1] is not None else None)
+
+    with _lock:
+        _stats["fingerprint_queries"] += 1
+        _fingerprints[key] = (fingerprint, now)
+        # Rolling windows (last N days) get a new key every day
+        if len(_fingerprints) > _MAX_ENTRIES:
+            for k in [k for k, (_, at) in _fingerprints.items() if now - at >= _FINGERPRINT_TTL]:
+                del _fingerprints[k]
+    return fingerprint
+
+
+def _params_key(params: Dict[str, Any]) -> tuple:
+    return tuple(sorted((k, str(v)) for k, v in params.items()))
+
+
+def get_or_compute(
+    db,
+    endpoint: str,
+    params: Dict[str, Any],
+    start: Optional[date],
+    end: Optional[date],
+    compute: Callable[[], Any],
+):
+    """
+    Cached result for (tenant, endpoint, params, window), calling compute()
+    on a miss or when an open window's fingerprint has changed.
+    """
+    db_name = _db_name(db)
+    key = (db_name, endpoint, _params_key(params), start, end)
+    closed = is_closed(start, end)
+
+    with _lock:
+        cached = _entries.get(key)
+        if cached is not None:
+            _entries.move_to_end(key)
+
+    fingerprint = None
+    if not closed:
+        fingerprint = _fingerprint(db, db_name, start, end)
+
+    if cached is not None:
+        if closed or cached[1] == fingerprint:
+            with _lock:
+                _stats["hits"] += 1
+            return cached[0]
+        with _lock:
+            _stats["stale"] += 1
+    else:
+        with _lock:
+            _stats["misses"] += 1
+
+    # Fingerprint was taken before computing: a change that lands while
+    # compute() runs leaves a mismatch, so the next lookup recomputes
+    result = compute()
+
+    with _lock:
+        _entries[key] = (result, fingerprint)
+        _entries.move_to_end(key)
+        while len(_entries) > _MAX_ENTRIES:
+            _entries.popitem(last=False)
+            _stats["evictions"] += 1
+    return result
+
+
+def cached(endpoint: str, window: Callable[..., Window]):
+    """
+    Decorator for analytics route functions taking a `db` session.
+
+    window(**arguments) receives the other call arguments and returns the
+    [start, end) date window the result covers. All non-db arguments are
+    part of the cache key.
+    """
+    def decorator(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            db = arguments.pop("db")
+            start, end = window(**arguments)
+            return get_or_compute(
+                db, endpoint, arguments, start, end,
+                lambda: func(*args, **kwargs),
+            )
+        return wrapper
+    return decorator
+
+
+def invalidate(db_name: str = None):
+    """
+    Drop one database's entries (or all of them) from this worker.
+
+    Local only — use cache_cleared() to clear every worker.
+    """
+    with _lock:
+        if db_name:
+            for key in [k for k in _entries if k[0] == db_name]:
+                del _entries[key]
+            for key in [k for k in _fingerprints if k[0] == db_name]:
+                del _fingerprints[key]
+        else:
+            _entries.clear()
+            _fingerprints.clear()
+        _stats["clears"] += 1
+    logger.debug(f"Analytics cache cleared: {db_name or 'all'}")
+
+
+def cache_cleared(db):
+    """
+    Clear a tenant's analytics cache on every worker.
+
+    Needed when closed-period results change underneath the cache (metrics
+    rebuild after a timezone / apparatus change, full reparse jobs, bulk
+    imports of old incidents). Clears this worker
+    immediately, then NOTIFYs the others over cadreport_alerts.
+    """
+    from sqlalchemy import text
+    from master_database import get_master_db
+    from routers.websocket import _NOTIFY_CHANNEL
+
+    db_name = _db_name(db)
+    invalidate(db_name)
+    try:
+        with get_master_db() as master:
+            master.execute(text("SELECT pg_notify(:channel, :payload)"), {
+                "channel": _NOTIFY_CHANNEL,
+                "payload": json.dumps({
+                    "tenant": db_name,
+                    "event_type": ANALYTICS_CACHE_EVENT,
+                    "payload": {"database": db_name},
+                }),
+            })
+            master.commit()
+    except Exception as e:
+        logger.error(f"Analytics cache NOTIFY failed for {db_name}: {e}")
+
+
+def get_cache_stats() -> dict:
+    """Hit/miss counters and entry counts for this worker."""
+    with _lock:
+        stats = dict(_stats)
+        stats["entries"] = len(_entries)
+        stats["closed_entries"] = sum(1 for _, fp in _entries.values() if fp is None)
+        stats["fingerprints"] = len(_fingerprints)
+    lookups = stats["hits"] + stats["misses"] + stats["stale"]
+    stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else None
+    stats["worker_pid"] = os.getpid()
+    return stats
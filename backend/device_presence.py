@@ -0,0 +1,335 @@
+"""
+Device Presence for CADReport /ws/AValerts
+
+Connected AV devices (station TVs, StationBell units, browsers) used to be
+written to connected_devices with a synchronous INSERT / UPDATE / DELETE
+straight from the async WebSocket handlers - every connect, register and
+disconnect blocked the event loop on Postgres.
+
+Presence is now kept in memory per worker and persisted in the background:
+- register / update / touch / unregister only change in-memory state and
+  mark the connection dirty. Changes are coalesced per connection (a
+  device that connects and drops between flushes is never inserted).
+- A flusher task (run_flusher, started from main.py lifespan) writes the
+  dirty set every FLUSH_INTERVAL seconds in a worker thread: per tenant one
+  upsert of changed rows (jsonb_to_recordset), one last_seen_at bump for
+  devices heard from, one DELETE for departures.
+- last_seen_at (migration 056) lets other workers ignore rows left behind
+  by a worker that died without cleaning up (STALE_AFTER). Every
+  HEARTBEAT_INTERVAL seconds a flush bumps last_seen_at for all of this
+  worker's live connections, so quiet devices (a TV that only listens)
+  never look stale while the worker is alive.
+
+Listing (list_devices): this worker's devices come from memory; other
+workers' devices from connected_devices. If the DB read fails the local
+view is returned on its own.
+
+All state changes happen on the event loop; only the DB writes run in the
+threadpool, on a snapshot swapped out on the loop.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Set, Tuple
+
+from sqlalchemy import text
+
+from database import get_db_for_tenant
+from executors import run_blocking
+
+logger = logging.getLogger(__name__)
+
+# Seconds between background flushes
+FLUSH_INTERVAL = 2
+
+# Rows whose last_seen_at is older than this are treated as gone (dead worker)
+STALE_AFTER = 180
+
+# Seconds between last_seen_at bumps for every live local connection
+HEARTBEAT_INTERVAL = 60
+
+_WORKER_PID = os.getpid()
+
+_EPOCH = datetime.fromtimestamp(0, timezone.utc)
+
+# tenant_slug -> connection_id -> row (connected_devices columns)
+_devices: Dict[str, Dict[str, dict]] = {}
+
+# Pending writes, coalesced per (tenant_slug, connection_id)
+_dirty: Set[Tuple[str, str]] = set()      # Row changed: upsert
+_touched: Set[Tuple[str, str]] = set()    # Heard from: bump last_seen_at
+_removed: Set[Tuple[str, str]] = set()    # Disconnected: delete
+
+# time.monotonic() of the last all-connections heartbeat
+_last_heartbeat = 0.0
+
+_stats = {
+    "flushes": 0,
+    "upserts": 0,
+    "touches": 0,
+    "deletes": 0,
+    "flush_errors": 0,
+    "last_flush_ms": 0.0,
+}
+
+
+# =============================================================================
+# IN-MEMORY STATE (event loop only)
+# =============================================================================
+
+def register(tenant_slug: str, connection_id: str, **fields):
+    """Track a new connection. fields: device_type, device_name, device_id, ip_address, user_agent, connected_at."""
+    now = datetime.now(timezone.utc)
+    _devices.setdefault(tenant_slug, {})[connection_id] = {
+        "connection_id": connection_id,
+        "worker_pid": _WORKER_PID,
+        "tenant_slug": tenant_slug,
+        "device_type": "unknown",
+        "device_name": "Unknown",
+        "device_id": None,
+        "ip_address": "",
+        "user_agent": "",
+        "connected_at": now,
+        **fields,
+        "last_seen_at": now,
+    }
+    key = (tenant_slug, connection_id)
+    _removed.discard(key)
+    _dirty.add(key)
+
+
+def update(tenant_slug: str, connection_id: str, **fields):
+    """Change a tracked connection's fields (e.g. after a register message)."""
+    row = _devices.get(tenant_slug, {}).get(connection_id)
+    if row is None:
+        return
+    row.update(fields)
+    _dirty.add((tenant_slug, connection_id))
+
+
+def touch(tenant_slug: str, connection_id: str):
+    """Record that a connection was heard from (ping / pong / any message)."""
+    row = _devices.get(tenant_slug, {}).get(connection_id)
+    if row is None:
+        return
+    row["last_seen_at"] = datetime.now(timezone.utc)
+    _touched.add((tenant_slug, connection_id))
+
+
+def unregister(tenant_slug: str, connection_id: str):
+    """Stop tracking a connection; its row is deleted on the next flush."""
+    devices = _devices.get(tenant_slug)
+    if devices is None or devices.pop(connection_id, None) is None:
+        return
+    if not devices:
+        del _devices[tenant_slug]
+    key = (tenant_slug, connection_id)
+    _dirty.discard(key)
+    _touched.discard(key)
+    # Always delete - an upsert for it may be in flight right now
+    _removed.add(key)
+
+
+def _public(row: dict) -> dict:
+    return {
+        "connection_id": row["connection_id"],
+        "device_type": row["device_type"],
+        "device_name": row["device_name"],
+        "device_id": row["device_id"],
+        "ip_address": row["ip_address"],
+        "user_agent": row["user_agent"],
+        "connected_at": row["connected_at"].isoformat() if row["connected_at"] else None,
+        "worker_pid": row["worker_pid"],
+    }
+
+
+def list_local(tenant_slug: str) -> List[dict]:
+    """This worker's devices for a tenant, oldest connection first."""
+    rows = sorted(_devices.get(tenant_slug, {}).values(), key=lambda r: r["connected_at"])
+    return [_public(row) for row in rows]
+
+
+def local_counts() -> Dict[str, int]:
+    return {tenant: len(devices) for tenant, devices in _devices.items()}
+
+
+# =============================================================================
+# LISTING
+# =============================================================================
+
+def _db_list_other_workers(tenant_slug: str) -> List[dict]:
+    """Devices held by other workers, from connected_devices (sync DB work)."""
+    db = next(get_db_for_tenant(tenant_slug))
+    try:
+        result = db.execute(text("""
+            SELECT connection_id, device_type, device_name, device_id,
+                   ip_address, user_agent, connected_at, worker_pid
+            FROM connected_devices
+            WHERE tenant_slug = :tenant
+              AND worker_pid <> :pid
+              AND last_seen_at > NOW() - make_interval(secs => :stale)
+            ORDER BY connected_at
+        """), {"tenant": tenant_slug, "pid": _WORKER_PID, "stale": STALE_AFTER})
+        return [
+            {
+                "connection_id": row[0],
+                "device_type": row[1],
+                "device_name": row[2],
+                "device_id": row[3],
+                "ip_address": row[4],
+                "user_agent": row[5],
+                "connected_at": row[6].isoformat() if row[6] else None,
+                "worker_pid": row[7],
+            }
+            for row in result
+        ]
+    finally:
+        db.close()
+
+
+async def list_devices(tenant_slug: str) -> List[dict]:
+    """All connected devices for a tenant: local from memory, other workers from the DB."""
+    devices = list_local(tenant_slug)
+    try:
+        devices.extend(await run_blocking(_db_list_other_workers, tenant_slug))
+    except Exception as e:
+        logger.warning(f"Device listing DB read failed, returning this worker's devices only: {e}")
+    devices.sort(key=lambda d: datetime.fromisoformat(d["connected_at"]) if d["connected_at"] else _EPOCH)
+    return devices
+
+
+# =============================================================================
+# BACKGROUND FLUSH
+# =============================================================================
+
+def _take_pending() -> Dict[str, dict]:
+    """Swap out pending writes, grouped by tenant (runs on the event loop)."""
+    global _dirty, _touched, _removed, _last_heartbeat
+    dirty, touched, removed = _dirty, _touched, _removed
+    _dirty, _touched, _removed = set(), set(), set()
+
+    now = time.monotonic()
+    if now - _last_heartbeat >= HEARTBEAT_INTERVAL:
+        # This worker is alive: keep all its rows fresh, heard from or not
+        _last_heartbeat = now
+        touched |= {
+            (tenant_slug, connection_id)
+            for tenant_slug, devices in _devices.items()
+            for connection_id in devices
+        }
+
+    batches: Dict[str, dict] = {}
+
+    def batch(tenant_slug):
+        return batches.setdefault(tenant_slug, {"upserts": [], "touches": [], "deletes": []})
+
+    for tenant_slug, connection_id in dirty:
+        row = _devices.get(tenant_slug, {}).get(connection_id)
+        if row is not None:
+            batch(tenant_slug)["upserts"].append(dict(row))
+    for key in touched - dirty:
+        batch(key[0])["touches"].append(key[1])
+    for tenant_slug, connection_id in removed:
+        batch(tenant_slug)["deletes"].append(connection_id)
+    return batches
+
+
+def _requeue(tenant_slug: str, pending: dict):
+    """Put a failed tenant batch back for the next flush, unless superseded."""
+    for row in pending["upserts"]:
+        key = (tenant_slug, row["connection_id"])
+        if row["connection_id"] in _devices.get(tenant_slug, {}):
+            _dirty.add(key)
+    for connection_id in pending["touches"]:
+        if connection_id in _devices.get(tenant_slug, {}):
+            _touched.add((tenant_slug, connection_id))
+    for connection_id in pending["deletes"]:
+        if connection_id not in _devices.get(tenant_slug, {}):
+            _removed.add((tenant_slug, connection_id))
+
+
+def _db_flush_tenant(tenant_slug: str, pending: dict):
+    """Write one tenant's batch in a single transaction (sync DB work)."""
+    db = next(get_db_for_tenant(tenant_slug))
+    try:
+        if pending["upserts"]:
+            db.execute(text("""
+                INSERT INTO connected_devices
+                    (connection_id, worker_pid, tenant_slug, device_type, device_name,
+                     device_id, ip_address, user_agent, connected_at, last_seen_at)
+                SELECT connection_id, worker_pid, tenant_slug, device_type, device_name,
+                       device_id, ip_address, user_agent, connected_at, last_seen_at
+                FROM jsonb_to_recordset(CAST(:rows AS jsonb)) AS r(
+                    connection_id VARCHAR(16), worker_pid INTEGER, tenant_slug VARCHAR(100),
+                    device_type VARCHAR(50), device_name VARCHAR(200), device_id VARCHAR(100),
+                    ip_address VARCHAR(45), user_agent TEXT,
+                    connected_at TIMESTAMPTZ, last_seen_at TIMESTAMPTZ
+                )
+                ON CONFLICT (connection_id) DO UPDATE SET
+                    worker_pid = EXCLUDED.worker_pid,
+                    device_type = EXCLUDED.device_type,
+                    device_name = EXCLUDED.device_name,
+                    device_id = EXCLUDED.device_id,
+                    ip_address = EXCLUDED.ip_address,
+                    user_agent = EXCLUDED.user_agent,
+                    last_seen_at = EXCLUDED.last_seen_at
+            """), {"rows": json.dumps(pending["upserts"], default=str)})
+        if pending["touches"]:
+            db.execute(text("""
+                UPDATE connected_devices SET last_seen_at = NOW()
+                WHERE connection_id = ANY(:cids)
+            """), {"cids": pending["touches"]})
+        if pending["deletes"]:
+            db.execute(text("""
+                DELETE FROM connected_devices WHERE connection_id = ANY(:cids)
+            """), {"cids": pending["deletes"]})
+        db.commit()
+    finally:
+        db.close()
+
+
+async def flush():
+    """Write all pending presence changes. Safe to call at any time."""
+    batches = _take_pending()
+    if not batches:
+        return
+
+    start = time.perf_counter()
+    for tenant_slug, pending in batches.items():
+        try:
+            await run_blocking(_db_flush_tenant, tenant_slug, pending)
+        except Exception as e:
+            _stats["flush_errors"] += 1
+            logger.warning(f"Device presence flush failed for {tenant_slug}: {e}")
+            _requeue(tenant_slug, pending)
+            continue
+
+        _stats["upserts"] += len(pending["upserts"])
+        _stats["touches"] += len(pending["touches"])
+        _stats["deletes"] += len(pending["deletes"])
+
+    _stats["flushes"] += 1
+    _stats["last_flush_ms"] = round((time.perf_counter() - start) * 1000, 1)
+
+
+async def run_flusher():
+    """Flush every FLUSH_INTERVAL seconds until cancelled, then flush once more."""
+    try:
+        while True:
+            await asyncio.sleep(FLUSH_INTERVAL)
+            await flush()
+    except asyncio.CancelledError:
+        await flush()
+        raise
+
+
+def get_stats() -> dict:
+    return {
+        **_stats,
+        "devices": sum(len(d) for d in _devices.values()),
+        "pending": len(_dirty) + len(_touched) + len(_removed),
+    }
@@ -0,0 +1,150 @@
+"""
+Execution model for blocking work in RunSheet
+
+The tenant database layer (database.get_db) hands out synchronous SQLAlchemy
+sessions. Running those on the event loop serializes every request in a
+uvicorn worker behind whichever query is slowest, so routes follow these rules:
+
+1. Routes that only do sync DB work are declared with plain `def`.
+   FastAPI runs them in its worker threadpool (anyio, 40 threads by default).
+   Async follow-ups (WebSocket NOTIFY, AV alerts) go through BackgroundTasks,
+   which still run on the loop after the response is sent.
+
+2. `async def` routes are reserved for handlers that await real async I/O
+   (httpx calls to NERIS/ArcGIS/Google). Their sync DB sections are wrapped
+   in `await run_blocking(...)`.
+
+3. CPU-heavy rendering (WeasyPrint PDFs) goes through render_pdf(), which
+   runs in a small separate process pool. A burst of yearly PDF requests
+   then cannot occupy every threadpool thread or hold the GIL against
+   dispatch-time routes.
+
+4. Bulk CAD HTML parsing (year-wide reparse jobs) goes through
+   parse_cad_reports(), a second small process pool, so BeautifulSoup work
+   runs on other cores instead of behind the GIL.
+
+scripts/check_async_routes.py enforces rules 1 and 2 for routers/.
+
+Pool sizes:
+    CADREPORT_RENDER_WORKERS  PDF render processes per uvicorn worker (default 2)
+    CADREPORT_PARSE_WORKERS   CAD parse processes per uvicorn worker (default 2)
+"""
+
+import os
+import sys
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from typing import Callable, Dict, List, Optional, Tuple, TypeVar
+
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RENDER_WORKERS = int(os.environ.get("CADREPORT_RENDER_WORKERS", "2"))
+PARSE_WORKERS = int(os.environ.get("CADREPORT_PARSE_WORKERS", "2"))
+
+_render_pool: Optional[ProcessPoolExecutor] = None
+_parse_pool: Optional[ProcessPoolExecutor] = None
+
+# Pools are created lazily from request threads and reparse job threads
+_pools_lock = threading.Lock()
+
+
+async def run_blocking(func: Callable[..., T], *args, **kwargs) -> T:
+    """
+    Run a sync callable (DB query, file I/O) in the shared worker threadpool.
+
+    Use from `async def` routes only — plain `def` routes are already
+    running in the threadpool.
+    """
+    return await run_in_threadpool(partial(func, *args, **kwargs))
+
+
+def _get_render_pool() -> ProcessPoolExecutor:
+    """Lazily create the PDF render pool (spawned, not forked — uvicorn has threads)."""
+    global _render_pool
+    with _pools_lock:
+        if _render_pool is None:
+            _render_pool = ProcessPoolExecutor(
+                max_workers=RENDER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info(f"PDF render pool started ({RENDER_WORKERS} processes)")
+        return _render_pool
+
+
+def _write_pdf(html_content: str) -> bytes:
+    """Render HTML to PDF bytes. Runs inside a render pool process."""
+    from weasyprint import HTML
+    return HTML(string=html_content).write_pdf()
+
+
+def render_pdf(html_content: str) -> bytes:
+    """
+    Render an HTML document to PDF bytes in the bounded render pool.
+
+    Blocks the calling thread until the PDF is ready — call from `def`
+    routes or from async code via run_blocking(). At most RENDER_WORKERS
+    PDFs render at once per uvicorn worker; extra requests queue.
+    """
+    return _get_render_pool().submit(_write_pdf, html_content).result()
+
+
+def _get_parse_pool() -> ProcessPoolExecutor:
+    """Lazily create the CAD parse pool (spawned, like the render pool)."""
+    global _parse_pool
+    with _pools_lock:
+        if _parse_pool is None:
+            _parse_pool = ProcessPoolExecutor(
+                max_workers=PARSE_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+            logger.info(f"CAD parse pool started ({PARSE_WORKERS} processes)")
+        return _parse_pool
+
+
+def _parse_cad_report(cad_path: str, raw_html: str) -> Tuple[Optional[Dict], Optional[str]]:
+    """
+    Parse stored CAD HTML to a report dict. Runs inside a parse pool process.
+    Returns (report_dict, error) - errors come back as strings so one bad
+    report doesn't fail the rest of the batch.
+    """
+    if cad_path not in sys.path:
+        sys.path.insert(0, cad_path)
+    try:
+        from cad_parser import parse_cad_html, report_to_dict
+        parsed = parse_cad_html(raw_html)
+        if not parsed:
+            return None, "Failed to parse stored HTML"
+        return report_to_dict(parsed), None
+    except Exception as e:
+        return None, f"Parse error: {e}"
+
+
+def parse_cad_reports(cad_path: str, html_list: List[str]) -> List[Tuple[Optional[Dict], Optional[str]]]:
+    """
+    Parse a batch of CAD HTML documents in the parse pool, in order.
+
+    cad_path is the directory containing cad_parser.py. Blocks the calling
+    thread - meant for background jobs, not request handlers.
+    """
+    return list(_get_parse_pool().map(
+        partial(_parse_cad_report, cad_path), html_list, chunksize=8
+    ))
+
+
+def shutdown_executors():
+    """Stop the render and parse pools. Called from main.py lifespan shutdown."""
+    global _render_pool, _parse_pool
+    with _pools_lock:
+        if _render_pool is not None:
+            _render_pool.shutdown(wait=False, cancel_futures=True)
+            _render_pool = None
+        if _parse_pool is not None:
+            _parse_pool.shutdown(wait=False, cancel_futures=True)
+            _parse_pool = None
@@ -0,0 +1,162 @@
+"""
+Incident Event Revisions for CADReport
+
+/ws/incidents events used to carry whole incident payloads. Past the
+~7500-byte NOTIFY limit, notify_tenant_event swapped them for a bare
+"refresh" hint and every open browser re-fetched the incident at once -
+large structure fires with many units and comments hit this constantly.
+
+Each incident now has a revision number and the last snapshot broadcast
+(incident_event_state, migration 055). emit_incident_event bumps the
+revision and sends a JSON-patch style delta (RFC 6902 add / replace /
+remove) against the previous snapshot:
+
+    {"type": "incident_updated", "incident_id": 42,
+     "revision": 7, "base_revision": 6,
+     "patch": [{"op": "replace", "path": "/status", "value": "CLOSED"}]}
+
+The first event for an incident (and every incident_created) carries the
+full snapshot in "incident", same as before. Lists are diffed as appends
+("/comments/-") when the old list is a prefix of the new one, otherwise
+replaced whole.
+
+A client holding revision N that receives base_revision != N has missed an
+event and sends {"type": "resync", "incident_id": 42} on its socket; the
+worker answers that client alone with an incident_snapshot (reads are
+coalesced per worker). If even the delta is over MAX_EVENT_BYTES, the
+event goes out as {"stale": true} and clients resync the same way - one
+small indexed read per worker instead of a full GET per browser.
+
+Revisions are assigned under a row lock, but NOTIFYs from two workers can
+still arrive out of order; clients treat that as a gap and resync.
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# Encoded event size above which a delta is replaced by a stale marker
+# (NOTIFY allows ~8000 bytes including the envelope)
+MAX_EVENT_BYTES = 6000
+
+
+def _pointer(path: str, key: Any) -> str:
+    """Append one JSON pointer segment (RFC 6901 escaping)."""
+    return f"{path}/{str(key).replace('~', '~0').replace('/', '~1')}"
+
+
+def diff(old: Any, new: Any, path: str = "") -> List[dict]:
+    """JSON-patch ops turning old into new (both plain JSON values)."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": _pointer(path, key)})
+        for key, value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": _pointer(path, key), "value": value})
+            elif old[key] != value:
+                ops.extend(diff(old[key], value, _pointer(path, key)))
+        return ops
+
+    if isinstance(old, list) and isinstance(new, list) and len(new) > len(old) and new[:len(old)] == old:
+        return [{"op": "add", "path": f"{path}/-", "value": value} for value in new[len(old):]]
+
+    if old == new:
+        return []
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def normalize(incident_data: dict) -> dict:
+    """Round-trip through JSON so snapshots compare equal to what JSONB returns."""
+    return json.loads(json.dumps(incident_data, default=str))
+
+
+def record_event(db, incident_id: int, snapshot: dict) -> Tuple[int, Optional[List[dict]]]:
+    """
+    Bump the incident's revision and store snapshot as the latest.
+    Returns (revision, ops) - ops is None when there was no previous
+    snapshot to diff against. Commits.
+    """
+    try:
+        prev = db.execute(text("""
+            SELECT revision, snapshot FROM incident_event_state
+            WHERE incident_id = :id
+            FOR UPDATE
+        """), {"id": incident_id}).fetchone()
+
+        revision = db.execute(text("""
+            INSERT INTO incident_event_state (incident_id, revision, snapshot, updated_at)
+            VALUES (:id, 1, CAST(:snapshot AS jsonb), NOW())
+            ON CONFLICT (incident_id) DO UPDATE SET
+                revision = incident_event_state.revision + 1,
+                snapshot = EXCLUDED.snapshot,
+                updated_at = NOW()
+            RETURNING revision
+        """), {"id": incident_id, "snapshot": json.dumps(snapshot)}).scalar()
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+    if prev is None:
+        return revision, None
+    return revision, diff(prev.snapshot, snapshot)
+
+
+def get_snapshot(db, incident_id: int) -> Optional[Tuple[int, dict]]:
+    """(revision, snapshot) for a resync, or None if never broadcast."""
+    row = db.execute(text("""
+        SELECT revision, snapshot FROM incident_event_state WHERE incident_id = :id
+    """), {"id": incident_id}).fetchone()
+    return (row.revision, row.snapshot) if row else None
+
+
+def build_message(
+    event_type: str,
+    snapshot: dict,
+    revision: Optional[int],
+    ops: Optional[List[dict]],
+    timestamp: str,
+) -> Dict[str, Any]:
+    """
+    The /ws/incidents message for one event: full snapshot, delta or stale
+    marker. revision None (state table unavailable) sends the unversioned
+    full payload as before.
+    """
+    incident_id = snapshot.get("id")
+    if revision is None:
+        return {"type": event_type, "incident": snapshot, "timestamp": timestamp}
+
+    if ops is None or event_type == "incident_created":
+        message = {
+            "type": event_type,
+            "incident_id": incident_id,
+            "revision": revision,
+            "incident": snapshot,
+            "timestamp": timestamp,
+        }
+    else:
+        message = {
+            "type": event_type,
+            "incident_id": incident_id,
+            "revision": revision,
+            "base_revision": revision - 1,
+            "patch": ops,
+            "timestamp": timestamp,
+        }
+
+    if len(json.dumps(message)) > MAX_EVENT_BYTES:
+        logger.info(f"Incident {incident_id} rev {revision} event too large, sending stale marker")
+        message = {
+            "type": event_type,
+            "incident_id": incident_id,
+            "revision": revision,
+            "stale": True,
+            "timestamp": timestamp,
+        }
+    return message
@@ -3,7 +3,7 @@ Incident Helper Functions
 Extracted from incidents.py for maintainability.
 
 Contains:
-- WebSocket event emission
+- WebSocket event emission (incident_event_payload shape)
 - ComCat validation status
 - Audit logging
 - Personnel reconciliation
@@ -17,7 +17,9 @@ from typing import Optional, List, Dict, Any
 from datetime import datetime, timezone
 import logging
 
-from database import _extract_slug, _is_internal_ip
+from database import _extract_slug, _is_internal_ip, get_db_for_tenant
+from executors import run_blocking
+import incident_events
 from models import (
     Incident, IncidentUnit, IncidentPersonnel,
     Apparatus, Personnel, AuditLog
@@ -46,17 +48,66 @@ def _get_ws_notify():
     return _ws_notify if _ws_notify else None
 
 
+def _record_incident_event(tenant_slug: str, snapshot: dict):
+    """Bump the incident's event revision (sync DB work). Returns (revision, ops)."""
+    db = next(get_db_for_tenant(tenant_slug))
+    try:
+        return incident_events.record_event(db, snapshot["id"], snapshot)
+    finally:
+        db.close()
+
+
+def incident_event_payload(incident: Incident) -> Dict[str, Any]:
+    """
+    Incident fields broadcast on /ws/incidents - one shape for every event
+    and emitter, so each revision's snapshot diffs cleanly against the last
+    and a resync answers with everything a list row or the incident modal's
+    header needs (units and CAD comments included) without a REST fetch.
+    """
+    from settings_helper import format_utc_iso
+
+    return {
+        "id": incident.id,
+        "internal_incident_number": incident.internal_incident_number,
+        "call_category": incident.call_category,
+        "neris_id": incident.neris_id,
+        "cad_event_number": incident.cad_event_number,
+        "cad_event_type": incident.cad_event_type,
+        "cad_event_subtype": incident.cad_event_subtype,
+        "status": incident.status,
+        "review_status": getattr(incident, 'review_status', None),
+        "incident_date": incident.incident_date.isoformat() if incident.incident_date else None,
+        "address": incident.address,
+        "location_name": getattr(incident, 'location_name', None),
+        "cross_streets": incident.cross_streets,
+        "esz_box": incident.esz_box,
+        "municipality_code": incident.municipality_code,
+        "time_dispatched": format_utc_iso(incident.time_dispatched),
+        "time_first_enroute": format_utc_iso(incident.time_first_enroute),
+        "time_first_on_scene": format_utc_iso(incident.time_first_on_scene),
+        "time_last_cleared": format_utc_iso(incident.time_last_cleared),
+        "cad_clear_received_at": format_utc_iso(incident.cad_clear_received_at),
+        "created_at": format_utc_iso(incident.created_at),
+        "updated_at": format_utc_iso(incident.updated_at),
+        "cad_units": incident.cad_units or [],
+        "cad_event_comments": incident.cad_event_comments or {},
+    }
+
+
 async def emit_incident_event(request, event_type: str, incident_data: dict):
     """
     Emit WebSocket event for incident changes via PostgreSQL NOTIFY.
     
     Phase D: Uses NOTIFY instead of direct broadcast so all workers
     receive the event and broadcast to their local connections.
+
+    Events are versioned deltas against the incident's previous event
+    (see incident_events.py), so they stay under the NOTIFY limit.
     
     Args:
         request: FastAPI request (to extract tenant)
         event_type: One of 'incident_created', 'incident_updated', 'incident_closed'
-        incident_data: Dict of incident fields to broadcast
+        incident_data: incident_event_payload(incident)
     """
     notify = _get_ws_notify()
     if not notify:
@@ -71,12 +122,19 @@ async def emit_incident_event(request, event_type: str, incident_data: dict):
     else:
         tenant_slug = _extract_slug(request.headers.get('host', ''))
     
+    snapshot = incident_events.normalize(incident_data)
     try:
-        await notify(tenant_slug, "incident", {
-            "type": event_type,
-            "incident": incident_data,
-            "timestamp": datetime.now(timezone.utc).isoformat()
-        })
+        revision, ops = await run_blocking(_record_incident_event, tenant_slug, snapshot)
+    except Exception as e:
+        # Unversioned full payload, as before revisions existed
+        logger.warning(f"Incident event revision failed for {snapshot.get('id')}: {e}")
+        revision, ops = None, None
+
+    try:
+        await notify(tenant_slug, "incident", incident_events.build_message(
+            event_type, snapshot, revision, ops,
+            datetime.now(timezone.utc).isoformat(),
+        ))
         logger.debug(f"WebSocket NOTIFY: {event_type} to {tenant_slug}")
     except Exception as e:
         logger.warning(f"WebSocket NOTIFY failed: {e}")
@@ -632,3 +690,24 @@ def parse_incident_number(number: str) -> tuple:
         return (None, None, None)
     
     return (category, year, seq_num)
+
+
+def is_out_of_sequence(db: Session, incident_number: str, year: int, category: str, incident_date) -> bool:
+    """
+    True if an earlier-numbered incident in the same year/category has a
+    later incident_date (i.e. this number was assigned out of date order).
+    """
+    _, _, seq_num = parse_incident_number(incident_number)
+    if not seq_num:
+        return False
+    
+    count = db.execute(text("""
+        SELECT COUNT(*) FROM incidents 
+        WHERE year_prefix = :year 
+          AND call_category = :cat
+          AND CAST(SUBSTRING(internal_incident_number FROM 4) AS INTEGER) < :seq
+          AND incident_date > :date
+          AND deleted_at IS NULL
+    """), {"year": year, "cat": category, "seq": seq_num, "date": incident_date}).scalar()
+    
+    return bool(count and count > 0)
@@ -53,6 +53,7 @@ from contextlib import asynccontextmanager
 from routers import incidents, incidents_admin, incidents_attendance, incidents_duplicate, incidents_cad_units, lookups, apparatus, personnel, settings, neris_codes, admin, backup, tenant_auth, master_admin
 from routers import branding, print_layout, comcat, websocket, analytics, review_tasks, analytics_v2, detail_types, test_alerts
 from routers import analytics_personnel, alert_audio, tts, devices
+from routers import cad_ingest
 from routers import help as help_router
 from routers import location as location_router
 from routers import map as map_router
@@ -66,6 +67,7 @@ from routers.reports import router as reports_router
 from database import engine, Base
 from master_database import MasterSessionLocal
 from master_models import TenantSession, Tenant
+import tenant_registry
 from jwt_auth import (
     validate_access_token,
     extract_token_from_request,
@@ -183,11 +185,10 @@ class SuspendedTenantMiddleware(BaseHTTPMiddleware):
             # Main domain or localhost - pass through
             return await call_next(request)
         
-        # Check tenant status
-        from database import check_tenant_status
-        status_info = check_tenant_status(tenant_slug)
+        # Check tenant status (tenant registry cache, shared with TenantAuthMiddleware)
+        tenant = tenant_registry.get_tenant(tenant_slug)
         
-        if status_info['exists'] and status_info['status'] != 'ACTIVE':
+        if tenant and not tenant.is_active:
             # Redirect to main domain
             from fastapi.responses import RedirectResponse
             return RedirectResponse(url="https://cadreport.com", status_code=302)
@@ -226,20 +227,14 @@ class TenantAuthMiddleware(BaseHTTPMiddleware):
         tenant_slug = extract_tenant_slug_from_host(host)
         
         if tenant_slug:
-            db = MasterSessionLocal()
-            try:
-                from sqlalchemy import func
-                tenant = db.query(Tenant).filter(
-                    func.lower(Tenant.slug) == tenant_slug.lower()
-                ).first()
-                
-                if tenant:
-                    # Store tenant info in request state for use by routes
-                    request.state.tenant = tenant
-                    request.state.tenant_id = tenant.id
-                    request.state.tenant_slug = tenant.slug
-            finally:
-                db.close()
+            # Served from the process-local tenant registry (no master DB hit)
+            tenant = tenant_registry.get_tenant(tenant_slug)
+            
+            if tenant:
+                # Store tenant info in request state for use by routes
+                request.state.tenant = tenant
+                request.state.tenant_id = tenant.id
+                request.state.tenant_slug = tenant.slug
         
         # =====================================================================
         # STEP 2: Check if this route requires authentication
@@ -375,6 +370,10 @@ async def lifespan(app: FastAPI):
     # Startup
     print("RunSheet starting up...")
     
+    # Load tenant registry (slug → database/status) before serving requests.
+    # Invalidated via LISTEN/NOTIFY when master admin changes a tenant.
+    tenant_registry.load_registry()
+    
     # Phase C: Start JWT revocation cache refresh (every 60s)
     revocation_task = asyncio.create_task(start_revocation_refresh_task())
     
@@ -383,6 +382,10 @@ async def lifespan(app: FastAPI):
     cleanup_stale_devices_on_startup()
     listen_task = asyncio.create_task(start_listen_subscriber())
     
+    # Batched connected_devices persistence (device_presence.py)
+    import device_presence
+    presence_task = asyncio.create_task(device_presence.run_flusher())
+    
     yield
     
     # Shutdown
@@ -400,6 +403,21 @@ async def lifespan(app: FastAPI):
         pass
     await stop_listen_subscriber()
     
+    # Final device presence flush
+    presence_task.cancel()
+    try:
+        await presence_task
+    except asyncio.CancelledError:
+        pass
+    
+    # Stop warm Piper processes
+    from services.tts_engine import shutdown as shutdown_tts_engine
+    await shutdown_tts_engine()
+    
+    # Stop PDF render pool
+    from executors import shutdown_executors
+    shutdown_executors()
+    
     print("RunSheet shutting down...")
 
 app = FastAPI(
@@ -430,6 +448,7 @@ app.include_router(incidents_admin.router, prefix="/api/incidents", tags=["Incid
 app.include_router(incidents_attendance.router, prefix="/api/incidents", tags=["Incidents Attendance"])
 app.include_router(incidents_duplicate.router, prefix="/api/incidents", tags=["Incidents Duplicate"])
 app.include_router(incidents_cad_units.router, prefix="/api/incidents", tags=["Incidents CAD Units"])
+app.include_router(cad_ingest.router, prefix="/api/cad", tags=["CAD Ingest"])  # CAD listener ingest: /api/cad/ingest
 app.include_router(lookups.router, prefix="/api/lookups", tags=["Lookups"])
 app.include_router(apparatus.router, prefix="/api/apparatus", tags=["Apparatus"])
 app.include_router(personnel.router, prefix="/api/personnel", tags=["Personnel"])
@@ -0,0 +1,50 @@
+-- Migration 048: Append-only ComCat training examples
+-- Officer corrections were only stored inside incidents.cad_event_comments
+-- (category_source = 'OFFICER'), so every retrain loaded and walked every
+-- incident's comments. PUT /api/comcat/comments/{id} now appends one row here
+-- per corrected comment and retraining reads only this table.
+--
+-- A comment corrected twice has two rows; training uses the latest row per
+-- (incident_id, comment_index).
+--
+-- Run against each TENANT database (not cadreport_master).
+
+CREATE TABLE IF NOT EXISTS comcat_training_examples (
+    id BIGSERIAL PRIMARY KEY,
+    incident_id INTEGER REFERENCES incidents(id) ON DELETE CASCADE,
+    comment_index INTEGER NOT NULL,
+    text TEXT NOT NULL,
+    operator_type VARCHAR(20) NOT NULL DEFAULT 'UNKNOWN',
+    category VARCHAR(20) NOT NULL,
+    previous_category VARCHAR(20),
+    corrected_by INTEGER REFERENCES personnel(id) ON DELETE SET NULL,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+-- Latest correction per comment (DISTINCT ON ... ORDER BY id DESC)
+CREATE INDEX IF NOT EXISTS idx_comcat_training_comment
+    ON comcat_training_examples(incident_id, comment_index, id DESC);
+
+-- Backfill existing officer corrections (first run only)
+INSERT INTO comcat_training_examples
+    (incident_id, comment_index, text, operator_type, category, corrected_by, created_at)
+SELECT
+    i.id,
+    (c.ord - 1)::int,
+    c.value->>'text',
+    COALESCE(c.value->>'operator_type', 'UNKNOWN'),
+    COALESCE(c.value->>'category', 'OTHER'),
+    p.id,
+    COALESCE((i.cad_event_comments->>'officer_reviewed_at')::timestamptz, NOW())
+FROM incidents i
+CROSS JOIN LATERAL jsonb_array_elements(i.cad_event_comments->'comments')
+    WITH ORDINALITY AS c(value, ord)
+LEFT JOIN personnel p
+    ON p.id = NULLIF(i.cad_event_comments->>'officer_reviewed_by', '')::int
+WHERE jsonb_typeof(i.cad_event_comments->'comments') = 'array'
+  AND c.value->>'category_source' = 'OFFICER'
+  AND COALESCE(c.value->>'text', '') <> ''
+  AND NOT EXISTS (SELECT 1 FROM comcat_training_examples);
+
+-- Verify
+SELECT category, COUNT(*) FROM comcat_training_examples GROUP BY category ORDER BY category;
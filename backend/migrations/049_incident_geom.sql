@@ -0,0 +1,72 @@
+-- Migration 049: Typed PostGIS point for incidents
+-- incidents.latitude / longitude are VARCHAR(20) (NERIS format, kept as-is).
+-- Spatial queries on incidents (map incident layers, open incidents, scene
+-- history) had to filter latitude != '' and cast text to numbers on every
+-- row, so none of them could use an index.
+--
+-- geom:  GEOMETRY(Point, 4326), maintained by trigger from latitude/longitude.
+--        Every writer (geocode background task, re-geocode, manual picker,
+--        incident PUT, location clears, backup restore) goes through the
+--        trigger, so no application code sets geom directly.
+--
+-- Indexes:
+--   idx_incidents_geom            GIST (geom)             - ST_Intersects(geom, envelope)
+--   idx_incidents_geog            GIST ((geom::geography)) - ST_DWithin(geom::geography, pt, meters)
+--   idx_incidents_category_date   (call_category, incident_date) - incident map layers
+--   idx_incidents_address_norm    (UPPER(TRIM(address)))  - scene history address match
+--
+-- Run against each TENANT database (not cadreport_master).
+
+CREATE EXTENSION IF NOT EXISTS postgis;
+
+ALTER TABLE incidents ADD COLUMN IF NOT EXISTS geom GEOMETRY(Point, 4326);
+
+-- Keep geom in sync with the text coordinates
+CREATE OR REPLACE FUNCTION incidents_sync_geom() RETURNS trigger AS $$
+BEGIN
+    IF NEW.latitude ~ '^\s*[-+]?([0-9]+\.?[0-9]*|\.[0-9]+)\s*$'
+       AND NEW.longitude ~ '^\s*[-+]?([0-9]+\.?[0-9]*|\.[0-9]+)\s*$'
+       AND trim(NEW.latitude)::double precision BETWEEN -90 AND 90
+       AND trim(NEW.longitude)::double precision BETWEEN -180 AND 180
+    THEN
+        NEW.geom := ST_SetSRID(ST_MakePoint(
+            trim(NEW.longitude)::double precision,
+            trim(NEW.latitude)::double precision
+        ), 4326);
+    ELSE
+        NEW.geom := NULL;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_incidents_sync_geom ON incidents;
+CREATE TRIGGER trg_incidents_sync_geom
+    BEFORE INSERT OR UPDATE OF latitude, longitude ON incidents
+    FOR EACH ROW EXECUTE FUNCTION incidents_sync_geom();
+
+-- Backfill history (fires the trigger; only rows that have coordinates)
+UPDATE incidents
+SET latitude = latitude
+WHERE geom IS NULL
+  AND latitude IS NOT NULL AND latitude != ''
+  AND longitude IS NOT NULL AND longitude != '';
+
+CREATE INDEX IF NOT EXISTS idx_incidents_geom
+    ON incidents USING GIST (geom);
+
+CREATE INDEX IF NOT EXISTS idx_incidents_geog
+    ON incidents USING GIST ((geom::geography));
+
+CREATE INDEX IF NOT EXISTS idx_incidents_category_date
+    ON incidents (call_category, incident_date);
+
+CREATE INDEX IF NOT EXISTS idx_incidents_address_norm
+    ON incidents (UPPER(TRIM(address)));
+
+ANALYZE incidents;
+
+-- Verify: rows with text coordinates but no geom (should be 0 or only junk values)
+SELECT COUNT(*) AS unparsed_coordinates
+FROM incidents
+WHERE geom IS NULL AND latitude IS NOT NULL AND latitude != '';
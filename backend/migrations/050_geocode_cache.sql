@@ -0,0 +1,70 @@
+-- Migration 050: Geocode cache
+-- Every incident geocode went to Google / Census / Geocodio, even though
+-- most calls are repeat addresses. geocode_with_mile_marker_fallback() now
+-- checks this table first (services/location/geocode_cache.py).
+--
+-- cache_key:   normalized address | municipality code | state
+--              (uppercase, whitespace collapsed - see normalize_address())
+-- result:      full geocode_address() result, copied into incidents.geocode_data
+-- manual:      officer correction from the location picker - never expires
+-- expires_at:  NULL for manual entries, created_at + 180 days otherwise
+--
+-- Seeded from already-geocoded incidents (latest per key) so the first
+-- backfill after enabling the cache is mostly hits.
+--
+-- Run against each TENANT database (not cadreport_master).
+
+CREATE TABLE IF NOT EXISTS geocode_cache (
+    cache_key TEXT PRIMARY KEY,
+    address TEXT NOT NULL,
+    municipality VARCHAR(20),
+    state VARCHAR(10),
+    result JSONB NOT NULL,
+    provider VARCHAR(30),
+    manual BOOLEAN NOT NULL DEFAULT FALSE,
+    hit_count INTEGER NOT NULL DEFAULT 0,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    expires_at TIMESTAMPTZ,
+    last_hit_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS idx_geocode_cache_expires
+    ON geocode_cache(expires_at) WHERE expires_at IS NOT NULL;
+
+-- Seed from existing incidents (mile marker results come from local tables
+-- and are never cached)
+INSERT INTO geocode_cache
+    (cache_key, address, municipality, state, result, provider, manual, created_at, expires_at)
+SELECT DISTINCT ON (cache_key)
+    cache_key, address, municipality, state, result, provider, manual, NOW(),
+    CASE WHEN manual THEN NULL ELSE NOW() + INTERVAL '180 days' END
+FROM (
+    SELECT
+        regexp_replace(upper(trim(i.address)), '\s+', ' ', 'g')
+            || '|' || COALESCE(regexp_replace(upper(trim(i.municipality_code)), '\s+', ' ', 'g'), '')
+            || '|' || upper(s.state) AS cache_key,
+        trim(i.address) AS address,
+        i.municipality_code AS municipality,
+        s.state,
+        i.geocode_data::jsonb AS result,
+        i.geocode_data->>'provider' AS provider,
+        COALESCE(i.geocode_data->>'source', '') = 'manual_picker' AS manual,
+        i.updated_at
+    FROM incidents i
+    CROSS JOIN (
+        SELECT COALESCE(
+            (SELECT NULLIF(trim(value), '') FROM settings
+             WHERE category = 'location' AND key = 'default_state'),
+            'PA'
+        ) AS state
+    ) s
+    WHERE i.deleted_at IS NULL
+      AND i.geocode_data IS NOT NULL
+      AND COALESCE(i.geocode_needs_review, false) = false
+      AND i.latitude IS NOT NULL AND trim(i.latitude) != ''
+      AND i.longitude IS NOT NULL AND trim(i.longitude) != ''
+      AND i.address IS NOT NULL AND trim(i.address) != ''
+      AND COALESCE(i.geocode_data->>'provider', '') != 'mile_marker'
+) seed
+WHERE NOT EXISTS (SELECT 1 FROM geocode_cache)
+ORDER BY cache_key, manual DESC, updated_at DESC NULLS LAST;
@@ -0,0 +1,249 @@
+-- Migration 051: Per-incident metrics fact table
+-- Analytics (routers/analytics_v2.py, routers/analytics.py dashboard) and
+-- the monthly / stats reports expanded incidents.cad_units with
+-- jsonb_array_elements() to decide "station responded", ran a correlated
+-- COUNT(*) on incident_personnel per incident and filtered on
+-- internal_incident_number LIKE 'F%' - for every incident in the range,
+-- every request. Multi-year dashboards were full scans.
+--
+-- incident_metrics holds one row per non-deleted incident with everything
+-- those queries derive, computed once when the incident changes:
+--
+--   category              first letter of internal_incident_number (F/E/D)
+--   incident_date         COALESCE(incident_date, created_at::date)
+--   station_responded     a non-mutual-aid cad_units entry has time_enroute
+--   turnout/travel/response/on_scene/duration_seconds
+--                         duration = COALESCE(cleared, on_scene) - dispatched
+--   personnel_count       incident_personnel rows (report "number of men")
+--   unique_personnel      distinct personnel_id
+--   manhours              duration hours * personnel_count, NULL unless
+--                         0 < duration < 24h (the reports' sanity window)
+--   local_hour/local_dow  dispatch hour in the station timezone setting /
+--                         day of week of incident_date
+--   first_unit_*          first counts_for_response_times unit enroute,
+--                         its turnout and crew size (turnout-vs-crew chart)
+--
+-- Maintenance: refresh_incident_metrics(id) is called by triggers on
+-- incidents (INSERT, UPDATE of the source columns, soft delete) and on
+-- incident_personnel, so every writer (CAD ingest, run sheet saves, close,
+-- attendance, restore) keeps it current without application changes. A
+-- failed refresh only logs a WARNING - it never blocks the incident write.
+--
+-- Rebuild after changing the station timezone or an apparatus'
+-- counts_for_response_times (POST /api/analytics/v2/metrics/rebuild, or):
+--   SELECT refresh_incident_metrics(id) FROM incidents;
+--
+-- Run against each TENANT database (not cadreport_master).
+
+CREATE TABLE IF NOT EXISTS incident_metrics (
+    incident_id INTEGER PRIMARY KEY REFERENCES incidents(id) ON DELETE CASCADE,
+    category CHAR(1) NOT NULL,
+    incident_date DATE NOT NULL,
+    status VARCHAR(20),
+    cad_event_type VARCHAR(100),
+    cad_event_subtype VARCHAR(100),
+    municipality_code VARCHAR(10),
+    station_responded BOOLEAN NOT NULL DEFAULT FALSE,
+    time_dispatched TIMESTAMPTZ,
+    local_hour SMALLINT,
+    local_dow SMALLINT NOT NULL,
+    turnout_seconds DOUBLE PRECISION,
+    travel_seconds DOUBLE PRECISION,
+    response_seconds DOUBLE PRECISION,
+    on_scene_seconds DOUBLE PRECISION,
+    duration_seconds DOUBLE PRECISION,
+    personnel_count INTEGER NOT NULL DEFAULT 0,
+    unique_personnel INTEGER NOT NULL DEFAULT 0,
+    manhours DOUBLE PRECISION,
+    first_unit_id VARCHAR(20),
+    first_unit_turnout_seconds DOUBLE PRECISION,
+    first_unit_crew INTEGER,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_incident_metrics_category_date
+    ON incident_metrics (category, incident_date);
+
+CREATE INDEX IF NOT EXISTS idx_incident_metrics_responded
+    ON incident_metrics (category, incident_date) WHERE station_responded;
+
+
+CREATE OR REPLACE FUNCTION refresh_incident_metrics(p_incident_id INTEGER) RETURNS void AS $$
+DECLARE
+    tz TEXT;
+BEGIN
+    SELECT NULLIF(trim(value), '') INTO tz
+    FROM settings WHERE category = 'station' AND key = 'timezone';
+    tz := COALESCE(tz, 'America/New_York');
+    BEGIN
+        PERFORM NOW() AT TIME ZONE tz;
+    EXCEPTION WHEN others THEN
+        tz := 'America/New_York';
+    END;
+
+    IF NOT EXISTS (
+        SELECT 1 FROM incidents
+        WHERE id = p_incident_id AND deleted_at IS NULL
+          AND internal_incident_number IS NOT NULL AND internal_incident_number != ''
+    ) THEN
+        DELETE FROM incident_metrics WHERE incident_id = p_incident_id;
+        RETURN;
+    END IF;
+
+    INSERT INTO incident_metrics (
+        incident_id, category, incident_date, status, cad_event_type, cad_event_subtype,
+        municipality_code, station_responded, time_dispatched, local_hour, local_dow,
+        turnout_seconds, travel_seconds, response_seconds, on_scene_seconds, duration_seconds,
+        personnel_count, unique_personnel, manhours,
+        first_unit_id, first_unit_turnout_seconds, first_unit_crew, updated_at
+    )
+    SELECT
+        i.id,
+        upper(left(i.internal_incident_number, 1)),
+        COALESCE(i.incident_date, i.created_at::date),
+        i.status,
+        i.cad_event_type,
+        i.cad_event_subtype,
+        i.municipality_code,
+        EXISTS (
+            SELECT 1 FROM jsonb_array_elements(COALESCE(i.cad_units, '[]'::jsonb)) AS unit_elem
+            WHERE unit_elem->>'time_enroute' IS NOT NULL
+              AND (unit_elem->>'is_mutual_aid')::boolean IS NOT TRUE
+        ),
+        i.time_dispatched,
+        EXTRACT(hour FROM i.time_dispatched AT TIME ZONE tz),
+        EXTRACT(dow FROM COALESCE(i.incident_date, i.created_at::date)),
+        EXTRACT(EPOCH FROM (i.time_first_enroute - i.time_dispatched)),
+        EXTRACT(EPOCH FROM (i.time_first_on_scene - i.time_first_enroute)),
+        EXTRACT(EPOCH FROM (i.time_first_on_scene - i.time_dispatched)),
+        EXTRACT(EPOCH FROM (i.time_last_cleared - i.time_first_on_scene)),
+        d.duration_seconds,
+        p.personnel_count,
+        p.unique_personnel,
+        CASE WHEN d.duration_seconds > 0 AND d.duration_seconds < 86400
+             THEN d.duration_seconds / 3600.0 * p.personnel_count END,
+        fu.unit_id,
+        EXTRACT(EPOCH FROM (fu.time_enroute - i.time_dispatched)),
+        (SELECT COUNT(*)
+         FROM incident_personnel ip
+         JOIN incident_units iu ON ip.incident_unit_id = iu.id
+         JOIN apparatus a ON iu.apparatus_id = a.id
+         WHERE ip.incident_id = i.id
+           AND a.unit_designator = fu.unit_id),
+        NOW()
+    FROM incidents i
+    CROSS JOIN LATERAL (
+        SELECT EXTRACT(EPOCH FROM (
+            COALESCE(i.time_last_cleared, i.time_first_on_scene) - i.time_dispatched
+        )) AS duration_seconds
+    ) d
+    CROSS JOIN LATERAL (
+        SELECT COUNT(*) AS personnel_count, COUNT(DISTINCT personnel_id) AS unique_personnel
+        FROM incident_personnel WHERE incident_id = i.id
+    ) p
+    LEFT JOIN LATERAL (
+        SELECT unit_elem->>'unit_id' AS unit_id,
+               (unit_elem->>'time_enroute')::timestamptz AS time_enroute
+        FROM jsonb_array_elements(COALESCE(i.cad_units, '[]'::jsonb)) AS unit_elem
+        JOIN apparatus a ON a.unit_designator = unit_elem->>'unit_id'
+        WHERE unit_elem->>'time_enroute' IS NOT NULL
+          AND (unit_elem->>'is_mutual_aid')::boolean IS NOT TRUE
+          AND a.counts_for_response_times = true
+        ORDER BY unit_elem->>'time_enroute'
+        LIMIT 1
+    ) fu ON true
+    WHERE i.id = p_incident_id
+    ON CONFLICT (incident_id) DO UPDATE SET
+        category = EXCLUDED.category,
+        incident_date = EXCLUDED.incident_date,
+        status = EXCLUDED.status,
+        cad_event_type = EXCLUDED.cad_event_type,
+        cad_event_subtype = EXCLUDED.cad_event_subtype,
+        municipality_code = EXCLUDED.municipality_code,
+        station_responded = EXCLUDED.station_responded,
+        time_dispatched = EXCLUDED.time_dispatched,
+        local_hour = EXCLUDED.local_hour,
+        local_dow = EXCLUDED.local_dow,
+        turnout_seconds = EXCLUDED.turnout_seconds,
+        travel_seconds = EXCLUDED.travel_seconds,
+        response_seconds = EXCLUDED.response_seconds,
+        on_scene_seconds = EXCLUDED.on_scene_seconds,
+        duration_seconds = EXCLUDED.duration_seconds,
+        personnel_count = EXCLUDED.personnel_count,
+        unique_personnel = EXCLUDED.unique_personnel,
+        manhours = EXCLUDED.manhours,
+        first_unit_id = EXCLUDED.first_unit_id,
+        first_unit_turnout_seconds = EXCLUDED.first_unit_turnout_seconds,
+        first_unit_crew = EXCLUDED.first_unit_crew,
+        updated_at = EXCLUDED.updated_at;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- Trigger wrappers: never let a metrics failure (e.g. a malformed
+-- cad_units time string) roll back the incident write itself
+CREATE OR REPLACE FUNCTION incidents_refresh_metrics() RETURNS trigger AS $$
+BEGIN
+    BEGIN
+        PERFORM refresh_incident_metrics(NEW.id);
+    EXCEPTION WHEN others THEN
+        RAISE WARNING 'incident_metrics refresh failed for incident %: %', NEW.id, SQLERRM;
+    END;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION incident_personnel_refresh_metrics() RETURNS trigger AS $$
+BEGIN
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            PERFORM refresh_incident_metrics(OLD.incident_id);
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE')
+           AND (TG_OP = 'INSERT' OR NEW.incident_id IS DISTINCT FROM OLD.incident_id) THEN
+            PERFORM refresh_incident_metrics(NEW.incident_id);
+        END IF;
+    EXCEPTION WHEN others THEN
+        RAISE WARNING 'incident_metrics refresh failed (incident_personnel %): %', TG_OP, SQLERRM;
+    END;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_incidents_refresh_metrics ON incidents;
+CREATE TRIGGER trg_incidents_refresh_metrics
+    AFTER INSERT OR UPDATE OF
+        internal_incident_number, status, incident_date, deleted_at,
+        cad_event_type, cad_event_subtype, municipality_code, cad_units,
+        time_dispatched, time_first_enroute, time_first_on_scene, time_last_cleared
+    ON incidents
+    FOR EACH ROW EXECUTE FUNCTION incidents_refresh_metrics();
+
+DROP TRIGGER IF EXISTS trg_incident_personnel_refresh_metrics ON incident_personnel;
+CREATE TRIGGER trg_incident_personnel_refresh_metrics
+    AFTER INSERT OR UPDATE OF incident_id, personnel_id, incident_unit_id OR DELETE
+    ON incident_personnel
+    FOR EACH ROW EXECUTE FUNCTION incident_personnel_refresh_metrics();
+
+-- Backfill (per row, so one malformed incident doesn't abort the migration)
+DO $$
+DECLARE
+    r RECORD;
+BEGIN
+    FOR r IN SELECT id FROM incidents WHERE deleted_at IS NULL LOOP
+        BEGIN
+            PERFORM refresh_incident_metrics(r.id);
+        EXCEPTION WHEN others THEN
+            RAISE WARNING 'incident_metrics backfill failed for incident %: %', r.id, SQLERRM;
+        END;
+    END LOOP;
+END $$;
+
+ANALYZE incident_metrics;
+
+-- Verify: non-deleted incidents without a metrics row (should be 0)
+SELECT COUNT(*) AS missing_metrics
+FROM incidents i
+WHERE i.deleted_at IS NULL
+  AND i.internal_incident_number IS NOT NULL AND i.internal_incident_number != ''
+  AND NOT EXISTS (SELECT 1 FROM incident_metrics m WHERE m.incident_id = i.id);
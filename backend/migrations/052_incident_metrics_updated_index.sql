@@ -0,0 +1,14 @@
+-- Migration 052: incident_metrics (incident_date, updated_at) index
+-- The analytics result cache (analytics_cache.py) fingerprints each open
+-- date window with
+--   SELECT COUNT(*), MAX(updated_at) FROM incident_metrics
+--   WHERE incident_date >= :start_date AND incident_date < :end_date
+-- before serving a cached dashboard result. This index makes that an
+-- index-only scan instead of a heap read per polling dashboard.
+--
+-- Run against each TENANT database (not cadreport_master).
+
+CREATE INDEX IF NOT EXISTS idx_incident_metrics_date_updated
+    ON incident_metrics (incident_date, updated_at);
+
+ANALYZE incident_metrics;
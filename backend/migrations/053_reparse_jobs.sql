@@ -0,0 +1,33 @@
+-- Migration 053: Full-reparse background jobs
+-- POST /api/backup/full-reparse-all used to reparse a whole year inside one
+-- HTTP request and hit proxy timeouts. It now queues a job
+-- (services/reparse_job.py) that works through the year in id order, one
+-- committed chunk at a time. This table holds each job's progress and
+-- cursor (last_incident_id), so any worker can report status and an
+-- interrupted job resumes where its last chunk committed.
+--
+-- Run against each TENANT database (not cadreport_master).
+
+CREATE TABLE IF NOT EXISTS reparse_jobs (
+    id SERIAL PRIMARY KEY,
+    year INTEGER NOT NULL,
+    status VARCHAR(20) NOT NULL DEFAULT 'queued',  -- queued, running, cancelling, cancelled, completed, failed
+    dry_run BOOLEAN NOT NULL DEFAULT false,
+    diff_only BOOLEAN NOT NULL DEFAULT true,
+    edited_by INTEGER REFERENCES personnel(id) ON DELETE SET NULL,
+    total INTEGER NOT NULL DEFAULT 0,
+    processed INTEGER NOT NULL DEFAULT 0,
+    changed INTEGER NOT NULL DEFAULT 0,
+    unchanged INTEGER NOT NULL DEFAULT 0,
+    error_count INTEGER NOT NULL DEFAULT 0,
+    errors JSONB NOT NULL DEFAULT '[]'::jsonb,     -- first 200 {incident_id, incident_number, error}
+    last_incident_id INTEGER NOT NULL DEFAULT 0,   -- resume cursor
+    message TEXT,
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    started_at TIMESTAMPTZ,
+    heartbeat_at TIMESTAMPTZ,
+    finished_at TIMESTAMPTZ
+);
+
+CREATE INDEX IF NOT EXISTS idx_reparse_jobs_year_created
+    ON reparse_jobs(year, created_at DESC);
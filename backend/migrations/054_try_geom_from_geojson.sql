@@ -0,0 +1,21 @@
+-- Migration 054: NULL-on-error GeoJSON geometry parsing for bulk imports
+-- services/location/import_pipeline.py COPYs a whole layer into a staging
+-- table and upserts it into map_features in one statement. A single bad
+-- geometry must not abort that statement, so parsing goes through this
+-- wrapper: invalid GeoJSON, or a geometry the map_features.geometry column
+-- (Geometry, 4326) would reject, comes back NULL and is counted as an
+-- import error instead.
+--
+-- Run against each TENANT database (not cadreport_master).
+
+CREATE OR REPLACE FUNCTION try_geom_from_geojson(geojson TEXT)
+RETURNS geometry(Geometry, 4326) AS $$
+BEGIN
+    IF geojson IS NULL THEN
+        RETURN NULL;
+    END IF;
+    RETURN ST_SetSRID(ST_GeomFromGeoJSON(geojson), 4326)::geometry(Geometry, 4326);
+EXCEPTION WHEN others THEN
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql IMMUTABLE PARALLEL SAFE;
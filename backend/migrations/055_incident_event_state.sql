@@ -0,0 +1,17 @@
+-- Migration 055: Incident event revisions
+-- /ws/incidents events used to carry whole incident payloads; past the
+-- ~7500-byte NOTIFY limit they were replaced by a bare "refresh" hint and
+-- every open browser re-fetched the incident at once. Events are now deltas
+-- against a per-incident revision (backend/incident_events.py). This table
+-- holds each incident's current revision and the last snapshot broadcast,
+-- so any worker can diff the next event against it and answer client
+-- resync requests.
+--
+-- Run against each TENANT database (not cadreport_master).
+
+CREATE TABLE IF NOT EXISTS incident_event_state (
+    incident_id INTEGER PRIMARY KEY REFERENCES incidents(id) ON DELETE CASCADE,
+    revision INTEGER NOT NULL,
+    snapshot JSONB NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
@@ -0,0 +1,11 @@
+-- Migration 056: connected_devices.last_seen_at
+-- Device presence is now kept in memory per worker and flushed to
+-- connected_devices in batches (backend/device_presence.py). last_seen_at
+-- is bumped for devices heard from since the previous flush, so the admin
+-- device listing can skip rows left behind by a worker that died without
+-- cleaning up.
+--
+-- Run against each TENANT database (not cadreport_master).
+
+ALTER TABLE connected_devices
+    ADD COLUMN IF NOT EXISTS last_seen_at TIMESTAMPTZ NOT NULL DEFAULT NOW();
@@ -0,0 +1,85 @@
+-- Migration 057: Per-layer bounding envelopes for proximity snapshots
+-- services/location/proximity.py gathers every layer hit for an incident in
+-- one statement. Each active layer's envelope (plus its search radius) is
+-- checked first, so layers that can't reach the incident - another
+-- county's hydrants, a flood zone layer on the far side of the district -
+-- are skipped without touching their features.
+--
+-- Envelopes grow automatically: statement-level triggers union the
+-- bounding box of inserted / updated rows into the layer's extent (one
+-- update per statement, so a bulk import costs one row per layer). Deletes
+-- never shrink an extent - a too-large envelope only costs a wasted
+-- feature lookup, never a missed hit. refresh_map_layer_extents() rebuilds
+-- them exactly (all layers, or one layer_id).
+--
+-- max_radius_meters is the largest point_radius feature radius in the
+-- layer, so point_radius layers are kept when the incident is within
+-- reach of any feature's radius.
+--
+-- Run against each TENANT database (not cadreport_master).
+
+CREATE TABLE IF NOT EXISTS map_layer_extents (
+    layer_id INTEGER PRIMARY KEY REFERENCES map_layers(id) ON DELETE CASCADE,
+    extent GEOMETRY(Geometry, 4326),              -- NULL = layer has no features
+    max_radius_meters DOUBLE PRECISION NOT NULL DEFAULT 0,
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+
+CREATE OR REPLACE FUNCTION refresh_map_layer_extents(p_layer_id INTEGER DEFAULT NULL)
+RETURNS void AS $$
+BEGIN
+    INSERT INTO map_layer_extents (layer_id, extent, max_radius_meters, updated_at)
+    SELECT ml.id,
+           ST_SetSRID(ST_Extent(mf.geometry)::geometry, 4326),
+           COALESCE(MAX(mf.radius_meters), 0),
+           NOW()
+    FROM map_layers ml
+    LEFT JOIN map_features mf ON mf.layer_id = ml.id
+    WHERE p_layer_id IS NULL OR ml.id = p_layer_id
+    GROUP BY ml.id
+    ON CONFLICT (layer_id) DO UPDATE SET
+        extent = EXCLUDED.extent,
+        max_radius_meters = EXCLUDED.max_radius_meters,
+        updated_at = NOW();
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE OR REPLACE FUNCTION map_layer_extents_grow()
+RETURNS trigger AS $$
+BEGIN
+    INSERT INTO map_layer_extents (layer_id, extent, max_radius_meters, updated_at)
+    SELECT layer_id,
+           ST_SetSRID(ST_Extent(geometry)::geometry, 4326),
+           COALESCE(MAX(radius_meters), 0),
+           NOW()
+    FROM new_rows
+    GROUP BY layer_id
+    ON CONFLICT (layer_id) DO UPDATE SET
+        extent = CASE
+            WHEN map_layer_extents.extent IS NULL THEN EXCLUDED.extent
+            ELSE ST_Envelope(ST_Collect(map_layer_extents.extent, EXCLUDED.extent))
+        END,
+        max_radius_meters = GREATEST(map_layer_extents.max_radius_meters, EXCLUDED.max_radius_meters),
+        updated_at = NOW();
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+
+DROP TRIGGER IF EXISTS trg_map_features_extent_insert ON map_features;
+CREATE TRIGGER trg_map_features_extent_insert
+    AFTER INSERT ON map_features
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION map_layer_extents_grow();
+
+DROP TRIGGER IF EXISTS trg_map_features_extent_update ON map_features;
+CREATE TRIGGER trg_map_features_extent_update
+    AFTER UPDATE ON map_features
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION map_layer_extents_grow();
+
+
+-- Backfill existing layers
+SELECT refresh_map_layer_extents();
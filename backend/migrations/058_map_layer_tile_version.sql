@@ -0,0 +1,51 @@
+-- Migration 058: Tile version per map layer
+-- /api/map/tiles/{layer}/{z}/{x}/{y}.mvt caches rendered vector tiles on
+-- disk under the layer's tile_version (services/location/map_tiles.py).
+-- Any statement that inserts, updates or deletes map_features bumps the
+-- version of every layer it touched, so cached tiles for that layer stop
+-- being served no matter who wrote the change: feature CRUD, ArcGIS / file
+-- imports, config deletes, manual SQL.
+--
+-- Statement-level triggers: a bulk import bumps each layer once, not once
+-- per feature.
+--
+-- Run against each TENANT database (not cadreport_master).
+
+ALTER TABLE map_layers ADD COLUMN IF NOT EXISTS tile_version BIGINT NOT NULL DEFAULT 1;
+
+
+CREATE OR REPLACE FUNCTION map_layers_bump_tile_version()
+RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        UPDATE map_layers SET tile_version = tile_version + 1
+        WHERE id IN (SELECT layer_id FROM new_rows);
+    ELSIF TG_OP = 'DELETE' THEN
+        UPDATE map_layers SET tile_version = tile_version + 1
+        WHERE id IN (SELECT layer_id FROM old_rows);
+    ELSE
+        UPDATE map_layers SET tile_version = tile_version + 1
+        WHERE id IN (SELECT layer_id FROM new_rows UNION SELECT layer_id FROM old_rows);
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+
+DROP TRIGGER IF EXISTS trg_map_features_tile_version_insert ON map_features;
+CREATE TRIGGER trg_map_features_tile_version_insert
+    AFTER INSERT ON map_features
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION map_layers_bump_tile_version();
+
+DROP TRIGGER IF EXISTS trg_map_features_tile_version_update ON map_features;
+CREATE TRIGGER trg_map_features_tile_version_update
+    AFTER UPDATE ON map_features
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION map_layers_bump_tile_version();
+
+DROP TRIGGER IF EXISTS trg_map_features_tile_version_delete ON map_features;
+CREATE TRIGGER trg_map_features_tile_version_delete
+    AFTER DELETE ON map_features
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION map_layers_bump_tile_version();
@@ -0,0 +1,47 @@
+-- Migration 059: incident_metrics change counter
+-- The analytics result cache (analytics_cache.py) fingerprinted open date
+-- windows with COUNT(*), MAX(updated_at). updated_at came from NOW() - the
+-- writing transaction's start time - so a transaction that started before
+-- a fingerprint was read but committed after it could land a change with
+-- an older updated_at than the one already seen, and the stale result was
+-- served until the next unrelated write in that window.
+--
+-- Every insert or update of a metrics row now takes the next value of
+-- incident_metrics_change_seq into change_seq, and the fingerprint reads
+-- (COUNT(*), SUM(change_seq)). A refreshed row always gets a value larger
+-- than any it replaces, and inserts / deletes move the count, so the
+-- fingerprint changes for every committed write regardless of commit
+-- order. updated_at now uses clock_timestamp() for the same reason.
+--
+-- The (incident_date) INCLUDE (change_seq) index keeps the fingerprint an
+-- index-only scan; it replaces migration 052's (incident_date, updated_at).
+--
+-- Run against each TENANT database (not cadreport_master).
+
+CREATE SEQUENCE IF NOT EXISTS incident_metrics_change_seq;
+
+ALTER TABLE incident_metrics
+    ADD COLUMN IF NOT EXISTS change_seq BIGINT NOT NULL DEFAULT nextval('incident_metrics_change_seq');
+
+
+CREATE OR REPLACE FUNCTION incident_metrics_bump_change_seq()
+RETURNS trigger AS $$
+BEGIN
+    NEW.change_seq := nextval('incident_metrics_change_seq');
+    NEW.updated_at := clock_timestamp();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_incident_metrics_change_seq ON incident_metrics;
+CREATE TRIGGER trg_incident_metrics_change_seq
+    BEFORE INSERT OR UPDATE ON incident_metrics
+    FOR EACH ROW EXECUTE FUNCTION incident_metrics_bump_change_seq();
+
+
+CREATE INDEX IF NOT EXISTS idx_incident_metrics_date_change_seq
+    ON incident_metrics (incident_date) INCLUDE (change_seq);
+
+DROP INDEX IF EXISTS idx_incident_metrics_date_updated;
+
+ANALYZE incident_metrics;
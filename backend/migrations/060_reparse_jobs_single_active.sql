@@ -0,0 +1,27 @@
+-- Migration 060: One active full-reparse job per tenant
+-- services/reparse_job.py checked for an active job and then inserted a new
+-- one in a separate statement, so two requests (or two workers) could both
+-- pass the check and start a job each. The partial unique index below lets
+-- at most one reparse_jobs row be queued / running / cancelling; a second
+-- insert fails and the caller returns the job that won.
+--
+-- Jobs whose heartbeat went stale are moved to the stored 'interrupted'
+-- status before a new job starts or one resumes, so a dead job never
+-- blocks the index. run_token identifies the thread that claimed the job:
+-- every chunk commit and the final status update require it, so a thread
+-- that stalled past STALE_AFTER and was superseded by a resume stops at its
+-- next chunk instead of processing alongside the new one.
+--
+-- Run against each TENANT database (not cadreport_master).
+
+ALTER TABLE reparse_jobs ADD COLUMN IF NOT EXISTS run_token VARCHAR(32);
+
+-- Keep only the newest active job active before the index is built
+UPDATE reparse_jobs
+SET status = 'interrupted', run_token = NULL
+WHERE status IN ('queued', 'running', 'cancelling')
+  AND id < (SELECT MAX(id) FROM reparse_jobs WHERE status IN ('queued', 'running', 'cancelling'));
+
+CREATE UNIQUE INDEX IF NOT EXISTS idx_reparse_jobs_one_active
+    ON reparse_jobs ((true))
+    WHERE status IN ('queued', 'running', 'cancelling');
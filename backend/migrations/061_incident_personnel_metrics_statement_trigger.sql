@@ -0,0 +1,69 @@
+-- Migration 061: Statement-level incident_personnel metrics trigger
+-- 051's trg_incident_personnel_refresh_metrics ran FOR EACH ROW, so saving
+-- a crew of N rebuilt that incident's incident_metrics row N times (and a
+-- roster replace - delete + insert - 2N times). The triggers below run once
+-- per statement and refresh each affected incident once, from the
+-- DISTINCT incident_ids in the statement's transition tables.
+--
+-- Postgres does not allow transition tables on an UPDATE OF column list, so
+-- the UPDATE trigger fires on any update and only refreshes incidents whose
+-- rows changed incident_id, personnel_id or incident_unit_id (051's list).
+-- Each incident is refreshed in its own block: a metrics failure is a
+-- WARNING and never rolls back the roster write, as in 051.
+--
+-- Run against each TENANT database (not cadreport_master).
+
+CREATE OR REPLACE FUNCTION incident_personnel_refresh_metrics() RETURNS trigger AS $$
+DECLARE
+    ids INTEGER[];
+    incident INTEGER;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        SELECT array_agg(DISTINCT incident_id) INTO ids
+        FROM new_rows WHERE incident_id IS NOT NULL;
+    ELSIF TG_OP = 'DELETE' THEN
+        SELECT array_agg(DISTINCT incident_id) INTO ids
+        FROM old_rows WHERE incident_id IS NOT NULL;
+    ELSE
+        SELECT array_agg(DISTINCT x.incident_id) INTO ids
+        FROM old_rows o
+        JOIN new_rows n ON n.id = o.id
+        CROSS JOIN LATERAL (VALUES (o.incident_id), (n.incident_id)) AS x(incident_id)
+        WHERE x.incident_id IS NOT NULL
+          AND (o.incident_id IS DISTINCT FROM n.incident_id
+               OR o.personnel_id IS DISTINCT FROM n.personnel_id
+               OR o.incident_unit_id IS DISTINCT FROM n.incident_unit_id);
+    END IF;
+
+    FOREACH incident IN ARRAY COALESCE(ids, '{}') LOOP
+        BEGIN
+            PERFORM refresh_incident_metrics(incident);
+        EXCEPTION WHEN others THEN
+            RAISE WARNING 'incident_metrics refresh failed for incident % (incident_personnel %): %',
+                incident, TG_OP, SQLERRM;
+        END;
+    END LOOP;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+
+DROP TRIGGER IF EXISTS trg_incident_personnel_refresh_metrics ON incident_personnel;
+
+DROP TRIGGER IF EXISTS trg_incident_personnel_refresh_metrics_insert ON incident_personnel;
+CREATE TRIGGER trg_incident_personnel_refresh_metrics_insert
+    AFTER INSERT ON incident_personnel
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION incident_personnel_refresh_metrics();
+
+DROP TRIGGER IF EXISTS trg_incident_personnel_refresh_metrics_update ON incident_personnel;
+CREATE TRIGGER trg_incident_personnel_refresh_metrics_update
+    AFTER UPDATE ON incident_personnel
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION incident_personnel_refresh_metrics();
+
+DROP TRIGGER IF EXISTS trg_incident_personnel_refresh_metrics_delete ON incident_personnel;
+CREATE TRIGGER trg_incident_personnel_refresh_metrics_delete
+    AFTER DELETE ON incident_personnel
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION incident_personnel_refresh_metrics();
@@ -0,0 +1,22 @@
+-- Migration 062: Refresh incident metrics on detail / event-time edits
+-- The cached /api/analytics/v2/personnel/stats/all payload is keyed on the
+-- incident_metrics fingerprint (COUNT, SUM(change_seq) - migration 059), so
+-- it is only invalidated when 051's incidents trigger refreshes a metrics row.
+-- Its detail and fun-fact sections also read call_category, detail_type,
+-- time_event_start and time_event_end, none of which were in the trigger's
+-- UPDATE OF list: retyping a detail or fixing its times kept serving the
+-- old numbers until some other column changed.
+--
+-- Same trigger and function as 051, with those four columns added.
+--
+-- Run against each TENANT database (not cadreport_master).
+
+DROP TRIGGER IF EXISTS trg_incidents_refresh_metrics ON incidents;
+CREATE TRIGGER trg_incidents_refresh_metrics
+    AFTER INSERT OR UPDATE OF
+        internal_incident_number, status, incident_date, deleted_at,
+        cad_event_type, cad_event_subtype, municipality_code, cad_units,
+        time_dispatched, time_first_enroute, time_first_on_scene, time_last_cleared,
+        call_category, detail_type, time_event_start, time_event_end
+    ON incidents
+    FOR EACH ROW EXECUTE FUNCTION incidents_refresh_metrics();
@@ -306,6 +306,8 @@ class Incident(Base):
     esz_box = Column(String(20))               # Emergency Service Zone
     
     # GPS coordinates for NERIS incident_point
+    # (geom GEOMETRY(Point, 4326) is kept in sync by trigger - migration 049;
+    # spatial queries use geom, not these strings)
     latitude = Column(String(20))
     longitude = Column(String(20))
     
@@ -593,6 +595,32 @@ class ReviewTask(Base):
     creator = relationship("Personnel", foreign_keys=[created_by])
 
 
+# =============================================================================
+# COMCAT TRAINING EXAMPLES
+# =============================================================================
+
+class ComCatTrainingExample(Base):
+    """
+    Append-only log of officer comment-category corrections.
+    
+    Written by PUT /api/comcat/comments/{id}; ComCat retraining reads only
+    this table (latest row per incident_id + comment_index).
+    """
+    __tablename__ = "comcat_training_examples"
+    
+    id = Column(Integer, primary_key=True)
+    incident_id = Column(Integer, ForeignKey("incidents.id", ondelete="CASCADE"))
+    comment_index = Column(Integer, nullable=False)
+    
+    text = Column(Text, nullable=False)
+    operator_type = Column(String(20), nullable=False, default="UNKNOWN")
+    category = Column(String(20), nullable=False)
+    previous_category = Column(String(20))
+    
+    corrected_by = Column(Integer, ForeignKey("personnel.id", ondelete="SET NULL"))
+    created_at = Column(TIMESTAMP(timezone=True), default=func.current_timestamp())
+
+
 # =============================================================================
 # AUDIT LOG
 # =============================================================================
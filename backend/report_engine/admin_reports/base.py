@@ -5,14 +5,13 @@ Provides shared infrastructure for all admin reports:
 - Branding integration
 - CSS generation
 - Header/footer rendering
-- PDF generation via WeasyPrint
+- PDF generation via WeasyPrint (bounded render pool, see executors.py)
 """
 
 from abc import ABC, abstractmethod
 from datetime import date, datetime
 from typing import Optional, Dict, Any
 from sqlalchemy.orm import Session
-import io
 
 from ..branding_config import get_logo_data_url
 
@@ -490,15 +489,11 @@ class AdminReport(ABC):
         Returns:
             PDF file bytes
         """
-        from weasyprint import HTML
+        from executors import render_pdf
         
         html_content = self.generate_html(**params)
         
-        pdf_buffer = io.BytesIO()
-        HTML(string=html_content).write_pdf(pdf_buffer)
-        pdf_buffer.seek(0)
-        
-        return pdf_buffer.getvalue()
+        return render_pdf(html_content)
     
     def get_pdf_filename(self, **params) -> str:
         """
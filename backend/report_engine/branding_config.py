@@ -8,9 +8,10 @@ NERIS Consideration: Branding is display-only, not exported to NERIS.
 """
 
 from sqlalchemy.orm import Session
-from sqlalchemy import text
 from typing import Optional
 
+from settings_cache import get_raw
+
 # =============================================================================
 # DEFAULT BRANDING
 # Fallback values when tenant hasn't configured a setting
@@ -194,11 +195,8 @@ def format_footer_template(template: str, context: dict) -> str:
 # =============================================================================
 
 def _get_setting(db: Session, category: str, key: str, default) -> any:
-    """Get string setting from database."""
-    result = db.execute(
-        text("SELECT value FROM settings WHERE category = :cat AND key = :key"),
-        {"cat": category, "key": key}
-    ).fetchone()
+    """Get string setting from the tenant's settings snapshot."""
+    result = get_raw(db, category, key)
     return result[0] if result and result[0] else default
 
 
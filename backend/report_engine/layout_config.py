@@ -13,9 +13,10 @@ NERIS Consideration: Layout is display-only, not exported to NERIS.
 
 import json
 from sqlalchemy.orm import Session
-from sqlalchemy import text
 from typing import List
 
+from settings_cache import get_raw
+
 # =============================================================================
 # V4 LAYOUT SCHEMA
 # =============================================================================
@@ -170,9 +171,7 @@ def get_layout(db: Session) -> dict:
     Load print layout from tenant's settings table.
     Merges stored layout with defaults to handle new blocks.
     """
-    result = db.execute(
-        text("SELECT value FROM settings WHERE category = 'print' AND key = 'layout'")
-    ).fetchone()
+    result = get_raw(db, 'print', 'layout')
     
     if result and result[0]:
         try:
@@ -22,7 +22,7 @@ router = APIRouter()
 # =============================================================================
 
 @router.get("/audit-log")
-async def get_audit_log(
+def get_audit_log(
     limit: int = 100,
     entity_type: Optional[str] = None,
     entity_id: Optional[int] = None,
@@ -6,21 +6,23 @@ Endpoints:
 
 These are served without auth since StationBell devices use device tokens
 and need to fetch audio files directly.
+
+Audio whose current file this worker wrote is served from memory; anything
+else (including files another worker regenerated since) from ALERTS_DIR
+(tmpfs when available - see services/tts_engine.py).
 """
 
 import logging
-from pathlib import Path
 
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, Response
+
+from services.tts_engine import ALERTS_DIR, get_audio
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/alerts", tags=["Alert Audio"])
 
-# TTS audio storage location (matches tts_service.py)
-ALERTS_DIR = Path("/tmp/tts_alerts")
-
 
 @router.get("/audio/{tenant}/{filename}")
 async def get_alert_audio(tenant: str, filename: str):
@@ -39,6 +41,15 @@ async def get_alert_audio(tenant: str, filename: str):
     if "/" in tenant or "\\" in tenant or ".." in tenant:
         raise HTTPException(status_code=400, detail="Invalid tenant")
     
+    # Current file generated by this worker - no file read
+    audio = get_audio(tenant, filename)
+    if audio is not None:
+        return Response(
+            content=audio,
+            media_type="audio/mpeg",
+            headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+        )
+    
     # Build file path
     audio_path = ALERTS_DIR / tenant / filename
     
@@ -17,6 +17,7 @@ from sqlalchemy import text, func
 import anthropic
 
 from database import get_db, _extract_slug
+import analytics_cache
 from models import Incident, IncidentUnit, Apparatus, Personnel
 from models_analytics import (
     TenantQueryUsage, SavedQuery, QueryExecutionLog, 
@@ -700,53 +701,70 @@ def get_incident_predictions(
 ):
     """Predict when the next incident is likely based on historical patterns"""
     
-    # Get hourly distribution
-    hourly = db.execute(text("""
-        SELECT 
-            EXTRACT(hour FROM time_dispatched) as hour,
-            COUNT(*) as count
-        FROM incidents
-        WHERE incident_date >= CURRENT_DATE - INTERVAL '2 years'
-            AND deleted_at IS NULL
-            AND time_dispatched IS NOT NULL
-        GROUP BY EXTRACT(hour FROM time_dispatched)
-        ORDER BY count DESC
-    """)).fetchall()
-    
-    # Get day of week distribution
-    daily = db.execute(text("""
-        SELECT 
-            EXTRACT(dow FROM incident_date) as dow,
-            COUNT(*) as count
-        FROM incidents
-        WHERE incident_date >= CURRENT_DATE - INTERVAL '2 years'
-            AND deleted_at IS NULL
-        GROUP BY EXTRACT(dow FROM incident_date)
-        ORDER BY count DESC
-    """)).fetchall()
+    def compute_distributions():
+        # Get hourly distribution
+        hourly = db.execute(text("""
+            SELECT 
+                EXTRACT(hour FROM time_dispatched) as hour,
+                COUNT(*) as count
+            FROM incidents
+            WHERE incident_date >= CURRENT_DATE - INTERVAL '2 years'
+                AND deleted_at IS NULL
+                AND time_dispatched IS NOT NULL
+            GROUP BY EXTRACT(hour FROM time_dispatched)
+            ORDER BY count DESC
+        """)).fetchall()
+        
+        # Get day of week distribution
+        daily = db.execute(text("""
+            SELECT 
+                EXTRACT(dow FROM incident_date) as dow,
+                COUNT(*) as count
+            FROM incidents
+            WHERE incident_date >= CURRENT_DATE - INTERVAL '2 years'
+                AND deleted_at IS NULL
+            GROUP BY EXTRACT(dow FROM incident_date)
+            ORDER BY count DESC
+        """)).fetchall()
+        
+        # Get monthly distribution (seasonality)
+        monthly = db.execute(text("""
+            SELECT 
+                EXTRACT(month FROM incident_date) as month,
+                COUNT(*) as count
+            FROM incidents
+            WHERE incident_date >= CURRENT_DATE - INTERVAL '5 years'
+                AND deleted_at IS NULL
+            GROUP BY EXTRACT(month FROM incident_date)
+            ORDER BY month
+        """)).fetchall()
+        
+        return (
+            [(int(h.hour), h.count) for h in hourly],
+            [(int(d.dow), d.count) for d in daily],
+            [(int(m.month), m.count) for m in monthly],
+        )
     
-    # Get monthly distribution (seasonality)
-    monthly = db.execute(text("""
-        SELECT 
-            EXTRACT(month FROM incident_date) as month,
-            COUNT(*) as count
-        FROM incidents
-        WHERE incident_date >= CURRENT_DATE - INTERVAL '5 years'
-            AND deleted_at IS NULL
-        GROUP BY EXTRACT(month FROM incident_date)
-        ORDER BY month
-    """)).fetchall()
+    # Distributions are cached per tenant (analytics_cache.py) and recomputed
+    # when an incident in the 5-year window changes; the current-hour ranking
+    # below is cheap and stays per-request.
+    today = date.today()
+    hourly, daily, monthly = analytics_cache.get_or_compute(
+        db, "analytics.predictions", {},
+        today.replace(year=today.year - 5, day=1), None,
+        compute_distributions,
+    )
     
     # Calculate probabilities
-    total_hourly = sum(h.count for h in hourly) if hourly else 1
-    busiest_hour = int(hourly[0].hour) if hourly else 12
-    busiest_hour_prob = round(hourly[0].count / total_hourly, 3) if hourly else 0
+    total_hourly = sum(count for _, count in hourly) if hourly else 1
+    busiest_hour = hourly[0][0] if hourly else 12
+    busiest_hour_prob = round(hourly[0][1] / total_hourly, 3) if hourly else 0
     
     # Current hour
     current_hour = datetime.now().hour
     
     # Find the next likely busy period
-    hour_probs = {int(h.hour): h.count / total_hourly for h in hourly}
+    hour_probs = {hour: count / total_hourly for hour, count in hourly}
     
     # Next 24 hours probability ranking
     next_24_hours = []
@@ -766,12 +784,12 @@ def get_incident_predictions(
     month_names = ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 
                    'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']
     seasonal = {
-        month_names[int(m.month) - 1]: m.count for m in monthly
+        month_names[month - 1]: count for month, count in monthly
     } if monthly else {}
     
     day_names = ['Sunday', 'Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday']
     day_pattern = {
-        day_names[int(d.dow)]: d.count for d in daily
+        day_names[dow]: count for dow, count in daily
     } if daily else {}
     
     return PredictionResult(
@@ -1094,57 +1112,31 @@ def get_category_stats(
     trend_days = max(total_days // 3, 7)  # At least 7 days for trend
     trend_start = end_date - timedelta(days=trend_days)
     
-    # Current period stats - using incident-level times (ALL calls)
-    current = db.execute(text("""
+    # Current period stats - incident-level times (ALL calls), precomputed
+    # per incident in incident_metrics (migration 051)
+    stats_sql = text("""
         SELECT 
             COUNT(*) as total_incidents,
             -- Response rate: incidents where first unit made it on scene
-            COUNT(*) FILTER (WHERE time_first_on_scene IS NOT NULL) as incidents_with_response,
+            COUNT(*) FILTER (WHERE response_seconds IS NOT NULL) as incidents_with_response,
             -- Turnout time: dispatch to first enroute (in minutes)
-            ROUND(AVG(
-                CASE WHEN time_dispatched IS NOT NULL AND time_first_enroute IS NOT NULL
-                THEN EXTRACT(EPOCH FROM (time_first_enroute - time_dispatched))/60
-                END
-            )::numeric, 1) as avg_turnout_mins,
+            ROUND((AVG(turnout_seconds) / 60)::numeric, 1) as avg_turnout_mins,
             -- Response time: dispatch to first on scene (in minutes)
-            ROUND(AVG(
-                CASE WHEN time_dispatched IS NOT NULL AND time_first_on_scene IS NOT NULL
-                THEN EXTRACT(EPOCH FROM (time_first_on_scene - time_dispatched))/60
-                END
-            )::numeric, 1) as avg_response_mins
-        FROM incidents
+            ROUND((AVG(response_seconds) / 60)::numeric, 1) as avg_response_mins
+        FROM incident_metrics
         WHERE incident_date >= :start_date
             AND incident_date < :end_date
-            AND deleted_at IS NULL
-            AND internal_incident_number LIKE :prefix || '%'
-    """), {
+            AND category = :prefix
+    """)
+    current = db.execute(stats_sql, {
         'start_date': start_date,
         'end_date': end_date,
         'prefix': prefix
     }).fetchone()
     
     # Trend period stats (last 1/3 of selected range)
-    trend = db.execute(text("""
-        SELECT 
-            COUNT(*) as total_incidents,
-            COUNT(*) FILTER (WHERE time_first_on_scene IS NOT NULL) as incidents_with_response,
-            ROUND(AVG(
-                CASE WHEN time_dispatched IS NOT NULL AND time_first_enroute IS NOT NULL
-                THEN EXTRACT(EPOCH FROM (time_first_enroute - time_dispatched))/60
-                END
-            )::numeric, 1) as avg_turnout_mins,
-            ROUND(AVG(
-                CASE WHEN time_dispatched IS NOT NULL AND time_first_on_scene IS NOT NULL
-                THEN EXTRACT(EPOCH FROM (time_first_on_scene - time_dispatched))/60
-                END
-            )::numeric, 1) as avg_response_mins
-        FROM incidents
-        WHERE incident_date >= :trend_start
-            AND incident_date < :end_date
-            AND deleted_at IS NULL
-            AND internal_incident_number LIKE :prefix || '%'
-    """), {
-        'trend_start': trend_start,
+    trend = db.execute(stats_sql, {
+        'start_date': trend_start,
         'end_date': end_date,
         'prefix': prefix
     }).fetchone()
@@ -1213,8 +1205,8 @@ def get_long_duration_calls(
     # Get long calls by day of week
     by_day = db.execute(text("""
         SELECT 
-            EXTRACT(dow FROM incident_date) as day_num,
-            CASE EXTRACT(dow FROM incident_date)
+            local_dow as day_num,
+            CASE local_dow
                 WHEN 0 THEN 'Sun'
                 WHEN 1 THEN 'Mon'
                 WHEN 2 THEN 'Tue'
@@ -1224,16 +1216,13 @@ def get_long_duration_calls(
                 WHEN 6 THEN 'Sat'
             END as day_name,
             COUNT(*) as count
-        FROM incidents
+        FROM incident_metrics
         WHERE incident_date >= :start_date
             AND incident_date < :end_date
-            AND deleted_at IS NULL
-            AND internal_incident_number LIKE :prefix || '%'
-            AND time_first_on_scene IS NOT NULL
-            AND time_last_cleared IS NOT NULL
-            AND EXTRACT(EPOCH FROM (time_last_cleared - time_first_on_scene))/60 >= :min_duration
-        GROUP BY EXTRACT(dow FROM incident_date)
-        ORDER BY EXTRACT(dow FROM incident_date)
+            AND category = :prefix
+            AND on_scene_seconds / 60 >= :min_duration
+        GROUP BY local_dow
+        ORDER BY local_dow
     """), {
         'start_date': start_date,
         'end_date': end_date,
@@ -1241,22 +1230,19 @@ def get_long_duration_calls(
         'min_duration': min_duration_mins
     }).fetchall()
     
-    # Get long calls by hour of day
+    # Get long calls by hour of day (local dispatch hour, station timezone)
     by_hour = db.execute(text("""
         SELECT 
-            EXTRACT(hour FROM time_dispatched) as hour,
+            local_hour as hour,
             COUNT(*) as count
-        FROM incidents
+        FROM incident_metrics
         WHERE incident_date >= :start_date
             AND incident_date < :end_date
-            AND deleted_at IS NULL
-            AND internal_incident_number LIKE :prefix || '%'
-            AND time_dispatched IS NOT NULL
-            AND time_first_on_scene IS NOT NULL
-            AND time_last_cleared IS NOT NULL
-            AND EXTRACT(EPOCH FROM (time_last_cleared - time_first_on_scene))/60 >= :min_duration
-        GROUP BY EXTRACT(hour FROM time_dispatched)
-        ORDER BY hour
+            AND category = :prefix
+            AND local_hour IS NOT NULL
+            AND on_scene_seconds / 60 >= :min_duration
+        GROUP BY local_hour
+        ORDER BY local_hour
     """), {
         'start_date': start_date,
         'end_date': end_date,
@@ -9,6 +9,11 @@ Shows:
 - Unit and role preferences
 - Fun facts (longest call, busiest day, streaks)
 - Detail participation (meetings, worknights, training)
+
+/stats covers one member; /stats/all computes the same sections for every
+active member with one grouped query per section and the department-wide
+denominators computed once (cached as a single matrix, analytics_cache.py).
+Hour-of-day buckets use the station timezone setting.
 """
 
 from datetime import date, timedelta
@@ -19,9 +24,39 @@ from sqlalchemy import text
 
 from database import get_db
 from models import Personnel, Rank
+from routers.settings import get_setting_value
+import analytics_cache
 
 router = APIRouter(prefix="/api/analytics/v2/personnel", tags=["analytics-personnel"])
 
+PERIODS = ['daytime', 'evening', 'overnight']
+CATEGORIES = ['fire', 'ems']
+
+# Local dispatch hour -> daytime (6am-4pm) / evening (4pm-12am) / overnight
+PERIOD_SQL = """
+    CASE 
+        WHEN EXTRACT(hour FROM i.time_dispatched AT TIME ZONE :tz) >= 6 
+             AND EXTRACT(hour FROM i.time_dispatched AT TIME ZONE :tz) < 16 
+        THEN 'daytime'
+        WHEN EXTRACT(hour FROM i.time_dispatched AT TIME ZONE :tz) >= 16 
+        THEN 'evening'
+        ELSE 'overnight'
+    END
+"""
+
+FULL_CALL_TYPE_SQL = """
+    COALESCE(i.cad_event_type, 'Unknown') || 
+        CASE WHEN i.cad_event_subtype IS NOT NULL 
+             THEN ' / ' || i.cad_event_subtype 
+             ELSE '' 
+        END
+"""
+
+
+def get_station_timezone(db: Session) -> str:
+    """Station timezone (IANA name) from tenant settings."""
+    return get_setting_value(db, 'station', 'timezone', 'America/New_York')
+
 
 @router.get("/stats")
 def get_personnel_stats(
@@ -57,7 +92,7 @@ def get_personnel_stats(
         },
         "calls": get_call_activity(db, personnel_id, start_date, today),
         "first_out": get_first_out_stats(db, personnel_id, start_date, today),
-        "availability": get_availability(db, personnel_id, start_date, today),
+        "availability": get_availability(db, personnel_id, start_date, today, get_station_timezone(db)),
         "units": get_unit_stats(db, personnel_id, start_date, today),
         "roles": get_role_stats(db, personnel_id, start_date, today),
         "fun_facts": get_fun_facts(db, personnel_id, start_date, today),
@@ -188,23 +223,11 @@ def get_first_out_stats(db: Session, personnel_id: int, start_date: date, end_da
     }
 
 
-def get_availability(db: Session, personnel_id: int, start_date: date, end_date: date) -> dict:
-    """
-    Get availability - percentage of station calls the person responded to.
-    Split by time period (daytime/evening/overnight) and by call type.
-    """
-    
-    # Get total station calls by period and category (denominator)
-    station_totals = db.execute(text("""
+def get_station_totals(db: Session, start_date: date, end_date: date, tz: str) -> list:
+    """Department-wide FIRE/EMS call counts by time period and category."""
+    return db.execute(text(f"""
         SELECT 
-            CASE 
-                WHEN EXTRACT(hour FROM i.time_dispatched AT TIME ZONE 'America/New_York') >= 6 
-                     AND EXTRACT(hour FROM i.time_dispatched AT TIME ZONE 'America/New_York') < 16 
-                THEN 'daytime'
-                WHEN EXTRACT(hour FROM i.time_dispatched AT TIME ZONE 'America/New_York') >= 16 
-                THEN 'evening'
-                ELSE 'overnight'
-            END as period,
+            {PERIOD_SQL} as period,
             CASE WHEN i.internal_incident_number LIKE 'F%' THEN 'fire' ELSE 'ems' END as category,
             COUNT(DISTINCT i.id) as total_calls
         FROM incidents i
@@ -216,46 +239,46 @@ def get_availability(db: Session, personnel_id: int, start_date: date, end_date:
         GROUP BY 1, 2
     """), {
         'start_date': start_date,
-        'end_date': end_date
+        'end_date': end_date,
+        'tz': tz
     }).fetchall()
-    
-    # Get person's calls by period and category (numerator)
-    person_totals = db.execute(text("""
+
+
+def get_station_by_type(db: Session, start_date: date, end_date: date) -> list:
+    """Department-wide FIRE/EMS call counts by full call type."""
+    return db.execute(text(f"""
         SELECT 
-            CASE 
-                WHEN EXTRACT(hour FROM i.time_dispatched AT TIME ZONE 'America/New_York') >= 6 
-                     AND EXTRACT(hour FROM i.time_dispatched AT TIME ZONE 'America/New_York') < 16 
-                THEN 'daytime'
-                WHEN EXTRACT(hour FROM i.time_dispatched AT TIME ZONE 'America/New_York') >= 16 
-                THEN 'evening'
-                ELSE 'overnight'
-            END as period,
+            {FULL_CALL_TYPE_SQL} as call_type,
             CASE WHEN i.internal_incident_number LIKE 'F%' THEN 'fire' ELSE 'ems' END as category,
-            COUNT(DISTINCT i.id) as responded
-        FROM incident_personnel ip
-        JOIN incidents i ON ip.incident_id = i.id
-        WHERE ip.personnel_id = :personnel_id
-            AND i.incident_date >= :start_date
+            COUNT(DISTINCT i.id) as total_calls
+        FROM incidents i
+        WHERE i.incident_date >= :start_date
             AND i.incident_date <= :end_date
             AND i.deleted_at IS NULL
             AND i.call_category IN ('FIRE', 'EMS')
-            AND i.time_dispatched IS NOT NULL
         GROUP BY 1, 2
+        ORDER BY category, total_calls DESC
     """), {
-        'personnel_id': personnel_id,
         'start_date': start_date,
         'end_date': end_date
     }).fetchall()
+
+
+def build_availability(station_totals, station_by_type, person_lookup: dict, person_type_lookup: dict) -> dict:
+    """
+    Availability result from department denominators and one person's counts.
     
-    # Build lookup dicts
+    station_totals / station_by_type are rows from get_station_totals() /
+    get_station_by_type(); person_lookup is {(period, category): responded},
+    person_type_lookup is {call_type: responded}.
+    """
     station_lookup = {(r.period, r.category): r.total_calls for r in station_totals}
-    person_lookup = {(r.period, r.category): r.responded for r in person_totals}
     
     # Calculate availability by period
     by_period = {}
-    for period in ['daytime', 'evening', 'overnight']:
+    for period in PERIODS:
         by_period[period] = {}
-        for category in ['fire', 'ems']:
+        for category in CATEGORIES:
             total = station_lookup.get((period, category), 0)
             responded = person_lookup.get((period, category), 0)
             pct = round((responded / total) * 100, 1) if total > 0 else 0
@@ -265,36 +288,67 @@ def get_availability(db: Session, personnel_id: int, start_date: date, end_date:
                 "percentage": pct
             }
     
-    # Get availability by call type (the "dodge report")
-    # Format: "cad_event_type / cad_event_subtype" for full context
-    station_by_type = db.execute(text("""
+    by_call_type = []
+    for r in station_by_type:
+        responded = person_type_lookup.get(r.call_type, 0)
+        pct = round((responded / r.total_calls) * 100, 1) if r.total_calls > 0 else 0
+        by_call_type.append({
+            "call_type": r.call_type,
+            "category": r.category,
+            "responded": responded,
+            "total": r.total_calls,
+            "percentage": pct
+        })
+    
+    return {
+        "by_period": by_period,
+        "by_call_type": by_call_type,
+        "period_labels": {
+            "daytime": "6am - 4pm",
+            "evening": "4pm - 12am",
+            "overnight": "12am - 6am"
+        }
+    }
+
+
+def get_availability(db: Session, personnel_id: int, start_date: date, end_date: date, tz: str) -> dict:
+    """
+    Get availability - percentage of station calls the person responded to.
+    Split by time period (daytime/evening/overnight) and by call type.
+    """
+    
+    # Get total station calls by period and category (denominator)
+    station_totals = get_station_totals(db, start_date, end_date, tz)
+    
+    # Get person's calls by period and category (numerator)
+    person_totals = db.execute(text(f"""
         SELECT 
-            COALESCE(i.cad_event_type, 'Unknown') || 
-                CASE WHEN i.cad_event_subtype IS NOT NULL 
-                     THEN ' / ' || i.cad_event_subtype 
-                     ELSE '' 
-                END as call_type,
+            {PERIOD_SQL} as period,
             CASE WHEN i.internal_incident_number LIKE 'F%' THEN 'fire' ELSE 'ems' END as category,
-            COUNT(DISTINCT i.id) as total_calls
-        FROM incidents i
-        WHERE i.incident_date >= :start_date
+            COUNT(DISTINCT i.id) as responded
+        FROM incident_personnel ip
+        JOIN incidents i ON ip.incident_id = i.id
+        WHERE ip.personnel_id = :personnel_id
+            AND i.incident_date >= :start_date
             AND i.incident_date <= :end_date
             AND i.deleted_at IS NULL
             AND i.call_category IN ('FIRE', 'EMS')
+            AND i.time_dispatched IS NOT NULL
         GROUP BY 1, 2
-        ORDER BY category, total_calls DESC
     """), {
+        'personnel_id': personnel_id,
         'start_date': start_date,
-        'end_date': end_date
+        'end_date': end_date,
+        'tz': tz
     }).fetchall()
     
-    person_by_type = db.execute(text("""
+    # Get availability by call type (the "dodge report")
+    # Format: "cad_event_type / cad_event_subtype" for full context
+    station_by_type = get_station_by_type(db, start_date, end_date)
+    
+    person_by_type = db.execute(text(f"""
         SELECT 
-            COALESCE(i.cad_event_type, 'Unknown') || 
-                CASE WHEN i.cad_event_subtype IS NOT NULL 
-                     THEN ' / ' || i.cad_event_subtype 
-                     ELSE '' 
-                END as call_type,
+            {FULL_CALL_TYPE_SQL} as call_type,
             COUNT(DISTINCT i.id) as responded
         FROM incident_personnel ip
         JOIN incidents i ON ip.incident_id = i.id
@@ -310,29 +364,12 @@ def get_availability(db: Session, personnel_id: int, start_date: date, end_date:
         'end_date': end_date
     }).fetchall()
     
-    person_type_lookup = {r.call_type: r.responded for r in person_by_type}
-    
-    by_call_type = []
-    for r in station_by_type:
-        responded = person_type_lookup.get(r.call_type, 0)
-        pct = round((responded / r.total_calls) * 100, 1) if r.total_calls > 0 else 0
-        by_call_type.append({
-            "call_type": r.call_type,
-            "category": r.category,
-            "responded": responded,
-            "total": r.total_calls,
-            "percentage": pct
-        })
-    
-    return {
-        "by_period": by_period,
-        "by_call_type": by_call_type,
-        "period_labels": {
-            "daytime": "6am - 4pm",
-            "evening": "4pm - 12am",
-            "overnight": "12am - 6am"
-        }
-    }
+    return build_availability(
+        station_totals,
+        station_by_type,
+        {(r.period, r.category): r.responded for r in person_totals},
+        {r.call_type: r.responded for r in person_by_type},
+    )
 
 
 def get_unit_stats(db: Session, personnel_id: int, start_date: date, end_date: date) -> dict:
@@ -561,11 +598,15 @@ def calculate_response_streak(db: Session, personnel_id: int) -> int:
         ORDER BY week_start DESC
     """), {'personnel_id': personnel_id}).fetchall()
     
-    if not result:
+    return streak_from_weeks([r.week_start.date() for r in result])
+
+
+def streak_from_weeks(weeks_with_calls) -> int:
+    """Consecutive weeks (Monday starts) with a call, counting back from this week."""
+    if not weeks_with_calls:
         return 0
     
-    weeks_with_calls = [r.week_start.date() for r in result]
-    
+    weeks_with_calls = set(weeks_with_calls)
     today = date.today()
     current_week_start = today - timedelta(days=today.weekday())
     
@@ -630,6 +671,462 @@ def get_detail_participation(db: Session, personnel_id: int, start_date: date, e
     }
 
 
+# =============================================================================
+# BULK: every member at once
+# =============================================================================
+
+# Distinct (member, FIRE/EMS incident) pairs in the date range
+PERSON_CALLS_CTE = """
+    person_calls AS (
+        SELECT DISTINCT ip.personnel_id, i.id as incident_id
+        FROM incident_personnel ip
+        JOIN incidents i ON ip.incident_id = i.id
+        WHERE i.incident_date >= :start_date
+            AND i.incident_date <= :end_date
+            AND i.deleted_at IS NULL
+            AND i.call_category IN ('FIRE', 'EMS')
+    )
+"""
+
+
+@router.get("/stats/all")
+def get_all_personnel_stats(
+    days: int = Query(365, description="Number of days to analyze (default: 365)"),
+    db: Session = Depends(get_db)
+):
+    """
+    Statistics for every active personnel member in one response.
+    
+    Same sections as /stats per member, plus the department-wide
+    denominators once. Cost is a fixed number of grouped queries regardless
+    of roster size; the stats matrix is cached per date window.
+    """
+    today = date.today()
+    start_date = today - timedelta(days=days)
+    tz = get_station_timezone(db)
+    
+    # Streaks look back 52 weeks regardless of the requested range
+    window_start = min(start_date, today - timedelta(weeks=52))
+    matrix = analytics_cache.get_or_compute(
+        db, "personnel.stats_all", {"days": days, "tz": tz},
+        window_start, today + timedelta(days=1),
+        lambda: compute_bulk_stats(db, start_date, today, tz),
+    )
+    
+    # Names/ranks stay outside the cache so roster edits show immediately
+    personnel = db.query(Personnel).filter(
+        Personnel.active == True
+    ).order_by(Personnel.last_name, Personnel.first_name).all()
+    ranks = {r.id: r.rank_name for r in db.query(Rank).all()}
+    
+    return {
+        "period": {
+            "start": start_date.isoformat(),
+            "end": today.isoformat(),
+            "days": days
+        },
+        "timezone": tz,
+        "department": matrix["department"],
+        "personnel": [
+            {
+                "personnel": {
+                    "id": p.id,
+                    "display_name": p.display_name,
+                    "first_name": p.first_name,
+                    "last_name": p.last_name,
+                    "rank": ranks.get(p.rank_id) if p.rank_id else None,
+                },
+                **matrix["members"].get(p.id, matrix["empty"]),
+            }
+            for p in personnel
+        ],
+    }
+
+
+def compute_bulk_stats(db: Session, start_date: date, end_date: date, tz: str) -> dict:
+    """
+    Per-member stats for everyone with activity in [start_date, end_date].
+    
+    Returns {"department": {...}, "members": {personnel_id: {calls,
+    first_out, availability, units, roles, fun_facts, details}}, "empty": {...}}.
+    """
+    params = {'start_date': start_date, 'end_date': end_date, 'tz': tz}
+    
+    # Department denominators - once for the whole roster
+    station_totals = get_station_totals(db, start_date, end_date, tz)
+    station_by_type = get_station_by_type(db, start_date, end_date)
+    
+    members = {}
+    
+    def member(personnel_id):
+        if personnel_id not in members:
+            members[personnel_id] = new_member_raw()
+        return members[personnel_id]
+    
+    # Call activity
+    for r in db.execute(text(f"""
+        WITH {PERSON_CALLS_CTE}
+        SELECT 
+            pc.personnel_id,
+            COUNT(*) as total,
+            COUNT(*) FILTER (WHERE i.internal_incident_number LIKE 'F%') as fire,
+            COUNT(*) FILTER (WHERE i.internal_incident_number LIKE 'E%') as ems
+        FROM person_calls pc
+        JOIN incidents i ON i.id = pc.incident_id
+        GROUP BY pc.personnel_id
+    """), params):
+        m = member(r.personnel_id)["calls"]
+        m.update(total=r.total, fire=r.fire, ems=r.ems)
+    
+    # Top 10 call types per member
+    for r in db.execute(text(f"""
+        WITH {PERSON_CALLS_CTE}
+        SELECT personnel_id, call_type, count FROM (
+            SELECT 
+                pc.personnel_id,
+                CASE 
+                    WHEN i.internal_incident_number LIKE 'F%' THEN COALESCE(i.cad_event_type, 'Unknown')
+                    ELSE COALESCE(i.cad_event_subtype, i.cad_event_type, 'Unknown')
+                END as call_type,
+                COUNT(*) as count,
+                ROW_NUMBER() OVER (PARTITION BY pc.personnel_id ORDER BY COUNT(*) DESC) as rn
+            FROM person_calls pc
+            JOIN incidents i ON i.id = pc.incident_id
+            GROUP BY 1, 2
+        ) ranked
+        WHERE rn <= 10
+        ORDER BY personnel_id, count DESC
+    """), params):
+        member(r.personnel_id)["calls"]["by_type"].append({"type": r.call_type, "count": r.count})
+    
+    # First out: first non-mutual-aid unit enroute per incident, computed once
+    for r in db.execute(text(f"""
+        WITH {PERSON_CALLS_CTE},
+        first_units AS (
+            SELECT 
+                i.id as incident_id,
+                (SELECT unit_elem->>'unit_id'
+                 FROM jsonb_array_elements(i.cad_units) AS unit_elem
+                 WHERE unit_elem->>'time_enroute' IS NOT NULL
+                   AND (unit_elem->>'is_mutual_aid')::boolean IS NOT TRUE
+                 ORDER BY unit_elem->>'time_enroute'
+                 LIMIT 1
+                ) as first_unit_id
+            FROM incidents i
+            WHERE i.incident_date >= :start_date
+                AND i.incident_date <= :end_date
+                AND i.deleted_at IS NULL
+                AND i.call_category IN ('FIRE', 'EMS')
+                AND i.cad_units IS NOT NULL
+                AND jsonb_array_length(i.cad_units) > 0
+        ),
+        person_on_first AS (
+            SELECT 
+                pc.personnel_id,
+                pc.incident_id,
+                bool_or(a.unit_designator = fu.first_unit_id) as on_first_unit
+            FROM person_calls pc
+            JOIN first_units fu ON fu.incident_id = pc.incident_id
+            LEFT JOIN incident_personnel ip2 
+                ON ip2.incident_id = pc.incident_id AND ip2.personnel_id = pc.personnel_id
+            LEFT JOIN incident_units iu ON ip2.incident_unit_id = iu.id
+            LEFT JOIN apparatus a ON iu.apparatus_id = a.id
+            WHERE fu.first_unit_id IS NOT NULL
+            GROUP BY 1, 2
+        )
+        SELECT 
+            personnel_id,
+            COUNT(*) as total_calls,
+            COUNT(*) FILTER (WHERE on_first_unit) as first_out_calls
+        FROM person_on_first
+        GROUP BY personnel_id
+    """), params):
+        member(r.personnel_id)["first_out"].update(total=r.total_calls, first_out=r.first_out_calls)
+    
+    # Availability numerators
+    for r in db.execute(text(f"""
+        WITH {PERSON_CALLS_CTE}
+        SELECT 
+            pc.personnel_id,
+            {PERIOD_SQL} as period,
+            CASE WHEN i.internal_incident_number LIKE 'F%' THEN 'fire' ELSE 'ems' END as category,
+            COUNT(*) as responded
+        FROM person_calls pc
+        JOIN incidents i ON i.id = pc.incident_id
+        WHERE i.time_dispatched IS NOT NULL
+        GROUP BY 1, 2, 3
+    """), params):
+        member(r.personnel_id)["period_counts"][(r.period, r.category)] = r.responded
+    
+    for r in db.execute(text(f"""
+        WITH {PERSON_CALLS_CTE}
+        SELECT 
+            pc.personnel_id,
+            {FULL_CALL_TYPE_SQL} as call_type,
+            COUNT(*) as responded
+        FROM person_calls pc
+        JOIN incidents i ON i.id = pc.incident_id
+        GROUP BY 1, 2
+    """), params):
+        member(r.personnel_id)["type_counts"][r.call_type] = r.responded
+    
+    # Units ridden
+    for r in db.execute(text("""
+        SELECT 
+            ip.personnel_id,
+            a.unit_designator,
+            a.name as unit_name,
+            COUNT(DISTINCT i.id) as count
+        FROM incident_personnel ip
+        JOIN incidents i ON ip.incident_id = i.id
+        JOIN incident_units iu ON ip.incident_unit_id = iu.id
+        JOIN apparatus a ON iu.apparatus_id = a.id
+        WHERE i.incident_date >= :start_date
+            AND i.incident_date <= :end_date
+            AND i.deleted_at IS NULL
+            AND i.call_category IN ('FIRE', 'EMS')
+            AND a.unit_category = 'APPARATUS'
+        GROUP BY 1, 2, 3
+        ORDER BY ip.personnel_id, count DESC
+    """), params):
+        member(r.personnel_id)["units"].append((r.unit_designator, r.unit_name, r.count))
+    
+    # Roles (see get_role_stats for the derivation)
+    role_map = {'DRIVER': 'driver', 'OFFICER': 'officer', 'FF': 'ff'}
+    for r in db.execute(text("""
+        SELECT 
+            ip.personnel_id,
+            CASE 
+                WHEN a.has_driver = true AND ip.slot_index = 0 THEN 'DRIVER'
+                WHEN a.has_officer = true AND a.has_driver = true AND ip.slot_index = 1 THEN 'OFFICER'
+                WHEN a.has_officer = true AND a.has_driver = false AND ip.slot_index = 0 THEN 'OFFICER'
+                ELSE 'FF'
+            END as derived_role,
+            COUNT(DISTINCT i.id) as count
+        FROM incident_personnel ip
+        JOIN incidents i ON ip.incident_id = i.id
+        JOIN incident_units iu ON ip.incident_unit_id = iu.id
+        JOIN apparatus a ON iu.apparatus_id = a.id
+        WHERE i.incident_date >= :start_date
+            AND i.incident_date <= :end_date
+            AND i.deleted_at IS NULL
+            AND i.call_category IN ('FIRE', 'EMS')
+        GROUP BY 1, 2
+    """), params):
+        member(r.personnel_id)["roles"][role_map.get(r.derived_role, 'ff')] += r.count
+    
+    # Fun facts: longest call, busiest day, first / most recent call
+    for r in db.execute(text(f"""
+        WITH {PERSON_CALLS_CTE}
+        SELECT DISTINCT ON (pc.personnel_id)
+            pc.personnel_id,
+            i.internal_incident_number,
+            i.cad_event_type,
+            EXTRACT(EPOCH FROM (i.time_last_cleared - i.time_first_on_scene)) / 60 as on_scene_mins
+        FROM person_calls pc
+        JOIN incidents i ON i.id = pc.incident_id
+        WHERE i.time_first_on_scene IS NOT NULL
+            AND i.time_last_cleared IS NOT NULL
+        ORDER BY pc.personnel_id, on_scene_mins DESC
+    """), params):
+        member(r.personnel_id)["fun_facts"]["longest"] = (r.internal_incident_number, r.cad_event_type, r.on_scene_mins)
+    
+    for r in db.execute(text(f"""
+        WITH {PERSON_CALLS_CTE},
+        person_days AS (
+            SELECT pc.personnel_id, i.incident_date, COUNT(*) as call_count
+            FROM person_calls pc
+            JOIN incidents i ON i.id = pc.incident_id
+            GROUP BY 1, 2
+        )
+        SELECT DISTINCT ON (personnel_id) personnel_id, incident_date, call_count
+        FROM person_days
+        ORDER BY personnel_id, call_count DESC
+    """), params):
+        member(r.personnel_id)["fun_facts"]["busiest_day"] = (r.incident_date, r.call_count)
+    
+    for r in db.execute(text(f"""
+        WITH {PERSON_CALLS_CTE}
+        SELECT 
+            pc.personnel_id,
+            (ARRAY_AGG(i.internal_incident_number ORDER BY i.incident_date, i.time_dispatched))[1] as first_incident,
+            MIN(i.incident_date) as first_date,
+            (ARRAY_AGG(i.internal_incident_number ORDER BY i.incident_date DESC, i.time_dispatched DESC))[1] as recent_incident,
+            MAX(i.incident_date) as recent_date
+        FROM person_calls pc
+        JOIN incidents i ON i.id = pc.incident_id
+        GROUP BY pc.personnel_id
+    """), params):
+        facts = member(r.personnel_id)["fun_facts"]
+        facts["first_call"] = (r.first_incident, r.first_date)
+        facts["most_recent_call"] = (r.recent_incident, r.recent_date)
+    
+    # Response streak weeks (always the last 52 weeks, like calculate_response_streak)
+    for r in db.execute(text("""
+        SELECT 
+            ip.personnel_id,
+            ARRAY_AGG(DISTINCT DATE_TRUNC('week', i.incident_date)::date) as weeks
+        FROM incident_personnel ip
+        JOIN incidents i ON ip.incident_id = i.id
+        WHERE i.incident_date >= CURRENT_DATE - INTERVAL '52 weeks'
+            AND i.deleted_at IS NULL
+            AND i.call_category IN ('FIRE', 'EMS')
+        GROUP BY ip.personnel_id
+    """)):
+        member(r.personnel_id)["weeks"] = r.weeks
+    
+    # Detail participation
+    for r in db.execute(text("""
+        SELECT 
+            ip.personnel_id,
+            dt.display_name as type_name,
+            COUNT(DISTINCT i.id) as count,
+            SUM(
+                EXTRACT(EPOCH FROM (
+                    COALESCE(i.time_event_end, i.time_last_cleared) - 
+                    COALESCE(i.time_event_start, i.time_dispatched)
+                )) / 3600
+            ) as hours
+        FROM incident_personnel ip
+        JOIN incidents i ON ip.incident_id = i.id
+        LEFT JOIN detail_types dt ON i.detail_type = dt.code
+        WHERE i.incident_date >= :start_date
+            AND i.incident_date <= :end_date
+            AND i.deleted_at IS NULL
+            AND i.call_category = 'DETAIL'
+        GROUP BY ip.personnel_id, dt.display_name, dt.display_order
+        ORDER BY ip.personnel_id, dt.display_order
+    """), params):
+        member(r.personnel_id)["details"].append((r.type_name, r.count, r.hours))
+    
+    months = max(1, (end_date - start_date).days / 30)
+    return {
+        "department": {
+            "by_period": {
+                period: {
+                    category: next(
+                        (r.total_calls for r in station_totals if r.period == period and r.category == category), 0
+                    )
+                    for category in CATEGORIES
+                }
+                for period in PERIODS
+            },
+            "by_call_type": [
+                {"call_type": r.call_type, "category": r.category, "total": r.total_calls}
+                for r in station_by_type
+            ],
+        },
+        "members": {
+            personnel_id: format_member_stats(raw, station_totals, station_by_type, months)
+            for personnel_id, raw in members.items()
+        },
+        # Members with no activity in the range
+        "empty": format_member_stats(new_member_raw(), station_totals, station_by_type, months),
+    }
+
+
+def new_member_raw() -> dict:
+    """Accumulator for one member's bulk query rows."""
+    return {
+        "calls": {"fire": 0, "ems": 0, "total": 0, "by_type": []},
+        "first_out": {"total": 0, "first_out": 0},
+        "period_counts": {},
+        "type_counts": {},
+        "units": [],
+        "roles": {'driver': 0, 'officer': 0, 'ff': 0},
+        "fun_facts": {},
+        "weeks": [],
+        "details": [],
+    }
+
+
+def format_member_stats(raw: dict, station_totals, station_by_type, months: float) -> dict:
+    """Shape one member's bulk query results like the /stats sections."""
+    calls = raw["calls"]
+    first_out_total = raw["first_out"]["total"]
+    first_out = raw["first_out"]["first_out"]
+    
+    unit_total = sum(count for _, _, count in raw["units"])
+    by_unit = [
+        {
+            "unit": unit,
+            "name": name,
+            "count": count,
+            "percentage": round((count / unit_total) * 100, 1) if unit_total > 0 else 0
+        }
+        for unit, name, count in raw["units"]
+    ]
+    
+    role_total = sum(raw["roles"].values())
+    
+    facts = raw["fun_facts"]
+    longest = facts.get("longest")
+    busiest_day = facts.get("busiest_day")
+    first_call = facts.get("first_call")
+    most_recent = facts.get("most_recent_call")
+    
+    details = [
+        {
+            "type": type_name or "Other",
+            "count": count,
+            "hours": round(float(hours), 1) if hours else 0
+        }
+        for type_name, count, hours in raw["details"]
+    ]
+    
+    return {
+        "calls": {
+            "total": calls["total"],
+            "fire": calls["fire"],
+            "ems": calls["ems"],
+            "by_type": calls["by_type"],
+            "calls_per_month_avg": round(calls["total"] / months, 1)
+        },
+        "first_out": {
+            "total_calls_with_data": first_out_total,
+            "first_out_calls": first_out,
+            "first_out_percentage": round((first_out / first_out_total) * 100, 1) if first_out_total > 0 else 0,
+            "avg_position": None
+        },
+        "availability": build_availability(
+            station_totals, station_by_type, raw["period_counts"], raw["type_counts"]
+        ),
+        "units": {
+            "by_unit": by_unit,
+            "favorite_unit": by_unit[0]["unit"] if by_unit else None,
+            "favorite_unit_name": by_unit[0]["name"] if by_unit else None
+        },
+        "roles": {
+            role: {
+                "count": count,
+                "percentage": round((count / role_total) * 100, 1) if role_total > 0 else 0
+            }
+            for role, count in raw["roles"].items()
+        },
+        "fun_facts": {
+            "longest_call_mins": round(longest[2]) if longest and longest[2] else None,
+            "longest_call_incident": longest[0] if longest else None,
+            "longest_call_type": longest[1] if longest else None,
+            "busiest_day_date": busiest_day[0].isoformat() if busiest_day else None,
+            "busiest_day_calls": busiest_day[1] if busiest_day else 0,
+            "first_call": {
+                "incident": first_call[0],
+                "date": first_call[1].isoformat()
+            } if first_call else None,
+            "most_recent_call": {
+                "incident": most_recent[0],
+                "date": most_recent[1].isoformat()
+            } if most_recent else None,
+            "current_streak_weeks": streak_from_weeks(raw["weeks"])
+        },
+        "details": {
+            "total_events": sum(d["count"] for d in details),
+            "total_hours": round(sum(d["hours"] for d in details), 1),
+            "by_type": details
+        },
+    }
+
+
 @router.get("/list")
 def get_personnel_list_for_analytics(
     db: Session = Depends(get_db)
@@ -6,6 +6,16 @@ IMPORTANT: Most metrics filter to incidents where station units actually
 responded (went enroute), not just all dispatched incidents.
 
 All endpoints filter by category (FIRE or EMS) - no combined views.
+
+Queries read the incident_metrics fact table (migration 051,
+services/incident_metrics.py): station_responded, durations in seconds,
+personnel counts and local dispatch hour are precomputed per incident, so
+a date range is an index scan on (category, incident_date).
+
+Dashboard endpoints are cached per tenant/params/date window
+(analytics_cache.py): closed months are served from memory indefinitely,
+windows touching the current period are recomputed when an incident in
+them changes.
 """
 
 from datetime import date, timedelta
@@ -15,6 +25,8 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text
 
 from database import get_db
+import analytics_cache
+from services import incident_metrics
 
 router = APIRouter(prefix="/api/analytics/v2", tags=["analytics-v2"])
 
@@ -23,13 +35,8 @@ router = APIRouter(prefix="/api/analytics/v2", tags=["analytics-v2"])
 # HELPER: Station responded filter (non-mutual-aid units that went enroute)
 # =============================================================================
 
-STATION_RESPONDED_FILTER = """
-    EXISTS (
-        SELECT 1 FROM jsonb_array_elements(i.cad_units) AS unit_elem
-        WHERE unit_elem->>'time_enroute' IS NOT NULL
-          AND (unit_elem->>'is_mutual_aid')::boolean IS NOT TRUE
-    )
-"""
+# Precomputed from cad_units by refresh_incident_metrics()
+STATION_RESPONDED_FILTER = "m.station_responded"
 
 
 def get_incident_counts(db: Session, start_date: date, end_date: date, prefix: str):
@@ -37,16 +44,11 @@ def get_incident_counts(db: Session, start_date: date, end_date: date, prefix: s
     result = db.execute(text("""
         SELECT 
             COUNT(*) as total_dispatched,
-            SUM(CASE WHEN EXISTS (
-                SELECT 1 FROM jsonb_array_elements(cad_units) AS unit_elem
-                WHERE unit_elem->>'time_enroute' IS NOT NULL
-                  AND (unit_elem->>'is_mutual_aid')::boolean IS NOT TRUE
-            ) THEN 1 ELSE 0 END) as station_responded
-        FROM incidents
+            COUNT(*) FILTER (WHERE station_responded) as station_responded
+        FROM incident_metrics
         WHERE incident_date >= :start_date
             AND incident_date < :end_date
-            AND deleted_at IS NULL
-            AND internal_incident_number LIKE :prefix || '%'
+            AND category = :prefix
     """), {
         'start_date': start_date,
         'end_date': end_date,
@@ -63,6 +65,7 @@ def get_incident_counts(db: Session, start_date: date, end_date: date, prefix: s
 # =============================================================================
 
 @router.get("/response-times/by-type")
+@analytics_cache.cached("v2.get_response_times_by_call_type", lambda start_date, end_date, **_: (start_date, end_date))
 def get_response_times_by_call_type(
     start_date: date = Query(...),
     end_date: date = Query(...),
@@ -87,28 +90,19 @@ def get_response_times_by_call_type(
     
     result = db.execute(text(f"""
         SELECT 
-            COALESCE(i.{type_field}, 'Unknown') as call_type,
-            COUNT(DISTINCT i.id) as incident_count,
-            ROUND(AVG(
-                EXTRACT(EPOCH FROM (i.time_first_enroute - i.time_dispatched)) / 60
-            )::numeric, 1) as avg_turnout_mins,
-            ROUND(AVG(
-                EXTRACT(EPOCH FROM (i.time_first_on_scene - i.time_first_enroute)) / 60
-            )::numeric, 1) as avg_travel_mins,
-            ROUND(AVG(
-                EXTRACT(EPOCH FROM (i.time_first_on_scene - i.time_dispatched)) / 60
-            )::numeric, 1) as avg_response_mins,
-            ROUND(AVG(
-                EXTRACT(EPOCH FROM (i.time_last_cleared - i.time_first_on_scene)) / 60
-            )::numeric, 1) as avg_on_scene_mins
-        FROM incidents i
-        WHERE i.incident_date >= :start_date
-            AND i.incident_date < :end_date
-            AND i.deleted_at IS NULL
-            AND i.internal_incident_number LIKE :prefix || '%'
-            AND i.time_dispatched IS NOT NULL
+            COALESCE(m.{type_field}, 'Unknown') as call_type,
+            COUNT(*) as incident_count,
+            ROUND((AVG(m.turnout_seconds) / 60)::numeric, 1) as avg_turnout_mins,
+            ROUND((AVG(m.travel_seconds) / 60)::numeric, 1) as avg_travel_mins,
+            ROUND((AVG(m.response_seconds) / 60)::numeric, 1) as avg_response_mins,
+            ROUND((AVG(m.on_scene_seconds) / 60)::numeric, 1) as avg_on_scene_mins
+        FROM incident_metrics m
+        WHERE m.incident_date >= :start_date
+            AND m.incident_date < :end_date
+            AND m.category = :prefix
+            AND m.time_dispatched IS NOT NULL
             AND {STATION_RESPONDED_FILTER}
-        GROUP BY i.{type_field}
+        GROUP BY m.{type_field}
         ORDER BY COUNT(*) DESC
     """), {
         'start_date': start_date,
@@ -136,6 +130,7 @@ def get_response_times_by_call_type(
 
 
 @router.get("/response-times/trends")
+@analytics_cache.cached("v2.get_response_time_trends", lambda **_: (date.today() - timedelta(days=90), date.today()))
 def get_response_time_trends(
     category: str = Query(..., description="FIRE or EMS"),
     db: Session = Depends(get_db)
@@ -162,22 +157,15 @@ def get_response_time_trends(
         
         row = db.execute(text(f"""
             SELECT 
-                COUNT(DISTINCT i.id) as incident_count,
-                ROUND(AVG(
-                    EXTRACT(EPOCH FROM (i.time_first_enroute - i.time_dispatched)) / 60
-                )::numeric, 1) as avg_turnout_mins,
-                ROUND(AVG(
-                    EXTRACT(EPOCH FROM (i.time_first_on_scene - i.time_dispatched)) / 60
-                )::numeric, 1) as avg_response_mins,
-                ROUND(AVG(
-                    EXTRACT(EPOCH FROM (i.time_last_cleared - i.time_first_on_scene)) / 60
-                )::numeric, 1) as avg_on_scene_mins
-            FROM incidents i
-            WHERE i.incident_date >= :start_date
-                AND i.incident_date < :end_date
-                AND i.deleted_at IS NULL
-                AND i.internal_incident_number LIKE :prefix || '%'
-                AND i.time_dispatched IS NOT NULL
+                COUNT(*) as incident_count,
+                ROUND((AVG(m.turnout_seconds) / 60)::numeric, 1) as avg_turnout_mins,
+                ROUND((AVG(m.response_seconds) / 60)::numeric, 1) as avg_response_mins,
+                ROUND((AVG(m.on_scene_seconds) / 60)::numeric, 1) as avg_on_scene_mins
+            FROM incident_metrics m
+            WHERE m.incident_date >= :start_date
+                AND m.incident_date < :end_date
+                AND m.category = :prefix
+                AND m.time_dispatched IS NOT NULL
                 AND {STATION_RESPONDED_FILTER}
         """), {
             'start_date': start,
@@ -217,6 +205,7 @@ def get_response_time_trends(
 # =============================================================================
 
 @router.get("/turnout-vs-crew")
+@analytics_cache.cached("v2.get_turnout_vs_crew_size", lambda start_date, end_date, **_: (start_date, end_date))
 def get_turnout_vs_crew_size(
     start_date: date = Query(...),
     end_date: date = Query(...),
@@ -227,71 +216,33 @@ def get_turnout_vs_crew_size(
     First-out unit turnout time vs crew size on that unit.
     Shows: when we leave faster, do we have fewer people on the first unit?
     
-    Uses cad_units JSONB to find the first unit enroute, then counts
-    personnel assigned to that specific unit.
+    The first-out unit (first counts_for_response_times unit enroute), its
+    turnout and its crew count are precomputed in incident_metrics.
+    Time periods use the local dispatch hour.
     """
     prefix = 'F' if category.upper() == 'FIRE' else 'E'
-    prefix_filter = f"AND i.internal_incident_number LIKE '{prefix}%'"
     
     # Get incident counts for context
     counts = get_incident_counts(db, start_date, end_date, prefix)
     
-    # Get first-out unit turnout time and crew count
-    # Only consider units where counts_for_response_times = true (excludes chief, assistant, deputy, etc.)
-    result = db.execute(text(f"""
-        WITH first_unit AS (
-            SELECT 
-                i.id as incident_id,
-                i.time_dispatched,
-                (SELECT unit_elem->>'unit_id' 
-                 FROM jsonb_array_elements(i.cad_units) AS unit_elem 
-                 JOIN apparatus a ON a.unit_designator = unit_elem->>'unit_id'
-                 WHERE unit_elem->>'time_enroute' IS NOT NULL 
-                   AND (unit_elem->>'is_mutual_aid')::boolean IS NOT TRUE
-                   AND a.counts_for_response_times = true
-                 ORDER BY unit_elem->>'time_enroute' 
-                 LIMIT 1
-                ) as first_unit_id,
-                (SELECT unit_elem->>'time_enroute' 
-                 FROM jsonb_array_elements(i.cad_units) AS unit_elem 
-                 JOIN apparatus a ON a.unit_designator = unit_elem->>'unit_id'
-                 WHERE unit_elem->>'time_enroute' IS NOT NULL 
-                   AND (unit_elem->>'is_mutual_aid')::boolean IS NOT TRUE
-                   AND a.counts_for_response_times = true
-                 ORDER BY unit_elem->>'time_enroute' 
-                 LIMIT 1
-                ) as first_enroute_time
-            FROM incidents i
-            WHERE i.incident_date >= :start_date
-                AND i.incident_date < :end_date
-                AND i.deleted_at IS NULL
-                AND i.time_dispatched IS NOT NULL
-                AND i.cad_units IS NOT NULL
-                AND jsonb_array_length(i.cad_units) > 0
-                {prefix_filter}
-        ),
-        unit_with_crew AS (
+    result = db.execute(text("""
+        WITH unit_with_crew AS (
             SELECT 
-                fu.incident_id,
-                fu.time_dispatched,
-                fu.first_unit_id,
-                fu.first_enroute_time::timestamp as first_enroute,
-                EXTRACT(EPOCH FROM (fu.first_enroute_time::timestamp - fu.time_dispatched)) / 60 as turnout_mins,
+                m.incident_id,
+                m.first_unit_turnout_seconds / 60 as turnout_mins,
                 CASE 
-                    WHEN EXTRACT(hour FROM fu.time_dispatched) >= 6 AND EXTRACT(hour FROM fu.time_dispatched) < 16 THEN 'daytime'
-                    WHEN EXTRACT(hour FROM fu.time_dispatched) >= 16 THEN 'evening'
+                    WHEN m.local_hour >= 6 AND m.local_hour < 16 THEN 'daytime'
+                    WHEN m.local_hour >= 16 THEN 'evening'
                     ELSE 'overnight'
                 END as time_period,
-                (SELECT COUNT(*) 
-                 FROM incident_personnel ip
-                 JOIN incident_units iu ON ip.incident_unit_id = iu.id
-                 JOIN apparatus a ON iu.apparatus_id = a.id
-                 WHERE ip.incident_id = fu.incident_id
-                   AND a.unit_designator = fu.first_unit_id
-                ) as crew_count
-            FROM first_unit fu
-            WHERE fu.first_unit_id IS NOT NULL
-              AND fu.first_enroute_time IS NOT NULL
+                m.first_unit_crew as crew_count
+            FROM incident_metrics m
+            WHERE m.incident_date >= :start_date
+                AND m.incident_date < :end_date
+                AND m.category = :prefix
+                AND m.time_dispatched IS NOT NULL
+                AND m.first_unit_id IS NOT NULL
+                AND m.first_unit_turnout_seconds IS NOT NULL
         ),
         bucketed AS (
             SELECT 
@@ -324,7 +275,8 @@ def get_turnout_vs_crew_size(
         ORDER BY turnout_bucket, time_period
     """), {
         'start_date': start_date,
-        'end_date': end_date
+        'end_date': end_date,
+        'prefix': prefix
     }).fetchall()
     
     buckets = {
@@ -372,6 +324,7 @@ def get_turnout_vs_crew_size(
 # =============================================================================
 
 @router.get("/patterns/monthly-volume")
+@analytics_cache.cached("v2.get_monthly_volume_pattern", lambda **_: (None, None))
 def get_monthly_volume_pattern(
     category: str = Query(..., description="FIRE or EMS"),
     db: Session = Depends(get_db)
@@ -388,9 +341,8 @@ def get_monthly_volume_pattern(
     # Get the earliest incident date to know how many years we have
     earliest = db.execute(text("""
         SELECT MIN(incident_date) as min_date
-        FROM incidents
-        WHERE deleted_at IS NULL
-            AND internal_incident_number LIKE :prefix || '%'
+        FROM incident_metrics
+        WHERE category = :prefix
     """), {'prefix': prefix}).fetchone()
     
     earliest_date = earliest.min_date if earliest and earliest.min_date else today
@@ -403,9 +355,8 @@ def get_monthly_volume_pattern(
             EXTRACT(month FROM incident_date) as month_num,
             TO_CHAR(incident_date, 'Mon') as month_name,
             COUNT(*) as incident_count
-        FROM incidents
-        WHERE deleted_at IS NULL
-            AND internal_incident_number LIKE :prefix || '%'
+        FROM incident_metrics
+        WHERE category = :prefix
         GROUP BY EXTRACT(year FROM incident_date), EXTRACT(month FROM incident_date), TO_CHAR(incident_date, 'Mon')
         ORDER BY EXTRACT(year FROM incident_date), EXTRACT(month FROM incident_date)
     """), {'prefix': prefix}).fetchall()
@@ -480,6 +431,7 @@ def get_monthly_volume_pattern(
 
 
 @router.get("/patterns/best-performance")
+@analytics_cache.cached("v2.get_best_performance_times", lambda start_date, end_date, **_: (start_date, end_date))
 def get_best_performance_times(
     start_date: date = Query(...),
     end_date: date = Query(...),
@@ -491,7 +443,7 @@ def get_best_performance_times(
     Only includes incidents where station units responded.
     """
     prefix = 'F' if category.upper() == 'FIRE' else 'E'
-    prefix_filter = f"AND i.internal_incident_number LIKE '{prefix}%'"
+    prefix_filter = incident_metrics.category_filter(category)
     
     # Get counts
     counts = get_incident_counts(db, start_date, end_date, prefix)
@@ -499,8 +451,8 @@ def get_best_performance_times(
     # By day of week
     by_day = db.execute(text(f"""
         SELECT 
-            EXTRACT(dow FROM i.incident_date) as day_num,
-            CASE EXTRACT(dow FROM i.incident_date)
+            m.local_dow as day_num,
+            CASE m.local_dow
                 WHEN 0 THEN 'Sun'
                 WHEN 1 THEN 'Mon'
                 WHEN 2 THEN 'Tue'
@@ -510,45 +462,35 @@ def get_best_performance_times(
                 WHEN 6 THEN 'Sat'
             END as day_name,
             COUNT(*) as incident_count,
-            ROUND(AVG(
-                EXTRACT(EPOCH FROM (i.time_first_enroute - i.time_dispatched)) / 60
-            )::numeric, 1) as avg_turnout_mins,
-            ROUND(AVG(
-                EXTRACT(EPOCH FROM (i.time_first_on_scene - i.time_dispatched)) / 60
-            )::numeric, 1) as avg_response_mins
-        FROM incidents i
-        WHERE i.incident_date >= :start_date
-            AND i.incident_date < :end_date
-            AND i.deleted_at IS NULL
-            AND i.time_dispatched IS NOT NULL
-            AND i.time_first_enroute IS NOT NULL
+            ROUND((AVG(m.turnout_seconds) / 60)::numeric, 1) as avg_turnout_mins,
+            ROUND((AVG(m.response_seconds) / 60)::numeric, 1) as avg_response_mins
+        FROM incident_metrics m
+        WHERE m.incident_date >= :start_date
+            AND m.incident_date < :end_date
+            AND m.time_dispatched IS NOT NULL
+            AND m.turnout_seconds IS NOT NULL
             AND {STATION_RESPONDED_FILTER}
             {prefix_filter}
-        GROUP BY EXTRACT(dow FROM i.incident_date)
-        ORDER BY EXTRACT(dow FROM i.incident_date)
+        GROUP BY m.local_dow
+        ORDER BY m.local_dow
     """), {'start_date': start_date, 'end_date': end_date}).fetchall()
     
-    # By hour (using local timezone)
+    # By hour (local dispatch hour, station timezone)
     by_hour = db.execute(text(f"""
         SELECT 
-            EXTRACT(hour FROM i.time_dispatched AT TIME ZONE 'America/New_York') as hour,
+            m.local_hour as hour,
             COUNT(*) as incident_count,
-            ROUND(AVG(
-                EXTRACT(EPOCH FROM (i.time_first_enroute - i.time_dispatched)) / 60
-            )::numeric, 1) as avg_turnout_mins,
-            ROUND(AVG(
-                EXTRACT(EPOCH FROM (i.time_first_on_scene - i.time_dispatched)) / 60
-            )::numeric, 1) as avg_response_mins
-        FROM incidents i
-        WHERE i.incident_date >= :start_date
-            AND i.incident_date < :end_date
-            AND i.deleted_at IS NULL
-            AND i.time_dispatched IS NOT NULL
-            AND i.time_first_enroute IS NOT NULL
+            ROUND((AVG(m.turnout_seconds) / 60)::numeric, 1) as avg_turnout_mins,
+            ROUND((AVG(m.response_seconds) / 60)::numeric, 1) as avg_response_mins
+        FROM incident_metrics m
+        WHERE m.incident_date >= :start_date
+            AND m.incident_date < :end_date
+            AND m.time_dispatched IS NOT NULL
+            AND m.turnout_seconds IS NOT NULL
             AND {STATION_RESPONDED_FILTER}
             {prefix_filter}
-        GROUP BY EXTRACT(hour FROM i.time_dispatched AT TIME ZONE 'America/New_York')
-        ORDER BY EXTRACT(hour FROM i.time_dispatched AT TIME ZONE 'America/New_York')
+        GROUP BY m.local_hour
+        ORDER BY m.local_hour
     """), {'start_date': start_date, 'end_date': end_date}).fetchall()
     
     day_data = [
@@ -595,6 +537,7 @@ def get_best_performance_times(
 
 
 @router.get("/patterns/staffing")
+@analytics_cache.cached("v2.get_staffing_patterns", lambda start_date, end_date, **_: (start_date, end_date))
 def get_staffing_patterns(
     start_date: date = Query(...),
     end_date: date = Query(...),
@@ -607,7 +550,7 @@ def get_staffing_patterns(
     Filtered by category.
     """
     prefix = 'F' if category.upper() == 'FIRE' else 'E'
-    prefix_filter = f"AND i.internal_incident_number LIKE '{prefix}%'"
+    prefix_filter = incident_metrics.category_filter(category)
     
     # Get counts
     counts = get_incident_counts(db, start_date, end_date, prefix)
@@ -615,8 +558,8 @@ def get_staffing_patterns(
     # By day of week
     by_day = db.execute(text(f"""
         SELECT 
-            EXTRACT(dow FROM i.incident_date) as day_num,
-            CASE EXTRACT(dow FROM i.incident_date)
+            m.local_dow as day_num,
+            CASE m.local_dow
                 WHEN 0 THEN 'Sun'
                 WHEN 1 THEN 'Mon'
                 WHEN 2 THEN 'Tue'
@@ -625,43 +568,33 @@ def get_staffing_patterns(
                 WHEN 5 THEN 'Fri'
                 WHEN 6 THEN 'Sat'
             END as day_name,
-            COUNT(DISTINCT i.id) as incident_count,
-            ROUND(AVG(personnel_count)::numeric, 1) as avg_personnel
-        FROM incidents i
-        JOIN (
-            SELECT incident_id, COUNT(DISTINCT personnel_id) as personnel_count
-            FROM incident_personnel
-            GROUP BY incident_id
-        ) ip ON i.id = ip.incident_id
-        WHERE i.incident_date >= :start_date
-            AND i.incident_date < :end_date
-            AND i.deleted_at IS NULL
+            COUNT(*) as incident_count,
+            ROUND(AVG(m.unique_personnel)::numeric, 1) as avg_personnel
+        FROM incident_metrics m
+        WHERE m.incident_date >= :start_date
+            AND m.incident_date < :end_date
+            AND m.unique_personnel > 0
             AND {STATION_RESPONDED_FILTER}
             {prefix_filter}
-        GROUP BY EXTRACT(dow FROM i.incident_date)
-        ORDER BY EXTRACT(dow FROM i.incident_date)
+        GROUP BY m.local_dow
+        ORDER BY m.local_dow
     """), {'start_date': start_date, 'end_date': end_date}).fetchall()
     
-    # By hour (using local timezone)
+    # By hour (local dispatch hour, station timezone)
     by_hour = db.execute(text(f"""
         SELECT 
-            EXTRACT(hour FROM i.time_dispatched AT TIME ZONE 'America/New_York') as hour,
-            COUNT(DISTINCT i.id) as incident_count,
-            ROUND(AVG(personnel_count)::numeric, 1) as avg_personnel
-        FROM incidents i
-        JOIN (
-            SELECT incident_id, COUNT(DISTINCT personnel_id) as personnel_count
-            FROM incident_personnel
-            GROUP BY incident_id
-        ) ip ON i.id = ip.incident_id
-        WHERE i.incident_date >= :start_date
-            AND i.incident_date < :end_date
-            AND i.deleted_at IS NULL
-            AND i.time_dispatched IS NOT NULL
+            m.local_hour as hour,
+            COUNT(*) as incident_count,
+            ROUND(AVG(m.unique_personnel)::numeric, 1) as avg_personnel
+        FROM incident_metrics m
+        WHERE m.incident_date >= :start_date
+            AND m.incident_date < :end_date
+            AND m.unique_personnel > 0
+            AND m.time_dispatched IS NOT NULL
             AND {STATION_RESPONDED_FILTER}
             {prefix_filter}
-        GROUP BY EXTRACT(hour FROM i.time_dispatched AT TIME ZONE 'America/New_York')
-        ORDER BY EXTRACT(hour FROM i.time_dispatched AT TIME ZONE 'America/New_York')
+        GROUP BY m.local_hour
+        ORDER BY m.local_hour
     """), {'start_date': start_date, 'end_date': end_date}).fetchall()
     
     day_data = [
@@ -706,7 +639,16 @@ def get_staffing_patterns(
 # SECTION 4: Year-over-Year Comparison
 # =============================================================================
 
+def _this_week_last_year_window(**_):
+    """Cache window for get_this_week_last_year: last year's week through this week."""
+    today = date.today()
+    this_week_start = today - timedelta(days=(today.weekday() + 1) % 7)
+    this_week_end = this_week_start + timedelta(days=7)
+    return this_week_start.replace(year=this_week_start.year - 1), this_week_end
+
+
 @router.get("/yoy/this-week-last-year")
+@analytics_cache.cached("v2.get_this_week_last_year", _this_week_last_year_window)
 def get_this_week_last_year(
     category: str = Query(..., description="FIRE or EMS"),
     db: Session = Depends(get_db)
@@ -740,17 +682,12 @@ def get_this_week_last_year(
         result = db.execute(text(f"""
             SELECT 
                 COUNT(*) as total_incidents,
-                ROUND(AVG(
-                    EXTRACT(EPOCH FROM (time_first_enroute - time_dispatched)) / 60
-                )::numeric, 1) as avg_turnout_mins,
-                ROUND(AVG(
-                    EXTRACT(EPOCH FROM (time_first_on_scene - time_dispatched)) / 60
-                )::numeric, 1) as avg_response_mins
-            FROM incidents i
-            WHERE i.incident_date >= :start_date
-                AND i.incident_date < :end_date
-                AND i.deleted_at IS NULL
-                AND i.internal_incident_number LIKE :prefix || '%'
+                ROUND((AVG(m.turnout_seconds) / 60)::numeric, 1) as avg_turnout_mins,
+                ROUND((AVG(m.response_seconds) / 60)::numeric, 1) as avg_response_mins
+            FROM incident_metrics m
+            WHERE m.incident_date >= :start_date
+                AND m.incident_date < :end_date
+                AND m.category = :prefix
                 AND {STATION_RESPONDED_FILTER}
         """), {'start_date': start, 'end_date': end, 'prefix': prefix}).fetchone()
         
@@ -758,15 +695,14 @@ def get_this_week_last_year(
         type_field = "cad_event_type" if category.upper() == 'FIRE' else "cad_event_subtype"
         types = db.execute(text(f"""
             SELECT 
-                COALESCE({type_field}, 'Unknown') as call_type,
+                COALESCE(m.{type_field}, 'Unknown') as call_type,
                 COUNT(*) as count
-            FROM incidents i
-            WHERE i.incident_date >= :start_date
-                AND i.incident_date < :end_date
-                AND i.deleted_at IS NULL
-                AND i.internal_incident_number LIKE :prefix || '%'
+            FROM incident_metrics m
+            WHERE m.incident_date >= :start_date
+                AND m.incident_date < :end_date
+                AND m.category = :prefix
                 AND {STATION_RESPONDED_FILTER}
-            GROUP BY {type_field}
+            GROUP BY m.{type_field}
             ORDER BY COUNT(*) DESC
             LIMIT 5
         """), {'start_date': start, 'end_date': end, 'prefix': prefix}).fetchall()
@@ -816,6 +752,7 @@ def get_this_week_last_year(
 # =============================================================================
 
 @router.get("/summary")
+@analytics_cache.cached("v2.get_analytics_summary", lambda days, **_: (date.today() - timedelta(days=days), date.today()))
 def get_analytics_summary(
     days: int = Query(30, description="Number of days to analyze"),
     category: str = Query(..., description="FIRE or EMS"),
@@ -835,20 +772,13 @@ def get_analytics_summary(
     result = db.execute(text(f"""
         SELECT 
             COUNT(*) as total_incidents,
-            ROUND(AVG(
-                EXTRACT(EPOCH FROM (time_first_enroute - time_dispatched)) / 60
-            )::numeric, 1) as avg_turnout_mins,
-            ROUND(AVG(
-                EXTRACT(EPOCH FROM (time_first_on_scene - time_dispatched)) / 60
-            )::numeric, 1) as avg_response_mins,
-            ROUND(AVG(
-                EXTRACT(EPOCH FROM (time_last_cleared - time_first_on_scene)) / 60
-            )::numeric, 1) as avg_on_scene_mins
-        FROM incidents i
-        WHERE i.incident_date >= :start_date
-            AND i.incident_date < :end_date
-            AND i.deleted_at IS NULL
-            AND i.internal_incident_number LIKE :prefix || '%'
+            ROUND((AVG(m.turnout_seconds) / 60)::numeric, 1) as avg_turnout_mins,
+            ROUND((AVG(m.response_seconds) / 60)::numeric, 1) as avg_response_mins,
+            ROUND((AVG(m.on_scene_seconds) / 60)::numeric, 1) as avg_on_scene_mins
+        FROM incident_metrics m
+        WHERE m.incident_date >= :start_date
+            AND m.incident_date < :end_date
+            AND m.category = :prefix
             AND {STATION_RESPONDED_FILTER}
     """), {'start_date': start_date, 'end_date': today, 'prefix': prefix}).fetchone()
     
@@ -862,3 +792,35 @@ def get_analytics_summary(
         "avg_response_mins": float(result.avg_response_mins) if result.avg_response_mins else None,
         "avg_on_scene_mins": float(result.avg_on_scene_mins) if result.avg_on_scene_mins else None,
     }
+
+
+# =============================================================================
+# SECTION 6: Metrics Maintenance
+# =============================================================================
+
+@router.post("/metrics/rebuild")
+def rebuild_incident_metrics(
+    start_date: Optional[date] = Query(None),
+    end_date: Optional[date] = Query(None),
+    db: Session = Depends(get_db)
+):
+    """
+    Recompute incident_metrics rows (all incidents, or a date range).
+    Triggers keep rows current as incidents change; run this after changing
+    the station timezone or which apparatus count for response times.
+    """
+    refreshed = incident_metrics.rebuild(db, start_date, end_date)
+    # Closed-period results never re-check their fingerprint
+    analytics_cache.cache_cleared(db)
+    return {"status": "ok", "incidents_refreshed": refreshed}
+
+
+@router.post("/cache/clear")
+def clear_analytics_cache(db: Session = Depends(get_db)):
+    """
+    Drop this tenant's cached analytics results on every worker.
+    Closed periods are never re-checked, so bulk loaders that write old
+    incidents (cad/adi_log_import.py) call this when they finish.
+    """
+    analytics_cache.cache_cleared(db)
+    return {"status": "ok"}
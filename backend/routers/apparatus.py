@@ -86,7 +86,7 @@ def apparatus_to_dict(a: Apparatus) -> dict:
 
 
 @router.get("")
-async def list_apparatus(
+def list_apparatus(
     active_only: bool = True,
     include_virtual: bool = True,
     category: Optional[str] = None,
@@ -158,7 +158,7 @@ async def list_categories():
 
 
 @router.get("/lookup")
-async def lookup_apparatus(
+def lookup_apparatus(
     unit_id: str,
     db: Session = Depends(get_db)
 ):
@@ -221,7 +221,7 @@ async def lookup_apparatus(
 
 
 @router.get("/{id}")
-async def get_apparatus(id: int, db: Session = Depends(get_db)):
+def get_apparatus(id: int, db: Session = Depends(get_db)):
     """Get single apparatus/unit by ID"""
     apparatus = db.query(Apparatus).filter(Apparatus.id == id).first()
     
@@ -232,7 +232,7 @@ async def get_apparatus(id: int, db: Session = Depends(get_db)):
 
 
 @router.post("")
-async def create_apparatus(
+def create_apparatus(
     data: ApparatusCreate,
     db: Session = Depends(get_db)
 ):
@@ -286,7 +286,7 @@ async def create_apparatus(
 
 
 @router.put("/{id}")
-async def update_apparatus(
+def update_apparatus(
     id: int,
     data: ApparatusUpdate,
     db: Session = Depends(get_db)
@@ -326,7 +326,7 @@ async def update_apparatus(
 
 
 @router.delete("/{id}")
-async def delete_apparatus(id: int, db: Session = Depends(get_db)):
+def delete_apparatus(id: int, db: Session = Depends(get_db)):
     """Deactivate apparatus/unit (soft delete)"""
     apparatus = db.query(Apparatus).filter(Apparatus.id == id).first()
     
@@ -340,7 +340,7 @@ async def delete_apparatus(id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/{id}/reactivate")
-async def reactivate_apparatus(id: int, db: Session = Depends(get_db)):
+def reactivate_apparatus(id: int, db: Session = Depends(get_db)):
     """Reactivate a previously deactivated apparatus/unit"""
     apparatus = db.query(Apparatus).filter(Apparatus.id == id).first()
     
@@ -354,7 +354,7 @@ async def reactivate_apparatus(id: int, db: Session = Depends(get_db)):
 
 
 @router.delete("/{id}/permanent")
-async def hard_delete_apparatus(id: int, db: Session = Depends(get_db)):
+def hard_delete_apparatus(id: int, db: Session = Depends(get_db)):
     """Permanently delete apparatus/unit from database"""
     apparatus = db.query(Apparatus).filter(Apparatus.id == id).first()
     
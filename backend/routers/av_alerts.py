@@ -67,8 +67,8 @@ def _extract_tenant_from_request(request) -> str:
 
 
 def _get_av_settings(db) -> dict:
-    """Get AV alert settings from database"""
-    from sqlalchemy import text
+    """Get AV alert settings from the tenant's settings snapshot"""
+    from settings_cache import get_category
     
     defaults = {
         'enabled': True,
@@ -79,12 +79,7 @@ def _get_av_settings(db) -> dict:
         return defaults
     
     try:
-        result = db.execute(text(
-            "SELECT key, value, value_type FROM settings WHERE category = 'av_alerts' AND key IN ('enabled', 'tts_enabled')"
-        ))
-        
-        for row in result:
-            key, value, value_type = row[0], row[1], row[2]
+        for key, (value, value_type) in get_category(db, 'av_alerts').items():
             if key in defaults:
                 if value_type == 'boolean':
                     defaults[key] = value.lower() in ('true', '1', 'yes')
@@ -6,7 +6,7 @@ matching the logic in cad_listener.py. This ensures old incidents get corrected
 when chief vehicles (CHF48, etc.) were incorrectly included in response metrics.
 """
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from sqlalchemy import text
@@ -14,12 +14,14 @@ from typing import Optional, Dict, Any, List
 from datetime import datetime, date, time as dt_time, timedelta
 from zoneinfo import ZoneInfo
 import json
-import io
+import logging
 import os
 import sys
+import threading
 
-from database import get_db
-from settings_helper import get_timezone, format_utc_iso
+from database import get_db, _request_tenant_slug
+from settings_helper import get_timezone
+from services import backup_export, reparse_job
 
 
 def get_local_timezone() -> ZoneInfo:
@@ -27,6 +29,8 @@ def get_local_timezone() -> ZoneInfo:
     return ZoneInfo(get_timezone())
 
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 
 
@@ -34,10 +38,10 @@ router = APIRouter()
 # HELPER FUNCTIONS
 # =============================================================================
 
-def get_cad_parser():
+def find_cad_parser_path() -> str:
     """
-    Import cad_parser module with cross-platform path handling.
-    Returns (parse_cad_html, report_to_dict) tuple or raises ImportError.
+    Directory containing cad_parser.py, with cross-platform path handling.
+    Raises ImportError if none of the known locations exist.
     """
     possible_paths = [
         '/opt/runsheet/cad',                                        # Linux production
@@ -47,18 +51,24 @@ def get_cad_parser():
     
     for path in possible_paths:
         abs_path = os.path.abspath(path)
-        if os.path.exists(abs_path):
-            if abs_path not in sys.path:
-                sys.path.insert(0, abs_path)
-            try:
-                from cad_parser import parse_cad_html, report_to_dict
-                return parse_cad_html, report_to_dict
-            except ImportError:
-                continue
+        if os.path.exists(os.path.join(abs_path, 'cad_parser.py')):
+            return abs_path
     
     raise ImportError("Could not import cad_parser from any known path")
 
 
+def get_cad_parser():
+    """
+    Import cad_parser module with cross-platform path handling.
+    Returns (parse_cad_html, report_to_dict) tuple or raises ImportError.
+    """
+    abs_path = find_cad_parser_path()
+    if abs_path not in sys.path:
+        sys.path.insert(0, abs_path)
+    from cad_parser import parse_cad_html, report_to_dict
+    return parse_cad_html, report_to_dict
+
+
 def get_full_unit_info(db: Session, unit_id: str) -> Dict[str, Any]:
     """
     Full unit lookup matching settings_helper.get_unit_info().
@@ -106,7 +116,8 @@ def get_full_unit_info(db: Session, unit_id: str) -> Dict[str, Any]:
     }
 
 
-def full_reparse_incident(incident_id: int, db: Session, edited_by: Optional[int] = None) -> Dict[str, Any]:
+def full_reparse_incident(incident_id: int, db: Session, tenant_slug: str,
+                          edited_by: Optional[int] = None) -> Dict[str, Any]:
     """
     Full reparse of an incident from stored CAD HTML.
     
@@ -118,6 +129,8 @@ def full_reparse_incident(incident_id: int, db: Session, edited_by: Optional[int
     5. Updates all CAD-derived fields
     
     This is the FULL reparse - not just times, but everything CAD-derived.
+    The year-wide version (services/reparse_job.py) runs the same
+    build_reparse() / apply_reparse() steps with parsing in a process pool.
     """
     try:
         parse_cad_html, report_to_dict = get_cad_parser()
@@ -125,10 +138,8 @@ def full_reparse_incident(incident_id: int, db: Session, edited_by: Optional[int
         return {"error": f"CAD parser not available: {e}"}
     
     # Get the incident
-    result = db.execute(text("""
-        SELECT 
-            id, internal_incident_number, incident_date,
-            cad_raw_dispatch, cad_raw_clear, cad_units
+    result = db.execute(text(f"""
+        SELECT {REPARSE_COLUMNS}
         FROM incidents 
         WHERE id = :id AND deleted_at IS NULL
     """), {"id": incident_id}).fetchone()
@@ -136,20 +147,11 @@ def full_reparse_incident(incident_id: int, db: Session, edited_by: Optional[int
     if not result:
         return {"error": "Incident not found", "incident_id": incident_id}
     
-    incident_number = result[1]
-    incident_date = result[2]
-    raw_dispatch = result[3]
-    raw_clear = result[4]
-    existing_cad_units = result[5] or []
-    
-    # Prefer clear report (has all times), fall back to dispatch
-    raw_html = raw_clear or raw_dispatch
-    report_source = "clear_report" if raw_clear else "dispatch_report"
-    
+    raw_html = result.cad_raw_clear or result.cad_raw_dispatch
     if not raw_html:
         return {"error": "No raw CAD HTML stored for this incident", "incident_id": incident_id}
     
-    if not incident_date:
+    if not result.incident_date:
         return {"error": "No incident_date set - cannot calculate times", "incident_id": incident_id}
     
     # Parse the HTML
@@ -157,7 +159,37 @@ def full_reparse_incident(incident_id: int, db: Session, edited_by: Optional[int
     if not parsed:
         return {"error": "Failed to parse stored HTML", "incident_id": incident_id}
     
-    report_dict = report_to_dict(parsed)
+    plan = build_reparse(result, report_to_dict(parsed), lambda unit_id: get_full_unit_info(db, unit_id))
+    
+    address_changed = apply_reparse(db, plan, reparse_personnel_name(db, edited_by), edited_by)
+    db.commit()
+    
+    if address_changed:
+        queue_reparse_geocode(db, tenant_slug, [incident_id])
+    
+    return reparse_result(plan)
+
+
+# Incident columns build_reparse() reads
+REPARSE_COLUMNS = """
+    id, internal_incident_number, incident_date,
+    cad_raw_dispatch, cad_raw_clear, cad_units, address
+"""
+
+
+def build_reparse(incident, report_dict: Dict[str, Any], unit_info) -> Dict[str, Any]:
+    """
+    Compute the CAD-derived fields for one incident from its parsed report.
+    
+    No database writes. incident is a row with REPARSE_COLUMNS; unit_info(unit_id)
+    returns get_full_unit_info() for a CAD unit id.
+    """
+    incident_id = incident.id
+    incident_date = incident.incident_date
+    existing_cad_units = incident.cad_units or []
+    
+    # Prefer clear report (has all times), fall back to dispatch
+    report_source = "clear_report" if incident.cad_raw_clear else "dispatch_report"
     
     # Track what changed
     changes = []
@@ -179,7 +211,7 @@ def full_reparse_incident(incident_id: int, db: Session, edited_by: Optional[int
             continue
         
         # Look up unit info from CURRENT apparatus table
-        unit_info = get_full_unit_info(db, unit_id)
+        unit_info_row = unit_info(unit_id)
         
         # Parse times with proper date and midnight crossing
         time_dispatched = build_datetime_with_midnight_crossing(
@@ -200,15 +232,15 @@ def full_reparse_incident(incident_id: int, db: Session, edited_by: Optional[int
         
         # Build the unit entry
         # Use canonical unit_designator if available (normalizes aliases like 48QRS -> QRS48)
-        canonical_unit_id = unit_info['unit_designator'] or unit_id
+        canonical_unit_id = unit_info_row['unit_designator'] or unit_id
         unit_entry = {
             'unit_id': canonical_unit_id,
             'station': None,
             'agency': None,
-            'is_mutual_aid': not unit_info['is_ours'],
-            'apparatus_id': unit_info['apparatus_id'],
-            'unit_category': unit_info['category'],
-            'counts_for_response_times': unit_info['counts_for_response_times'],
+            'is_mutual_aid': not unit_info_row['is_ours'],
+            'apparatus_id': unit_info_row['apparatus_id'],
+            'unit_category': unit_info_row['category'],
+            'counts_for_response_times': unit_info_row['counts_for_response_times'],
             'time_dispatched': time_dispatched.isoformat() if time_dispatched else None,
             'time_enroute': time_enroute.isoformat() if time_enroute else None,
             'time_arrived': time_arrived.isoformat() if time_arrived else None,
@@ -335,89 +367,102 @@ def full_reparse_incident(incident_id: int, db: Session, edited_by: Optional[int
     # NOTE: time_in_service is NOT stored as a timestamp
     # It's calculated as duration (Cleared - Dispatched) in the frontend
     
+    return {
+        "incident_id": incident_id,
+        "incident_number": incident.internal_incident_number,
+        "old_address": incident.address,
+        "source": report_source,
+        "update_fields": update_fields,
+        "restored_fields": restored_fields,
+        "included_units": included_units,
+        "excluded_units": excluded_units,
+        "unit_changes": units_changed,
+    }
+
+
+def reparse_personnel_name(db: Session, edited_by: Optional[int]) -> str:
+    """Audit log name for a reparse: the editor's name, otherwise "CAD Parser"."""
+    personnel_name = "CAD Parser"
+    if edited_by:
+        person_result = db.execute(text("""
+            SELECT first_name, last_name FROM personnel WHERE id = :id
+        """), {"id": edited_by}).fetchone()
+        if person_result:
+            personnel_name = f"{person_result[1]}, {person_result[0]}"
+    return personnel_name
+
+
+def apply_reparse(
+    db: Session,
+    plan: Dict[str, Any],
+    personnel_name: str,
+    edited_by: Optional[int] = None,
+    diff_only: bool = False,
+) -> Optional[bool]:
+    """
+    Write a build_reparse() plan: UPDATE the incident, clear location data
+    if the address changed, and add the REPARSE audit entry. Does not commit.
+    
+    With diff_only, the UPDATE only matches when a derived field actually
+    differs; an unchanged incident gets no write and no audit entry and
+    None is returned. Otherwise returns whether the address changed (the
+    caller queues a re-geocode after committing).
+    """
+    incident_id = plan["incident_id"]
+    update_fields = plan["update_fields"]
+    
     # ==========================================================================
     # EXECUTE UPDATE
     # ==========================================================================
     
     # Build SET clause - handle cad_units specially (it's JSONB)
     set_parts = []
+    distinct_parts = []
     params = {'id': incident_id}
     
     for key, value in update_fields.items():
         if key == 'cad_units':
             set_parts.append(f"{key} = CAST(:cad_units AS jsonb)")
+            distinct_parts.append(f"{key} IS DISTINCT FROM CAST(:cad_units AS jsonb)")
             params['cad_units'] = value
         else:
             set_parts.append(f"{key} = :{key}")
+            distinct_parts.append(f"{key} IS DISTINCT FROM :{key}")
             params[key] = value
     
     set_clause = ", ".join(set_parts)
+    diff_clause = f"AND ({' OR '.join(distinct_parts)})" if diff_only else ""
     
-    # Check if address changed — need old address for location invalidation
-    old_address_row = db.execute(text(
-        "SELECT address FROM incidents WHERE id = :id"
-    ), {"id": incident_id}).fetchone()
-    old_address = old_address_row[0] if old_address_row else None
-    new_address = update_fields.get('address')
-    
-    db.execute(text(f"""
+    updated = db.execute(text(f"""
         UPDATE incidents 
         SET {set_clause}, updated_at = NOW()
-        WHERE id = :id
-    """), params)
+        WHERE id = :id {diff_clause}
+        RETURNING id
+    """), params).fetchone()
     
-    # If address changed from reparse, invalidate cached location data and re-geocode
-    if new_address and old_address != new_address:
-        try:
-            db.execute(text("""
-                UPDATE incidents SET 
-                    latitude = NULL, longitude = NULL,
-                    route_polyline = NULL, route_geometry = NULL,
-                    map_snapshot = NULL, geocode_data = NULL,
-                    geocode_needs_review = false
-                WHERE id = :id
-            """), {"id": incident_id})
-            db.commit()
-            import logging
-            _logger = logging.getLogger(__name__)
-            _logger.info(
-                f"Reparse changed address on incident {incident_id}: '{old_address}' → '{new_address}' — location data invalidated"
-            )
-            # Queue background geocode for the new address
-            try:
-                from services.location.background_task import process_incident_location
-                from routers.settings import is_location_enabled
-                if is_location_enabled(db):
-                    # Can't use background_tasks here (not an async endpoint with BackgroundTasks),
-                    # so run synchronously in a thread
-                    import threading
-                    threading.Thread(
-                        target=process_incident_location,
-                        args=(incident_id, None),
-                        daemon=True
-                    ).start()
-                    _logger.info(f"Queued background geocode for reparsed incident {incident_id}")
-            except ImportError:
-                pass
-        except Exception as e:
-            import logging
-            logging.getLogger(__name__).warning(f"Location invalidation failed during reparse for incident {incident_id}: {e}")
-    
-    # Add audit log entry for the reparse
-    # Look up person's name if edited_by provided, otherwise use "CAD Parser"
-    personnel_name = "CAD Parser"
-    if edited_by:
-        person_result = db.execute(text("""
-            SELECT first_name, last_name FROM personnel WHERE id = :id
-        """), {"id": edited_by}).fetchone()
-        if person_result:
-            personnel_name = f"{person_result[1]}, {person_result[0]}"
+    if not updated:
+        return None
+    
+    # If address changed from reparse, invalidate cached location data
+    old_address = plan["old_address"]
+    new_address = update_fields.get('address')
+    address_changed = bool(new_address and old_address != new_address)
+    if address_changed:
+        db.execute(text("""
+            UPDATE incidents SET 
+                latitude = NULL, longitude = NULL,
+                route_polyline = NULL, route_geometry = NULL,
+                map_snapshot = NULL, geocode_data = NULL,
+                geocode_needs_review = false
+            WHERE id = :id
+        """), {"id": incident_id})
+        logger.info(
+            f"Reparse changed address on incident {incident_id}: '{old_address}' → '{new_address}' — location data invalidated"
+        )
     
-    audit_summary = f"Reparsed from {report_source}"
+    units_changed = plan["unit_changes"]
+    audit_summary = f"Reparsed from {plan['source']}"
     if units_changed:
-        unit_change_descs = []
-        for uc in units_changed:
-            unit_change_descs.append(f"{uc['unit_id']} {uc['field']}: {uc['old']} → {uc['new']}")
         audit_summary += f" ({len(units_changed)} unit config changes)"
     
     # Build fields_changed in {old, new} format for frontend display
@@ -425,10 +470,10 @@ def full_reparse_incident(incident_id: int, db: Session, edited_by: Optional[int
     for uc in units_changed:
         label = f"{uc['unit_id']} {uc['field'].replace('_', ' ')}"
         audit_fields[label] = {"old": str(uc['old']), "new": str(uc['new'])}
-    if excluded_units:
-        audit_fields["Excluded from metrics"] = {"old": None, "new": ', '.join(excluded_units)}
-    if included_units:
-        audit_fields["Included in metrics"] = {"old": None, "new": ', '.join(included_units)}
+    if plan["excluded_units"]:
+        audit_fields["Excluded from metrics"] = {"old": None, "new": ', '.join(plan["excluded_units"])}
+    if plan["included_units"]:
+        audit_fields["Included in metrics"] = {"old": None, "new": ', '.join(plan["included_units"])}
     
     db.execute(text("""
         INSERT INTO audit_log (
@@ -442,25 +487,55 @@ def full_reparse_incident(incident_id: int, db: Session, edited_by: Optional[int
         "personnel_id": edited_by,
         "personnel_name": personnel_name,
         "incident_id": incident_id,
-        "entity_display": f"Incident {incident_number}",
+        "entity_display": f"Incident {plan['incident_number']}",
         "summary": audit_summary,
         "fields_changed": json.dumps(audit_fields) if audit_fields else None,
     })
     
-    db.commit()
+    return address_changed
+
+
+def queue_reparse_geocode(db: Session, tenant_slug: str, incident_ids: List[int]):
+    """Re-geocode incidents whose address a committed reparse changed (in tenant_slug's database)."""
+    try:
+        from services.location.background_task import process_incident_location
+        from routers.settings import is_location_enabled
+    except ImportError:
+        return
+    
+    try:
+        if not is_location_enabled(db):
+            return
+    except Exception as e:
+        logger.warning(f"Location check failed during reparse: {e}")
+        return
+    
+    def run():
+        for incident_id in incident_ids:
+            try:
+                process_incident_location(incident_id, tenant_slug)
+            except Exception as e:
+                logger.warning(f"Background geocode failed for reparsed incident {incident_id}: {e}")
     
+    # Not an async endpoint with BackgroundTasks - run in a thread
+    threading.Thread(target=run, daemon=True).start()
+    logger.info(f"Queued background geocode for {len(incident_ids)} reparsed incident(s)")
+
+
+def reparse_result(plan: Dict[str, Any]) -> Dict[str, Any]:
+    """API response for a reparsed incident."""
     return {
         "success": True,
-        "incident_id": incident_id,
-        "incident_number": incident_number,
-        "source": report_source,
-        "restored_fields": restored_fields,
-        "included_units": included_units,
-        "excluded_units": excluded_units,
-        "unit_changes": units_changed,
+        "incident_id": plan["incident_id"],
+        "incident_number": plan["incident_number"],
+        "source": plan["source"],
+        "restored_fields": plan["restored_fields"],
+        "included_units": plan["included_units"],
+        "excluded_units": plan["excluded_units"],
+        "unit_changes": plan["unit_changes"],
         "values": {
             k: (v if isinstance(v, str) else v.isoformat() if hasattr(v, 'isoformat') else str(v))
-            for k, v in update_fields.items() if k != 'cad_units'
+            for k, v in plan["update_fields"].items() if k != 'cad_units'
         }
     }
 
@@ -597,7 +672,7 @@ def calculate_response_times_from_units(
 # =============================================================================
 
 @router.get("/diagnose-times")
-async def diagnose_incident_times(
+def diagnose_incident_times(
     year: int = Query(None),
     incident_id: int = Query(None),
     db: Session = Depends(get_db)
@@ -815,8 +890,9 @@ async def diagnose_incident_times(
 # =============================================================================
 
 @router.post("/restore-from-cad/{incident_id}")
-async def restore_incident_from_cad(
+def restore_incident_from_cad(
     incident_id: int,
+    request: Request,
     edited_by: Optional[int] = Query(None, description="Personnel ID of logged-in user"),
     db: Session = Depends(get_db)
 ):
@@ -831,25 +907,29 @@ async def restore_incident_from_cad(
     
     Keeps: internal_incident_number, call_category, personnel, NERIS codes, notes.
     """
-    return full_reparse_incident(incident_id, db, edited_by)
+    return full_reparse_incident(incident_id, db, _request_tenant_slug(request), edited_by)
 
 
 @router.post("/full-reparse/{incident_id}")
-async def full_reparse_from_cad(
+def full_reparse_from_cad(
     incident_id: int,
+    request: Request,
     edited_by: Optional[int] = Query(None, description="Personnel ID of logged-in user"),
     db: Session = Depends(get_db)
 ):
     """
     Alias for restore-from-cad. Full reparse of incident from stored CAD HTML.
     """
-    return full_reparse_incident(incident_id, db, edited_by)
+    return full_reparse_incident(incident_id, db, _request_tenant_slug(request), edited_by)
 
 
 @router.post("/full-reparse-all")
-async def full_reparse_all_incidents(
+def full_reparse_all_incidents(
+    request: Request,
     year: int = Query(None),
     dry_run: bool = Query(True),
+    diff_only: bool = Query(True),
+    edited_by: Optional[int] = Query(None),
     db: Session = Depends(get_db)
 ):
     """
@@ -858,71 +938,64 @@ async def full_reparse_all_incidents(
     This rebuilds cad_units, is_mutual_aid flags, and all times for every incident.
     Use this after changing apparatus configuration to update historical incidents.
     
+    Runs as a background job (services/reparse_job.py) - returns the job
+    immediately; poll GET /reparse-jobs/{job_id} or watch /ws/incidents for
+    "reparse_progress" messages. If a job is already running for this
+    tenant, that job is returned instead.
+    
     Args:
         year: Year to process (defaults to current year)
-        dry_run: If True, only report what would be fixed without making changes
+        dry_run: If True, count what would change and roll every chunk back
+        diff_only: Skip the write and audit entry for incidents whose derived fields are unchanged
+        edited_by: Personnel ID recorded on the audit entries
     """
     if not year:
         year = datetime.now().year
     
-    # Get all incidents for the year
-    result = db.execute(text("""
-        SELECT id, internal_incident_number
-        FROM incidents 
-        WHERE year_prefix = :year AND deleted_at IS NULL
-        ORDER BY incident_date, internal_incident_number
-    """), {"year": year})
-    
-    incidents = list(result)
-    results = []
-    success_count = 0
-    error_count = 0
-    
-    for row in incidents:
-        inc_id = row[0]
-        incident_number = row[1]
-        
-        if dry_run:
-            # Just check if it would work
-            results.append({
-                "incident_id": inc_id,
-                "incident_number": incident_number,
-                "would_reparse": True
-            })
-        else:
-            # Actually do the reparse
-            reparse_result = full_reparse_incident(inc_id, db)
-            
-            if reparse_result.get('success'):
-                success_count += 1
-                results.append({
-                    "incident_id": inc_id,
-                    "incident_number": incident_number,
-                    "success": True,
-                    "unit_changes": reparse_result.get('unit_changes', []),
-                    "restored_fields": reparse_result.get('restored_fields', []),
-                })
-            else:
-                error_count += 1
-                results.append({
-                    "incident_id": inc_id,
-                    "incident_number": incident_number,
-                    "success": False,
-                    "error": reparse_result.get('error', 'Unknown error'),
-                })
-    
-    return {
-        "dry_run": dry_run,
-        "year": year,
-        "total_incidents": len(incidents),
-        "success_count": success_count if not dry_run else len(incidents),
-        "error_count": error_count,
-        "results": results
-    }
+    return reparse_job.start_job(
+        db, _request_tenant_slug(request), year,
+        dry_run=dry_run, diff_only=diff_only, edited_by=edited_by,
+    )
+
+
+@router.get("/reparse-jobs")
+def list_reparse_jobs(
+    limit: int = Query(20, ge=1, le=100),
+    db: Session = Depends(get_db)
+):
+    """Recent full-reparse jobs, newest first."""
+    return {"jobs": reparse_job.list_jobs(db, limit)}
+
+
+@router.get("/reparse-jobs/{job_id}")
+def get_reparse_job(job_id: int, db: Session = Depends(get_db)):
+    """Progress of a full-reparse job, including stored per-incident errors."""
+    job = reparse_job.get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Reparse job not found")
+    return job
+
+
+@router.post("/reparse-jobs/{job_id}/resume")
+def resume_reparse_job(job_id: int, request: Request, db: Session = Depends(get_db)):
+    """Resume an interrupted or failed job from its last committed chunk."""
+    job = reparse_job.resume_job(db, _request_tenant_slug(request), job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Reparse job not found")
+    return job
+
+
+@router.post("/reparse-jobs/{job_id}/cancel")
+def cancel_reparse_job(job_id: int, db: Session = Depends(get_db)):
+    """Stop a job after its current chunk (committed chunks stay applied)."""
+    job = reparse_job.cancel_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Reparse job not found")
+    return job
 
 
 @router.get("/preview-restore/{incident_id}")
-async def preview_restore_from_cad(
+def preview_restore_from_cad(
     incident_id: int,
     db: Session = Depends(get_db)
 ):
@@ -1234,62 +1307,52 @@ async def preview_restore_from_cad(
 # EXPORT ENDPOINTS
 # =============================================================================
 
-@router.get("/cad-export")
-async def export_cad_data(
-    start_date: Optional[date] = None,
-    end_date: Optional[date] = None,
-    year: Optional[int] = None,
-    db: Session = Depends(get_db)
-):
-    """Export raw CAD data as JSON."""
-    
+def _export_session_factory(db: Session):
+    """Session factory for the request's tenant - export streams open their own."""
+    from database import _get_session_factory
+    return _get_session_factory(db.get_bind().url.database)
+
+
+def _cad_export_filter(start_date: Optional[date], end_date: Optional[date], year: Optional[int]):
+    """(where_sql, params, year) for the CAD export date selection."""
     if year:
-        date_filter = "year_prefix = :year"
-        params = {"year": year}
-    elif start_date and end_date:
-        date_filter = "COALESCE(incident_date, created_at::date) BETWEEN :start_date AND :end_date"
-        params = {"start_date": start_date, "end_date": end_date}
-    else:
-        year = datetime.now().year
-        date_filter = "year_prefix = :year"
-        params = {"year": year}
-    
-    result = db.execute(text(f"""
-        SELECT 
-            id, internal_incident_number, call_category, cad_event_number, cad_event_type,
-            incident_date, address, municipality_code,
-            time_dispatched, time_first_enroute, time_first_on_scene,
-            time_last_cleared,
-            cad_raw_dispatch, cad_raw_updates, cad_raw_clear,
-            created_at, updated_at
-        FROM incidents
-        WHERE {date_filter} AND deleted_at IS NULL
-        ORDER BY incident_date ASC, created_at ASC
-    """), params)
-    
-    incidents = []
-    for row in result:
-        incidents.append({
-            "id": row[0],
-            "internal_incident_number": row[1],
-            "call_category": row[2],
-            "cad_event_number": row[3],
-            "cad_event_type": row[4],
-            "incident_date": row[5].isoformat() if row[5] else None,  # DATE only, no Z needed
-            "address": row[6],
-            "municipality_code": row[7],
-            "time_dispatched": format_utc_iso(row[8]),
-            "time_first_enroute": format_utc_iso(row[9]),
-            "time_first_on_scene": format_utc_iso(row[10]),
-            "time_last_cleared": format_utc_iso(row[11]),
-            "cad_raw_dispatch": row[12],
-            "cad_raw_updates": row[13] or [],
-            "cad_raw_clear": row[14],
-            "created_at": format_utc_iso(row[15]),
-            "updated_at": format_utc_iso(row[16]),
-        })
-    
-    return {
+        return "year_prefix = :year", {"year": year}, year
+    if start_date and end_date:
+        return (
+            "COALESCE(incident_date, created_at::date) BETWEEN :start_date AND :end_date",
+            {"start_date": start_date, "end_date": end_date},
+            None,
+        )
+    year = datetime.now().year
+    return "year_prefix = :year", {"year": year}, year
+
+
+def _cad_export_response(
+    db: Session,
+    start_date: Optional[date],
+    end_date: Optional[date],
+    year: Optional[int],
+    format: str,
+    compress: str,
+    after: Optional[str],
+    chunk_days: int,
+    attachment: bool,
+):
+    error = backup_export.validate_options(format, compress)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+    try:
+        resume = backup_export.parse_after(after)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="after must be '<YYYY-MM-DD>:<incident id>'")
+    
+    requested_year = year
+    date_filter, params, year = _cad_export_filter(start_date, end_date, year)
+    records = backup_export.iter_cad_records(
+        _export_session_factory(db), date_filter, params,
+        after=resume, chunk_days=chunk_days,
+    )
+    header = {
         "export_date": datetime.now().isoformat(),
         "export_type": "cad_data",
         "filter": {
@@ -1297,140 +1360,122 @@ async def export_cad_data(
             "start_date": start_date.isoformat() if start_date else None,
             "end_date": end_date.isoformat() if end_date else None,
         },
-        "incident_count": len(incidents),
-        "incidents": incidents
     }
+    
+    if requested_year:
+        filename = f"cad_export_{requested_year}"
+    elif start_date and end_date:
+        filename = f"cad_export_{start_date}_{end_date}"
+    else:
+        filename = f"cad_export_{datetime.now().strftime('%Y%m%d')}"
+    
+    media_type, headers = backup_export.response_headers(filename, format, compress, attachment)
+    return StreamingResponse(
+        backup_export.export_stream(records, header, format, compress),
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+def _full_export_response(
+    db: Session,
+    year: int,
+    format: str,
+    compress: str,
+    after: Optional[str],
+    chunk_days: int,
+    attachment: bool,
+):
+    error = backup_export.validate_options(format, compress)
+    if error:
+        raise HTTPException(status_code=400, detail=error)
+    try:
+        resume = backup_export.parse_after(after)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="after must be '<YYYY-MM-DD>:<incident id>'")
+    
+    records = backup_export.iter_full_records(
+        _export_session_factory(db), "year_prefix = :year", {"year": year},
+        after=resume, chunk_days=chunk_days,
+    )
+    header = {
+        "export_date": datetime.now().isoformat(),
+        "export_type": "full_incidents",
+        "year": year,
+    }
+    
+    media_type, headers = backup_export.response_headers(
+        f"incidents_full_export_{year}", format, compress, attachment
+    )
+    return StreamingResponse(
+        backup_export.export_stream(records, header, format, compress),
+        media_type=media_type,
+        headers=headers,
+    )
+
+
+# Export options shared by the four export endpoints (services/backup_export.py)
+_FORMAT_QUERY = Query("json", description="json (one document) or ndjson (one incident per line)")
+_COMPRESS_QUERY = Query("none", description="none, gzip or zstd")
+_AFTER_QUERY = Query(None, description="Resume after '<YYYY-MM-DD>:<incident id>' of the last record received")
+_CHUNK_DAYS_QUERY = Query(backup_export.DEFAULT_CHUNK_DAYS, ge=1, le=366, description="Days per export transaction")
+
+
+@router.get("/cad-export")
+def export_cad_data(
+    start_date: Optional[date] = None,
+    end_date: Optional[date] = None,
+    year: Optional[int] = None,
+    format: str = _FORMAT_QUERY,
+    compress: str = _COMPRESS_QUERY,
+    after: Optional[str] = _AFTER_QUERY,
+    chunk_days: int = _CHUNK_DAYS_QUERY,
+    db: Session = Depends(get_db)
+):
+    """Export raw CAD data as JSON (streamed)."""
+    return _cad_export_response(
+        db, start_date, end_date, year, format, compress, after, chunk_days, attachment=False
+    )
 
 
 @router.get("/cad-export/download")
-async def download_cad_export(
+def download_cad_export(
     start_date: Optional[date] = None,
     end_date: Optional[date] = None,
     year: Optional[int] = None,
+    format: str = _FORMAT_QUERY,
+    compress: str = _COMPRESS_QUERY,
+    after: Optional[str] = _AFTER_QUERY,
+    chunk_days: int = _CHUNK_DAYS_QUERY,
     db: Session = Depends(get_db)
 ):
-    """Download CAD export as JSON file."""
-    
-    data = await export_cad_data(start_date, end_date, year, db)
-    
-    json_str = json.dumps(data, indent=2)
-    buffer = io.BytesIO(json_str.encode('utf-8'))
-    
-    if year:
-        filename = f"cad_export_{year}.json"
-    elif start_date and end_date:
-        filename = f"cad_export_{start_date}_{end_date}.json"
-    else:
-        filename = f"cad_export_{datetime.now().strftime('%Y%m%d')}.json"
-    
-    return StreamingResponse(
-        buffer,
-        media_type="application/json",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
+    """Download CAD export as a JSON / NDJSON file (streamed)."""
+    return _cad_export_response(
+        db, start_date, end_date, year, format, compress, after, chunk_days, attachment=True
     )
 
 
 @router.get("/full-export")
-async def export_full_incidents(
+def export_full_incidents(
     year: int = Query(...),
+    format: str = _FORMAT_QUERY,
+    compress: str = _COMPRESS_QUERY,
+    after: Optional[str] = _AFTER_QUERY,
+    chunk_days: int = _CHUNK_DAYS_QUERY,
     db: Session = Depends(get_db)
 ):
-    """Export complete incident data for a year."""
-    
-    incidents_result = db.execute(text("""
-        SELECT * FROM incidents 
-        WHERE year_prefix = :year AND deleted_at IS NULL
-        ORDER BY internal_incident_number
-    """), {"year": year})
-    
-    incidents = []
-    columns = incidents_result.keys()
-    
-    for row in incidents_result:
-        incident_dict = {}
-        for i, col in enumerate(columns):
-            val = row[i]
-            # Use format_utc_iso for datetime fields, regular isoformat for date fields
-            if hasattr(val, 'isoformat'):
-                if hasattr(val, 'hour'):  # It's a datetime, not a date
-                    val = format_utc_iso(val)
-                else:  # It's a date
-                    val = val.isoformat()
-            incident_dict[col] = val
-        
-        incident_id = incident_dict['id']
-        
-        # Get personnel
-        personnel_result = db.execute(text("""
-            SELECT ip.id, ip.incident_id, ip.incident_unit_id, ip.personnel_id,
-                   ip.personnel_first_name, ip.personnel_last_name, 
-                   ip.rank_name_snapshot, ip.role, ip.slot_index,
-                   COALESCE(a.unit_designator, iu.cad_unit_id) as unit_designator
-            FROM incident_personnel ip
-            LEFT JOIN incident_units iu ON ip.incident_unit_id = iu.id
-            LEFT JOIN apparatus a ON iu.apparatus_id = a.id
-            WHERE ip.incident_id = :incident_id
-        """), {"incident_id": incident_id})
-        
-        personnel = []
-        for prow in personnel_result:
-            personnel.append({
-                "personnel_id": prow[3],
-                "first_name": prow[4],
-                "last_name": prow[5],
-                "rank": prow[6],
-                "role": prow[7],
-                "slot_index": prow[8],
-                "unit_designator": prow[9]
-            })
-        incident_dict['personnel_assignments'] = personnel
-        
-        # Get units
-        units_result = db.execute(text("""
-            SELECT * FROM incident_units WHERE incident_id = :incident_id
-        """), {"incident_id": incident_id})
-        
-        units = []
-        unit_cols = units_result.keys()
-        for urow in units_result:
-            unit_dict = {}
-            for i, col in enumerate(unit_cols):
-                val = urow[i]
-                # Use format_utc_iso for datetime fields
-                if hasattr(val, 'isoformat'):
-                    if hasattr(val, 'hour'):  # It's a datetime
-                        val = format_utc_iso(val)
-                    else:  # It's a date
-                        val = val.isoformat()
-                unit_dict[col] = val
-            units.append(unit_dict)
-        incident_dict['units'] = units
-        
-        incidents.append(incident_dict)
-    
-    return {
-        "export_date": datetime.now().isoformat(),
-        "export_type": "full_incidents",
-        "year": year,
-        "incident_count": len(incidents),
-        "incidents": incidents
-    }
+    """Export complete incident data for a year (streamed)."""
+    return _full_export_response(db, year, format, compress, after, chunk_days, attachment=False)
 
 
 @router.get("/full-export/download")
-async def download_full_export(
+def download_full_export(
     year: int = Query(...),
+    format: str = _FORMAT_QUERY,
+    compress: str = _COMPRESS_QUERY,
+    after: Optional[str] = _AFTER_QUERY,
+    chunk_days: int = _CHUNK_DAYS_QUERY,
     db: Session = Depends(get_db)
 ):
-    """Download full incident export as JSON file."""
-    
-    data = await export_full_incidents(year, db)
-    
-    json_str = json.dumps(data, indent=2, default=str)
-    buffer = io.BytesIO(json_str.encode('utf-8'))
-    
-    return StreamingResponse(
-        buffer,
-        media_type="application/json",
-        headers={"Content-Disposition": f"attachment; filename=incidents_full_export_{year}.json"}
-    )
+    """Download full incident export as a JSON / NDJSON file (streamed)."""
+    return _full_export_response(db, year, format, compress, after, chunk_days, attachment=True)
@@ -13,6 +13,7 @@ from typing import Optional
 import base64
 
 from database import get_db
+from settings_cache import settings_changed
 from report_engine.branding_config import DEFAULT_BRANDING, get_branding
 
 router = APIRouter()
@@ -57,7 +58,7 @@ class BrandingUpdate(BaseModel):
 
 
 @router.get("")
-async def get_branding_config(db: Session = Depends(get_db)):
+def get_branding_config(db: Session = Depends(get_db)):
     branding = get_branding(db)
     result = dict(branding)
     result.pop('logo_data', None)
@@ -65,7 +66,7 @@ async def get_branding_config(db: Session = Depends(get_db)):
 
 
 @router.get("/theme")
-async def get_ui_theme(db: Session = Depends(get_db)):
+def get_ui_theme(db: Session = Depends(get_db)):
     """
     Get all UI theming data in a single call.
     Used by frontend BrandingContext to apply tenant colors app-wide.
@@ -137,7 +138,7 @@ def _lighten_color(hex_color: str, percent: int) -> str:
 
 
 @router.put("")
-async def update_branding_config(updates: BrandingUpdate, db: Session = Depends(get_db)):
+def update_branding_config(updates: BrandingUpdate, db: Session = Depends(get_db)):
     field_mappings = {
         'station_name': ('station', 'name'),
         'station_number': ('station', 'number'),
@@ -172,11 +173,12 @@ async def update_branding_config(updates: BrandingUpdate, db: Session = Depends(
             _upsert_setting(db, category, key, value)
     
     db.commit()
+    settings_changed(db)
     return {"status": "ok", "updated": list(updates_dict.keys())}
 
 
 @router.post("/reset")
-async def reset_branding(db: Session = Depends(get_db)):
+def reset_branding(db: Session = Depends(get_db)):
     db.execute(text("""
         DELETE FROM settings 
         WHERE category = 'branding' 
@@ -187,11 +189,12 @@ async def reset_branding(db: Session = Depends(get_db)):
         WHERE category = 'station' AND key IN ('tagline')
     """))
     db.commit()
+    settings_changed(db)
     return {"status": "ok", "message": "Branding reset to defaults"}
 
 
 @router.get("/logo")
-async def get_branding_logo(db: Session = Depends(get_db)):
+def get_branding_logo(db: Session = Depends(get_db)):
     result = db.execute(
         text("SELECT value FROM settings WHERE category = 'branding' AND key = 'logo'")
     ).fetchone()
@@ -211,7 +214,7 @@ async def get_branding_logo(db: Session = Depends(get_db)):
 
 
 @router.post("/logo")
-async def upload_branding_logo(logo: LogoUpload, db: Session = Depends(get_db)):
+def upload_branding_logo(logo: LogoUpload, db: Session = Depends(get_db)):
     if not logo.data:
         raise HTTPException(status_code=400, detail="No image data provided")
     
@@ -250,16 +253,18 @@ async def upload_branding_logo(logo: LogoUpload, db: Session = Depends(get_db)):
     _upsert_setting(db, 'branding', 'logo', data)
     _upsert_setting(db, 'branding', 'logo_mime_type', logo.mime_type)
     db.commit()
+    settings_changed(db)
     
     return {"status": "ok", "message": "Logo uploaded successfully", "mime_type": logo.mime_type}
 
 
 @router.delete("/logo")
-async def delete_branding_logo(db: Session = Depends(get_db)):
+def delete_branding_logo(db: Session = Depends(get_db)):
     db.execute(text(
         "DELETE FROM settings WHERE category = 'branding' AND key IN ('logo', 'logo_mime_type')"
     ))
     db.commit()
+    settings_changed(db)
     return {"status": "ok", "message": "Logo deleted"}
 
 
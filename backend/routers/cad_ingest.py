@@ -0,0 +1,571 @@
+"""
+CAD Ingest Router - single-round-trip dispatch ingest
+
+POST /api/cad/ingest takes one parsed CAD report (cad_parser.report_to_dict)
+and applies it in ONE transaction:
+
+    1. Lock the event (advisory lock + SELECT ... FOR UPDATE on the incident)
+    2. Auto-create the municipality if needed
+    3. Resolve every CAD unit against apparatus (one query, in memory)
+    4. Create the incident, or merge cad_units into the existing one
+    5. Commit, then emit WebSocket / AV alert / location / weather follow-ups
+
+This replaces the listener's old dispatch choreography (GET by-cad,
+POST municipality auto-create, GET apparatus/lookup per unit, POST incident,
+PUT incident) — 6-10 HTTP calls and as many DB sessions — with one call.
+
+Used by:
+- cad/cad_listener.py (DISPATCH reports)
+- cad/adi_log_import.py (historical DISPATCH reports, skip_existing=True)
+
+CLEAR reports still go through the regular incident endpoints.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from typing import Optional, List, Dict, Any
+from datetime import datetime, timezone, timedelta
+from zoneinfo import ZoneInfo
+import logging
+
+from schemas_incidents import CadIngest
+from incident_helpers import (
+    emit_incident_event,
+    incident_event_payload,
+    log_incident_audit,
+    format_audit_changes,
+    build_audit_summary,
+    maybe_generate_neris_id,
+    claim_incident_number,
+    is_out_of_sequence,
+)
+from database import get_db, get_db_for_tenant, _request_tenant_slug
+from models import Incident, Apparatus
+from settings_helper import format_utc_iso
+from routers.settings import get_setting_value
+
+logger = logging.getLogger(__name__)
+router = APIRouter()
+
+
+# Incident field -> report key, overwritten on a repeat DISPATCH
+# (cad_event_type/subtype are handled separately - they default to '')
+DISPATCH_UPDATE_FIELDS = {
+    'address': 'address',
+    'location_name': 'location_name',
+    'municipality_code': 'municipality',
+    'cross_streets': 'cross_streets',
+    'esz_box': 'esz',
+    'caller_name': 'caller_name',
+    'caller_phone': 'caller_phone',
+}
+
+# Changing any of these invalidates cached geocode/route/snapshot
+LOCATION_FIELDS = {'address', 'municipality_code', 'cross_streets', 'esz_box'}
+
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+def _to_utc_iso(local_dt: datetime, tz: ZoneInfo) -> str:
+    return local_dt.replace(tzinfo=tz).astimezone(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+def _parse_cad_time(time_str: Optional[str], incident_date: Optional[str],
+                    dispatch_time_str: Optional[str], tz: ZoneInfo) -> Optional[str]:
+    """CAD time (HH:MM:SS) → UTC ISO, rolling past midnight relative to dispatch time."""
+    if not time_str:
+        return None
+    try:
+        time_part = datetime.strptime(time_str, '%H:%M:%S').time()
+        if incident_date:
+            base_date = datetime.strptime(incident_date, '%Y-%m-%d').date()
+        else:
+            base_date = datetime.now(tz).date()
+
+        dt = datetime.combine(base_date, time_part)
+
+        # Midnight crossover detection
+        if dispatch_time_str and incident_date:
+            try:
+                dispatch_time = datetime.strptime(dispatch_time_str, '%H:%M:%S').time()
+                if time_part < dispatch_time:
+                    dt = dt + timedelta(days=1)
+            except ValueError:
+                pass
+
+        return _to_utc_iso(dt, tz)
+    except Exception as e:
+        logger.warning(f"Could not parse CAD time {time_str}: {e}")
+        return None
+
+
+def _resolve_dispatch_times(data: CadIngest, tz: ZoneInfo) -> tuple:
+    """
+    Returns (incident_date 'YYYY-MM-DD', dispatch_time 'HH:MM:SS', time_dispatched UTC ISO).
+
+    Explicit overrides win; otherwise report['dispatch_time'] is parsed as
+    MM-DD-YY HH:MM:SS local (FDCMS ADI format).
+    """
+    incident_date = data.incident_date
+    dispatch_time = data.dispatch_time
+
+    if not incident_date and data.report.get('dispatch_time'):
+        try:
+            dt = datetime.strptime(data.report['dispatch_time'], '%m-%d-%y %H:%M:%S')
+            incident_date = dt.strftime('%Y-%m-%d')
+            dispatch_time = dispatch_time or dt.strftime('%H:%M:%S')
+        except ValueError:
+            pass
+
+    time_dispatched = None
+    if incident_date and dispatch_time:
+        try:
+            local_dt = datetime.strptime(f"{incident_date} {dispatch_time}", '%Y-%m-%d %H:%M:%S')
+            time_dispatched = _to_utc_iso(local_dt, tz)
+        except ValueError:
+            pass
+
+    return incident_date, dispatch_time, time_dispatched
+
+
+def _determine_category(db: Session, event_type: str, override: Optional[str]) -> str:
+    """Same rules as the listener: explicit → cad.force_category → MEDICAL* = EMS, else FIRE."""
+    if override in ('FIRE', 'EMS'):
+        return override
+
+    force_category = get_setting_value(db, 'cad', 'force_category', None)
+    if force_category in ('FIRE', 'EMS'):
+        return force_category
+
+    if (event_type or '').upper().startswith('MEDICAL'):
+        return 'EMS'
+    return 'FIRE'
+
+
+def _ensure_municipality(db: Session, code: str) -> Optional[int]:
+    """Auto-create municipality from CAD code (same row shape as lookups auto-create)."""
+    code = (code or '').upper().strip()
+    if not code:
+        return None
+
+    row = db.execute(text("""
+        WITH ins AS (
+            INSERT INTO municipalities (code, name, display_name, subdivision_type, auto_created, active)
+            VALUES (:code, :code, :code, 'Township', true, true)
+            ON CONFLICT (code) DO NOTHING
+            RETURNING id
+        )
+        SELECT id FROM ins
+        UNION ALL
+        SELECT id FROM municipalities WHERE code = :code
+        LIMIT 1
+    """), {"code": code}).fetchone()
+    return row[0] if row else None
+
+
+def _build_unit_resolver(db: Session):
+    """
+    Load active apparatus once and return a unit_id → unit info function.
+
+    Matches apparatus/lookup: unit_designator, then cad_unit_id, then
+    cad_unit_aliases. Unknown units are treated as mutual aid.
+    """
+    by_designator = {}
+    by_cad_id = {}
+    by_alias = {}
+
+    for a in db.query(Apparatus).filter(Apparatus.active == True).all():
+        info = {
+            'unit_designator': a.unit_designator,
+            'apparatus_id': a.id,
+            'category': getattr(a, 'unit_category', 'APPARATUS'),
+            'is_ours': True,
+            'counts_for_response_times': getattr(a, 'counts_for_response_times', True),
+        }
+        if a.unit_designator:
+            by_designator.setdefault(a.unit_designator.upper(), info)
+        if a.cad_unit_id:
+            by_cad_id.setdefault(a.cad_unit_id.upper(), info)
+        for alias in (getattr(a, 'cad_unit_aliases', []) or []):
+            by_alias.setdefault(alias.upper(), info)
+
+    def resolve(unit_id: str) -> Dict[str, Any]:
+        key = unit_id.upper().strip()
+        info = by_designator.get(key) or by_cad_id.get(key) or by_alias.get(key)
+        if info:
+            return info
+        return {
+            'unit_designator': key,
+            'apparatus_id': None,
+            'category': None,
+            'is_ours': False,
+            'counts_for_response_times': False,
+        }
+
+    return resolve
+
+
+def _build_cad_units(report: dict, existing_units: list, resolve,
+                     incident_date: Optional[str], dispatch_time: Optional[str],
+                     tz: ZoneInfo) -> List[dict]:
+    """
+    cad_units for a DISPATCH report.
+
+    Units already on the incident keep their times and get refreshed
+    apparatus info; new units get their dispatch time from the report.
+    """
+    existing = {u['unit_id']: dict(u) for u in (existing_units or []) if u.get('unit_id')}
+    cad_units = []
+
+    for unit in report.get('responding_units', []):
+        unit_id = unit.get('unit_id')
+        if not unit_id:
+            continue
+
+        unit_info = resolve(unit_id)
+        canonical_unit_id = unit_info['unit_designator'] or unit_id
+
+        if canonical_unit_id in existing:
+            unit_data = existing[canonical_unit_id]
+            unit_data['is_mutual_aid'] = not unit_info['is_ours']
+            unit_data['apparatus_id'] = unit_info['apparatus_id']
+            unit_data['unit_category'] = unit_info['category']
+            unit_data['counts_for_response_times'] = unit_info['counts_for_response_times']
+        else:
+            unit_dispatch_time = None
+            if unit.get('time') and incident_date:
+                unit_dispatch_time = _parse_cad_time(unit.get('time'), incident_date, dispatch_time, tz)
+
+            unit_data = {
+                'unit_id': canonical_unit_id,
+                'station': unit.get('station'),
+                'agency': unit.get('agency'),
+                'is_mutual_aid': not unit_info['is_ours'],
+                'apparatus_id': unit_info['apparatus_id'],
+                'unit_category': unit_info['category'],
+                'counts_for_response_times': unit_info['counts_for_response_times'],
+                'time_dispatched': unit_dispatch_time,
+                'time_enroute': None,
+                'time_arrived': None,
+                'time_available': None,
+                'time_cleared': None,
+            }
+
+        cad_units.append(unit_data)
+
+    return cad_units
+
+
+def _incident_response(incident: Incident, action: str, out_of_sequence: bool = False) -> dict:
+    """Same shape as GET /api/incidents/by-cad/{n}, plus what the ingest did."""
+    return {
+        "action": action,
+        "id": incident.id,
+        "internal_incident_number": incident.internal_incident_number,
+        "call_category": incident.call_category,
+        "neris_id": incident.neris_id,
+        "cad_event_number": incident.cad_event_number,
+        "cad_event_type": incident.cad_event_type,
+        "status": incident.status,
+        "incident_date": incident.incident_date.isoformat() if incident.incident_date else None,
+        "address": incident.address,
+        "location_name": getattr(incident, 'location_name', None),
+        "municipality_code": incident.municipality_code,
+        "time_dispatched": format_utc_iso(incident.time_dispatched),
+        "cad_units": incident.cad_units or [],
+        "out_of_sequence": out_of_sequence,
+    }
+
+
+def _check_review_tasks(db: Session, incident: Incident):
+    try:
+        from routers.review_tasks import check_incident_review_tasks
+        check_incident_review_tasks(db, incident)
+    except Exception as e:
+        logger.error(f"Review task check failed for incident {incident.id}: {e}")
+
+
+def _queue_location(db: Session, background_tasks: BackgroundTasks, incident_id: int, tenant_slug: str):
+    try:
+        from services.location.background_task import process_incident_location
+        from routers.settings import is_location_enabled
+        if is_location_enabled(db):
+            background_tasks.add_task(process_incident_location, incident_id, tenant_slug)
+    except ImportError:
+        pass
+
+
+def fetch_dispatch_weather(incident_id: int, tenant_slug: str):
+    """
+    Background task: fill weather_conditions from the dispatch time.
+
+    PUT /api/incidents does this inline; ingest defers it so the weather
+    API never sits between a CAD dispatch and the incident existing.
+    """
+    try:
+        from weather_service import get_weather_for_incident
+        from routers.settings import get_station_coords
+    except ImportError:
+        return
+
+    db = next(get_db_for_tenant(tenant_slug))
+    try:
+        if not get_setting_value(db, 'weather', 'auto_fetch', True):
+            return
+
+        row = db.execute(text("""
+            SELECT time_dispatched, weather_conditions FROM incidents WHERE id = :id
+        """), {"id": incident_id}).fetchone()
+        if not row or not row[0] or row[1]:
+            return
+
+        lat, lon = get_station_coords(db)
+        weather = get_weather_for_incident(row[0], latitude=lat, longitude=lon)
+        if weather and weather.get('description'):
+            incident = db.query(Incident).filter(Incident.id == incident_id).first()
+            incident.weather_conditions = weather['description']
+            incident.weather_api_data = weather
+            incident.weather_fetched_at = datetime.now(timezone.utc)
+            db.commit()
+    except Exception as e:
+        logger.warning(f"Failed to auto-fetch weather for incident {incident_id}: {e}")
+    finally:
+        db.close()
+
+
+# =============================================================================
+# INGEST
+# =============================================================================
+
+@router.post("/ingest")
+def ingest_cad_report(
+    data: CadIngest,
+    request: Request,
+    background_tasks: BackgroundTasks,
+    db: Session = Depends(get_db)
+):
+    """
+    Create or update an incident from one parsed CAD DISPATCH report.
+
+    Returns the incident (by-cad shape) with action = created | updated | skipped.
+    """
+    report = data.report
+    event_number = report.get('event_number')
+    if not event_number:
+        raise HTTPException(status_code=400, detail="report.event_number is required")
+
+    report_type = report.get('report_type', 'DISPATCH')
+    if report_type != 'DISPATCH':
+        raise HTTPException(status_code=400, detail=f"Unsupported report_type for ingest: {report_type}")
+
+    tz_name = data.timezone or get_setting_value(db, 'station', 'timezone', 'America/New_York')
+    try:
+        tz = ZoneInfo(tz_name)
+    except Exception:
+        raise HTTPException(status_code=400, detail=f"Invalid timezone: {tz_name}")
+
+    # Serialize concurrent reports for this event (covers the no-row-yet case),
+    # then lock the incident row itself.
+    db.execute(text("SELECT pg_advisory_xact_lock(hashtext(:evt))"), {"evt": event_number})
+    incident = db.query(Incident).filter(
+        Incident.cad_event_number == event_number,
+        Incident.deleted_at.is_(None)
+    ).with_for_update().first()
+
+    if incident and data.skip_existing:
+        db.rollback()
+        return _incident_response(incident, "skipped")
+
+    municipality_code = report.get('municipality')
+    municipality_id = _ensure_municipality(db, municipality_code) if municipality_code else None
+
+    incident_date, dispatch_time, time_dispatched = _resolve_dispatch_times(data, tz)
+    resolve = _build_unit_resolver(db)
+    cad_units = _build_cad_units(
+        report, incident.cad_units if incident else None, resolve,
+        incident_date, dispatch_time, tz,
+    )
+    tenant_slug = _request_tenant_slug(request)
+
+    if incident:
+        return _update_from_dispatch(db, request, background_tasks, incident, data, cad_units, tenant_slug)
+    return _create_from_dispatch(
+        db, request, background_tasks, data, cad_units, municipality_id,
+        incident_date, time_dispatched, tenant_slug,
+    )
+
+
+def _create_from_dispatch(db: Session, request: Request, background_tasks: BackgroundTasks,
+                          data: CadIngest, cad_units: list, municipality_id: Optional[int],
+                          incident_date_str: Optional[str], time_dispatched: Optional[str],
+                          tenant_slug: str) -> dict:
+    """New incident with every dispatch field set up front (no follow-up PUT)."""
+    report = data.report
+    event_type = report.get('event_type', '')
+    event_subtype = report.get('event_subtype', '')
+    call_category = _determine_category(db, event_type, data.call_category)
+
+    incident_date = None
+    if incident_date_str:
+        try:
+            incident_date = datetime.strptime(incident_date_str, "%Y-%m-%d").date()
+        except ValueError:
+            pass
+    if not incident_date:
+        incident_date = datetime.now(timezone.utc).date()
+
+    year_prefix = incident_date.year
+    incident_number = claim_incident_number(db, year_prefix, call_category)
+    out_of_sequence = is_out_of_sequence(db, incident_number, year_prefix, call_category, incident_date)
+
+    incident = Incident(
+        internal_incident_number=incident_number,
+        year_prefix=year_prefix,
+        call_category=call_category,
+        status='OPEN',
+        cad_event_number=report['event_number'],
+        cad_event_type=event_type,
+        cad_event_subtype=event_subtype,
+        cad_raw_dispatch=data.raw_html,
+        address=report.get('address'),
+        location_name=report.get('location_name'),
+        municipality_id=municipality_id,
+        municipality_code=report.get('municipality'),
+        cross_streets=report.get('cross_streets'),
+        esz_box=report.get('esz'),
+        caller_name=report.get('caller_name'),
+        caller_phone=report.get('caller_phone'),
+        incident_date=incident_date,
+        time_dispatched=time_dispatched,
+        cad_units=cad_units,
+        dispatched_units=cad_units,  # Write-once snapshot of original dispatch units
+        out_of_sequence=out_of_sequence,
+        created_at=datetime.now(timezone.utc),
+    )
+    db.add(incident)
+    db.flush()
+
+    neris_id = maybe_generate_neris_id(db, incident)
+    if neris_id:
+        incident.neris_id = neris_id
+
+    log_incident_audit(
+        db=db,
+        action="CREATE",
+        incident=incident,
+        completed_by_id=None,
+        summary=f"Incident created: {event_type or 'Manual'} ({call_category})"
+    )
+    _check_review_tasks(db, incident)
+    db.commit()
+    db.refresh(incident)
+
+    logger.info(f"CAD ingest: created {incident.cad_event_number} as {incident_number} - {len(cad_units)} units")
+
+    background_tasks.add_task(
+        emit_incident_event,
+        request,
+        "incident_created",
+        incident_event_payload(incident),
+    )
+
+    # Units are known now, so the dispatch alert can announce them
+    from routers.av_alerts import emit_av_alert
+    background_tasks.add_task(
+        emit_av_alert,
+        request,
+        "dispatch",
+        incident.id,
+        call_category,
+        event_type,
+        event_subtype,
+        incident.address,
+        [u['unit_id'] for u in cad_units],
+        incident.cross_streets,
+        incident.esz_box,
+        incident.municipality_code,
+        getattr(incident, 'development', None),
+    )
+
+    _queue_location(db, background_tasks, incident.id, tenant_slug)
+    if incident.time_dispatched:
+        background_tasks.add_task(fetch_dispatch_weather, incident.id, tenant_slug)
+
+    return _incident_response(incident, "created", out_of_sequence)
+
+
+def _update_from_dispatch(db: Session, request: Request, background_tasks: BackgroundTasks,
+                          incident: Incident, data: CadIngest, cad_units: list,
+                          tenant_slug: str) -> dict:
+    """Repeat DISPATCH for a known event: refresh CAD fields, merge units, keep raw history."""
+    report = data.report
+
+    update_data = {field: report.get(key) for field, key in DISPATCH_UPDATE_FIELDS.items()}
+    update_data['cad_event_type'] = report.get('event_type', '')
+    update_data['cad_event_subtype'] = report.get('event_subtype', '')
+    update_data['cad_units'] = cad_units
+    if data.raw_html:
+        update_data['cad_raw_updates'] = list(incident.cad_raw_updates or []) + [data.raw_html]
+
+    # Track changes for audit (same normalization as PUT /api/incidents)
+    changes = {}
+    for field, new_value in update_data.items():
+        old_value = getattr(incident, field)
+        old_str = str(old_value) if old_value is not None else None
+        new_str = str(new_value) if new_value is not None else None
+        if old_str != new_str:
+            changes[field] = {"old": old_str, "new": new_str}
+
+    for field, value in update_data.items():
+        setattr(incident, field, value)
+    incident.updated_at = datetime.now(timezone.utc)
+
+    if not incident.neris_id and incident.time_dispatched:
+        neris_id = maybe_generate_neris_id(db, incident)
+        if neris_id:
+            incident.neris_id = neris_id
+
+    if changes:
+        log_incident_audit(
+            db=db,
+            action="UPDATE",
+            incident=incident,
+            completed_by_id=None,
+            summary=build_audit_summary(db, changes),
+            fields_changed=format_audit_changes(db, changes),
+        )
+
+    location_changed = bool(LOCATION_FIELDS & set(changes.keys()))
+    if location_changed:
+        db.flush()
+        db.execute(text("""
+            UPDATE incidents SET
+                latitude = NULL, longitude = NULL,
+                route_polyline = NULL, route_geometry = NULL,
+                map_snapshot = NULL, geocode_data = NULL,
+                geocode_needs_review = false
+            WHERE id = :id
+        """), {"id": incident.id})
+
+    _check_review_tasks(db, incident)
+    db.commit()
+    db.refresh(incident)
+
+    logger.info(f"CAD ingest: updated {incident.cad_event_number} - {len(cad_units)} units")
+
+    background_tasks.add_task(
+        emit_incident_event,
+        request,
+        "incident_updated",
+        incident_event_payload(incident),
+    )
+
+    if location_changed:
+        _queue_location(db, background_tasks, incident.id, tenant_slug)
+    if incident.time_dispatched and not incident.weather_conditions:
+        background_tasks.add_task(fetch_dispatch_weather, incident.id, tenant_slug)
+
+    return _incident_response(incident, "updated")
@@ -9,10 +9,15 @@ Provides API endpoints for:
 - Training statistics
 
 All officer corrections are stored in the cad_event_comments JSONB field
-with category_source="OFFICER", which then feeds into ML retraining.
+with category_source="OFFICER" (what the UI shows) and appended to
+comcat_training_examples, which is all retraining reads.
+
+Retraining runs as a background job (one per tenant per worker at a time);
+GET /retrain/status reports progress. The new model is hot-swapped by
+comcat_model.get_model() in every worker without a restart.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks, Request
 from sqlalchemy.orm import Session
 from sqlalchemy.orm.attributes import flag_modified
 from sqlalchemy import text
@@ -21,9 +26,10 @@ from datetime import datetime, timezone
 from pydantic import BaseModel, Field
 import logging
 import json
+import threading
 
-from database import get_db
-from models import Incident, Personnel, AuditLog
+from database import get_db, get_db_for_tenant, _request_tenant_slug
+from models import Incident, Personnel, AuditLog, ComCatTrainingExample
 
 # Import ComCat components
 import sys
@@ -86,14 +92,17 @@ class RetrainRequest(BaseModel):
 
 
 class RetrainResponse(BaseModel):
-    """Response from model retraining"""
-    success: bool
-    total_examples: int
-    seed_examples: int
-    officer_examples: int
-    cv_accuracy: Optional[float]
-    trained_at: str
-    message: str
+    """Retrain job status (POST /retrain and GET /retrain/status)"""
+    status: str = Field(..., description="idle, queued, running, completed, failed")
+    success: bool = False
+    total_examples: int = 0
+    seed_examples: int = 0
+    officer_examples: int = 0
+    cv_accuracy: Optional[float] = None
+    trained_at: Optional[str] = None
+    started_at: Optional[str] = None
+    finished_at: Optional[str] = None
+    message: str = ""
 
 
 class CommentResponse(BaseModel):
@@ -353,6 +362,19 @@ def update_comment_categories(
                     "new": update.category
                 })
                 updated_count += 1
+                
+                # Ground truth for the next retrain (append-only)
+                comment_text = comments[update.index].get("text", "")
+                if comment_text:
+                    db.add(ComCatTrainingExample(
+                        incident_id=incident.id,
+                        comment_index=update.index,
+                        text=comment_text,
+                        operator_type=comments[update.index].get("operator_type") or "UNKNOWN",
+                        category=update.category,
+                        previous_category=old_category,
+                        corrected_by=request.edited_by,
+                    ))
     
     if updated_count > 0:
         # Update the JSONB field - must use flag_modified for SQLAlchemy to detect change
@@ -447,17 +469,85 @@ def get_comments_for_review(
     }
 
 
+# =============================================================================
+# RETRAINING (background job)
+# =============================================================================
+
+# tenant_slug -> status dict of the latest retrain job in this worker
+_retrain_jobs: Dict[str, Dict[str, Any]] = {}
+_retrain_jobs_lock = threading.Lock()
+
+
+def _load_training_examples(db: Session) -> List[tuple]:
+    """
+    Officer corrections as (text, operator_type, category) tuples.
+    
+    Latest correction per comment only - re-correcting a comment appends a
+    row rather than updating the old one.
+    """
+    rows = db.execute(text("""
+        SELECT text, operator_type, category FROM (
+            SELECT DISTINCT ON (incident_id, comment_index)
+                   text, operator_type, category
+            FROM comcat_training_examples
+            ORDER BY incident_id, comment_index, id DESC
+        ) latest
+        WHERE category = ANY(:categories)
+    """), {"categories": list(VALID_CATEGORIES)}).fetchall()
+    return [(r[0], r[1] or "UNKNOWN", r[2]) for r in rows]
+
+
+def _run_retrain_job(tenant_slug: str):
+    """Background task: retrain from comcat_training_examples and hot-swap the model."""
+    job = _retrain_jobs[tenant_slug]
+    job.update(status="running", started_at=datetime.now(timezone.utc).isoformat())
+    
+    db = next(get_db_for_tenant(tenant_slug))
+    try:
+        officer_examples = _load_training_examples(db)
+    except Exception as e:
+        logger.error(f"ComCat retrain [{tenant_slug}]: could not read training examples: {e}")
+        job.update(status="failed", message=f"Retraining failed: {e}",
+                   finished_at=datetime.now(timezone.utc).isoformat())
+        return
+    finally:
+        db.close()
+    
+    try:
+        stats = retrain_model(officer_examples)
+    except Exception as e:
+        logger.error(f"Model retraining failed: {e}")
+        job.update(status="failed", message=f"Retraining failed: {e}",
+                   finished_at=datetime.now(timezone.utc).isoformat())
+        return
+    
+    job.update(
+        status="completed",
+        success=True,
+        total_examples=stats.get("total_examples", 0),
+        seed_examples=stats.get("seed_examples", 0),
+        officer_examples=len(officer_examples),
+        cv_accuracy=stats.get("cv_accuracy"),
+        trained_at=stats.get("trained_at"),
+        finished_at=datetime.now(timezone.utc).isoformat(),
+        message=f"Model retrained with {stats.get('total_examples', 0)} examples",
+    )
+    logger.info(f"ComCat retrain [{tenant_slug}]: {job['message']} (CV: {job['cv_accuracy']})")
+
+
 @router.post("/retrain", response_model=RetrainResponse)
 def retrain_ml_model(
     request: RetrainRequest,
     background_tasks: BackgroundTasks,
-    db: Session = Depends(get_db)
+    http_request: Request,
 ):
     """
-    Trigger ML model retraining with officer corrections.
+    Queue ML model retraining with officer corrections.
     
-    v2.0: Now includes operator_type in training data for context-aware learning.
-    Gathers training data from all incidents and retrains the Random Forest model.
+    v2.0: Training data includes operator_type for context-aware learning.
+    Reads only comcat_training_examples (no incident scan) and trains in a
+    background task; poll GET /retrain/status for the result. A retrain that
+    is already queued or running for this tenant is returned as-is.
     """
     if not COMCAT_AVAILABLE:
         raise HTTPException(
@@ -471,42 +561,28 @@ def retrain_ml_model(
             detail="scikit-learn not installed on server"
         )
     
-    # Gather training data from all incidents
-    # v2.0: (text, operator_type, category) tuples
-    officer_examples = []
+    tenant_slug = _request_tenant_slug(http_request)
     
-    incidents = db.query(Incident).filter(
-        Incident.cad_event_comments.isnot(None)
-    ).all()
-    
-    for incident in incidents:
-        cad_event_comments = incident.cad_event_comments or {}
+    with _retrain_jobs_lock:
+        job = _retrain_jobs.get(tenant_slug)
+        if job and job["status"] in ("queued", "running"):
+            return RetrainResponse(**job)
         
-        # Directly gather OFFICER corrections with operator_type
-        for comment in cad_event_comments.get("comments", []):
-            if comment.get("category_source") == "OFFICER":
-                text = comment.get("text", "")
-                operator_type = comment.get("operator_type", "UNKNOWN")
-                category = comment.get("category", "OTHER")
-                if text and category:
-                    officer_examples.append((text, operator_type, category))
-    
-    # Retrain the model
-    try:
-        stats = retrain_model(officer_examples)
-    except Exception as e:
-        logger.error(f"Model retraining failed: {e}")
-        raise HTTPException(status_code=500, detail=f"Retraining failed: {str(e)}")
+        job = {"status": "queued", "message": "Retraining queued"}
+        _retrain_jobs[tenant_slug] = job
     
-    return RetrainResponse(
-        success=True,
-        total_examples=stats.get("total_examples", 0),
-        seed_examples=stats.get("seed_examples", 0),
-        officer_examples=len(officer_examples),
-        cv_accuracy=stats.get("cv_accuracy"),
-        trained_at=stats.get("trained_at", datetime.now(timezone.utc).isoformat()),
-        message=f"Model retrained with {stats.get('total_examples', 0)} examples"
-    )
+    background_tasks.add_task(_run_retrain_job, tenant_slug)
+    return RetrainResponse(**job)
+
+
+@router.get("/retrain/status", response_model=RetrainResponse)
+def get_retrain_status(http_request: Request):
+    """Status of the latest retrain job for this tenant (this worker)."""
+    tenant_slug = _request_tenant_slug(http_request)
+    job = _retrain_jobs.get(tenant_slug)
+    if not job:
+        return RetrainResponse(status="idle")
+    return RetrainResponse(**job)
 
 
 @router.get("/stats", response_model=TrainingStatsResponse)
@@ -520,22 +596,23 @@ def get_training_stats(db: Session = Depends(get_db)):
     - Cross-validation accuracy
     - Category distribution
     """
-    # Count officer corrections across all incidents
-    officer_count = 0
+    # Count officer corrections (latest per comment, same set retraining uses)
     category_counts = {cat: 0 for cat in VALID_CATEGORIES}
     
-    incidents = db.query(Incident).filter(
-        Incident.cad_event_comments.isnot(None)
-    ).all()
+    rows = db.execute(text("""
+        SELECT category, COUNT(*) FROM (
+            SELECT DISTINCT ON (incident_id, comment_index) category
+            FROM comcat_training_examples
+            ORDER BY incident_id, comment_index, id DESC
+        ) latest
+        GROUP BY category
+    """)).fetchall()
     
-    for incident in incidents:
-        cad_event_comments = incident.cad_event_comments or {}
-        for comment in cad_event_comments.get("comments", []):
-            if comment.get("category_source") == "OFFICER":
-                officer_count += 1
-                cat = comment.get("category", "OTHER")
-                if cat in category_counts:
-                    category_counts[cat] += 1
+    officer_count = 0
+    for category, count in rows:
+        officer_count += count
+        if category in category_counts:
+            category_counts[category] += count
     
     # Get model stats
     model_trained = False
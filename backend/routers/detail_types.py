@@ -44,7 +44,7 @@ class DetailTypeResponse(BaseModel):
 # =============================================================================
 
 @router.get("", response_model=List[DetailTypeResponse])
-async def get_detail_types(
+def get_detail_types(
     active_only: bool = True,
     db: Session = Depends(get_db)
 ):
@@ -77,7 +77,7 @@ async def get_detail_types(
 
 
 @router.get("/{detail_type_id}", response_model=DetailTypeResponse)
-async def get_detail_type(
+def get_detail_type(
     detail_type_id: int,
     db: Session = Depends(get_db)
 ):
@@ -104,7 +104,7 @@ async def get_detail_type(
 
 
 @router.post("", response_model=DetailTypeResponse)
-async def create_detail_type(
+def create_detail_type(
     data: DetailTypeCreate,
     db: Session = Depends(get_db)
 ):
@@ -146,7 +146,7 @@ async def create_detail_type(
 
 
 @router.put("/{detail_type_id}", response_model=DetailTypeResponse)
-async def update_detail_type(
+def update_detail_type(
     detail_type_id: int,
     data: DetailTypeUpdate,
     db: Session = Depends(get_db)
@@ -201,7 +201,7 @@ async def update_detail_type(
 
 
 @router.delete("/{detail_type_id}")
-async def delete_detail_type(
+def delete_detail_type(
     detail_type_id: int,
     db: Session = Depends(get_db)
 ):
@@ -42,7 +42,7 @@ async def list_connected_devices(request: Request):
     
     from routers.websocket import get_connected_av_devices
     
-    devices = get_connected_av_devices(tenant_slug)
+    devices = await get_connected_av_devices(tenant_slug)
     
     return {
         "tenant": tenant_slug,
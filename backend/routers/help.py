@@ -42,7 +42,7 @@ class HelpTextUpdate(BaseModel):
 # =============================================================================
 
 @router.get("/pages")
-async def get_help_pages(db: Session = Depends(get_db)):
+def get_help_pages(db: Session = Depends(get_db)):
     """Get list of all page_keys that have help entries"""
     result = db.execute(text(
         "SELECT DISTINCT page_key, COUNT(*) as entry_count FROM help_texts GROUP BY page_key ORDER BY page_key"
@@ -51,7 +51,7 @@ async def get_help_pages(db: Session = Depends(get_db)):
 
 
 @router.get("/page/{page_key:path}")
-async def get_help_for_page(
+def get_help_for_page(
     page_key: str,
     role: Optional[str] = None,
     db: Session = Depends(get_db)
@@ -85,7 +85,7 @@ async def get_help_for_page(
 
 
 @router.get("")
-async def get_all_help(db: Session = Depends(get_db)):
+def get_all_help(db: Session = Depends(get_db)):
     """Get all help entries (for admin management)"""
     result = db.execute(text("""
         SELECT id, page_key, element_key, title, body, sort_order,
@@ -97,7 +97,7 @@ async def get_all_help(db: Session = Depends(get_db)):
 
 
 @router.post("")
-async def create_help_text(
+def create_help_text(
     data: HelpTextCreate,
     created_by: Optional[int] = None,
     db: Session = Depends(get_db)
@@ -131,7 +131,7 @@ async def create_help_text(
 
 
 @router.put("/{help_id}")
-async def update_help_text(help_id: int, data: HelpTextUpdate, db: Session = Depends(get_db)):
+def update_help_text(help_id: int, data: HelpTextUpdate, db: Session = Depends(get_db)):
     """Update an existing help entry"""
     updates = []
     params = {"id": help_id}
@@ -159,7 +159,7 @@ async def update_help_text(help_id: int, data: HelpTextUpdate, db: Session = Dep
 
 
 @router.delete("/{help_id}")
-async def delete_help_text(help_id: int, db: Session = Depends(get_db)):
+def delete_help_text(help_id: int, db: Session = Depends(get_db)):
     """Delete a help entry"""
     result = db.execute(text("DELETE FROM help_texts WHERE id = :id RETURNING id"), {"id": help_id})
     db.commit()
@@ -169,7 +169,7 @@ async def delete_help_text(help_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/element-keys/{page_key:path}")
-async def get_available_element_keys(page_key: str, db: Session = Depends(get_db)):
+def get_available_element_keys(page_key: str, db: Session = Depends(get_db)):
     """Get element_keys that already have help entries for a page."""
     result = db.execute(
         text("SELECT element_key FROM help_texts WHERE page_key = :pk ORDER BY element_key"),
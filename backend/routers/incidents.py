@@ -23,6 +23,7 @@ from schemas_incidents import (
 # Helper functions (extracted for maintainability)
 from incident_helpers import (
     emit_incident_event,
+    incident_event_payload,
     get_comments_validation_status,
     log_incident_audit,
     format_audit_changes,
@@ -32,11 +33,11 @@ from incident_helpers import (
     maybe_generate_neris_id,
     CATEGORY_PREFIXES,
     PREFIX_CATEGORIES,
-    get_category_prefix,
     get_prefix_category,
     get_next_incident_number,
     claim_incident_number,
     parse_incident_number,
+    is_out_of_sequence,
 )
 
 from database import get_db, _extract_slug, _is_internal_ip
@@ -65,7 +66,7 @@ router = APIRouter()
 
 
 @router.get("/years")
-async def get_incident_years(db: Session = Depends(get_db)):
+def get_incident_years(db: Session = Depends(get_db)):
     """Get list of years that have incident data, plus current year"""
     result = db.execute(text("""
         SELECT DISTINCT year_prefix 
@@ -85,7 +86,7 @@ async def get_incident_years(db: Session = Depends(get_db)):
 
 
 @router.get("/suggest-number")
-async def suggest_incident_number(
+def suggest_incident_number(
     year: Optional[int] = None,
     category: str = 'FIRE',
     db: Session = Depends(get_db)
@@ -107,7 +108,7 @@ async def suggest_incident_number(
 # =============================================================================
 
 @router.get("")
-async def list_incidents(
+def list_incidents(
     year: Optional[int] = None,
     status: Optional[str] = None,
     category: Optional[str] = None,  # FIRE, EMS, DETAIL, or None for all
@@ -202,7 +203,7 @@ async def list_incidents(
 
 
 @router.get("/by-cad/{cad_event_number}")
-async def get_incident_by_cad(
+def get_incident_by_cad(
     cad_event_number: str,
     db: Session = Depends(get_db)
 ):
@@ -237,7 +238,7 @@ async def get_incident_by_cad(
 # =============================================================================
 
 @router.get("/{incident_id}")
-async def get_incident(
+def get_incident(
     incident_id: int,
     db: Session = Depends(get_db)
 ):
@@ -382,7 +383,7 @@ async def get_incident(
 # =============================================================================
 
 @router.post("")
-async def create_incident(
+def create_incident(
     data: IncidentCreate,
     request: Request,
     background_tasks: BackgroundTasks,
@@ -445,24 +446,7 @@ async def create_incident(
         municipality_id = muni.id
     
     # Check sequence (compare within same category)
-    out_of_sequence = False
-    prefix = get_category_prefix(call_category)
-    year_short = year_prefix % 100
-    
-    # Get sequence number from incident_number string
-    _, _, seq_num = parse_incident_number(incident_number)
-    if seq_num:
-        check_result = db.execute(text("""
-            SELECT COUNT(*) FROM incidents 
-            WHERE year_prefix = :year 
-              AND call_category = :cat
-              AND CAST(SUBSTRING(internal_incident_number FROM 4) AS INTEGER) < :seq
-              AND incident_date > :date
-              AND deleted_at IS NULL
-        """), {"year": year_prefix, "cat": call_category, "seq": seq_num, "date": incident_date}).scalar()
-        
-        if check_result and check_result > 0:
-            out_of_sequence = True
+    out_of_sequence = is_out_of_sequence(db, incident_number, year_prefix, call_category, incident_date)
     
     incident = Incident(
         internal_incident_number=incident_number,
@@ -507,21 +491,7 @@ async def create_incident(
         emit_incident_event,
         request,
         "incident_created",
-        {
-            "id": incident.id,
-            "internal_incident_number": incident_number,
-            "call_category": call_category,
-            "cad_event_number": data.cad_event_number,
-            "cad_event_type": data.cad_event_type,
-            "cad_event_subtype": data.cad_event_subtype,
-            "status": "OPEN",
-            "incident_date": incident_date.isoformat() if incident_date else None,
-            "address": data.address,
-            "location_name": data.location_name,
-            "municipality_code": data.municipality_code,
-            "created_at": format_utc_iso(incident.created_at),
-            "updated_at": format_utc_iso(incident.updated_at),
-        }
+        incident_event_payload(incident),
     )
     
     # Emit AV alert for browser sound/TTS notifications
@@ -567,7 +537,7 @@ async def create_incident(
 # =============================================================================
 
 @router.put("/{incident_id}")
-async def update_incident(
+def update_incident(
     incident_id: int,
     data: IncidentUpdate,
     request: Request,
@@ -792,22 +762,7 @@ async def update_incident(
         emit_incident_event,
         request,
         "incident_updated",
-        {
-            "id": incident.id,
-            "internal_incident_number": incident.internal_incident_number,
-            "call_category": incident.call_category,
-            "cad_event_number": incident.cad_event_number,
-            "cad_event_type": incident.cad_event_type,
-            "cad_event_subtype": incident.cad_event_subtype,
-            "status": incident.status,
-            "incident_date": incident.incident_date.isoformat() if incident.incident_date else None,
-            "address": incident.address,
-            "location_name": getattr(incident, 'location_name', None),
-            "municipality_code": incident.municipality_code,
-            "time_dispatched": format_utc_iso(incident.time_dispatched),
-            "updated_at": format_utc_iso(incident.updated_at),
-            "cad_clear_received_at": format_utc_iso(incident.cad_clear_received_at),
-        }
+        incident_event_payload(incident),
     )
     
     # ==========================================================================
@@ -860,7 +815,7 @@ async def update_incident(
 # =============================================================================
 
 @router.post("/{incident_id}/close")
-async def close_incident(
+def close_incident(
     incident_id: int,
     request: Request,
     background_tasks: BackgroundTasks,
@@ -943,18 +898,7 @@ async def close_incident(
         emit_incident_event,
         request,
         "incident_closed",
-        {
-            "id": incident.id,
-            "internal_incident_number": incident.internal_incident_number,
-            "call_category": incident.call_category,
-            "cad_event_number": incident.cad_event_number,
-            "status": "CLOSED",
-            "incident_date": incident.incident_date.isoformat() if incident.incident_date else None,
-            "address": incident.address,
-            "location_name": getattr(incident, 'location_name', None),
-            "updated_at": format_utc_iso(incident.updated_at),
-            "cad_clear_received_at": format_utc_iso(incident.cad_clear_received_at),
-        }
+        incident_event_payload(incident),
     )
     
     # Emit AV alert for browser sound notifications (close sound)
@@ -994,7 +938,7 @@ async def close_incident(
 # =============================================================================
 
 @router.delete("/{incident_id}")
-async def delete_incident(
+def delete_incident(
     incident_id: int,
     edited_by: Optional[int] = Query(None, description="Personnel ID of admin deleting"),
     db: Session = Depends(get_db)
@@ -1065,7 +1009,7 @@ async def delete_incident(
 # =============================================================================
 
 @router.put("/{incident_id}/assignments")
-async def save_assignments(
+def save_assignments(
     incident_id: int,
     data: AssignmentsUpdate,
     edited_by: Optional[int] = Query(None, description="Personnel ID of logged-in user making the edit"),
@@ -1253,7 +1197,7 @@ async def save_assignments(
 # =============================================================================
 
 @router.get("/{incident_id}/validate-neris")
-async def validate_neris(
+def validate_neris(
     incident_id: int,
     db: Session = Depends(get_db)
 ):
@@ -1305,7 +1249,7 @@ async def validate_neris(
 # =============================================================================
 
 @router.get("/{incident_id}/audit-log")
-async def get_incident_audit_log(
+def get_incident_audit_log(
     incident_id: int,
     limit: int = Query(50, ge=1, le=200),
     db: Session = Depends(get_db)
@@ -1346,7 +1290,7 @@ async def get_incident_audit_log(
 # =============================================================================
 
 @router.get("/{incident_id}/adjacent")
-async def get_adjacent_incidents(
+def get_adjacent_incidents(
     incident_id: int,
     db: Session = Depends(get_db)
 ):
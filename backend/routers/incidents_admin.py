@@ -26,7 +26,7 @@ router = APIRouter()
 
 
 @router.get("/admin/sequence-status")
-async def get_sequence_status(
+def get_sequence_status(
     year: Optional[int] = None,
     db: Session = Depends(get_db)
 ):
@@ -92,7 +92,7 @@ async def get_sequence_status(
 
 
 @router.get("/admin/sequence")
-async def get_incident_sequence(
+def get_incident_sequence(
     year: Optional[int] = None,
     category: str = Query('FIRE', description="Category: FIRE, EMS, or DETAIL"),
     db: Session = Depends(get_db)
@@ -173,7 +173,7 @@ async def get_incident_sequence(
 
 
 @router.post("/admin/fix-sequence")
-async def fix_incident_sequence(
+def fix_incident_sequence(
     year: int = Query(..., description="Year to fix"),
     category: str = Query(..., description="Category to fix: FIRE, EMS, or DETAIL"),
     db: Session = Depends(get_db)
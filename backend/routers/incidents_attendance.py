@@ -23,7 +23,7 @@ router = APIRouter()
 
 
 @router.post("/attendance")
-async def create_attendance_record(
+def create_attendance_record(
     data: AttendanceRecordCreate,
     db: Session = Depends(get_db)
 ):
@@ -94,7 +94,7 @@ async def create_attendance_record(
 
 
 @router.put("/{incident_id}/attendance")
-async def save_attendance(
+def save_attendance(
     incident_id: int,
     data: AttendanceSave,
     edited_by: int = Query(None, description="Personnel ID of logged-in user"),
@@ -170,7 +170,7 @@ async def save_attendance(
 
 
 @router.get("/{incident_id}/attendance")
-async def get_attendance(
+def get_attendance(
     incident_id: int,
     db: Session = Depends(get_db)
 ):
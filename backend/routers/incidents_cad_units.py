@@ -157,7 +157,7 @@ def has_admin_overrides(cad_units: list) -> List[Dict[str, str]]:
 
 
 @router.put("/{incident_id}/cad-units")
-async def update_cad_units(
+def update_cad_units(
     incident_id: int,
     cad_units: List[Dict[str, Any]],
     edited_by: int = Query(..., description="Personnel ID of admin making the edit"),
@@ -280,7 +280,7 @@ async def update_cad_units(
 
 
 @router.get("/{incident_id}/cad-units/overrides")
-async def check_cad_unit_overrides(
+def check_cad_unit_overrides(
     incident_id: int,
     db: Session = Depends(get_db)
 ):
@@ -35,7 +35,7 @@ router = APIRouter()
 
 
 @router.get("/{incident_id}/duplicate-check")
-async def check_duplicate_status(
+def check_duplicate_status(
     incident_id: int,
     db: Session = Depends(get_db)
 ):
@@ -103,7 +103,7 @@ async def check_duplicate_status(
 
 
 @router.post("/{incident_id}/duplicate")
-async def duplicate_incident(
+def duplicate_incident(
     incident_id: int,
     data: IncidentDuplicate,
     edited_by: int = Query(None, description="Personnel ID of admin duplicating"),
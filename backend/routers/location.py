@@ -8,6 +8,8 @@ Endpoints:
     POST /api/location/geocode          - Geocode a raw address string
     POST /api/location/geocode/{id}     - Geocode an incident by ID (updates DB)
     GET  /api/location/config           - Get location service config (for frontend)
+    GET  /api/location/geocode-cache/stats      - Geocode cache hit rate + provider latency
+    DELETE /api/location/geocode-cache/{id}     - Drop the cached geocode for an incident's address
 """
 
 import json
@@ -36,6 +38,7 @@ router = APIRouter()
 class GeocodeRequest(BaseModel):
     address: str
     state: Optional[str] = None
+    municipality: Optional[str] = None
 
 
 class GeocodeResponse(BaseModel):
@@ -55,7 +58,7 @@ class GeocodeResponse(BaseModel):
 # =============================================================================
 
 @router.post("/geocode", response_model=GeocodeResponse)
-async def geocode_address_endpoint(
+def geocode_address_endpoint(
     request: GeocodeRequest,
     db: Session = Depends(get_db),
 ):
@@ -82,6 +85,7 @@ async def geocode_address_endpoint(
         state=state,
         google_api_key=google_key,
         geocodio_api_key=geocodio_key,
+        municipality=request.municipality,
     )
     
     if result:
@@ -101,7 +105,7 @@ async def geocode_address_endpoint(
 
 
 @router.post("/geocode/{incident_id}", response_model=GeocodeResponse)
-async def geocode_incident_endpoint(
+def geocode_incident_endpoint(
     incident_id: int,
     db: Session = Depends(get_db),
 ):
@@ -109,7 +113,8 @@ async def geocode_incident_endpoint(
     Geocode an incident by ID. Reads the address from the incident,
     geocodes it, and updates the incident with lat/lng + geocode data.
     
-    This ALWAYS clears existing location data first and re-geocodes fresh.
+    This ALWAYS clears existing location data first and re-geocodes fresh
+    (the address's geocode cache entry is dropped too).
     Used for manual re-geocode button and ensures clean state.
     """
     if not is_location_enabled(db):
@@ -117,7 +122,7 @@ async def geocode_incident_endpoint(
     
     # Get the incident
     incident = db.execute(
-        text("SELECT id, address FROM incidents WHERE id = :id AND deleted_at IS NULL"),
+        text("SELECT id, address, municipality_code FROM incidents WHERE id = :id AND deleted_at IS NULL"),
         {"id": incident_id}
     ).fetchone()
     
@@ -125,6 +130,7 @@ async def geocode_incident_endpoint(
         raise HTTPException(status_code=404, detail="Incident not found")
     
     address = incident[1]
+    municipality = incident[2]
     if not address:
         raise HTTPException(status_code=400, detail="Incident has no address")
     
@@ -151,12 +157,16 @@ async def geocode_incident_endpoint(
     logger.info(f"Cleared all location data for incident {incident_id} before re-geocode")
     
     from services.location.mile_marker import geocode_with_mile_marker_fallback
+    from services.location import geocode_cache
     
     station_lat, station_lng = get_station_coords(db)
     google_key = get_google_api_key(db)
     geocodio_key = get_geocodio_api_key(db)
     state = get_default_state(db)
     
+    # Re-geocode means "don't trust the old answer" - including a cached one
+    geocode_cache.invalidate(db, address, municipality, state or "PA")
+    
     result = geocode_with_mile_marker_fallback(
         db=db,
         address=address,
@@ -165,6 +175,7 @@ async def geocode_incident_endpoint(
         state=state,
         google_api_key=google_key,
         geocodio_api_key=geocodio_key,
+        municipality=municipality,
     )
     
     if result:
@@ -343,7 +354,7 @@ async def geocode_incident_endpoint(
 
 
 @router.get("/config")
-async def get_location_config(db: Session = Depends(get_db)):
+def get_location_config(db: Session = Depends(get_db)):
     """
     Get location services configuration for the frontend.
     Returns whether the feature is enabled and basic config.
@@ -369,7 +380,7 @@ async def get_location_config(db: Session = Depends(get_db)):
 
 
 @router.post("/geocode-options")
-async def geocode_options(
+def geocode_options(
     request: GeocodeRequest,
     db: Session = Depends(get_db),
 ):
@@ -398,7 +409,7 @@ async def geocode_options(
 
 
 @router.post("/set-coords/{incident_id}")
-async def set_incident_coords(
+def set_incident_coords(
     incident_id: int,
     data: dict,
     db: Session = Depends(get_db),
@@ -406,6 +417,9 @@ async def set_incident_coords(
     """
     Manually set lat/lng on an incident from the location picker.
     Expects: {latitude, longitude, matched_address, provider}
+    
+    The pick also replaces the address's geocode cache entry, so the next
+    incident at this address gets the corrected location.
     """
     import json
 
@@ -416,7 +430,7 @@ async def set_incident_coords(
 
     # Verify incident exists
     row = db.execute(text(
-        "SELECT id FROM incidents WHERE id = :id AND deleted_at IS NULL"
+        "SELECT id, address, municipality_code FROM incidents WHERE id = :id AND deleted_at IS NULL"
     ), {"id": incident_id}).fetchone()
     if not row:
         raise HTTPException(status_code=404, detail="Incident not found")
@@ -445,6 +459,13 @@ async def set_incident_coords(
     })
     db.commit()
 
+    # Officer correction becomes the cached answer for this address
+    if row[1] and row[1].strip():
+        from services.location import geocode_cache
+        geocode_cache.store(
+            db, row[1], geocode_data, row[2], get_default_state(db) or "PA", manual=True,
+        )
+
     # Fetch route in background
     try:
         google_key = get_google_api_key(db)
@@ -470,8 +491,47 @@ async def set_incident_coords(
     return {"success": True, "latitude": lat, "longitude": lng}
 
 
+@router.get("/geocode-cache/stats")
+def geocode_cache_stats(db: Session = Depends(get_db)):
+    """
+    Geocode cache hit rate and provider latency.
+    Counters are for this worker process since startup; table counts are
+    for the tenant.
+    """
+    from services.location import geocode_cache
+
+    return {
+        "process": geocode_cache.cache_stats(),
+        "table": geocode_cache.table_stats(db),
+        "ttl_days": geocode_cache.GEOCODE_CACHE_TTL_DAYS,
+    }
+
+
+@router.delete("/geocode-cache/{incident_id}")
+def invalidate_geocode_cache(
+    incident_id: int,
+    db: Session = Depends(get_db),
+):
+    """
+    Drop the cached geocode for an incident's address (wrong location that
+    keeps coming back). The incident itself is not changed.
+    """
+    row = db.execute(text(
+        "SELECT address, municipality_code FROM incidents WHERE id = :id AND deleted_at IS NULL"
+    ), {"id": incident_id}).fetchone()
+    if not row:
+        raise HTTPException(status_code=404, detail="Incident not found")
+    if not row[0]:
+        raise HTTPException(status_code=400, detail="Incident has no address")
+
+    from services.location import geocode_cache
+
+    removed = geocode_cache.invalidate(db, row[0], row[1], get_default_state(db) or "PA")
+    return {"success": True, "removed": removed}
+
+
 @router.post("/backfill")
-async def backfill_location_data(
+def backfill_location_data(
     request: Request,
     background_tasks: BackgroundTasks,
     year: Optional[int] = Query(None, description="Process all incidents from this year"),
@@ -484,6 +544,7 @@ async def backfill_location_data(
 
     Use cases:
         - Enable location services for the first time → backfill all
+          (repeat addresses are served from the geocode cache)
         - Switch geocoding providers → force=true for a year
         - Import new hydrant GIS layer → re-run proximity
         - Change station coordinates → force=true to regenerate routes
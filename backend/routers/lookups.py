@@ -22,7 +22,7 @@ router = APIRouter()
 # ============================================================================
 
 @router.get("/neris/all-dropdowns")
-async def get_all_neris_dropdowns(db: Session = Depends(get_db)):
+def get_all_neris_dropdowns(db: Session = Depends(get_db)):
     """
     Get ALL NERIS dropdown codes in a single call.
     This replaces 25+ individual API calls with one efficient query.
@@ -90,7 +90,7 @@ class MunicipalityUpdate(BaseModel):
 # ============================================================================
 
 @router.get("/neris/incident-types")
-async def get_incident_types(
+def get_incident_types(
     include_inactive: bool = False,
     db: Session = Depends(get_db)
 ):
@@ -134,7 +134,7 @@ async def get_incident_types(
 
 
 @router.get("/neris/incident-types/by-category")
-async def get_incident_types_by_category(db: Session = Depends(get_db)):
+def get_incident_types_by_category(db: Session = Depends(get_db)):
     """Get NERIS incident types grouped by top-level category"""
     result = db.execute(text("""
         SELECT value, value_1, value_2, value_3, 
@@ -178,7 +178,7 @@ async def get_incident_types_by_category(db: Session = Depends(get_db)):
 
 
 @router.get("/neris/location-uses")
-async def get_location_uses(
+def get_location_uses(
     include_inactive: bool = False,
     db: Session = Depends(get_db)
 ):
@@ -218,7 +218,7 @@ async def get_location_uses(
 
 
 @router.get("/neris/location-uses/by-category")
-async def get_location_uses_by_category(db: Session = Depends(get_db)):
+def get_location_uses_by_category(db: Session = Depends(get_db)):
     """Get location uses grouped by type"""
     result = db.execute(text("""
         SELECT value, value_1, value_2, description_1, description_2
@@ -249,7 +249,7 @@ async def get_location_uses_by_category(db: Session = Depends(get_db)):
 
 
 @router.get("/neris/actions-taken")
-async def get_actions_taken(
+def get_actions_taken(
     include_inactive: bool = False,
     db: Session = Depends(get_db)
 ):
@@ -289,7 +289,7 @@ async def get_actions_taken(
 
 
 @router.get("/neris/actions-taken/by-category")
-async def get_actions_taken_by_category(db: Session = Depends(get_db)):
+def get_actions_taken_by_category(db: Session = Depends(get_db)):
     """Get actions grouped by category"""
     result = db.execute(text("""
         SELECT value, value_1, value_2, value_3,
@@ -327,7 +327,7 @@ async def get_actions_taken_by_category(db: Session = Depends(get_db)):
 
 
 @router.get("/neris/unit-types")
-async def get_unit_types(db: Session = Depends(get_db)):
+def get_unit_types(db: Session = Depends(get_db)):
     """Get NERIS unit types for apparatus mapping"""
     result = db.execute(text("""
         SELECT id, value, COALESCE(description, value) as description
@@ -343,7 +343,7 @@ async def get_unit_types(db: Session = Depends(get_db)):
 
 
 @router.get("/neris/aid-types")
-async def get_aid_types(db: Session = Depends(get_db)):
+def get_aid_types(db: Session = Depends(get_db)):
     """Get NERIS mutual aid types"""
     result = db.execute(text("""
         SELECT value, COALESCE(description, value) as description
@@ -356,7 +356,7 @@ async def get_aid_types(db: Session = Depends(get_db)):
 
 
 @router.get("/neris/aid-directions")
-async def get_aid_directions(db: Session = Depends(get_db)):
+def get_aid_directions(db: Session = Depends(get_db)):
     """Get NERIS aid direction codes"""
     result = db.execute(text("""
         SELECT value, COALESCE(description, value) as description
@@ -369,7 +369,7 @@ async def get_aid_directions(db: Session = Depends(get_db)):
 
 
 @router.get("/neris/vacancy-types")
-async def get_vacancy_types(db: Session = Depends(get_db)):
+def get_vacancy_types(db: Session = Depends(get_db)):
     """Get NERIS vacancy status codes for location use module"""
     result = db.execute(text("""
         SELECT value, COALESCE(description, value) as description
@@ -386,7 +386,7 @@ async def get_vacancy_types(db: Session = Depends(get_db)):
 # ============================================================================
 
 @router.get("/municipalities")
-async def get_municipalities(
+def get_municipalities(
     include_inactive: bool = False,
     db: Session = Depends(get_db)
 ):
@@ -429,7 +429,7 @@ async def get_municipalities(
 
 
 @router.get("/municipalities/{code}")
-async def get_municipality_by_code(
+def get_municipality_by_code(
     code: str,
     db: Session = Depends(get_db)
 ):
@@ -462,7 +462,7 @@ async def get_municipality_by_code(
 
 
 @router.post("/municipalities")
-async def create_municipality(
+def create_municipality(
     data: MunicipalityCreate,
     db: Session = Depends(get_db)
 ):
@@ -500,7 +500,7 @@ async def create_municipality(
 
 
 @router.put("/municipalities/{municipality_id}")
-async def update_municipality(
+def update_municipality(
     municipality_id: int,
     data: MunicipalityUpdate,
     db: Session = Depends(get_db)
@@ -544,7 +544,7 @@ async def update_municipality(
 
 
 @router.delete("/municipalities/{municipality_id}")
-async def delete_municipality(
+def delete_municipality(
     municipality_id: int,
     db: Session = Depends(get_db)
 ):
@@ -562,7 +562,7 @@ async def delete_municipality(
 
 
 @router.post("/municipalities/auto-create")
-async def auto_create_municipality(
+def auto_create_municipality(
     code: str,
     db: Session = Depends(get_db)
 ):
@@ -33,21 +33,26 @@ Phase 5b - GIS Import (File Upload):
 
 Phase A - Viewport Optimization:
     POST /api/map/layers/batch/clustered  - Batch viewport query (multiple layers, single request)
+
+Phase B - Vector Tiles:
+    GET  /api/map/tiles/{layer}/{z}/{x}/{y}.mvt - Mapbox Vector Tile (map layer id or incident_*)
 """
 
 import json
 import logging
 import httpx
-from fastapi import APIRouter, Depends, File, HTTPException, Query, UploadFile
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Request, Response, UploadFile
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from typing import List, Optional
 
 from database import get_db
+from executors import run_blocking
 from routers.settings import (
     get_setting_value, get_station_coords, get_google_api_key,
 )
+from services.location.map_tiles import invalidate_layer
 
 logger = logging.getLogger(__name__)
 
@@ -68,7 +73,7 @@ def _get_feature_flag(db: Session, key: str) -> bool:
 # =============================================================================
 
 @router.get("/nearby")
-async def get_nearby(
+def get_nearby(
     lat: float = Query(..., description="Latitude"),
     lng: float = Query(..., description="Longitude"),
     address: Optional[str] = Query(None, description="Address for notes/preplan lookup"),
@@ -111,7 +116,7 @@ async def get_nearby(
 
 
 @router.get("/nearby/{incident_id}")
-async def get_nearby_for_incident(
+def get_nearby_for_incident(
     incident_id: int,
     db: Session = Depends(get_db),
 ):
@@ -188,7 +193,7 @@ async def get_nearby_for_incident(
 # =============================================================================
 
 @router.get("/open-incidents")
-async def get_open_incidents(db: Session = Depends(get_db)):
+def get_open_incidents(db: Session = Depends(get_db)):
     """
     Lightweight list of all OPEN incidents with coordinates.
     Polled by MapPage to show pulsing markers and the open incident overlay.
@@ -198,13 +203,12 @@ async def get_open_incidents(db: Session = Depends(get_db)):
         result = db.execute(text("""
             SELECT i.id, i.internal_incident_number, i.call_category,
                    i.cad_event_type, i.cad_event_subtype, i.address,
-                   i.latitude, i.longitude, i.time_dispatched, i.status,
+                   ST_Y(i.geom), ST_X(i.geom), i.time_dispatched, i.status,
                    i.cad_units
             FROM incidents i
             WHERE i.status = 'OPEN'
               AND i.deleted_at IS NULL
-              AND i.latitude IS NOT NULL AND i.longitude IS NOT NULL
-              AND i.latitude != '' AND i.longitude != ''
+              AND i.geom IS NOT NULL
             ORDER BY i.time_dispatched DESC
         """))
 
@@ -217,8 +221,8 @@ async def get_open_incidents(db: Session = Depends(get_db)):
                 "event_type": row[3],
                 "event_subtype": row[4],
                 "address": row[5],
-                "latitude": float(row[6]) if row[6] else None,
-                "longitude": float(row[7]) if row[7] else None,
+                "latitude": row[6],
+                "longitude": row[7],
                 "time_dispatched": row[8].isoformat() if row[8] else None,
                 "status": row[9],
                 "unit_count": len(row[10]) if row[10] else 0,
@@ -235,7 +239,7 @@ async def get_open_incidents(db: Session = Depends(get_db)):
 # =============================================================================
 
 @router.get("/incident-response/{incident_id}")
-async def get_incident_response_data(
+def get_incident_response_data(
     incident_id: int,
     origin_lat: Optional[float] = Query(None, description="GPS lat for live routing"),
     origin_lng: Optional[float] = Query(None, description="GPS lng for live routing"),
@@ -492,7 +496,7 @@ async def get_incident_response_data(
 # =============================================================================
 
 @router.get("/config")
-async def get_map_config(db: Session = Depends(get_db)):
+def get_map_config(db: Session = Depends(get_db)):
     """
     Get map configuration for frontend initialization.
     Returns API key status, feature flags, station coords, and layer list.
@@ -568,7 +572,7 @@ async def get_map_config(db: Session = Depends(get_db)):
 # =============================================================================
 
 @router.get("/layers")
-async def list_layers(
+def list_layers(
     include_inactive: bool = False,
     db: Session = Depends(get_db),
 ):
@@ -630,8 +634,7 @@ async def list_layers(
                     SELECT COUNT(*) FROM incidents
                     WHERE call_category = :cat
                       AND deleted_at IS NULL
-                      AND latitude IS NOT NULL AND longitude IS NOT NULL
-                      AND latitude != '' AND longitude != ''
+                      AND geom IS NOT NULL
                       AND incident_date >= :ds
                 """), {"cat": vl["call_category"], "ds": _date_start}).scalar() or 0
             except Exception:
@@ -661,7 +664,7 @@ class LayerStyleUpdate(BaseModel):
 
 
 @router.put("/layers/{layer_id}/style")
-async def update_layer_style(
+def update_layer_style(
     layer_id: int,
     style: LayerStyleUpdate,
     db: Session = Depends(get_db),
@@ -722,7 +725,7 @@ async def update_layer_style(
 # =============================================================================
 
 @router.get("/layers/{layer_id}/features")
-async def list_layer_features(
+def list_layer_features(
     layer_id: int,
     bbox: Optional[str] = Query(None, description="Bounding box: west,south,east,north"),
     limit: int = Query(500, le=5000),
@@ -834,7 +837,7 @@ async def list_layer_features(
 
 
 @router.get("/layers/{layer_id}/features/geojson")
-async def get_layer_features_geojson(
+def get_layer_features_geojson(
     layer_id: int,
     bbox: Optional[str] = Query(None, description="Bounding box: west,south,east,north"),
     db: Session = Depends(get_db),
@@ -1070,7 +1073,7 @@ def _query_clustered_layer(
 
 
 @router.get("/layers/{layer_id}/features/clustered")
-async def get_clustered_features(
+def get_clustered_features(
     layer_id: int,
     bbox: str = Query(..., description="Bounding box: west,south,east,north"),
     zoom: int = Query(14, ge=0, le=22),
@@ -1204,8 +1207,8 @@ def _query_incident_layer(
         result = db.execute(text("""
             SELECT
                 COUNT(*) as point_count,
-                AVG(CAST(latitude AS DOUBLE PRECISION)) as center_lat,
-                AVG(CAST(longitude AS DOUBLE PRECISION)) as center_lng,
+                AVG(ST_Y(geom)) as center_lat,
+                AVG(ST_X(geom)) as center_lng,
                 MIN(id) as sample_id,
                 MIN(internal_incident_number) as sample_title,
                 CASE WHEN COUNT(*) = 1 THEN MIN(address) ELSE NULL END as single_address,
@@ -1213,20 +1216,20 @@ def _query_incident_layer(
                 CASE WHEN COUNT(*) = 1 THEN MIN(cad_event_subtype) ELSE NULL END as single_subtype,
                 CASE WHEN COUNT(*) = 1 THEN MIN(incident_date::text) ELSE NULL END as single_date,
                 CASE WHEN COUNT(*) = 1 THEN MIN(internal_incident_number) ELSE NULL END as single_number,
-                FLOOR(CAST(longitude AS DOUBLE PRECISION) / :cell_size) as cell_x,
-                FLOOR(CAST(latitude AS DOUBLE PRECISION) / :cell_size) as cell_y,
+                FLOOR(ST_X(geom) / :cell_size) as cell_x,
+                FLOOR(ST_Y(geom) / :cell_size) as cell_y,
                 ARRAY_AGG(id ORDER BY incident_date DESC) as incident_ids
             FROM incidents
             WHERE call_category = :category
               AND deleted_at IS NULL
-              AND latitude IS NOT NULL AND longitude IS NOT NULL
-              AND latitude != '' AND longitude != ''
               AND incident_date >= :date_start
-              AND CAST(longitude AS DOUBLE PRECISION) BETWEEN :west AND :east
-              AND CAST(latitude AS DOUBLE PRECISION) BETWEEN :south AND :north
+              AND ST_Intersects(
+                  geom,
+                  ST_MakeEnvelope(:west, :south, :east, :north, 4326)
+              )
             GROUP BY
-                FLOOR(CAST(longitude AS DOUBLE PRECISION) / :cell_size),
-                FLOOR(CAST(latitude AS DOUBLE PRECISION) / :cell_size)
+                FLOOR(ST_X(geom) / :cell_size),
+                FLOOR(ST_Y(geom) / :cell_size)
             ORDER BY point_count DESC
         """), params)
 
@@ -1316,17 +1319,17 @@ def _query_incident_layer(
         result = db.execute(text("""
             SELECT id, internal_incident_number, address, cad_event_type,
                    cad_event_subtype, incident_date::text, call_category,
-                   CAST(latitude AS DOUBLE PRECISION) as lat,
-                   CAST(longitude AS DOUBLE PRECISION) as lng,
+                   ST_Y(geom) as lat,
+                   ST_X(geom) as lng,
                    location_name, municipality_code
             FROM incidents
             WHERE call_category = :category
               AND deleted_at IS NULL
-              AND latitude IS NOT NULL AND longitude IS NOT NULL
-              AND latitude != '' AND longitude != ''
               AND incident_date >= :date_start
-              AND CAST(longitude AS DOUBLE PRECISION) BETWEEN :west AND :east
-              AND CAST(latitude AS DOUBLE PRECISION) BETWEEN :south AND :north
+              AND ST_Intersects(
+                  geom,
+                  ST_MakeEnvelope(:west, :south, :east, :north, 4326)
+              )
             ORDER BY incident_date DESC
             LIMIT 2000
         """), params)
@@ -1414,7 +1417,7 @@ def _query_incident_layer(
 
 
 @router.post("/layers/batch/clustered")
-async def get_batch_clustered_features(
+def get_batch_clustered_features(
     request: BatchClusteredRequest,
     db: Session = Depends(get_db),
 ):
@@ -1456,6 +1459,56 @@ async def get_batch_clustered_features(
     return {"layers": layers_result, "zoom": request.zoom}
 
 
+# =============================================================================
+# VECTOR TILES (Phase B — MVT with on-disk cache, see services/location/map_tiles.py)
+# =============================================================================
+
+@router.get("/tiles/{layer}/{z}/{x}/{y}.mvt")
+def get_layer_tile(
+    layer: str,
+    z: int,
+    x: int,
+    y: int,
+    request: Request,
+    date_range: str = Query("ytd", description="Incident layers only: ytd or 90days"),
+    db: Session = Depends(get_db),
+):
+    """
+    Mapbox Vector Tile for a map layer (integer id) or a virtual incident
+    layer ("incident_fire", "incident_ems"). The MVT layer name is the
+    layer path value. Empty tiles return 204.
+    """
+    from services.location import map_tiles
+
+    if not map_tiles.valid_tile(z, x, y):
+        raise HTTPException(status_code=400, detail="Invalid tile coordinates")
+
+    try:
+        if layer in INCIDENT_VIRTUAL_LAYERS:
+            if date_range not in ("ytd", "90days"):
+                date_range = "ytd"
+            category = INCIDENT_VIRTUAL_LAYERS[layer]["call_category"]
+            result = map_tiles.get_incident_tile(db, layer, category, date_range, z, x, y)
+        elif layer.isdigit():
+            result = map_tiles.get_feature_tile(db, int(layer), z, x, y)
+        else:
+            result = None
+    except Exception as e:
+        logger.error(f"Failed to render tile {layer}/{z}/{x}/{y}: {e}")
+        raise HTTPException(status_code=500, detail="Failed to render tile")
+
+    if result is None:
+        raise HTTPException(status_code=404, detail="Layer not found")
+
+    tile, etag = result
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    if not tile:
+        return Response(status_code=204, headers=headers)
+    return Response(content=tile, media_type=map_tiles.MEDIA_TYPE, headers=headers)
+
+
 # =============================================================================
 # MUTUAL AID STATIONS — REMOVED
 # Table dropped in migration 002_neris_mutual_aid.sql
@@ -1495,7 +1548,7 @@ class FeatureUpdate(BaseModel):
 
 
 @router.post("/layers/{layer_id}/features")
-async def create_feature(
+def create_feature(
     layer_id: int,
     feature: FeatureCreate,
     db: Session = Depends(get_db),
@@ -1549,6 +1602,7 @@ async def create_feature(
         )
         row = result.fetchone()
         db.commit()
+        invalidate_layer(db, layer_id)
 
         logger.info(f"Created feature '{feature.title}' in layer {layer_id} (id={row[0]})")
 
@@ -1568,7 +1622,7 @@ async def create_feature(
 
 
 @router.put("/features/{feature_id}")
-async def update_feature(
+def update_feature(
     feature_id: int,
     update: FeatureUpdate,
     db: Session = Depends(get_db),
@@ -1632,6 +1686,7 @@ async def update_feature(
             params
         )
         db.commit()
+        invalidate_layer(db, existing[1])
 
         # Return updated feature
         updated = db.execute(
@@ -1671,7 +1726,7 @@ async def update_feature(
 
 
 @router.delete("/features/{feature_id}")
-async def delete_feature(
+def delete_feature(
     feature_id: int,
     hard_delete: bool = Query(False, description="Hard delete (for closures). Default is soft-delete."),
     db: Session = Depends(get_db),
@@ -1685,7 +1740,7 @@ async def delete_feature(
     """
     existing = db.execute(
         text("""
-            SELECT mf.id, mf.title, ml.layer_type
+            SELECT mf.id, mf.title, ml.layer_type, mf.layer_id
             FROM map_features mf
             JOIN map_layers ml ON ml.id = mf.layer_id
             WHERE mf.id = :id
@@ -1702,6 +1757,7 @@ async def delete_feature(
             {"id": feature_id}
         )
         db.commit()
+        invalidate_layer(db, existing[3])
 
         logger.info(f"Deleted feature {feature_id} ('{existing[1]}', type={existing[2]})")
 
@@ -1736,7 +1792,7 @@ class AddressNoteUpdate(BaseModel):
 
 
 @router.get("/address-notes")
-async def get_address_notes(
+def get_address_notes(
     address: str = Query(..., description="Address to look up"),
     db: Session = Depends(get_db),
 ):
@@ -1781,7 +1837,7 @@ async def get_address_notes(
 
 
 @router.post("/address-notes")
-async def create_address_note(
+def create_address_note(
     note: AddressNoteCreate,
     db: Session = Depends(get_db),
 ):
@@ -1824,7 +1880,7 @@ async def create_address_note(
 
 
 @router.put("/address-notes/{note_id}")
-async def update_address_note(
+def update_address_note(
     note_id: int,
     update: AddressNoteUpdate,
     db: Session = Depends(get_db),
@@ -1867,7 +1923,7 @@ async def update_address_note(
 
 
 @router.delete("/address-notes/{note_id}")
-async def delete_address_note(
+def delete_address_note(
     note_id: int,
     db: Session = Depends(get_db),
 ):
@@ -2001,14 +2057,15 @@ async def arcgis_import(
     Uses external_id for upsert (update existing, insert new).
     """
     import httpx as httpx_lib
-    from services.location.gis_import import fetch_arcgis_features
-    from services.location.import_pipeline import import_features_to_layer
+    from services.location.import_pipeline import BulkFeatureImport
 
     # Verify layer exists
-    layer = db.execute(
-        text("SELECT id, layer_type, name FROM map_layers WHERE id = :id"),
-        {"id": request.layer_id}
-    ).fetchone()
+    layer = await run_blocking(
+        lambda: db.execute(
+            text("SELECT id, layer_type, name FROM map_layers WHERE id = :id"),
+            {"id": request.layer_id}
+        ).fetchone()
+    )
 
     if not layer:
         raise HTTPException(status_code=404, detail="Target layer not found")
@@ -2019,52 +2076,21 @@ async def arcgis_import(
         metadata = await fetch_arcgis_metadata(request.url)
         source_fields = metadata.get("fields", [])
 
-        # Fetch features from ArcGIS
+        # Fetch features from ArcGIS and import into layer as pages arrive —
+        # stores ALL fields, auto-generates property_schema
         where = request.filter_expression or "1=1"
-        features = await fetch_arcgis_features(request.url, where=where)
+        bulk = await run_blocking(
+            BulkFeatureImport, db, request.layer_id, request.field_mapping or {},
+            import_source="arcgis_rest", upsert=True, source_fields=source_fields,
+        )
+        stats = await _stream_arcgis_import(bulk, request.url, where)
 
-        if not features:
+        if stats is None:
             return {"success": True, "message": "No features found at source", "stats": {"imported": 0}}
 
-        # Import into layer — stores ALL fields, auto-generates property_schema
-        stats = import_features_to_layer(
-            db=db,
-            layer_id=request.layer_id,
-            features=features,
-            field_mapping=request.field_mapping,
-            import_source="arcgis_rest",
-            upsert=True,
-            source_fields=source_fields,
-        )
-
         # Optionally save import config for re-import
         if request.save_config and request.config_name:
-            # Count actual features in layer
-            total_features = db.execute(
-                text("SELECT COUNT(*) FROM map_features WHERE layer_id = :lid"),
-                {"lid": request.layer_id}
-            ).scalar() or 0
-
-            db.execute(
-                text("""
-                    INSERT INTO gis_import_configs
-                        (layer_id, name, source_type, source_url, field_mapping,
-                         import_options, last_refresh_at, last_refresh_status, last_refresh_count)
-                    VALUES
-                        (:layer_id, :name, 'arcgis_rest', :url, :mapping,
-                         :options, NOW(), 'success', :count)
-                    ON CONFLICT DO NOTHING
-                """),
-                {
-                    "layer_id": request.layer_id,
-                    "name": request.config_name,
-                    "url": request.url,
-                    "mapping": json.dumps(request.field_mapping),
-                    "options": json.dumps({"filter_expression": request.filter_expression}),
-                    "count": total_features,
-                },
-            )
-            db.commit()
+            await run_blocking(_save_arcgis_import_config, db, request)
 
         return {
             "success": True,
@@ -2075,17 +2101,69 @@ async def arcgis_import(
     except httpx_lib.HTTPStatusError as e:
         raise HTTPException(status_code=502, detail=f"ArcGIS server returned {e.response.status_code}")
     except Exception as e:
-        db.rollback()
+        await run_blocking(db.rollback)
         logger.error(f"ArcGIS import failed: {e}")
         raise HTTPException(status_code=500, detail=f"Import failed: {str(e)}")
 
 
+async def _stream_arcgis_import(bulk, url: str, where: str) -> Optional[dict]:
+    """
+    Fetch an ArcGIS layer page by page (concurrently, see iter_arcgis_pages)
+    and COPY each page into a BulkFeatureImport as it arrives. Later pages
+    keep downloading while a page is staged, and at most a few pages are in
+    memory. Returns import stats, or None if the source had no features.
+
+    The staging transaction stays open for the whole download.
+    """
+    from contextlib import aclosing
+    from services.location.gis_import import iter_arcgis_pages
+
+    async with aclosing(iter_arcgis_pages(url, where=where)) as pages:
+        async for page in pages:
+            await run_blocking(bulk.add, page)
+
+    if not bulk.count:
+        await run_blocking(bulk.db.rollback)
+        return None
+    return await run_blocking(bulk.finish)
+
+
+def _save_arcgis_import_config(db: Session, request: ArcGISImportRequest):
+    """Save an ArcGIS import as a re-runnable config (sync DB work)."""
+    # Count actual features in layer
+    total_features = db.execute(
+        text("SELECT COUNT(*) FROM map_features WHERE layer_id = :lid"),
+        {"lid": request.layer_id}
+    ).scalar() or 0
+
+    db.execute(
+        text("""
+            INSERT INTO gis_import_configs
+                (layer_id, name, source_type, source_url, field_mapping,
+                 import_options, last_refresh_at, last_refresh_status, last_refresh_count)
+            VALUES
+                (:layer_id, :name, 'arcgis_rest', :url, :mapping,
+                 :options, NOW(), 'success', :count)
+            ON CONFLICT DO NOTHING
+        """),
+        {
+            "layer_id": request.layer_id,
+            "name": request.config_name,
+            "url": request.url,
+            "mapping": json.dumps(request.field_mapping),
+            "options": json.dumps({"filter_expression": request.filter_expression}),
+            "count": total_features,
+        },
+    )
+    db.commit()
+
+
 # =============================================================================
 # SAVED IMPORT CONFIGS (Phase 5a)
 # =============================================================================
 
 @router.get("/gis/configs")
-async def list_import_configs(db: Session = Depends(get_db)):
+def list_import_configs(db: Session = Depends(get_db)):
     """List saved GIS import configurations."""
     try:
         result = db.execute(text("""
@@ -2137,14 +2215,14 @@ async def refresh_import_config(
     Re-run a saved import configuration.
     Fetches fresh data from the source and upserts into the target layer.
     """
-    import httpx as httpx_lib
-    from services.location.gis_import import fetch_arcgis_features
-    from services.location.import_pipeline import import_features_to_layer
+    from services.location.import_pipeline import BulkFeatureImport
 
-    config = db.execute(
-        text("SELECT id, layer_id, source_type, source_url, field_mapping, import_options FROM gis_import_configs WHERE id = :id"),
-        {"id": config_id}
-    ).fetchone()
+    config = await run_blocking(
+        lambda: db.execute(
+            text("SELECT id, layer_id, source_type, source_url, field_mapping, import_options FROM gis_import_configs WHERE id = :id"),
+            {"id": config_id}
+        ).fetchone()
+    )
 
     if not config:
         raise HTTPException(status_code=404, detail="Import config not found")
@@ -2161,43 +2239,28 @@ async def refresh_import_config(
         metadata = await fetch_arcgis_metadata(config[3])
         source_fields = metadata.get("fields", [])
 
-        features = await fetch_arcgis_features(config[3], where=where)
-
-        stats = import_features_to_layer(
-            db=db,
-            layer_id=config[1],
-            features=features,
-            field_mapping=config[4] or {},
-            import_source="arcgis_rest",
-            upsert=True,
-            source_fields=source_fields,
+        bulk = await run_blocking(
+            BulkFeatureImport, db, config[1], config[4] or {},
+            import_source="arcgis_rest", upsert=True, source_fields=source_fields,
         )
+        stats = await _stream_arcgis_import(bulk, config[3], where) or {
+            "imported": 0, "updated": 0, "skipped": 0, "errors": 0, "error_details": [],
+        }
 
-        # Update config with refresh status — use actual feature count from DB
-        # Force fresh transaction to see committed data from import
-        db.commit()
-        total_features = db.execute(
-            text("SELECT COUNT(*) FROM map_features WHERE layer_id = :lid"),
-            {"lid": config[1]}
-        ).scalar() or 0
-        logger.info(f"Config {config_id} refresh complete: COUNT={total_features}, stats={stats}")
-
-        db.execute(
-            text("""
-                UPDATE gis_import_configs
-                SET last_refresh_at = NOW(),
-                    last_refresh_status = 'success',
-                    last_refresh_count = :count,
-                    updated_at = NOW()
-                WHERE id = :id
-            """),
-            {"count": total_features, "id": config_id},
-        )
-        db.commit()
+        await run_blocking(_record_config_refresh, db, config_id, config[1], stats)
 
         return {"success": True, "stats": stats}
     except Exception as e:
         # Record failure
+        await run_blocking(_record_config_refresh, db, config_id, config[1], None)
+        logger.error(f"Config refresh failed for config {config_id}: {e}")
+        raise HTTPException(status_code=500, detail=f"Refresh failed: {str(e)}")
+
+
+def _record_config_refresh(db: Session, config_id: int, layer_id: int, stats: Optional[dict]):
+    """Record refresh outcome on a saved import config. stats=None records a failure."""
+    if stats is None:
+        db.rollback()
         db.execute(
             text("""
                 UPDATE gis_import_configs
@@ -2207,12 +2270,33 @@ async def refresh_import_config(
             {"id": config_id},
         )
         db.commit()
-        logger.error(f"Config refresh failed for config {config_id}: {e}")
-        raise HTTPException(status_code=500, detail=f"Refresh failed: {str(e)}")
+        return
+
+    # Update config with refresh status — use actual feature count from DB
+    # Force fresh transaction to see committed data from import
+    db.commit()
+    total_features = db.execute(
+        text("SELECT COUNT(*) FROM map_features WHERE layer_id = :lid"),
+        {"lid": layer_id}
+    ).scalar() or 0
+    logger.info(f"Config {config_id} refresh complete: COUNT={total_features}, stats={stats}")
+
+    db.execute(
+        text("""
+            UPDATE gis_import_configs
+            SET last_refresh_at = NOW(),
+                last_refresh_status = 'success',
+                last_refresh_count = :count,
+                updated_at = NOW()
+            WHERE id = :id
+        """),
+        {"count": total_features, "id": config_id},
+    )
+    db.commit()
 
 
 @router.delete("/gis/configs/{config_id}")
-async def delete_import_config(
+def delete_import_config(
     config_id: int,
     db: Session = Depends(get_db),
 ):
@@ -2240,6 +2324,7 @@ async def delete_import_config(
     # Delete the config
     db.execute(text("DELETE FROM gis_import_configs WHERE id = :id"), {"id": config_id})
     db.commit()
+    invalidate_layer(db, layer_id)
 
     logger.info(f"Deleted import config {config_id} ('{existing[1]}') and {deleted_count} features from layer {layer_id}")
 
@@ -2352,7 +2437,7 @@ class FileImportRequest(BaseModel):
 
 
 @router.post("/gis/file/import")
-async def file_import(
+def file_import(
     request: FileImportRequest,
     db: Session = Depends(get_db),
 ):
@@ -2549,7 +2634,7 @@ class HighwayRouteUpdate(BaseModel):
 
 
 @router.get("/highway-routes")
-async def list_highway_routes(db: Session = Depends(get_db)):
+def list_highway_routes(db: Session = Depends(get_db)):
     """List all highway routes with their points and aliases."""
     try:
         # Check if tables exist
@@ -2620,7 +2705,7 @@ async def list_highway_routes(db: Session = Depends(get_db)):
 
 
 @router.get("/highway-routes/{route_id}")
-async def get_highway_route(route_id: int, db: Session = Depends(get_db)):
+def get_highway_route(route_id: int, db: Session = Depends(get_db)):
     """Get a single highway route with points and aliases."""
     try:
         route = db.execute(text("""
@@ -2678,7 +2763,7 @@ async def get_highway_route(route_id: int, db: Session = Depends(get_db)):
 
 
 @router.post("/highway-routes")
-async def create_highway_route(
+def create_highway_route(
     route: HighwayRouteCreate,
     db: Session = Depends(get_db),
 ):
@@ -2749,7 +2834,7 @@ async def create_highway_route(
 
 
 @router.put("/highway-routes/{route_id}")
-async def update_highway_route(
+def update_highway_route(
     route_id: int,
     update: HighwayRouteUpdate,
     db: Session = Depends(get_db),
@@ -2868,7 +2953,7 @@ async def trace_road(
     This is a UX helper - instead of clicking 27 points manually,
     user clicks start and end, we get the perfect road geometry.
     """
-    google_key = get_google_api_key(db)
+    google_key = await run_blocking(get_google_api_key, db)
     if not google_key:
         raise HTTPException(status_code=400, detail="Google API key not configured")
     
@@ -2972,7 +3057,7 @@ def _decode_polyline(encoded: str) -> list:
 
 
 @router.delete("/highway-routes/{route_id}")
-async def delete_highway_route(route_id: int, db: Session = Depends(get_db)):
+def delete_highway_route(route_id: int, db: Session = Depends(get_db)):
     """Delete a highway route and its points/aliases (cascades)."""
     existing = db.execute(
         text("SELECT id, name FROM highway_routes WHERE id = :id"),
@@ -29,6 +29,9 @@ import tempfile
 import psycopg2  # Retained for tenant DB provisioning only
 
 from master_database import get_master_db
+from tenant_registry import notify_tenant_changed, get_registry_stats
+from settings_cache import get_cache_stats as get_settings_cache_stats
+from analytics_cache import get_cache_stats as get_analytics_cache_stats
 
 logger = logging.getLogger(__name__)
 
@@ -421,6 +424,8 @@ async def approve_tenant(
             get_client_ip(request)
         )
 
+        await notify_tenant_changed(slug)
+
         return {
             'status': 'ok',
             'tenant_id': tenant_id,
@@ -472,6 +477,8 @@ async def suspend_tenant(
             get_client_ip(request)
         )
 
+        await notify_tenant_changed(slug)
+
         return {'status': 'ok', 'message': f'Tenant {name} suspended'}
 
 
@@ -511,6 +518,8 @@ async def reactivate_tenant(
             ip_address=get_client_ip(request)
         )
 
+        await notify_tenant_changed(slug)
+
         return {'status': 'ok', 'message': f'Tenant {name} reactivated'}
 
 
@@ -544,6 +553,8 @@ async def reject_tenant(
             ip_address=get_client_ip(request)
         )
 
+        await notify_tenant_changed(slug)
+
         return {'status': 'ok', 'message': f'Tenant {name} rejected'}
 
 
@@ -597,6 +608,8 @@ async def update_tenant(
             ip_address=get_client_ip(request)
         )
 
+        await notify_tenant_changed(slug)
+
         return {'status': 'ok', 'message': 'Tenant updated'}
 
 
@@ -699,6 +712,9 @@ async def create_tenant(
         new_id = db.execute(text("SELECT id FROM tenants WHERE slug = :slug"),
                             {"slug": slug}).fetchone()[0]
 
+    # New slug may have a cached negative entry from an earlier lookup
+    await notify_tenant_changed(slug)
+
     # Provision the database (outside the master db context)
     initial_admin_name = data.initial_admin_name or data.contact_name
     initial_admin_email = data.initial_admin_email or data.contact_email
@@ -850,6 +866,11 @@ async def get_system_stats(
             'created_at': r[2].isoformat() if r[2] else None
         } for r in result]
 
+        # Tenant registry cache counters (this worker only)
+        stats['tenant_cache'] = get_registry_stats()
+        stats['settings_cache'] = get_settings_cache_stats()
+        stats['analytics_cache'] = get_analytics_cache_stats()
+
         return stats
 
 
@@ -1284,6 +1305,8 @@ async def provision_database(
             get_client_ip(request)
         )
 
+    await notify_tenant_changed(slug)
+
     return {'status': 'ok', 'database_name': db_name}
 
 
@@ -83,7 +83,7 @@ def parse_csv_row(row: Dict[str, str], is_hierarchical: bool) -> Dict[str, Any]:
 # ============================================================================
 
 @router.get("/categories")
-async def list_categories(db: Session = Depends(get_db)):
+def list_categories(db: Session = Depends(get_db)):
     """Get all NERIS code categories with counts."""
     result = db.execute(text("""
         SELECT 
@@ -110,7 +110,7 @@ async def list_categories(db: Session = Depends(get_db)):
 
 
 @router.get("/categories/{category}")
-async def get_category_codes(
+def get_category_codes(
     category: str,
     include_inactive: bool = False,
     db: Session = Depends(get_db)
@@ -161,7 +161,7 @@ async def get_category_codes(
 
 
 @router.get("/categories/{category}/grouped")
-async def get_category_grouped(category: str, db: Session = Depends(get_db)):
+def get_category_grouped(category: str, db: Session = Depends(get_db)):
     """Get hierarchical codes grouped for dropdown display."""
     
     # Check if hierarchical
@@ -170,7 +170,7 @@ async def get_category_grouped(category: str, db: Session = Depends(get_db)):
     """), {"cat": category}).fetchone()
     
     if not check or not check[0]:
-        codes = await get_category_codes(category, False, db)
+        codes = get_category_codes(category, False, db)
         return {"hierarchical": False, "codes": codes}
     
     result = db.execute(text("""
@@ -207,7 +207,7 @@ async def get_category_grouped(category: str, db: Session = Depends(get_db)):
 # ============================================================================
 
 @router.post("/import")
-async def import_csv(
+def import_csv(
     category: str = Query(..., description="Category (e.g., 'type_unit')"),
     mode: str = Query("merge", description="'merge' keeps existing, 'replace' deletes first"),
     file: UploadFile = File(...),
@@ -215,7 +215,7 @@ async def import_csv(
 ):
     """Import NERIS codes from CSV file."""
     
-    content = await file.read()
+    content = file.file.read()
     content_str = content.decode('utf-8-sig')
     
     reader = csv.DictReader(StringIO(content_str))
@@ -319,7 +319,7 @@ async def import_csv(
 
 
 @router.get("/import-history")
-async def get_import_history(category: Optional[str] = None, db: Session = Depends(get_db)):
+def get_import_history(category: Optional[str] = None, db: Session = Depends(get_db)):
     """Get import history."""
     query = """
         SELECT id, category, rows_imported, rows_updated, rows_removed, 
@@ -348,7 +348,7 @@ async def get_import_history(category: Optional[str] = None, db: Session = Depen
 # ============================================================================
 
 @router.get("/validate")
-async def validate_incidents(
+def validate_incidents(
     year: Optional[int] = None,
     db: Session = Depends(get_db)
 ):
@@ -443,7 +443,7 @@ async def validate_incidents(
 
 
 @router.get("/validate/apparatus")
-async def validate_apparatus(db: Session = Depends(get_db)):
+def validate_apparatus(db: Session = Depends(get_db)):
     """Find apparatus with invalid unit types."""
     
     issues = []
@@ -473,7 +473,7 @@ async def validate_apparatus(db: Session = Depends(get_db)):
 # ============================================================================
 
 @router.post("/update-incidents")
-async def update_incident_codes(
+def update_incident_codes(
     request: IncidentUpdateRequest,
     db: Session = Depends(get_db)
 ):
@@ -539,7 +539,7 @@ async def update_incident_codes(
 # ============================================================================
 
 @router.put("/codes/{code_id}")
-async def update_code(code_id: int, update: CodeUpdate, db: Session = Depends(get_db)):
+def update_code(code_id: int, update: CodeUpdate, db: Session = Depends(get_db)):
     """Update a code's active status, description, or display order."""
     
     updates = []
@@ -570,7 +570,7 @@ async def update_code(code_id: int, update: CodeUpdate, db: Session = Depends(ge
 
 
 @router.delete("/codes/{code_id}")
-async def deactivate_code(code_id: int, db: Session = Depends(get_db)):
+def deactivate_code(code_id: int, db: Session = Depends(get_db)):
     """Deactivate a code (soft delete)."""
     
     result = db.execute(text("""
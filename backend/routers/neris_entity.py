@@ -35,6 +35,7 @@ import logging
 import json
 
 from database import get_db
+from executors import run_blocking
 
 logger = logging.getLogger(__name__)
 
@@ -284,7 +285,7 @@ def _update_station_count(db: Session):
 # =============================================================================
 
 @router.get("/entity")
-async def get_entity(db: Session = Depends(get_db)):
+def get_entity(db: Session = Depends(get_db)):
     """Get the full Entity record with nested stations and units."""
     entity = _get_entity(db)
     if not entity:
@@ -302,7 +303,7 @@ async def get_entity(db: Session = Depends(get_db)):
 
 
 @router.put("/entity")
-async def update_entity(data: EntityUpdate, db: Session = Depends(get_db)):
+def update_entity(data: EntityUpdate, db: Session = Depends(get_db)):
     """Update Entity fields. Creates a new entity row if none exists."""
     entity = _get_entity(db)
 
@@ -338,7 +339,7 @@ async def update_entity(data: EntityUpdate, db: Session = Depends(get_db)):
 # =============================================================================
 
 @router.post("/stations")
-async def add_station(data: StationCreate, db: Session = Depends(get_db)):
+def add_station(data: StationCreate, db: Session = Depends(get_db)):
     """Add a station to the Entity."""
     entity = _get_entity(db)
     if not entity:
@@ -376,7 +377,7 @@ async def add_station(data: StationCreate, db: Session = Depends(get_db)):
 
 
 @router.put("/stations/{station_id}")
-async def update_station(station_id: int, data: StationUpdate, db: Session = Depends(get_db)):
+def update_station(station_id: int, data: StationUpdate, db: Session = Depends(get_db)):
     """Update a station's fields."""
     updates = {k: v for k, v in data.dict().items() if v is not None}
     if not updates:
@@ -397,7 +398,7 @@ async def update_station(station_id: int, data: StationUpdate, db: Session = Dep
 
 
 @router.delete("/stations/{station_id}")
-async def delete_station(station_id: int, db: Session = Depends(get_db)):
+def delete_station(station_id: int, db: Session = Depends(get_db)):
     """Remove a station (cascades to its units)."""
     result = db.execute(text(
         "DELETE FROM neris_stations WHERE id = :id RETURNING id"
@@ -414,7 +415,7 @@ async def delete_station(station_id: int, db: Session = Depends(get_db)):
 # =============================================================================
 
 @router.post("/stations/{station_id}/units")
-async def add_unit(station_id: int, data: UnitCreate, db: Session = Depends(get_db)):
+def add_unit(station_id: int, data: UnitCreate, db: Session = Depends(get_db)):
     """Add a unit to a station."""
     exists = db.execute(text(
         "SELECT 1 FROM neris_stations WHERE id = :id"
@@ -458,7 +459,7 @@ async def add_unit(station_id: int, data: UnitCreate, db: Session = Depends(get_
 
 
 @router.put("/units/{unit_id}")
-async def update_unit(unit_id: int, data: UnitUpdate, db: Session = Depends(get_db)):
+def update_unit(unit_id: int, data: UnitUpdate, db: Session = Depends(get_db)):
     """Update a unit's fields."""
     updates = {k: v for k, v in data.dict().items() if v is not None}
 
@@ -488,7 +489,7 @@ async def update_unit(unit_id: int, data: UnitUpdate, db: Session = Depends(get_
 
 
 @router.delete("/units/{unit_id}")
-async def delete_unit(unit_id: int, db: Session = Depends(get_db)):
+def delete_unit(unit_id: int, db: Session = Depends(get_db)):
     """Remove a unit."""
     result = db.execute(text(
         "DELETE FROM neris_units WHERE id = :id RETURNING id"
@@ -504,7 +505,7 @@ async def delete_unit(unit_id: int, db: Session = Depends(get_db)):
 # =============================================================================
 
 @router.post("/entity/validate")
-async def validate_entity(db: Session = Depends(get_db)):
+def validate_entity(db: Session = Depends(get_db)):
     """
     Local completeness check for the Entity before submission to NERIS.
     Returns list of errors and warnings.
@@ -583,7 +584,7 @@ async def submit_entity(db: Session = Depends(get_db)):
     Build the NERIS Entity payload and POST it to the NERIS API.
     Runs local validation first — blocks submission if errors exist.
     """
-    validation = await validate_entity(db)
+    validation = await run_blocking(validate_entity, db)
     if not validation["valid"]:
         return {
             "success": False,
@@ -592,19 +593,10 @@ async def submit_entity(db: Session = Depends(get_db)):
             "warnings": validation["warnings"],
         }
 
-    entity = _get_entity(db)
-    stations = _get_stations(db, entity["id"])
+    entity, stations, creds = await run_blocking(_load_submission_context, db)
 
     payload = _build_entity_payload(entity, stations)
 
-    # Load NERIS credentials from tenant settings
-    creds = {}
-    rows = db.execute(text(
-        "SELECT key, value FROM settings WHERE category = 'neris' AND key IN ('client_id','client_secret','environment')"
-    )).fetchall()
-    for row in rows:
-        creds[row[0]] = row[1]
-
     if not creds.get("client_id") or not creds.get("client_secret"):
         return {
             "success": False,
@@ -623,10 +615,7 @@ async def submit_entity(db: Session = Depends(get_db)):
     try:
         result = await client.submit_entity(entity["fd_neris_id"], payload)
     except NerisApiError as e:
-        db.execute(text("""
-            UPDATE neris_entity SET neris_entity_status = 'error', updated_at = NOW() WHERE id = :id
-        """), {"id": entity["id"]})
-        db.commit()
+        await run_blocking(_set_entity_submit_status, db, entity["id"], "error")
         return {
             "success": False,
             "api_error": e.detail,
@@ -636,14 +625,7 @@ async def submit_entity(db: Session = Depends(get_db)):
         }
 
     # Record successful submission
-    db.execute(text("""
-        UPDATE neris_entity
-        SET neris_entity_status = 'submitted',
-            neris_entity_submitted_at = :now,
-            updated_at = NOW()
-        WHERE id = :id
-    """), {"id": entity["id"], "now": datetime.now(timezone.utc)})
-    db.commit()
+    await run_blocking(_set_entity_submit_status, db, entity["id"], "submitted")
 
     return {
         "success": True,
@@ -652,6 +634,39 @@ async def submit_entity(db: Session = Depends(get_db)):
     }
 
 
+def _load_submission_context(db: Session) -> tuple:
+    """Entity, stations and NERIS credentials for submit_entity (sync DB work)."""
+    entity = _get_entity(db)
+    stations = _get_stations(db, entity["id"])
+
+    # Load NERIS credentials from tenant settings
+    creds = {}
+    rows = db.execute(text(
+        "SELECT key, value FROM settings WHERE category = 'neris' AND key IN ('client_id','client_secret','environment')"
+    )).fetchall()
+    for row in rows:
+        creds[row[0]] = row[1]
+
+    return entity, stations, creds
+
+
+def _set_entity_submit_status(db: Session, entity_id: int, status: str):
+    """Record the outcome of an entity submission."""
+    if status == "submitted":
+        db.execute(text("""
+            UPDATE neris_entity
+            SET neris_entity_status = 'submitted',
+                neris_entity_submitted_at = :now,
+                updated_at = NOW()
+            WHERE id = :id
+        """), {"id": entity_id, "now": datetime.now(timezone.utc)})
+    else:
+        db.execute(text("""
+            UPDATE neris_entity SET neris_entity_status = :status, updated_at = NOW() WHERE id = :id
+        """), {"id": entity_id, "status": status})
+    db.commit()
+
+
 def _build_entity_payload(entity: dict, stations: list) -> dict:
     """
     Build the NERIS DepartmentPayload dict from entity + stations data.
@@ -1058,7 +1073,7 @@ async def search_neris_entities(
     if not is_neris_id and len(q) < 3:
         raise HTTPException(status_code=400, detail="Name search requires at least 3 characters")
 
-    client = _get_neris_client(db)
+    client = await run_blocking(_get_neris_client, db)
     try:
         if is_neris_id:
             result = await client.search_entities(neris_id=q)
@@ -1100,7 +1115,7 @@ async def pull_neris_entity(
     from services.neris.api_client import NerisApiError
 
     # Resolve NERIS ID
-    entity = _get_entity(db)
+    entity = await run_blocking(_get_entity, db)
     fd_neris_id = data.fd_neris_id or (entity.get("fd_neris_id") if entity else None)
     if not fd_neris_id:
         raise HTTPException(
@@ -1108,7 +1123,7 @@ async def pull_neris_entity(
             detail="No NERIS ID provided and none stored in entity record",
         )
 
-    client = _get_neris_client(db)
+    client = await run_blocking(_get_neris_client, db)
     try:
         neris_data = await client.get_entity(fd_neris_id)
     except NerisApiError as e:
@@ -1116,7 +1131,7 @@ async def pull_neris_entity(
 
     # Build local snapshot for diffing
     local_entity   = entity or {}
-    local_stations = _get_stations(db, local_entity["id"]) if local_entity.get("id") else []
+    local_stations = await run_blocking(_get_stations, db, local_entity["id"]) if local_entity.get("id") else []
 
     # NERIS stations are nested under the entity response
     neris_stations = neris_data.get("stations", [])
@@ -1142,7 +1157,7 @@ async def pull_neris_entity(
 
 
 @router.post("/entity/pull/apply")
-async def apply_neris_pull(
+def apply_neris_pull(
     data: ApplyRequest,
     db: Session = Depends(get_db),
 ):
@@ -28,6 +28,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text
 
 from database import get_db
+from executors import run_blocking
 
 logger = logging.getLogger(__name__)
 
@@ -85,7 +86,7 @@ class NerisImportRequest(BaseModel):
 # =============================================================================
 
 @router.get("/departments")
-async def list_departments(
+def list_departments(
     include_inactive: bool = False,
     db: Session = Depends(get_db),
 ):
@@ -131,7 +132,7 @@ async def list_departments(
 
 
 @router.post("/departments")
-async def create_department(
+def create_department(
     dept: DepartmentCreate,
     db: Session = Depends(get_db),
 ):
@@ -170,7 +171,7 @@ async def create_department(
 
 
 @router.put("/departments/{dept_id}")
-async def update_department(
+def update_department(
     dept_id: int,
     update: DepartmentUpdate,
     db: Session = Depends(get_db),
@@ -211,7 +212,7 @@ async def update_department(
 
 
 @router.delete("/departments/{dept_id}")
-async def deactivate_department(
+def deactivate_department(
     dept_id: int,
     db: Session = Depends(get_db),
 ):
@@ -234,7 +235,7 @@ async def deactivate_department(
 # =============================================================================
 
 @router.get("/departments/{dept_id}/units")
-async def list_units(
+def list_units(
     dept_id: int,
     include_inactive: bool = False,
     db: Session = Depends(get_db),
@@ -278,7 +279,7 @@ async def list_units(
 
 
 @router.post("/departments/{dept_id}/units")
-async def create_unit(
+def create_unit(
     dept_id: int,
     unit: UnitCreate,
     db: Session = Depends(get_db),
@@ -310,7 +311,7 @@ async def create_unit(
 
 
 @router.put("/units/{unit_id}")
-async def update_unit(
+def update_unit(
     unit_id: int,
     update: UnitUpdate,
     db: Session = Depends(get_db),
@@ -346,7 +347,7 @@ async def update_unit(
 
 
 @router.delete("/units/{unit_id}")
-async def delete_unit(
+def delete_unit(
     unit_id: int,
     db: Session = Depends(get_db),
 ):
@@ -382,7 +383,7 @@ async def search_neris_departments(
     import httpx
 
     # Get NERIS credentials from settings
-    creds = _get_neris_credentials(db)
+    creds = await run_blocking(_get_neris_credentials, db)
     if not creds:
         raise HTTPException(status_code=400, detail="NERIS API credentials not configured")
 
@@ -409,23 +410,21 @@ async def search_neris_departments(
     # Extract department list from response
     entities = data if isinstance(data, list) else data.get("results", data.get("entities", []))
 
+    # Apply name filter if provided
+    if name_filter:
+        entities = [e for e in entities if name_filter.lower() in e.get("name", "").lower()]
+
+    # Check which are already imported (one query, off the event loop)
+    imported_ids = await run_blocking(
+        _get_imported_entity_ids, db,
+        [e.get("neris_id") for e in entities if e.get("neris_id")],
+    )
+
     results = []
     for entity in entities:
         name = entity.get("name", "")
-
-        # Apply name filter if provided
-        if name_filter and name_filter.lower() not in name.lower():
-            continue
-
-        # Check if already imported
         neris_id = entity.get("neris_id", "")
-        already_imported = False
-        if neris_id:
-            existing = db.execute(
-                text("SELECT id FROM neris_mutual_aid_departments WHERE neris_entity_id = :eid"),
-                {"eid": neris_id}
-            ).fetchone()
-            already_imported = existing is not None
+        already_imported = bool(neris_id) and neris_id in imported_ids
 
         results.append({
             "neris_entity_id": neris_id,
@@ -446,7 +445,7 @@ async def search_neris_departments(
 
 
 @router.post("/import-neris")
-async def import_neris_departments(
+def import_neris_departments(
     request: NerisImportRequest,
     db: Session = Depends(get_db),
 ):
@@ -513,6 +512,17 @@ def _get_neris_credentials(db: Session) -> Optional[dict]:
     }
 
 
+def _get_imported_entity_ids(db: Session, neris_ids: list) -> set:
+    """Return the subset of NERIS entity IDs already in neris_mutual_aid_departments."""
+    if not neris_ids:
+        return set()
+    rows = db.execute(
+        text("SELECT neris_entity_id FROM neris_mutual_aid_departments WHERE neris_entity_id = ANY(:eids)"),
+        {"eids": neris_ids}
+    ).fetchall()
+    return {r[0] for r in rows}
+
+
 async def _get_neris_token(creds: dict) -> str:
     """Authenticate with NERIS OAuth2 password grant and return access token."""
     import httpx
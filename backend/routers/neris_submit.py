@@ -19,6 +19,7 @@ from datetime import datetime, timezone
 import logging
 
 from database import get_db
+from executors import run_blocking
 from models import Incident, IncidentUnit, Setting
 from services.neris.builder import build_and_validate
 from services.neris.api_client import NerisApiClient, NerisApiError
@@ -102,7 +103,7 @@ def _build_preview(incident, db: Session, settings: dict) -> dict:
 
 
 @router.get("/preview/{incident_id}")
-async def preview_neris_payload(incident_id: int, db: Session = Depends(get_db)):
+def preview_neris_payload(incident_id: int, db: Session = Depends(get_db)):
     """Build and validate NERIS payload without submitting."""
     incident = db.query(Incident).filter(Incident.id == incident_id).first()
     if not incident:
@@ -112,14 +113,21 @@ async def preview_neris_payload(incident_id: int, db: Session = Depends(get_db))
     return _build_preview(incident, db, settings)
 
 
-@router.post("/submit/{incident_id}")
-async def submit_to_neris(incident_id: int, db: Session = Depends(get_db)):
-    """Validate and POST incident to NERIS."""
+def _prepare_submission(db: Session, incident_id: int, resubmit: bool) -> dict:
+    """
+    Load incident + settings and build/validate the payload.
+    Sync DB work for submit/resubmit — called via run_blocking().
+    """
     incident = db.query(Incident).filter(Incident.id == incident_id).first()
     if not incident:
         raise HTTPException(status_code=404, detail="Incident not found")
 
-    if incident.neris_submission_id:
+    if resubmit and not incident.neris_submission_id:
+        raise HTTPException(
+            status_code=400,
+            detail="Incident has not been submitted yet. Use submit first.",
+        )
+    if not resubmit and incident.neris_submission_id:
         raise HTTPException(
             status_code=400,
             detail=f"Already submitted as {incident.neris_submission_id}. Use resubmit to update.",
@@ -134,8 +142,30 @@ async def submit_to_neris(incident_id: int, db: Session = Depends(get_db)):
     if not department_neris_id:
         raise HTTPException(status_code=400, detail="fd_neris_id not configured in neris_entity.")
 
-    # Build and validate
-    result = _build_preview(incident, db, settings)
+    return {
+        "incident": incident,
+        "settings": settings,
+        "department_neris_id": department_neris_id,
+        "result": _build_preview(incident, db, settings),
+    }
+
+
+def _record_submission(db: Session, incident, neris_id: str = None):
+    """Update incident submission tracking after a successful API call."""
+    now = datetime.now(timezone.utc)
+    if neris_id is not None:
+        incident.neris_submission_id = neris_id
+        incident.neris_validation_errors = None
+    incident.neris_submitted_at = now
+    incident.neris_last_validated_at = now
+    db.commit()
+
+
+@router.post("/submit/{incident_id}")
+async def submit_to_neris(incident_id: int, db: Session = Depends(get_db)):
+    """Validate and POST incident to NERIS."""
+    prepared = await run_blocking(_prepare_submission, db, incident_id, False)
+    result = prepared["result"]
     if not result["valid"]:
         return {
             "success": False,
@@ -145,9 +175,9 @@ async def submit_to_neris(incident_id: int, db: Session = Depends(get_db)):
         }
 
     # Submit to NERIS: POST /incident/{department_neris_id}
-    client = _get_client(settings)
+    client = _get_client(prepared["settings"])
     try:
-        api_result = await client.create_incident(department_neris_id, result["payload"])
+        api_result = await client.create_incident(prepared["department_neris_id"], result["payload"])
     except NerisApiError as e:
         return {
             "success": False,
@@ -159,11 +189,7 @@ async def submit_to_neris(incident_id: int, db: Session = Depends(get_db)):
 
     # Update incident with submission tracking
     neris_id = api_result.get("neris_id") or api_result.get("id") or api_result.get("incident_neris_id")
-    incident.neris_submission_id = neris_id
-    incident.neris_submitted_at = datetime.now(timezone.utc)
-    incident.neris_validation_errors = None
-    incident.neris_last_validated_at = datetime.now(timezone.utc)
-    db.commit()
+    await run_blocking(_record_submission, db, prepared["incident"], neris_id)
 
     return {
         "success": True,
@@ -176,27 +202,9 @@ async def submit_to_neris(incident_id: int, db: Session = Depends(get_db)):
 @router.post("/resubmit/{incident_id}")
 async def resubmit_to_neris(incident_id: int, db: Session = Depends(get_db)):
     """Validate and PATCH existing incident in NERIS."""
-    incident = db.query(Incident).filter(Incident.id == incident_id).first()
-    if not incident:
-        raise HTTPException(status_code=404, detail="Incident not found")
-
-    if not incident.neris_submission_id:
-        raise HTTPException(
-            status_code=400,
-            detail="Incident has not been submitted yet. Use submit first.",
-        )
-
-    settings = _get_neris_settings(db)
-    entity_row = db.execute(
-        text("SELECT fd_neris_id FROM neris_entity LIMIT 1")
-    ).fetchone()
-    department_neris_id = entity_row[0] if entity_row and entity_row[0] else settings.get("department_neris_id")
-
-    if not department_neris_id:
-        raise HTTPException(status_code=400, detail="fd_neris_id not configured in neris_entity.")
-
-    # Build and validate
-    result = _build_preview(incident, db, settings)
+    prepared = await run_blocking(_prepare_submission, db, incident_id, True)
+    incident = prepared["incident"]
+    result = prepared["result"]
     if not result["valid"]:
         return {
             "success": False,
@@ -206,10 +214,10 @@ async def resubmit_to_neris(incident_id: int, db: Session = Depends(get_db)):
         }
 
     # PATCH to NERIS: PATCH /incident/{department_neris_id}/{incident_neris_id}
-    client = _get_client(settings)
+    client = _get_client(prepared["settings"])
     try:
         api_result = await client.update_incident(
-            department_neris_id,
+            prepared["department_neris_id"],
             incident.neris_submission_id,
             result["payload"],
         )
@@ -223,9 +231,7 @@ async def resubmit_to_neris(incident_id: int, db: Session = Depends(get_db)):
         }
 
     # Update tracking
-    incident.neris_submitted_at = datetime.now(timezone.utc)
-    incident.neris_last_validated_at = datetime.now(timezone.utc)
-    db.commit()
+    await run_blocking(_record_submission, db, incident)
 
     return {
         "success": True,
@@ -237,7 +243,7 @@ async def resubmit_to_neris(incident_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/status/{incident_id}")
-async def get_neris_status(incident_id: int, db: Session = Depends(get_db)):
+def get_neris_status(incident_id: int, db: Session = Depends(get_db)):
     """Check NERIS submission status for an incident."""
     incident = db.query(Incident).filter(Incident.id == incident_id).first()
     if not incident:
@@ -262,7 +268,7 @@ class PsapTimestampUpdate(BaseModel):
 
 
 @router.patch("/psap/{incident_id}")
-async def update_psap(incident_id: int, data: PsapTimestampUpdate, db: Session = Depends(get_db)):
+def update_psap(incident_id: int, data: PsapTimestampUpdate, db: Session = Depends(get_db)):
     """Update PSAP timestamps on an incident. Values are ISO 8601 strings or null to clear."""
     incident = db.query(Incident).filter(Incident.id == incident_id).first()
     if not incident:
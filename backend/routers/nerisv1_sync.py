@@ -25,6 +25,7 @@ from sqlalchemy.orm import Session
 from sqlalchemy import text
 
 from database import get_db
+from executors import run_blocking
 
 logger = logging.getLogger(__name__)
 
@@ -197,6 +198,11 @@ async def sync_codes(
         logger.error(f"Failed to fetch OpenAPI spec from {spec_url}: {e}")
         return {"error": f"Failed to fetch spec: {e}", "spec_url": spec_url}
 
+    return await run_blocking(_apply_spec, db, spec, spec_url)
+
+
+def _apply_spec(db: Session, spec: dict, spec_url: str) -> dict:
+    """Upsert enum values from a fetched OpenAPI spec. Runs in the threadpool."""
     version = spec.get("info", {}).get("version", "unknown")
     schemas = spec.get("components", {}).get("schemas", {})
 
@@ -62,7 +62,7 @@ class PersonnelUpdate(BaseModel):
 
 
 @router.get("")
-async def list_personnel(
+def list_personnel(
     active_only: bool = True,
     db: Session = Depends(get_db)
 ):
@@ -116,12 +116,12 @@ async def list_personnel(
 
 
 @router.get("/by-rank")
-async def personnel_by_rank(
+def personnel_by_rank(
     active_only: bool = True,
     db: Session = Depends(get_db)
 ):
     """Get personnel grouped by rank for dropdown"""
-    personnel = await list_personnel(active_only, db)
+    personnel = list_personnel(active_only, db)
     
     grouped = {}
     for p in personnel:
@@ -139,7 +139,7 @@ async def personnel_by_rank(
 
 
 @router.get("/ranks")
-async def list_ranks(
+def list_ranks(
     active_only: bool = True,
     db: Session = Depends(get_db)
 ):
@@ -181,7 +181,7 @@ class RankUpdate(BaseModel):
 
 
 @router.post("/ranks")
-async def create_rank(
+def create_rank(
     data: RankCreate,
     db: Session = Depends(get_db)
 ):
@@ -198,7 +198,7 @@ async def create_rank(
 
 
 @router.put("/ranks/{rank_id}")
-async def update_rank(
+def update_rank(
     rank_id: int,
     data: RankUpdate,
     db: Session = Depends(get_db)
@@ -218,7 +218,7 @@ async def update_rank(
 
 
 @router.delete("/ranks/{rank_id}")
-async def delete_rank(
+def delete_rank(
     rank_id: int,
     db: Session = Depends(get_db)
 ):
@@ -247,7 +247,7 @@ async def delete_rank(
 # =============================================================================
 
 @router.get("/needs-review")
-async def get_personnel_needing_review(db: Session = Depends(get_db)):
+def get_personnel_needing_review(db: Session = Depends(get_db)):
     """
     Get list of personnel who were manually added and need profile review.
     These are typically added during roll call attendance entry.
@@ -276,7 +276,7 @@ async def get_personnel_needing_review(db: Session = Depends(get_db)):
 
 
 @router.post("/needs-review/{personnel_id}/complete")
-async def complete_profile_review(
+def complete_profile_review(
     personnel_id: int,
     db: Session = Depends(get_db)
 ):
@@ -301,7 +301,7 @@ async def complete_profile_review(
 
 
 @router.post("/quick-add")
-async def quick_add_personnel(
+def quick_add_personnel(
     first_name: str,
     last_name: str,
     db: Session = Depends(get_db)
@@ -356,7 +356,7 @@ async def quick_add_personnel(
 
 
 @router.get("/{id}")
-async def get_personnel(id: int, db: Session = Depends(get_db)):
+def get_personnel(id: int, db: Session = Depends(get_db)):
     """Get single personnel"""
     person = db.query(Personnel).filter(Personnel.id == id).first()
     
@@ -380,7 +380,7 @@ async def get_personnel(id: int, db: Session = Depends(get_db)):
 
 
 @router.post("")
-async def create_personnel(
+def create_personnel(
     data: PersonnelCreate,
     db: Session = Depends(get_db)
 ):
@@ -400,7 +400,7 @@ async def create_personnel(
 
 
 @router.put("/{id}")
-async def update_personnel(
+def update_personnel(
     id: int,
     data: PersonnelUpdate,
     db: Session = Depends(get_db)
@@ -422,7 +422,7 @@ async def update_personnel(
 
 
 @router.delete("/{id}")
-async def delete_personnel(id: int, db: Session = Depends(get_db)):
+def delete_personnel(id: int, db: Session = Depends(get_db)):
     """Deactivate personnel"""
     person = db.query(Personnel).filter(Personnel.id == id).first()
     
@@ -472,7 +472,7 @@ class UpdateRoleRequest(BaseModel):
 
 
 @router.post("/auth/login")
-async def login(
+def login(
     data: LoginRequest,
     db: Session = Depends(get_db)
 ):
@@ -518,7 +518,7 @@ async def login(
 
 
 @router.post("/auth/register")
-async def register(
+def register(
     data: RegisterRequest,
     request: Request,
     db: Session = Depends(get_db)
@@ -580,7 +580,7 @@ async def register(
 
 
 @router.post("/auth/verify-email")
-async def verify_email(
+def verify_email(
     data: VerifyEmailRequest,
     db: Session = Depends(get_db)
 ):
@@ -618,7 +618,7 @@ async def verify_email(
 
 
 @router.post("/auth/set-password")
-async def set_password(
+def set_password(
     data: SetPasswordRequest,
     db: Session = Depends(get_db)
 ):
@@ -646,7 +646,7 @@ async def set_password(
 
 
 @router.post("/{id}/approve")
-async def approve_member(
+def approve_member(
     id: int,
     data: ApproveRequest,
     db: Session = Depends(get_db)
@@ -699,7 +699,7 @@ async def approve_member(
 
 
 @router.put("/{id}/role")
-async def update_role(
+def update_role(
     id: int,
     data: UpdateRoleRequest,
     db: Session = Depends(get_db)
@@ -734,7 +734,7 @@ async def update_role(
 
 
 @router.get("/auth/status/{id}")
-async def get_auth_status(
+def get_auth_status(
     id: int,
     db: Session = Depends(get_db)
 ):
@@ -985,7 +985,7 @@ async def preview_csv_import(
 
 
 @router.post("/import/execute")
-async def execute_csv_import(
+def execute_csv_import(
     file: UploadFile = File(...),
     clear_existing: bool = False,
     db: Session = Depends(get_db)
@@ -998,7 +998,7 @@ async def execute_csv_import(
         raise HTTPException(status_code=400, detail="File must be a CSV")
     
     try:
-        contents = await file.read()
+        contents = file.file.read()
         try:
             csv_text = contents.decode('utf-8-sig')
         except UnicodeDecodeError:
@@ -1241,7 +1241,7 @@ class RequestEmailChangeRequest(BaseModel):
 # -----------------------------------------------------------------------------
 
 @router.post("/{id}/send-password-reset")
-async def send_password_reset(
+def send_password_reset(
     id: int,
     data: SendPasswordResetRequest,
     request: Request,
@@ -1306,7 +1306,7 @@ async def send_password_reset(
 
 
 @router.get("/auth/validate-reset/{token}")
-async def validate_reset_token(
+def validate_reset_token(
     token: str,
     db: Session = Depends(get_db)
 ):
@@ -1334,7 +1334,7 @@ async def validate_reset_token(
 
 
 @router.post("/auth/complete-reset")
-async def complete_password_reset(
+def complete_password_reset(
     data: CompletePasswordResetRequest,
     db: Session = Depends(get_db)
 ):
@@ -1375,7 +1375,7 @@ async def complete_password_reset(
 # -----------------------------------------------------------------------------
 
 @router.post("/{id}/send-invite")
-async def send_invite(
+def send_invite(
     id: int,
     data: SendInviteRequest,
     request: Request,
@@ -1441,7 +1441,7 @@ async def send_invite(
 
 
 @router.post("/{id}/resend-invite")
-async def resend_invite(
+def resend_invite(
     id: int,
     data: SendPasswordResetRequest,  # Reuse same schema (admin_id, admin_password)
     request: Request,
@@ -1506,7 +1506,7 @@ async def resend_invite(
 
 
 @router.get("/auth/validate-invite/{token}")
-async def validate_invite_token(
+def validate_invite_token(
     token: str,
     db: Session = Depends(get_db)
 ):
@@ -1534,7 +1534,7 @@ async def validate_invite_token(
 
 
 @router.post("/auth/accept-invite")
-async def accept_invite(
+def accept_invite(
     data: AcceptInviteRequest,
     request: Request,
     db: Session = Depends(get_db)
@@ -1690,7 +1690,7 @@ async def accept_invite(
 # -----------------------------------------------------------------------------
 
 @router.get("/me")
-async def get_my_profile(
+def get_my_profile(
     request: Request,
     db: Session = Depends(get_db)
 ):
@@ -1722,7 +1722,7 @@ async def get_my_profile(
 
 
 @router.put("/me/notifications")
-async def update_my_notifications(
+def update_my_notifications(
     data: UpdateNotificationPrefsRequest,
     request: Request,
     db: Session = Depends(get_db)
@@ -1756,7 +1756,7 @@ async def update_my_notifications(
 
 
 @router.post("/me/change-password")
-async def change_my_password(
+def change_my_password(
     data: ChangePasswordRequest,
     request: Request,
     db: Session = Depends(get_db)
@@ -1794,7 +1794,7 @@ async def change_my_password(
 
 
 @router.post("/me/request-email-change")
-async def request_email_change(
+def request_email_change(
     data: RequestEmailChangeRequest,
     request: Request,
     db: Session = Depends(get_db)
@@ -1864,7 +1864,7 @@ async def request_email_change(
 
 
 @router.get("/auth/validate-email-change/{token}")
-async def validate_email_change_token(
+def validate_email_change_token(
     token: str,
     db: Session = Depends(get_db)
 ):
@@ -1894,7 +1894,7 @@ async def validate_email_change_token(
 
 
 @router.post("/auth/confirm-email-change")
-async def confirm_email_change(
+def confirm_email_change(
     token: str,
     db: Session = Depends(get_db)
 ):
@@ -1939,7 +1939,7 @@ async def confirm_email_change(
 # -----------------------------------------------------------------------------
 
 @router.get("/{id}/full")
-async def get_personnel_full(
+def get_personnel_full(
     id: int,
     db: Session = Depends(get_db)
 ):
@@ -1992,7 +1992,7 @@ async def get_personnel_full(
 # =============================================================================
 
 @router.post("/sync-from-dashboard")
-async def sync_from_dashboard(db: Session = Depends(get_db)):
+def sync_from_dashboard(db: Session = Depends(get_db)):
     """
     Placeholder for syncing personnel from Dashboard database.
     Future: Connect to dashboard_db and import personnel.
@@ -11,18 +11,19 @@ from sqlalchemy import text
 import json
 
 from database import get_db
+from settings_cache import settings_changed
 from report_engine.layout_config import DEFAULT_PRINT_LAYOUT, get_layout, validate_layout
 
 router = APIRouter()
 
 
 @router.get("")
-async def get_print_layout(db: Session = Depends(get_db)):
+def get_print_layout(db: Session = Depends(get_db)):
     return get_layout(db)
 
 
 @router.put("")
-async def update_print_layout(layout: dict, db: Session = Depends(get_db)):
+def update_print_layout(layout: dict, db: Session = Depends(get_db)):
     errors = validate_layout(layout)
     if errors:
         raise HTTPException(status_code=400, detail={"message": "Invalid layout", "errors": errors})
@@ -45,13 +46,15 @@ async def update_print_layout(layout: dict, db: Session = Depends(get_db)):
         )
     
     db.commit()
+    settings_changed(db)
     return {"status": "ok", "message": "Layout saved", "version": layout.get("version")}
 
 
 @router.post("/reset")
-async def reset_print_layout(db: Session = Depends(get_db)):
+def reset_print_layout(db: Session = Depends(get_db)):
     db.execute(text("DELETE FROM settings WHERE category = 'print' AND key = 'layout'"))
     db.commit()
+    settings_changed(db)
     return {"status": "ok", "message": "Layout reset to defaults", "version": DEFAULT_PRINT_LAYOUT["version"]}
 
 
@@ -61,7 +64,7 @@ async def get_default_layout():
 
 
 @router.get("/blocks")
-async def get_all_blocks(db: Session = Depends(get_db)):
+def get_all_blocks(db: Session = Depends(get_db)):
     layout = get_layout(db)
     return {
         "version": layout.get("version"),
@@ -71,7 +74,7 @@ async def get_all_blocks(db: Session = Depends(get_db)):
 
 
 @router.put("/blocks/{block_id}")
-async def update_block(block_id: str, updates: dict, db: Session = Depends(get_db)):
+def update_block(block_id: str, updates: dict, db: Session = Depends(get_db)):
     layout = get_layout(db)
     
     block_found = False
@@ -110,4 +113,5 @@ async def update_block(block_id: str, updates: dict, db: Session = Depends(get_d
         )
     
     db.commit()
+    settings_changed(db)
     return {"status": "ok", "block_id": block_id, "updates": updates}
@@ -37,7 +37,7 @@ router = APIRouter()
 # =============================================================================
 
 @router.get("/personnel")
-async def get_personnel_report(
+def get_personnel_report(
     start_date: date = Query(...),
     end_date: date = Query(...),
     category: Optional[str] = Query(None, description="FIRE or EMS filter"),
@@ -61,7 +61,7 @@ async def get_personnel_report(
 
 
 @router.get("/personnel/html")
-async def get_personnel_html(
+def get_personnel_html(
     start_date: date = Query(...),
     end_date: date = Query(...),
     category: Optional[str] = Query(None),
@@ -83,7 +83,7 @@ async def get_personnel_html(
 
 
 @router.get("/personnel/pdf")
-async def get_personnel_pdf(
+def get_personnel_pdf(
     start_date: date = Query(...),
     end_date: date = Query(...),
     category: Optional[str] = Query(None),
@@ -119,7 +119,7 @@ async def get_personnel_pdf(
 # =============================================================================
 
 @router.get("/details")
-async def get_details_report(
+def get_details_report(
     start_date: date = Query(...),
     end_date: date = Query(...),
     limit: int = Query(50, le=100),
@@ -141,7 +141,7 @@ async def get_details_report(
 
 
 @router.get("/details/html")
-async def get_details_html(
+def get_details_html(
     start_date: date = Query(...),
     end_date: date = Query(...),
     limit: int = Query(50, le=100),
@@ -161,7 +161,7 @@ async def get_details_html(
 
 
 @router.get("/details/pdf")
-async def get_details_pdf(
+def get_details_pdf(
     start_date: date = Query(...),
     end_date: date = Query(...),
     limit: int = Query(50, le=100),
@@ -190,7 +190,7 @@ async def get_details_pdf(
 
 
 @router.get("/details/{personnel_id}")
-async def get_detail_personnel(
+def get_detail_personnel(
     personnel_id: int,
     start_date: date = Query(...),
     end_date: date = Query(...),
@@ -217,7 +217,7 @@ async def get_detail_personnel(
 
 
 @router.get("/details/{personnel_id}/pdf")
-async def get_detail_personnel_pdf(
+def get_detail_personnel_pdf(
     personnel_id: int,
     start_date: date = Query(...),
     end_date: date = Query(...),
@@ -257,7 +257,7 @@ async def get_detail_personnel_pdf(
 
 
 @router.get("/personnel/{personnel_id}")
-async def get_personnel_detail(
+def get_personnel_detail(
     personnel_id: int,
     start_date: date = Query(...),
     end_date: date = Query(...),
@@ -284,7 +284,7 @@ async def get_personnel_detail(
 
 
 @router.get("/personnel/{personnel_id}/pdf")
-async def get_personnel_detail_pdf(
+def get_personnel_detail_pdf(
     personnel_id: int,
     start_date: date = Query(...),
     end_date: date = Query(...),
@@ -328,7 +328,7 @@ async def get_personnel_detail_pdf(
 # =============================================================================
 
 @router.get("/units")
-async def get_units_report(
+def get_units_report(
     start_date: date = Query(...),
     end_date: date = Query(...),
     include_virtual: bool = Query(False, description="Include DIRECT/STATION units"),
@@ -351,7 +351,7 @@ async def get_units_report(
 
 
 @router.get("/units/html")
-async def get_units_html(
+def get_units_html(
     start_date: date = Query(...),
     end_date: date = Query(...),
     include_virtual: bool = Query(False),
@@ -371,7 +371,7 @@ async def get_units_html(
 
 
 @router.get("/units/pdf")
-async def get_units_pdf(
+def get_units_pdf(
     start_date: date = Query(...),
     end_date: date = Query(...),
     include_virtual: bool = Query(False),
@@ -400,7 +400,7 @@ async def get_units_pdf(
 
 
 @router.get("/units/{unit_id}")
-async def get_unit_detail(
+def get_unit_detail(
     unit_id: int,
     start_date: date = Query(...),
     end_date: date = Query(...),
@@ -427,7 +427,7 @@ async def get_unit_detail(
 
 
 @router.get("/units/{unit_id}/pdf")
-async def get_unit_detail_pdf(
+def get_unit_detail_pdf(
     unit_id: int,
     start_date: date = Query(...),
     end_date: date = Query(...),
@@ -471,7 +471,7 @@ async def get_unit_detail_pdf(
 # =============================================================================
 
 @router.get("/incidents")
-async def get_incidents_report(
+def get_incidents_report(
     start_date: date = Query(...),
     end_date: date = Query(...),
     db: Session = Depends(get_db)
@@ -492,7 +492,7 @@ async def get_incidents_report(
 
 
 @router.get("/incidents/html")
-async def get_incidents_html(
+def get_incidents_html(
     start_date: date = Query(...),
     end_date: date = Query(...),
     db: Session = Depends(get_db)
@@ -510,7 +510,7 @@ async def get_incidents_html(
 
 
 @router.get("/incidents/pdf")
-async def get_incidents_pdf(
+def get_incidents_pdf(
     start_date: date = Query(...),
     end_date: date = Query(...),
     db: Session = Depends(get_db)
@@ -537,7 +537,7 @@ async def get_incidents_pdf(
 
 
 @router.get("/incidents/types/{incident_type}")
-async def get_incident_type_detail(
+def get_incident_type_detail(
     incident_type: str,
     start_date: date = Query(...),
     end_date: date = Query(...),
@@ -559,7 +559,7 @@ async def get_incident_type_detail(
 
 
 @router.get("/incidents/types/{incident_type}/pdf")
-async def get_incident_type_detail_pdf(
+def get_incident_type_detail_pdf(
     incident_type: str,
     start_date: date = Query(...),
     end_date: date = Query(...),
@@ -593,7 +593,7 @@ async def get_incident_type_detail_pdf(
 # =============================================================================
 
 @router.get("/details")
-async def get_details_report(
+def get_details_report(
     start_date: date = Query(...),
     end_date: date = Query(...),
     limit: int = Query(50, le=100),
@@ -615,7 +615,7 @@ async def get_details_report(
 
 
 @router.get("/details/html")
-async def get_details_html(
+def get_details_html(
     start_date: date = Query(...),
     end_date: date = Query(...),
     limit: int = Query(50, le=100),
@@ -635,7 +635,7 @@ async def get_details_html(
 
 
 @router.get("/details/pdf")
-async def get_details_pdf(
+def get_details_pdf(
     start_date: date = Query(...),
     end_date: date = Query(...),
     limit: int = Query(50, le=100),
@@ -664,7 +664,7 @@ async def get_details_pdf(
 
 
 @router.get("/details/{personnel_id}")
-async def get_detail_personnel(
+def get_detail_personnel(
     personnel_id: int,
     start_date: date = Query(...),
     end_date: date = Query(...),
@@ -691,7 +691,7 @@ async def get_detail_personnel(
 
 
 @router.get("/details/{personnel_id}/pdf")
-async def get_detail_personnel_pdf(
+def get_detail_personnel_pdf(
     personnel_id: int,
     start_date: date = Query(...),
     end_date: date = Query(...),
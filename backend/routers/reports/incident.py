@@ -11,6 +11,7 @@ from typing import Dict, List, Optional
 import io
 
 from database import get_db
+from executors import render_pdf
 from report_engine.branding_config import get_branding
 from report_engine.layout_config import get_layout, get_page_blocks, get_blocks_by_row
 from report_engine.templates import generate_css, generate_base_html, render_header
@@ -101,7 +102,7 @@ def _create_time_formatter(db: Session):
 
 
 @router.get("/html/incident/{incident_id}")
-async def get_incident_html_report(incident_id: int, db: Session = Depends(get_db)):
+def get_incident_html_report(incident_id: int, db: Session = Depends(get_db)):
     inc, personnel_lookup, apparatus_list, personnel_assignments, municipality_lookup = _load_incident_context(db, incident_id)
     branding = get_branding(db)
     
@@ -196,10 +197,8 @@ def _render_page(ctx: RenderContext, blocks: List[dict], branding: dict, is_firs
 
 
 @router.get("/pdf/incident/{incident_id}")
-async def get_incident_pdf(incident_id: int, db: Session = Depends(get_db)):
-    from weasyprint import HTML
-    
-    html_response = await get_incident_html_report(incident_id, db)
+def get_incident_pdf(incident_id: int, db: Session = Depends(get_db)):
+    html_response = get_incident_html_report(incident_id, db)
     html_content = html_response.body.decode('utf-8')
     
     incident = db.execute(
@@ -213,9 +212,7 @@ async def get_incident_pdf(incident_id: int, db: Session = Depends(get_db)):
     incident_number = incident[0] or f"INC{incident_id}"
     incident_date = incident[1] or datetime.now().date()
     
-    pdf_buffer = io.BytesIO()
-    HTML(string=html_content).write_pdf(pdf_buffer)
-    pdf_buffer.seek(0)
+    pdf_buffer = io.BytesIO(render_pdf(html_content))
     
     filename = f"incident_{incident_number}_{incident_date}.pdf"
     
@@ -223,7 +220,7 @@ async def get_incident_pdf(incident_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/preview/incident/{incident_id}")
-async def preview_incident_report(incident_id: int, db: Session = Depends(get_db)):
+def preview_incident_report(incident_id: int, db: Session = Depends(get_db)):
     inc, personnel_lookup, apparatus_list, personnel_assignments = _load_incident_context(db, incident_id)
     branding = get_branding(db)
     layout = get_layout(db)
@@ -4,6 +4,9 @@ Monthly Chiefs Report Router
 Filters by incident number prefix (F=Fire, E=EMS) rather than call_category.
 This is more accurate since the prefix reflects the final classification.
 Detail incidents (D-prefix) are always excluded from metrics.
+
+Counts, durations, manhours and "responded" come from the incident_metrics
+fact table; incidents is joined only for damage and mutual aid columns.
 """
 
 from fastapi import APIRouter, Depends, Query
@@ -15,100 +18,37 @@ from typing import Optional
 import io
 
 from database import get_db
+from executors import render_pdf
+from services.incident_metrics import category_filter
+from .stats import get_response_times
 from report_engine.branding_config import get_branding, get_logo_data_url
 
 router = APIRouter()
 
 
-def _build_prefix_filter(category: str = None, alias: str = "i") -> str:
-    """
-    Build SQL filter based on incident number prefix (F=Fire, E=EMS).
-    This is more accurate than call_category since the prefix reflects
-    the final classification after any category changes.
-    Detail incidents (D-prefix) are always excluded from metrics.
-    """
-    if category and category.upper() == 'FIRE':
-        return f"AND {alias}.internal_incident_number LIKE 'F%'"
-    elif category and category.upper() == 'EMS':
-        return f"AND {alias}.internal_incident_number LIKE 'E%'"
-    else:
-        # Default: include Fire and EMS, exclude Detail
-        return f"AND ({alias}.internal_incident_number LIKE 'F%' OR {alias}.internal_incident_number LIKE 'E%')"
-
-
-def _calculate_manhours(db: Session, start_date: date, end_date: date, category: str = None) -> dict:
-    prefix_filter = _build_prefix_filter(category)
-    
-    result = db.execute(text(f"""
-        WITH incident_durations AS (
-            SELECT i.id,
-                EXTRACT(EPOCH FROM (COALESCE(i.time_last_cleared, i.time_first_on_scene) - i.time_dispatched)) / 3600.0 AS duration_hours,
-                (SELECT COUNT(*) FROM incident_personnel ip WHERE ip.incident_id = i.id) AS personnel_count
-            FROM incidents i
-            WHERE COALESCE(i.incident_date, i.created_at::date) BETWEEN :start_date AND :end_date
-              AND i.deleted_at IS NULL AND i.time_dispatched IS NOT NULL {prefix_filter}
-        )
-        SELECT COALESCE(SUM(duration_hours * personnel_count), 0), COALESCE(SUM(personnel_count), 0), COUNT(*), COALESCE(AVG(duration_hours), 0)
-        FROM incident_durations WHERE duration_hours > 0 AND duration_hours < 24
-    """), {"start_date": start_date, "end_date": end_date})
-    
-    row = result.fetchone()
-    return {"total_manhours": round(float(row[0] or 0), 2), "total_responses": int(row[1] or 0), "incident_count": int(row[2] or 0), "avg_duration_hours": round(float(row[3] or 0), 2)}
-
-
-def _get_response_times(db: Session, start_date: date, end_date: date, category: str = None) -> dict:
-    # Note: no alias needed here since single table query
-    if category and category.upper() == 'FIRE':
-        prefix_filter = "AND internal_incident_number LIKE 'F%'"
-    elif category and category.upper() == 'EMS':
-        prefix_filter = "AND internal_incident_number LIKE 'E%'"
-    else:
-        prefix_filter = "AND (internal_incident_number LIKE 'F%' OR internal_incident_number LIKE 'E%')"
-    
-    result = db.execute(text(f"""
-        SELECT AVG(EXTRACT(EPOCH FROM (time_first_enroute - time_dispatched)) / 60),
-               AVG(EXTRACT(EPOCH FROM (time_first_on_scene - time_dispatched)) / 60),
-               AVG(EXTRACT(EPOCH FROM (time_last_cleared - time_first_on_scene)) / 60)
-        FROM incidents WHERE COALESCE(incident_date, created_at::date) BETWEEN :start_date AND :end_date
-          AND deleted_at IS NULL AND time_dispatched IS NOT NULL {prefix_filter}
-    """), {"start_date": start_date, "end_date": end_date})
-    
-    row = result.fetchone()
-    return {
-        "avg_turnout_minutes": round(float(row[0] or 0), 1) if row[0] else None,
-        "avg_response_minutes": round(float(row[1] or 0), 1) if row[1] else None,
-        "avg_on_scene_minutes": round(float(row[2] or 0), 1) if row[2] else None
-    }
-
-
 @router.get("/monthly")
-async def get_monthly_chiefs_report(year: int = Query(...), month: int = Query(...), category: Optional[str] = None, db: Session = Depends(get_db)):
-    prefix_filter = _build_prefix_filter(category)
+def get_monthly_chiefs_report(year: int = Query(...), month: int = Query(...), category: Optional[str] = None, db: Session = Depends(get_db)):
+    prefix_filter = category_filter(category)
     
     start_date = date(year, month, 1)
     end_date = date(year + 1, 1, 1) - timedelta(days=1) if month == 12 else date(year, month + 1, 1) - timedelta(days=1)
     prev_start = date(year - 1, month, 1)
     prev_end = date(year, 1, 1) - timedelta(days=1) if month == 12 else date(year - 1, month + 1, 1) - timedelta(days=1)
     
+    # manhours is NULL outside the 0-24h duration window
     summary_result = db.execute(text(f"""
-        WITH incident_data AS (
-            SELECT i.id,
-                EXTRACT(EPOCH FROM (COALESCE(i.time_last_cleared, i.time_first_on_scene) - i.time_dispatched)) / 3600.0 AS duration_hours,
-                (SELECT COUNT(*) FROM incident_personnel ip WHERE ip.incident_id = i.id) AS personnel_count
-            FROM incidents i
-            WHERE COALESCE(i.incident_date, i.created_at::date) BETWEEN :start_date AND :end_date
-              AND i.deleted_at IS NULL AND i.time_dispatched IS NOT NULL {prefix_filter}
-        )
-        SELECT COUNT(*), COALESCE(SUM(personnel_count), 0),
-            COALESCE(SUM(CASE WHEN duration_hours > 0 AND duration_hours < 24 THEN duration_hours ELSE 0 END), 0),
-            COALESCE(SUM(CASE WHEN duration_hours > 0 AND duration_hours < 24 THEN duration_hours * personnel_count ELSE 0 END), 0)
-        FROM incident_data
+        SELECT COUNT(*), COALESCE(SUM(m.personnel_count), 0),
+            COALESCE(SUM(CASE WHEN m.manhours IS NOT NULL THEN m.duration_seconds / 3600.0 ELSE 0 END), 0),
+            COALESCE(SUM(m.manhours), 0)
+        FROM incident_metrics m
+        WHERE m.incident_date BETWEEN :start_date AND :end_date
+          AND m.time_dispatched IS NOT NULL {prefix_filter}
     """), {"start_date": start_date, "end_date": end_date})
     
     summary_row = summary_result.fetchone()
     
     prev_result = db.execute(text(f"""
-        SELECT COUNT(*) FROM incidents i WHERE COALESCE(incident_date, created_at::date) BETWEEN :start_date AND :end_date AND deleted_at IS NULL {prefix_filter}
+        SELECT COUNT(*) FROM incident_metrics m WHERE m.incident_date BETWEEN :start_date AND :end_date {prefix_filter}
     """), {"start_date": prev_start, "end_date": prev_end})
     prev_count = prev_result.fetchone()[0]
     
@@ -122,22 +62,18 @@ async def get_monthly_chiefs_report(year: int = Query(...), month: int = Query(.
         damage_result = db.execute(text(f"""
             SELECT COALESCE(SUM(property_value_at_risk), 0), COALESCE(SUM(fire_damages_estimate), 0),
                    COALESCE(SUM(ff_injuries_count), 0), COALESCE(SUM(civilian_injuries_count), 0)
-            FROM incidents i WHERE COALESCE(i.incident_date, i.created_at::date) BETWEEN :start_date AND :end_date
-              AND i.deleted_at IS NULL AND (i.neris_aid_direction IS NULL OR i.neris_aid_direction != 'GIVEN') {prefix_filter}
+            FROM incident_metrics m JOIN incidents i ON i.id = m.incident_id
+            WHERE m.incident_date BETWEEN :start_date AND :end_date
+              AND (i.neris_aid_direction IS NULL OR i.neris_aid_direction != 'GIVEN') {prefix_filter}
         """), {"start_date": start_date, "end_date": end_date})
         damage_row = damage_result.fetchone()
         damage_stats = {"property_at_risk": int(damage_row[0] or 0), "fire_damages": int(damage_row[1] or 0), "ff_injuries": int(damage_row[2] or 0), "civilian_injuries": int(damage_row[3] or 0)}
     
-    # Count incidents where at least one non-mutual-aid unit went enroute (cad_units JSONB)
+    # Count incidents where at least one non-mutual-aid unit went enroute
     responded_result = db.execute(text(f"""
-        SELECT COUNT(*) FROM incidents i
-        WHERE COALESCE(i.incident_date, i.created_at::date) BETWEEN :start_date AND :end_date
-          AND i.deleted_at IS NULL {prefix_filter}
-          AND EXISTS (
-              SELECT 1 FROM jsonb_array_elements(i.cad_units) AS unit_elem
-              WHERE unit_elem->>'time_enroute' IS NOT NULL
-                AND (unit_elem->>'is_mutual_aid')::boolean IS NOT TRUE
-          )
+        SELECT COUNT(*) FROM incident_metrics m
+        WHERE m.incident_date BETWEEN :start_date AND :end_date
+          AND m.station_responded {prefix_filter}
     """), {"start_date": start_date, "end_date": end_date})
     responded_count = responded_result.fetchone()[0] or 0
     responded_pct = round((responded_count / current_count * 100), 1) if current_count > 0 else 0.0
@@ -146,32 +82,26 @@ async def get_monthly_chiefs_report(year: int = Query(...), month: int = Query(.
     unique_responders_result = db.execute(text(f"""
         SELECT COUNT(DISTINCT ip.personnel_id)
         FROM incident_personnel ip
-        JOIN incidents i ON ip.incident_id = i.id
-        WHERE COALESCE(i.incident_date, i.created_at::date) BETWEEN :start_date AND :end_date
-          AND i.deleted_at IS NULL {prefix_filter}
+        JOIN incident_metrics m ON ip.incident_id = m.incident_id
+        WHERE m.incident_date BETWEEN :start_date AND :end_date {prefix_filter}
     """), {"start_date": start_date, "end_date": end_date})
     unique_responders = unique_responders_result.fetchone()[0] or 0
     
     call_summary = {"number_of_calls": current_count, "responded": responded_count, "responded_pct": responded_pct, "unique_responders": unique_responders, "number_of_men": int(summary_row[1] or 0), "hours": round(float(summary_row[2] or 0), 2), "man_hours": round(float(summary_row[3] or 0), 2), "previous_year_calls": prev_count, "change": change, "percent_change": pct_change, **damage_stats}
     
     muni_result = db.execute(text(f"""
-        WITH incident_data AS (
-            SELECT i.id, COALESCE(m.display_name, i.municipality_code, 'Unknown') AS municipality,
-                EXTRACT(EPOCH FROM (COALESCE(i.time_last_cleared, i.time_first_on_scene) - i.time_dispatched)) / 3600.0 AS duration_hours,
-                (SELECT COUNT(*) FROM incident_personnel ip WHERE ip.incident_id = i.id) AS personnel_count
-            FROM incidents i LEFT JOIN municipalities m ON i.municipality_code = m.code
-            WHERE COALESCE(i.incident_date, i.created_at::date) BETWEEN :start_date AND :end_date AND i.deleted_at IS NULL {prefix_filter}
-        )
-        SELECT municipality, COUNT(*), COALESCE(SUM(CASE WHEN duration_hours > 0 AND duration_hours < 24 THEN duration_hours * personnel_count ELSE 0 END), 0)
-        FROM incident_data GROUP BY municipality ORDER BY COUNT(*) DESC
+        SELECT COALESCE(mu.display_name, m.municipality_code, 'Unknown') AS municipality, COUNT(*), COALESCE(SUM(m.manhours), 0)
+        FROM incident_metrics m LEFT JOIN municipalities mu ON m.municipality_code = mu.code
+        WHERE m.incident_date BETWEEN :start_date AND :end_date {prefix_filter}
+        GROUP BY 1 ORDER BY COUNT(*) DESC
     """), {"start_date": start_date, "end_date": end_date})
     
     municipalities = [{"municipality": row[0], "calls": row[1], "manhours": round(float(row[2] or 0), 2)} for row in muni_result]
     
     type_result = db.execute(text(f"""
-        SELECT COALESCE(cad_event_type, 'Unknown'), COALESCE(cad_event_subtype, 'Unspecified'), COUNT(*)
-        FROM incidents i WHERE COALESCE(incident_date, created_at::date) BETWEEN :start_date AND :end_date AND deleted_at IS NULL {prefix_filter}
-        GROUP BY cad_event_type, cad_event_subtype ORDER BY cad_event_type, COUNT(*) DESC
+        SELECT COALESCE(m.cad_event_type, 'Unknown'), COALESCE(m.cad_event_subtype, 'Unspecified'), COUNT(*)
+        FROM incident_metrics m WHERE m.incident_date BETWEEN :start_date AND :end_date {prefix_filter}
+        GROUP BY m.cad_event_type, m.cad_event_subtype ORDER BY m.cad_event_type, COUNT(*) DESC
     """), {"start_date": start_date, "end_date": end_date})
     
     incident_types_grouped = {}
@@ -187,8 +117,8 @@ async def get_monthly_chiefs_report(year: int = Query(...), month: int = Query(.
     
     unit_result = db.execute(text(f"""
         SELECT COALESCE(a.unit_designator, iu.cad_unit_id, 'Unknown'), COALESCE(a.name, iu.cad_unit_id), COUNT(DISTINCT iu.incident_id)
-        FROM incident_units iu LEFT JOIN apparatus a ON iu.apparatus_id = a.id JOIN incidents i ON iu.incident_id = i.id
-        WHERE COALESCE(i.incident_date, i.created_at::date) BETWEEN :start_date AND :end_date AND i.deleted_at IS NULL {prefix_filter}
+        FROM incident_units iu LEFT JOIN apparatus a ON iu.apparatus_id = a.id JOIN incident_metrics m ON iu.incident_id = m.incident_id
+        WHERE m.incident_date BETWEEN :start_date AND :end_date {prefix_filter}
         GROUP BY COALESCE(a.unit_designator, iu.cad_unit_id, 'Unknown'), COALESCE(a.name, iu.cad_unit_id) ORDER BY COUNT(DISTINCT iu.incident_id) DESC
     """), {"start_date": start_date, "end_date": end_date})
     
@@ -199,11 +129,12 @@ async def get_monthly_chiefs_report(year: int = Query(...), month: int = Query(.
         # Try new mutual_aid_department_ids first, fall back to legacy neris_aid_departments
         ma_result = db.execute(text(f"""
             SELECT d.name, d.station_number, COUNT(*)
-            FROM incidents i,
-                 unnest(i.mutual_aid_department_ids) AS dept_id
+            FROM incident_metrics m
+            JOIN incidents i ON i.id = m.incident_id
+            CROSS JOIN LATERAL unnest(i.mutual_aid_department_ids) AS dept_id
             JOIN neris_mutual_aid_departments d ON d.id = dept_id
-            WHERE COALESCE(i.incident_date, i.created_at::date) BETWEEN :start_date AND :end_date
-              AND i.deleted_at IS NULL AND i.neris_aid_direction = 'GIVEN'
+            WHERE m.incident_date BETWEEN :start_date AND :end_date
+              AND i.neris_aid_direction = 'GIVEN'
               AND i.mutual_aid_department_ids IS NOT NULL AND array_length(i.mutual_aid_department_ids, 1) > 0
               {prefix_filter}
             GROUP BY d.name, d.station_number ORDER BY COUNT(*) DESC
@@ -213,10 +144,11 @@ async def get_monthly_chiefs_report(year: int = Query(...), month: int = Query(.
         # Fall back to legacy field for older incidents
         if not mutual_aid:
             legacy_result = db.execute(text(f"""
-                SELECT unnest(neris_aid_departments), COUNT(*) FROM incidents i
-                WHERE COALESCE(i.incident_date, i.created_at::date) BETWEEN :start_date AND :end_date
-                  AND i.deleted_at IS NULL AND i.neris_aid_direction = 'GIVEN' AND i.neris_aid_departments IS NOT NULL {prefix_filter}
-                GROUP BY unnest(neris_aid_departments) ORDER BY COUNT(*) DESC
+                SELECT unnest(i.neris_aid_departments), COUNT(*)
+                FROM incident_metrics m JOIN incidents i ON i.id = m.incident_id
+                WHERE m.incident_date BETWEEN :start_date AND :end_date
+                  AND i.neris_aid_direction = 'GIVEN' AND i.neris_aid_departments IS NOT NULL {prefix_filter}
+                GROUP BY unnest(i.neris_aid_departments) ORDER BY COUNT(*) DESC
             """), {"start_date": start_date, "end_date": end_date})
             mutual_aid = [{"station": row[0], "count": row[1]} for row in legacy_result]
     
@@ -227,23 +159,19 @@ async def get_monthly_chiefs_report(year: int = Query(...), month: int = Query(.
             SELECT 
                 ma_unit->>'unit_id' AS unit_id,
                 COUNT(DISTINCT i.id) AS assist_count
-            FROM incidents i,
-                 jsonb_array_elements(i.cad_units) AS ma_unit
-            WHERE COALESCE(i.incident_date, i.created_at::date) BETWEEN :start_date AND :end_date
-              AND i.deleted_at IS NULL {prefix_filter}
+            FROM incident_metrics m
+            JOIN incidents i ON i.id = m.incident_id
+            CROSS JOIN LATERAL jsonb_array_elements(i.cad_units) AS ma_unit
+            WHERE m.incident_date BETWEEN :start_date AND :end_date
+              AND m.station_responded {prefix_filter}
               AND ma_unit->>'time_arrived' IS NOT NULL
               AND (ma_unit->>'is_mutual_aid')::boolean IS TRUE
-              AND EXISTS (
-                  SELECT 1 FROM jsonb_array_elements(i.cad_units) AS our_unit
-                  WHERE our_unit->>'time_enroute' IS NOT NULL
-                    AND (our_unit->>'is_mutual_aid')::boolean IS NOT TRUE
-              )
             GROUP BY ma_unit->>'unit_id'
             ORDER BY assist_count DESC
         """), {"start_date": start_date, "end_date": end_date})
         units_assisted = [{"unit": row[0], "count": row[1]} for row in ua_result]
     
-    times = _get_response_times(db, start_date, end_date, category)
+    times = get_response_times(db, start_date, end_date, category)
     
     return {
         "month": month, "year": year, "month_name": start_date.strftime("%B"),
@@ -256,8 +184,8 @@ async def get_monthly_chiefs_report(year: int = Query(...), month: int = Query(.
 
 
 @router.get("/html/monthly")
-async def get_monthly_html_report(year: int = Query(...), month: int = Query(...), category: Optional[str] = None, db: Session = Depends(get_db)):
-    report = await get_monthly_chiefs_report(year, month, category, db)
+def get_monthly_html_report(year: int = Query(...), month: int = Query(...), category: Optional[str] = None, db: Session = Depends(get_db)):
+    report = get_monthly_chiefs_report(year, month, category, db)
     branding = get_branding(db)
     
     is_fire_report = category and category.upper() == 'FIRE'
@@ -307,15 +235,11 @@ async def get_monthly_html_report(year: int = Query(...), month: int = Query(...
 
 
 @router.get("/pdf/monthly-weasy")
-async def get_monthly_pdf(year: int = Query(...), month: int = Query(...), category: Optional[str] = None, db: Session = Depends(get_db)):
-    from weasyprint import HTML
-    
-    html_response = await get_monthly_html_report(year, month, category, db)
+def get_monthly_pdf(year: int = Query(...), month: int = Query(...), category: Optional[str] = None, db: Session = Depends(get_db)):
+    html_response = get_monthly_html_report(year, month, category, db)
     html_content = html_response.body.decode('utf-8')
     
-    pdf_buffer = io.BytesIO()
-    HTML(string=html_content).write_pdf(pdf_buffer)
-    pdf_buffer.seek(0)
+    pdf_buffer = io.BytesIO(render_pdf(html_content))
     
     month_name = date(year, month, 1).strftime("%B")
     filename = f"monthly_report_{year}_{month:02d}_{month_name}.pdf"
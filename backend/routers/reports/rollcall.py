@@ -14,6 +14,7 @@ from typing import Optional
 import io
 
 from database import get_db
+from executors import render_pdf
 from report_engine.branding_config import get_branding, get_logo_data_url
 from report_engine.templates import generate_css, generate_base_html, render_header
 
@@ -527,7 +528,7 @@ def _render_rollcall_body(data: dict, branding: dict) -> str:
 
 
 @router.get("/html/rollcall/{incident_id}")
-async def get_rollcall_html_report(incident_id: int, db: Session = Depends(get_db)):
+def get_rollcall_html_report(incident_id: int, db: Session = Depends(get_db)):
     """Generate HTML roll call report for preview."""
     data = _load_rollcall_data(db, incident_id)
     branding = get_branding(db)
@@ -546,11 +547,9 @@ async def get_rollcall_html_report(incident_id: int, db: Session = Depends(get_d
 
 
 @router.get("/pdf/rollcall/{incident_id}")
-async def get_rollcall_pdf(incident_id: int, db: Session = Depends(get_db)):
+def get_rollcall_pdf(incident_id: int, db: Session = Depends(get_db)):
     """Generate PDF roll call report."""
-    from weasyprint import HTML
-    
-    html_response = await get_rollcall_html_report(incident_id, db)
+    html_response = get_rollcall_html_report(incident_id, db)
     html_content = html_response.body.decode('utf-8')
     
     data = _load_rollcall_data(db, incident_id)
@@ -560,9 +559,7 @@ async def get_rollcall_pdf(incident_id: int, db: Session = Depends(get_db)):
     incident_date = inc.get('incident_date') or datetime.now().date()
     detail_type = inc.get('detail_type', 'OTHER').lower()
     
-    pdf_buffer = io.BytesIO()
-    HTML(string=html_content).write_pdf(pdf_buffer)
-    pdf_buffer.seek(0)
+    pdf_buffer = io.BytesIO(render_pdf(html_content))
     
     filename = f"rollcall_{detail_type}_{incident_number}_{incident_date}.pdf"
     
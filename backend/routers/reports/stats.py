@@ -3,6 +3,9 @@ Reports Stats Router - Summary statistics and trends
 
 Filters by incident number prefix (F=Fire, E=EMS) rather than call_category.
 Detail incidents (D-prefix) are always excluded from metrics.
+
+Reads the incident_metrics fact table (category letter, durations,
+personnel counts precomputed per incident - services/incident_metrics.py).
 """
 
 from fastapi import APIRouter, Depends, Query
@@ -12,48 +15,26 @@ from datetime import date
 from typing import Optional
 
 from database import get_db
+from services.incident_metrics import category_filter
 
 router = APIRouter()
 
 
-def _build_prefix_filter(category: str = None, alias: str = "i") -> str:
-    """
-    Build SQL filter based on incident number prefix (F=Fire, E=EMS).
-    Detail incidents (D-prefix) are always excluded from metrics.
-    """
-    if category and category.upper() == 'FIRE':
-        return f"AND {alias}.internal_incident_number LIKE 'F%'"
-    elif category and category.upper() == 'EMS':
-        return f"AND {alias}.internal_incident_number LIKE 'E%'"
-    else:
-        # Default: include Fire and EMS, exclude Detail
-        return f"AND ({alias}.internal_incident_number LIKE 'F%' OR {alias}.internal_incident_number LIKE 'E%')"
-
-
 def calculate_manhours(db: Session, start_date: date, end_date: date, category: str = None) -> dict:
-    prefix_filter = _build_prefix_filter(category)
+    prefix_filter = category_filter(category)
     
+    # manhours is NULL outside the 0-24h duration window
     result = db.execute(text(f"""
-        WITH incident_durations AS (
-            SELECT 
-                i.id,
-                EXTRACT(EPOCH FROM (
-                    COALESCE(i.time_last_cleared, i.time_first_on_scene) - i.time_dispatched
-                )) / 3600.0 AS duration_hours,
-                (SELECT COUNT(*) FROM incident_personnel ip WHERE ip.incident_id = i.id) AS personnel_count
-            FROM incidents i
-            WHERE COALESCE(i.incident_date, i.created_at::date) BETWEEN :start_date AND :end_date
-              AND i.deleted_at IS NULL
-              AND i.time_dispatched IS NOT NULL
-              {prefix_filter}
-        )
         SELECT 
-            COALESCE(SUM(duration_hours * personnel_count), 0) AS total_manhours,
-            COALESCE(SUM(personnel_count), 0) AS total_responses,
+            COALESCE(SUM(m.manhours), 0) AS total_manhours,
+            COALESCE(SUM(m.personnel_count), 0) AS total_responses,
             COUNT(*) AS incident_count,
-            COALESCE(AVG(duration_hours), 0) AS avg_duration_hours
-        FROM incident_durations
-        WHERE duration_hours > 0 AND duration_hours < 24
+            COALESCE(AVG(m.duration_seconds / 3600.0), 0) AS avg_duration_hours
+        FROM incident_metrics m
+        WHERE m.incident_date BETWEEN :start_date AND :end_date
+          AND m.time_dispatched IS NOT NULL
+          AND m.manhours IS NOT NULL
+          {prefix_filter}
     """), {"start_date": start_date, "end_date": end_date})
     
     row = result.fetchone()
@@ -66,23 +47,16 @@ def calculate_manhours(db: Session, start_date: date, end_date: date, category:
 
 
 def get_response_times(db: Session, start_date: date, end_date: date, category: str = None) -> dict:
-    # No alias needed for single table query
-    if category and category.upper() == 'FIRE':
-        prefix_filter = "AND internal_incident_number LIKE 'F%'"
-    elif category and category.upper() == 'EMS':
-        prefix_filter = "AND internal_incident_number LIKE 'E%'"
-    else:
-        prefix_filter = "AND (internal_incident_number LIKE 'F%' OR internal_incident_number LIKE 'E%')"
+    prefix_filter = category_filter(category)
     
     result = db.execute(text(f"""
         SELECT 
-            AVG(EXTRACT(EPOCH FROM (time_first_enroute - time_dispatched)) / 60) AS avg_turnout,
-            AVG(EXTRACT(EPOCH FROM (time_first_on_scene - time_dispatched)) / 60) AS avg_response,
-            AVG(EXTRACT(EPOCH FROM (time_last_cleared - time_first_on_scene)) / 60) AS avg_on_scene
-        FROM incidents
-        WHERE COALESCE(incident_date, created_at::date) BETWEEN :start_date AND :end_date
-          AND deleted_at IS NULL
-          AND time_dispatched IS NOT NULL
+            AVG(m.turnout_seconds) / 60 AS avg_turnout,
+            AVG(m.response_seconds) / 60 AS avg_response,
+            AVG(m.on_scene_seconds) / 60 AS avg_on_scene
+        FROM incident_metrics m
+        WHERE m.incident_date BETWEEN :start_date AND :end_date
+          AND m.time_dispatched IS NOT NULL
           {prefix_filter}
     """), {"start_date": start_date, "end_date": end_date})
     
@@ -95,25 +69,24 @@ def get_response_times(db: Session, start_date: date, end_date: date, category:
 
 
 @router.get("/summary")
-async def get_summary_report(
+def get_summary_report(
     start_date: date = Query(...),
     end_date: date = Query(...),
     category: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    prefix_filter = _build_prefix_filter(category)
+    prefix_filter = category_filter(category)
     
     basic_stats = db.execute(text(f"""
         SELECT 
             COUNT(*) AS total_incidents,
-            COUNT(CASE WHEN status = 'OPEN' THEN 1 END) AS open_count,
-            COUNT(CASE WHEN status = 'CLOSED' THEN 1 END) AS closed_count,
-            COUNT(CASE WHEN status = 'SUBMITTED' THEN 1 END) AS submitted_count,
-            COUNT(CASE WHEN internal_incident_number LIKE 'F%' THEN 1 END) AS fire_count,
-            COUNT(CASE WHEN internal_incident_number LIKE 'E%' THEN 1 END) AS ems_count
-        FROM incidents i
-        WHERE COALESCE(incident_date, created_at::date) BETWEEN :start_date AND :end_date
-          AND deleted_at IS NULL
+            COUNT(CASE WHEN m.status = 'OPEN' THEN 1 END) AS open_count,
+            COUNT(CASE WHEN m.status = 'CLOSED' THEN 1 END) AS closed_count,
+            COUNT(CASE WHEN m.status = 'SUBMITTED' THEN 1 END) AS submitted_count,
+            COUNT(CASE WHEN m.category = 'F' THEN 1 END) AS fire_count,
+            COUNT(CASE WHEN m.category = 'E' THEN 1 END) AS ems_count
+        FROM incident_metrics m
+        WHERE m.incident_date BETWEEN :start_date AND :end_date
           {prefix_filter}
     """), {"start_date": start_date, "end_date": end_date}).fetchone()
     
@@ -135,19 +108,19 @@ async def get_summary_report(
 
 
 @router.get("/trends/daily")
-async def get_daily_trends(
+def get_daily_trends(
     start_date: date = Query(...),
     end_date: date = Query(...),
     category: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    prefix_filter = _build_prefix_filter(category)
+    prefix_filter = category_filter(category)
     
     result = db.execute(text(f"""
-        SELECT COALESCE(incident_date, created_at::date) AS day, COUNT(*) AS count
-        FROM incidents i
-        WHERE COALESCE(incident_date, created_at::date) BETWEEN :start_date AND :end_date
-          AND deleted_at IS NULL {prefix_filter}
+        SELECT m.incident_date AS day, COUNT(*) AS count
+        FROM incident_metrics m
+        WHERE m.incident_date BETWEEN :start_date AND :end_date
+          {prefix_filter}
         GROUP BY day ORDER BY day
     """), {"start_date": start_date, "end_date": end_date})
     
@@ -159,20 +132,20 @@ async def get_daily_trends(
 
 
 @router.get("/trends/by-type")
-async def get_type_breakdown(
+def get_type_breakdown(
     start_date: date = Query(...),
     end_date: date = Query(...),
     category: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    prefix_filter = _build_prefix_filter(category)
+    prefix_filter = category_filter(category)
     
     result = db.execute(text(f"""
-        SELECT COALESCE(cad_event_type, 'Unknown') AS incident_type, COUNT(*) AS count
-        FROM incidents i
-        WHERE COALESCE(incident_date, created_at::date) BETWEEN :start_date AND :end_date
-          AND deleted_at IS NULL {prefix_filter}
-        GROUP BY cad_event_type ORDER BY count DESC
+        SELECT COALESCE(m.cad_event_type, 'Unknown') AS incident_type, COUNT(*) AS count
+        FROM incident_metrics m
+        WHERE m.incident_date BETWEEN :start_date AND :end_date
+          {prefix_filter}
+        GROUP BY m.cad_event_type ORDER BY count DESC
     """), {"start_date": start_date, "end_date": end_date})
     
     return {
@@ -183,21 +156,21 @@ async def get_type_breakdown(
 
 
 @router.get("/trends/by-municipality")
-async def get_municipality_breakdown(
+def get_municipality_breakdown(
     start_date: date = Query(...),
     end_date: date = Query(...),
     category: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    prefix_filter = _build_prefix_filter(category)
+    prefix_filter = category_filter(category)
     
     result = db.execute(text(f"""
-        SELECT COALESCE(m.display_name, i.municipality_code, 'Unknown') AS municipality, COUNT(*) AS count
-        FROM incidents i
-        LEFT JOIN municipalities m ON i.municipality_code = m.code
-        WHERE COALESCE(i.incident_date, i.created_at::date) BETWEEN :start_date AND :end_date
-          AND i.deleted_at IS NULL {prefix_filter}
-        GROUP BY COALESCE(m.display_name, i.municipality_code, 'Unknown') ORDER BY count DESC
+        SELECT COALESCE(mu.display_name, m.municipality_code, 'Unknown') AS municipality, COUNT(*) AS count
+        FROM incident_metrics m
+        LEFT JOIN municipalities mu ON m.municipality_code = mu.code
+        WHERE m.incident_date BETWEEN :start_date AND :end_date
+          {prefix_filter}
+        GROUP BY COALESCE(mu.display_name, m.municipality_code, 'Unknown') ORDER BY count DESC
     """), {"start_date": start_date, "end_date": end_date})
     
     return {
@@ -208,7 +181,7 @@ async def get_municipality_breakdown(
 
 
 @router.get("/personnel")
-async def get_personnel_report(
+def get_personnel_report(
     start_date: date = Query(...),
     end_date: date = Query(...),
     category: Optional[str] = None,
@@ -217,21 +190,15 @@ async def get_personnel_report(
 ):
     """Get personnel response statistics - top responders"""
     # Filter by incident number prefix (F=Fire, E=EMS), excludes Detail (D)
-    if category and category.upper() == 'FIRE':
-        prefix_filter = "AND internal_incident_number LIKE 'F%'"
-    elif category and category.upper() == 'EMS':
-        prefix_filter = "AND internal_incident_number LIKE 'E%'"
-    else:
-        prefix_filter = "AND (internal_incident_number LIKE 'F%' OR internal_incident_number LIKE 'E%')"
+    prefix_filter = category_filter(category)
     
     result = db.execute(text(f"""
         WITH filtered_incidents AS (
             -- Pre-filter incidents by date range and category
-            SELECT id, time_dispatched, time_last_cleared, time_first_on_scene
-            FROM incidents
-            WHERE COALESCE(incident_date, created_at::date) BETWEEN :start_date AND :end_date
-              AND deleted_at IS NULL
-              AND time_dispatched IS NOT NULL
+            SELECT m.incident_id AS id, m.duration_seconds
+            FROM incident_metrics m
+            WHERE m.incident_date BETWEEN :start_date AND :end_date
+              AND m.time_dispatched IS NOT NULL
               {prefix_filter}
         ),
         personnel_stats AS (
@@ -241,11 +208,7 @@ async def get_personnel_report(
                 p.last_name,
                 r.rank_name AS rank_name,
                 COUNT(DISTINCT fi.id) AS incident_count,
-                SUM(
-                    EXTRACT(EPOCH FROM (
-                        COALESCE(fi.time_last_cleared, fi.time_first_on_scene) - fi.time_dispatched
-                    )) / 3600.0
-                ) AS total_hours
+                SUM(fi.duration_seconds / 3600.0) AS total_hours
             FROM personnel p
             LEFT JOIN ranks r ON p.rank_id = r.id
             LEFT JOIN incident_personnel ip ON ip.personnel_id = p.id
@@ -282,7 +245,7 @@ async def get_personnel_report(
 
 
 @router.get("/by-apparatus")
-async def get_apparatus_report(
+def get_apparatus_report(
     start_date: date = Query(...),
     end_date: date = Query(...),
     category: Optional[str] = None,
@@ -290,20 +253,14 @@ async def get_apparatus_report(
 ):
     """Get incident breakdown by apparatus"""
     # Filter by incident number prefix (F=Fire, E=EMS), excludes Detail (D)
-    if category and category.upper() == 'FIRE':
-        prefix_filter = "AND i.internal_incident_number LIKE 'F%'"
-    elif category and category.upper() == 'EMS':
-        prefix_filter = "AND i.internal_incident_number LIKE 'E%'"
-    else:
-        prefix_filter = "AND (i.internal_incident_number LIKE 'F%' OR i.internal_incident_number LIKE 'E%')"
+    prefix_filter = category_filter(category)
     
     result = db.execute(text(f"""
         WITH filtered_incidents AS (
             -- Pre-filter incidents by date range and category
-            SELECT id
-            FROM incidents
-            WHERE COALESCE(incident_date, created_at::date) BETWEEN :start_date AND :end_date
-              AND deleted_at IS NULL
+            SELECT m.incident_id AS id
+            FROM incident_metrics m
+            WHERE m.incident_date BETWEEN :start_date AND :end_date
               {prefix_filter}
         )
         SELECT 
@@ -335,25 +292,22 @@ async def get_apparatus_report(
 
 
 @router.get("/monthly-trend")
-async def get_monthly_trend(
+def get_monthly_trend(
     year: int = Query(...),
     db: Session = Depends(get_db)
 ):
     """Get monthly incident trends for a year (excludes Detail incidents)"""
-    result = db.execute(text("""
+    result = db.execute(text(f"""
         SELECT 
-            EXTRACT(MONTH FROM COALESCE(i.incident_date, i.created_at::date))::int AS month,
+            EXTRACT(MONTH FROM m.incident_date)::int AS month,
             COUNT(*) AS incident_count,
-            COALESCE(SUM(
-                (SELECT COUNT(*) FROM incident_personnel ip WHERE ip.incident_id = i.id)
-            ), 0) AS personnel_responses
-        FROM incidents i
-        WHERE EXTRACT(YEAR FROM COALESCE(i.incident_date, i.created_at::date)) = :year
-          AND i.deleted_at IS NULL
-          AND (i.internal_incident_number LIKE 'F%' OR i.internal_incident_number LIKE 'E%')
-        GROUP BY EXTRACT(MONTH FROM COALESCE(i.incident_date, i.created_at::date))
+            COALESCE(SUM(m.personnel_count), 0) AS personnel_responses
+        FROM incident_metrics m
+        WHERE m.incident_date >= :year_start AND m.incident_date < :next_year_start
+          {category_filter()}
+        GROUP BY EXTRACT(MONTH FROM m.incident_date)
         ORDER BY month
-    """), {"year": year})
+    """), {"year_start": date(year, 1, 1), "next_year_start": date(year + 1, 1, 1)})
     
     # Initialize all months
     months = {m: {"incident_count": 0, "personnel_responses": 0} for m in range(1, 13)}
@@ -377,26 +331,21 @@ async def get_monthly_trend(
 
 
 @router.get("/trends/by-hour")
-async def get_hourly_distribution(
+def get_hourly_distribution(
     start_date: date = Query(...),
     end_date: date = Query(...),
     category: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    # No alias needed for single table query
-    if category and category.upper() == 'FIRE':
-        prefix_filter = "AND internal_incident_number LIKE 'F%'"
-    elif category and category.upper() == 'EMS':
-        prefix_filter = "AND internal_incident_number LIKE 'E%'"
-    else:
-        prefix_filter = "AND (internal_incident_number LIKE 'F%' OR internal_incident_number LIKE 'E%')"
+    prefix_filter = category_filter(category)
     
+    # Local dispatch hour (station timezone)
     result = db.execute(text(f"""
-        SELECT EXTRACT(HOUR FROM time_dispatched) AS hour, COUNT(*) AS count
-        FROM incidents
-        WHERE COALESCE(incident_date, created_at::date) BETWEEN :start_date AND :end_date
-          AND deleted_at IS NULL AND time_dispatched IS NOT NULL {prefix_filter}
-        GROUP BY EXTRACT(HOUR FROM time_dispatched) ORDER BY hour
+        SELECT m.local_hour AS hour, COUNT(*) AS count
+        FROM incident_metrics m
+        WHERE m.incident_date BETWEEN :start_date AND :end_date
+          AND m.time_dispatched IS NOT NULL {prefix_filter}
+        GROUP BY m.local_hour ORDER BY hour
     """), {"start_date": start_date, "end_date": end_date})
     
     return {
@@ -241,7 +241,7 @@ class ReviewTaskDismiss(BaseModel):
 # =============================================================================
 
 @router.get("")
-async def list_review_tasks(
+def list_review_tasks(
     status: Optional[str] = Query(None, description="Filter by status: pending, resolved, dismissed"),
     task_type: Optional[str] = Query(None, description="Filter by task type"),
     entity_type: Optional[str] = Query(None, description="Filter by entity type (e.g., 'incident')"),
@@ -293,7 +293,7 @@ async def list_review_tasks(
 
 
 @router.get("/count")
-async def get_pending_count(
+def get_pending_count(
     db: Session = Depends(get_db)
 ):
     """
@@ -307,7 +307,7 @@ async def get_pending_count(
 
 
 @router.get("/grouped")
-async def get_tasks_grouped_by_incident(
+def get_tasks_grouped_by_incident(
     status: str = 'pending',
     limit: int = Query(20, le=100),
     db: Session = Depends(get_db)
@@ -393,7 +393,7 @@ async def get_tasks_grouped_by_incident(
 
 
 @router.get("/{task_id}")
-async def get_review_task(
+def get_review_task(
     task_id: int,
     db: Session = Depends(get_db)
 ):
@@ -416,7 +416,7 @@ async def get_review_task(
 # =============================================================================
 
 @router.post("")
-async def create_review_task(
+def create_review_task(
     data: ReviewTaskCreate,
     db: Session = Depends(get_db)
 ):
@@ -465,7 +465,7 @@ async def create_review_task(
 # =============================================================================
 
 @router.post("/{task_id}/resolve")
-async def resolve_review_task(
+def resolve_review_task(
     task_id: int,
     data: ReviewTaskResolve,
     db: Session = Depends(get_db)
@@ -499,7 +499,7 @@ async def resolve_review_task(
 
 
 @router.post("/{task_id}/dismiss")
-async def dismiss_review_task(
+def dismiss_review_task(
     task_id: int,
     data: ReviewTaskDismiss,
     db: Session = Depends(get_db)
@@ -539,7 +539,7 @@ async def dismiss_review_task(
 # =============================================================================
 
 @router.post("/resolve-for-incident/{incident_id}")
-async def resolve_tasks_for_incident(
+def resolve_tasks_for_incident(
     incident_id: int,
     data: ReviewTaskResolve,
     task_type: Optional[str] = Query(None, description="Only resolve specific task type"),
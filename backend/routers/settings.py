@@ -6,7 +6,7 @@ Handles generic settings CRUD. Specialized settings have their own routers:
 - Print Layout: /api/print-layout (print_layout.py)
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from sqlalchemy import text
 from typing import Optional, Any
@@ -14,6 +14,7 @@ from pydantic import BaseModel
 import json
 
 from database import get_db
+from settings_cache import get_raw as get_cached_setting, settings_changed
 
 # Import UTC formatting helper
 try:
@@ -53,7 +54,7 @@ class SettingCreate(BaseModel):
 # =============================================================================
 
 @router.get("")
-async def list_all_settings(db: Session = Depends(get_db)):
+def list_all_settings(db: Session = Depends(get_db)):
     """Get all settings grouped by category"""
     result = db.execute(text("""
         SELECT id, category, key, value, value_type, description, updated_at
@@ -81,7 +82,7 @@ async def list_all_settings(db: Session = Depends(get_db)):
 
 
 @router.get("/flat")
-async def list_settings_flat(db: Session = Depends(get_db)):
+def list_settings_flat(db: Session = Depends(get_db)):
     """Get all settings as flat list"""
     result = db.execute(text("""
         SELECT id, category, key, value, value_type, description, updated_at
@@ -105,7 +106,7 @@ async def list_settings_flat(db: Session = Depends(get_db)):
 
 
 @router.get("/category/{category}")
-async def get_settings_by_category(
+def get_settings_by_category(
     category: str,
     db: Session = Depends(get_db)
 ):
@@ -160,7 +161,7 @@ DEFAULT_PRINT_SETTINGS = {
 
 
 @router.get("/print")
-async def get_print_settings(db: Session = Depends(get_db)):
+def get_print_settings(db: Session = Depends(get_db)):
     """Get legacy print settings (show/hide toggles)"""
     result = db.execute(
         text("SELECT key, value, value_type FROM settings WHERE category = 'print'")
@@ -178,7 +179,7 @@ async def get_print_settings(db: Session = Depends(get_db)):
 
 
 @router.put("/print")
-async def update_print_settings(
+def update_print_settings(
     settings: dict,
     db: Session = Depends(get_db)
 ):
@@ -204,12 +205,13 @@ async def update_print_settings(
             )
     
     db.commit()
+    settings_changed(db)
     return {"status": "ok"}
 
 
 # Legacy print/layout endpoint - redirects to new location
 @router.get("/print/layout")
-async def get_print_layout_legacy(db: Session = Depends(get_db)):
+def get_print_layout_legacy(db: Session = Depends(get_db)):
     """
     Legacy endpoint - use GET /api/print-layout instead.
     Kept for backward compatibility.
@@ -219,7 +221,7 @@ async def get_print_layout_legacy(db: Session = Depends(get_db)):
 
 
 @router.put("/print/layout")
-async def update_print_layout_legacy(
+def update_print_layout_legacy(
     layout: dict,
     db: Session = Depends(get_db)
 ):
@@ -254,16 +256,18 @@ async def update_print_layout_legacy(
         )
     
     db.commit()
+    settings_changed(db)
     return {"status": "ok", "message": "Layout saved successfully"}
 
 
 @router.post("/print/layout/reset")
-async def reset_print_layout_legacy(db: Session = Depends(get_db)):
+def reset_print_layout_legacy(db: Session = Depends(get_db)):
     """
     Legacy endpoint - use POST /api/print-layout/reset instead.
     """
     db.execute(text("DELETE FROM settings WHERE category = 'print' AND key = 'layout'"))
     db.commit()
+    settings_changed(db)
     return {"status": "ok", "message": "Layout reset to defaults"}
 
 
@@ -279,7 +283,7 @@ class LogoUpload(BaseModel):
 
 
 @router.get("/branding/logo")
-async def get_branding_logo_legacy(db: Session = Depends(get_db)):
+def get_branding_logo_legacy(db: Session = Depends(get_db)):
     """Legacy endpoint - use GET /api/branding/logo instead."""
     result = db.execute(
         text("SELECT value FROM settings WHERE category = 'branding' AND key = 'logo'")
@@ -297,7 +301,7 @@ async def get_branding_logo_legacy(db: Session = Depends(get_db)):
 
 
 @router.post("/branding/logo")
-async def upload_branding_logo_legacy(
+def upload_branding_logo_legacy(
     logo: LogoUpload,
     db: Session = Depends(get_db)
 ):
@@ -342,17 +346,19 @@ async def upload_branding_logo_legacy(
     _upsert_setting(db, 'branding', 'logo', data)
     _upsert_setting(db, 'branding', 'logo_mime_type', logo.mime_type)
     db.commit()
+    settings_changed(db)
     
     return {"status": "ok", "message": "Logo uploaded successfully"}
 
 
 @router.delete("/branding/logo")
-async def delete_branding_logo_legacy(db: Session = Depends(get_db)):
+def delete_branding_logo_legacy(db: Session = Depends(get_db)):
     """Legacy endpoint - use DELETE /api/branding/logo instead."""
     db.execute(text(
         "DELETE FROM settings WHERE category = 'branding' AND key IN ('logo', 'logo_mime_type')"
     ))
     db.commit()
+    settings_changed(db)
     return {"status": "ok", "message": "Logo deleted"}
 
 
@@ -361,7 +367,7 @@ async def delete_branding_logo_legacy(db: Session = Depends(get_db)):
 # =============================================================================
 
 @router.get("/{category}/{key}")
-async def get_setting(
+def get_setting(
     category: str,
     key: str,
     db: Session = Depends(get_db)
@@ -391,7 +397,7 @@ async def get_setting(
 
 
 @router.put("/{category}/{key}")
-async def update_setting(
+def update_setting(
     category: str,
     key: str,
     data: SettingUpdate,
@@ -421,11 +427,12 @@ async def update_setting(
         row = result.fetchone()
     
     db.commit()
+    settings_changed(db)
     return {"status": "ok", "id": row[0]}
 
 
 @router.post("")
-async def create_setting(
+def create_setting(
     data: SettingCreate,
     db: Session = Depends(get_db)
 ):
@@ -446,13 +453,14 @@ async def create_setting(
             }
         )
         db.commit()
+        settings_changed(db)
         return {"status": "ok", "id": result.fetchone()[0]}
     except Exception as e:
         raise HTTPException(status_code=400, detail=f"Setting already exists or invalid: {e}")
 
 
 @router.delete("/{category}/{key}")
-async def delete_setting(
+def delete_setting(
     category: str,
     key: str,
     db: Session = Depends(get_db)
@@ -463,6 +471,7 @@ async def delete_setting(
         {"category": category, "key": key}
     )
     db.commit()
+    settings_changed(db)
     
     if not result.fetchone():
         raise HTTPException(status_code=404, detail="Setting not found")
@@ -520,11 +529,12 @@ def _upsert_setting(db: Session, category: str, key: str, value: str) -> None:
 # =============================================================================
 
 def get_setting_value(db: Session, category: str, key: str, default: Any = None) -> Any:
-    """Get a setting value with type conversion"""
-    result = db.execute(
-        text("SELECT value, value_type FROM settings WHERE category = :cat AND key = :key"),
-        {"cat": category, "key": key}
-    ).fetchone()
+    """
+    Get a setting value with type conversion.
+    Served from the tenant's settings snapshot (settings_cache) — no query
+    per key.
+    """
+    result = get_cached_setting(db, category, key)
     
     if not result:
         return default
@@ -597,6 +607,7 @@ DEFAULT_AV_ALERTS = {
     'tts_voice': 'en_US-ryan-medium',  # Piper voice model name
     'tts_speed': 1.1,       # Speech rate: 0.8 (fast) to 1.5 (slow), 1.0 = normal
     'tts_pause_style': 'normal',  # 'minimal', 'normal', 'dramatic' - pause duration between sections
+    'tts_segment_cache': True,  # Build audio from cached fragment clips (False = synthesize whole text)
     
     # Unit announcement options
     'tts_announce_all_units': False,  # If True, announce all units on call; if False, only your department's units
@@ -607,7 +618,7 @@ DEFAULT_AV_ALERTS = {
 
 
 @router.get("/av-alerts")
-async def get_av_alerts_settings(db: Session = Depends(get_db)):
+def get_av_alerts_settings(db: Session = Depends(get_db)):
     """
     Get AV alerts settings.
     Returns defaults merged with any custom values.
@@ -628,8 +639,9 @@ async def get_av_alerts_settings(db: Session = Depends(get_db)):
 
 
 @router.put("/av-alerts")
-async def update_av_alerts_settings(
+def update_av_alerts_settings(
     settings: dict,
+    background_tasks: BackgroundTasks,
     request: Request = None,
     db: Session = Depends(get_db)
 ):
@@ -698,7 +710,7 @@ async def update_av_alerts_settings(
                 host = request.headers.get('host', '')
                 tenant_slug = _extract_slug(host) or "glenmoorefc"
             
-            await broadcast_av_alert(tenant_slug, {
+            background_tasks.add_task(broadcast_av_alert, tenant_slug, {
                 "type": "settings_updated",
                 "settings_version": new_version,
             })
@@ -707,13 +719,15 @@ async def update_av_alerts_settings(
             logging.getLogger(__name__).warning(f"Failed to broadcast settings_updated: {e}")
     
     db.commit()
+    settings_changed(db)
     return {"status": "ok", "changes_made": changes_made}
 
 
 @router.post("/av-alerts/upload-sound")
-async def upload_av_alert_sound(
+def upload_av_alert_sound(
     sound_type: str,  # 'dispatch_fire', 'dispatch_ems', 'close'
     data: dict,       # {"data": "base64...", "filename": "alert.mp3"}
+    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     request: Request = None,
 ):
@@ -776,6 +790,7 @@ async def upload_av_alert_sound(
     _upsert_setting(db, 'av_alerts', path_key, f'/api/settings/av-alerts/sound/{sound_type}')
     
     db.commit()
+    settings_changed(db)
     
     # Broadcast sound_updated to all connected StationBells via WebSocket
     # This notifies ESP32 devices to re-download the updated sound file
@@ -789,7 +804,7 @@ async def upload_av_alert_sound(
             host = request.headers.get('host', '')
             tenant_slug = _extract_slug(host) or "glenmoorefc"
         
-        await broadcast_av_alert(tenant_slug, {
+        background_tasks.add_task(broadcast_av_alert, tenant_slug, {
             "type": "sound_updated",
             "sound_type": sound_type,
             "path": f'/api/settings/av-alerts/sound/{sound_type}',
@@ -808,7 +823,7 @@ async def upload_av_alert_sound(
 
 
 @router.get("/av-alerts/sound/{sound_type}")
-async def get_av_alert_sound(
+def get_av_alert_sound(
     sound_type: str,
     db: Session = Depends(get_db)
 ):
@@ -867,7 +882,7 @@ async def get_av_alert_sound(
 
 
 @router.delete("/av-alerts/sound/{sound_type}")
-async def delete_av_alert_sound(
+def delete_av_alert_sound(
     sound_type: str,
     db: Session = Depends(get_db)
 ):
@@ -889,6 +904,7 @@ async def delete_av_alert_sound(
     _upsert_setting(db, 'av_alerts', f'{sound_type}_sound', default_path)
     
     db.commit()
+    settings_changed(db)
     
     return {"status": "ok", "message": f"Reverted {sound_type} to default sound"}
 
@@ -930,7 +946,7 @@ DEFAULT_CAD_SETTINGS = {
 
 
 @router.get("/cad")
-async def get_cad_settings(db: Session = Depends(get_db)):
+def get_cad_settings(db: Session = Depends(get_db)):
     """
     Get CAD import settings.
     Returns defaults merged with any custom values stored in database.
@@ -951,7 +967,7 @@ async def get_cad_settings(db: Session = Depends(get_db)):
 
 
 @router.put("/cad")
-async def update_cad_settings(
+def update_cad_settings(
     settings: dict,
     db: Session = Depends(get_db)
 ):
@@ -990,6 +1006,7 @@ async def update_cad_settings(
             )
     
     db.commit()
+    settings_changed(db)
     return {"status": "ok"}
 
 
@@ -1005,7 +1022,7 @@ DEFAULT_FEATURES = {
 
 
 @router.get("/features")
-async def get_features(db: Session = Depends(get_db)):
+def get_features(db: Session = Depends(get_db)):
     """
     Get all feature flags.
     Returns defaults merged with any custom values.
@@ -1026,7 +1043,7 @@ async def get_features(db: Session = Depends(get_db)):
 
 
 @router.put("/features")
-async def update_features(
+def update_features(
     features: dict,
     db: Session = Depends(get_db)
 ):
@@ -1065,4 +1082,5 @@ async def update_features(
             )
     
     db.commit()
+    settings_changed(db)
     return {"status": "ok"}
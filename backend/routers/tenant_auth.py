@@ -120,7 +120,7 @@ def _extract_subdomain_slug(host: str) -> Optional[str]:
 
 
 @router.post("/login", response_model=TenantLoginResponse)
-async def tenant_login(
+def tenant_login(
     data: TenantLoginRequest,
     request: Request,
     response: Response,
@@ -191,7 +191,7 @@ async def tenant_login(
 
 
 @router.post("/refresh")
-async def refresh_access_token(
+def refresh_access_token(
     request: Request,
     response: Response,
     db: Session = Depends(get_master_session)
@@ -283,7 +283,7 @@ async def refresh_access_token(
 
 
 @router.post("/logout")
-async def tenant_logout(
+def tenant_logout(
     request: Request,
     response: Response,
     db: Session = Depends(get_master_session)
@@ -321,7 +321,7 @@ async def tenant_logout(
 
 
 @router.get("/session", response_model=SessionCheckResponse)
-async def check_session(
+def check_session(
     request: Request,
     response: Response,
     db: Session = Depends(get_master_session)
@@ -455,7 +455,7 @@ async def check_session(
 
 
 @router.post("/signup-request")
-async def submit_signup_request(
+def submit_signup_request(
     data: TenantSignupRequest,
     db: Session = Depends(get_master_session)
 ):
@@ -514,7 +514,7 @@ async def submit_signup_request(
 
 
 @router.get("/requests")
-async def list_tenant_requests(
+def list_tenant_requests(
     status: Optional[str] = None,
     db: Session = Depends(get_master_session)
 ):
@@ -544,7 +544,7 @@ async def list_tenant_requests(
 
 
 @router.post("/requests/{request_id}/approve")
-async def approve_tenant_request(
+def approve_tenant_request(
     request_id: int,
     initial_password: str,
     admin_name: str = "System",
@@ -592,7 +592,7 @@ async def approve_tenant_request(
 
 
 @router.post("/requests/{request_id}/reject")
-async def reject_tenant_request(
+def reject_tenant_request(
     request_id: int,
     reason: str,
     admin_name: str = "System",
@@ -18,12 +18,33 @@ logger = logging.getLogger(__name__)
 
 from database import get_db
 from services.tts_preprocessing import tts_preprocessor
+from services import tts_segment_cache
 
 router = APIRouter()
 
 # Piper models directory
 PIPER_MODELS_DIR = "/home/dashboard/piper"
 
+# Segment-cache kinds built from each abbreviation category
+_ABBREVIATION_SEGMENT_KINDS = {
+    'unit_prefix': ('units',),
+    'street_type': ('address', 'cross_streets'),
+}
+
+
+def _get_spoken_as(db: Session, cad_unit_id: str) -> Optional[str]:
+    row = db.execute(
+        text("SELECT spoken_as FROM tts_unit_mappings WHERE cad_unit_id = :unit_id"),
+        {"unit_id": cad_unit_id}
+    ).fetchone()
+    return row[0] if row else None
+
+
+def _invalidate_abbreviation_segments(category: Optional[str]):
+    """Drop cached clips whose spoken text came from an abbreviation category."""
+    for kind in _ABBREVIATION_SEGMENT_KINDS.get(category, ()):
+        tts_segment_cache.invalidate(kind=kind)
+
 
 # =============================================================================
 # SCHEMAS
@@ -50,7 +71,7 @@ class FieldSettingsUpdate(BaseModel):
 # =============================================================================
 
 @router.get("/units")
-async def list_unit_mappings(
+def list_unit_mappings(
     needs_review: Optional[bool] = Query(None, description="Filter by review status"),
     search: Optional[str] = Query(None, description="Search by CAD unit ID"),
     limit: int = Query(100, le=500),
@@ -138,7 +159,7 @@ async def list_unit_mappings(
 
 
 @router.get("/units/needs-review-count")
-async def get_needs_review_count(db: Session = Depends(get_db)):
+def get_needs_review_count(db: Session = Depends(get_db)):
     """Get count of unit mappings needing review."""
     count = db.execute(
         text("SELECT COUNT(*) FROM tts_unit_mappings WHERE needs_review = true")
@@ -147,7 +168,7 @@ async def get_needs_review_count(db: Session = Depends(get_db)):
 
 
 @router.get("/units/{unit_id}")
-async def get_unit_mapping(
+def get_unit_mapping(
     unit_id: str,
     db: Session = Depends(get_db),
 ):
@@ -186,7 +207,7 @@ async def get_unit_mapping(
 
 
 @router.put("/units/{unit_id}")
-async def update_unit_mapping(
+def update_unit_mapping(
     unit_id: str,
     data: UnitMappingUpdate,
     db: Session = Depends(get_db),
@@ -195,6 +216,7 @@ async def update_unit_mapping(
     Update a unit mapping pronunciation.
     Clears needs_review flag when updated.
     """
+    old_spoken = _get_spoken_as(db, unit_id.upper())
     result = db.execute(text("""
         UPDATE tts_unit_mappings
         SET spoken_as = :spoken_as,
@@ -212,11 +234,13 @@ async def update_unit_mapping(
         raise HTTPException(status_code=404, detail="Unit mapping not found")
     
     db.commit()
+    if old_spoken and old_spoken != data.spoken_as.strip():
+        tts_segment_cache.invalidate(text=old_spoken)
     return {"status": "ok", "id": row[0]}
 
 
 @router.post("/units")
-async def create_unit_mapping(
+def create_unit_mapping(
     data: UnitMappingCreate,
     db: Session = Depends(get_db),
 ):
@@ -261,7 +285,7 @@ async def create_unit_mapping(
 
 
 @router.delete("/units/{unit_id}")
-async def delete_unit_mapping(
+def delete_unit_mapping(
     unit_id: str,
     db: Session = Depends(get_db),
 ):
@@ -269,7 +293,7 @@ async def delete_unit_mapping(
     result = db.execute(text("""
         DELETE FROM tts_unit_mappings
         WHERE cad_unit_id = :unit_id
-        RETURNING id
+        RETURNING id, spoken_as
     """), {"unit_id": unit_id.upper()})
     
     row = result.fetchone()
@@ -277,11 +301,13 @@ async def delete_unit_mapping(
         raise HTTPException(status_code=404, detail="Unit mapping not found")
     
     db.commit()
+    if row[1]:
+        tts_segment_cache.invalidate(text=row[1])
     return {"status": "ok"}
 
 
 @router.post("/units/{unit_id}/regenerate")
-async def regenerate_unit_pronunciation(
+def regenerate_unit_pronunciation(
     unit_id: str,
     station_digits: int = Query(2, ge=1, le=4, description="Number of digits in station number"),
     db: Session = Depends(get_db),
@@ -294,7 +320,7 @@ async def regenerate_unit_pronunciation(
     
     # Check exists
     existing = db.execute(
-        text("SELECT id FROM tts_unit_mappings WHERE cad_unit_id = :unit_id"),
+        text("SELECT id, spoken_as FROM tts_unit_mappings WHERE cad_unit_id = :unit_id"),
         {"unit_id": cad_unit_id}
     ).fetchone()
     
@@ -311,6 +337,8 @@ async def regenerate_unit_pronunciation(
     """), {"unit_id": cad_unit_id, "spoken_as": spoken_as})
     
     db.commit()
+    if existing[1] and existing[1] != spoken_as:
+        tts_segment_cache.invalidate(text=existing[1])
     
     return {
         "status": "ok",
@@ -321,7 +349,7 @@ async def regenerate_unit_pronunciation(
 
 
 @router.post("/units/preview-pronunciation")
-async def preview_pronunciation(
+def preview_pronunciation(
     cad_unit_id: str = Query(..., description="CAD unit ID to preview"),
     station_digits: int = Query(2, ge=1, le=4, description="Number of digits in station number"),
     db: Session = Depends(get_db),
@@ -339,7 +367,7 @@ async def preview_pronunciation(
 
 
 @router.post("/units/mark-all-reviewed")
-async def mark_all_reviewed(db: Session = Depends(get_db)):
+def mark_all_reviewed(db: Session = Depends(get_db)):
     """
     Mark all units as reviewed (accept auto-generated pronunciations).
     Useful for bulk-accepting the defaults.
@@ -362,7 +390,7 @@ async def mark_all_reviewed(db: Session = Depends(get_db)):
 # =============================================================================
 
 @router.get("/fields")
-async def list_field_settings(db: Session = Depends(get_db)):
+def list_field_settings(db: Session = Depends(get_db)):
     """
     Get all TTS field settings.
     Returns settings for each available field (units, call_type, address, etc.)
@@ -388,7 +416,7 @@ async def list_field_settings(db: Session = Depends(get_db)):
 
 
 @router.get("/fields/{field_id}")
-async def get_field_settings(
+def get_field_settings(
     field_id: str,
     db: Session = Depends(get_db),
 ):
@@ -413,7 +441,7 @@ async def get_field_settings(
 
 
 @router.put("/fields/{field_id}")
-async def update_field_settings(
+def update_field_settings(
     field_id: str,
     data: FieldSettingsUpdate,
     db: Session = Depends(get_db),
@@ -482,8 +510,9 @@ async def preview_tts_text(
     Does not generate audio, just returns the formatted text.
     """
     from services.tts_service import tts_service, _get_tts_settings
+    from executors import run_blocking
     
-    settings = _get_tts_settings(db)
+    settings = await run_blocking(_get_tts_settings, db)
     
     text = await tts_service.format_announcement(
         units=units,
@@ -552,12 +581,41 @@ async def list_available_voices():
     return {"voices": voices}
 
 
+@router.get("/engine")
+async def get_tts_engine_stats():
+    """
+    Warm Piper pool and encoder counters for this worker (processes per
+    voice/speed, fallbacks, average synth / encode time).
+    """
+    from services.tts_engine import get_engine_stats
+    return get_engine_stats()
+
+
+@router.get("/segments")
+def get_tts_segment_stats():
+    """
+    Phrase-segment clip cache: clips stored, hit rate for this worker and
+    segments synthesized vs reused.
+    """
+    return tts_segment_cache.get_segment_stats()
+
+
+@router.delete("/segments")
+def clear_tts_segments(
+    voice: Optional[str] = Query(None, description="Only clips for this voice"),
+    kind: Optional[str] = Query(None, description="Only clips of this field kind (units, address, ...)"),
+):
+    """Delete cached segment clips (all, or filtered by voice / kind)."""
+    removed = tts_segment_cache.invalidate(voice=voice, kind=kind)
+    return {"status": "ok", "removed": removed}
+
+
 # =============================================================================
 # SEED FROM RECENT INCIDENTS
 # =============================================================================
 
 @router.post("/units/seed-from-incidents")
-async def seed_units_from_incidents(
+def seed_units_from_incidents(
     count: int = Query(10, ge=1, le=50, description="Number of recent incidents to scan"),
     db: Session = Depends(get_db),
 ):
@@ -688,7 +746,7 @@ class AbbreviationUpdate(BaseModel):
 
 
 @router.get("/abbreviations")
-async def list_abbreviations(
+def list_abbreviations(
     category: Optional[str] = Query(None, description="Filter by category: unit_prefix, street_type"),
     search: Optional[str] = Query(None, description="Search abbreviations"),
     db: Session = Depends(get_db),
@@ -743,7 +801,7 @@ async def list_abbreviations(
 
 
 @router.get("/abbreviations/{abbr_id}")
-async def get_abbreviation(
+def get_abbreviation(
     abbr_id: int,
     db: Session = Depends(get_db),
 ):
@@ -768,7 +826,7 @@ async def get_abbreviation(
 
 
 @router.post("/abbreviations")
-async def create_abbreviation(
+def create_abbreviation(
     data: AbbreviationCreate,
     db: Session = Depends(get_db),
 ):
@@ -812,12 +870,13 @@ async def create_abbreviation(
     
     # Clear the cache so changes take effect
     tts_preprocessor.clear_cache()
+    _invalidate_abbreviation_segments(data.category)
     
     return {"status": "ok", "id": new_id}
 
 
 @router.put("/abbreviations/{abbr_id}")
-async def update_abbreviation(
+def update_abbreviation(
     abbr_id: int,
     data: AbbreviationUpdate,
     db: Session = Depends(get_db),
@@ -827,7 +886,7 @@ async def update_abbreviation(
         UPDATE tts_abbreviations
         SET spoken_as = :spoken, updated_at = NOW()
         WHERE id = :id
-        RETURNING id
+        RETURNING id, category
     """), {
         "id": abbr_id,
         "spoken": data.spoken_as.strip(),
@@ -841,12 +900,13 @@ async def update_abbreviation(
     
     # Clear the cache so changes take effect
     tts_preprocessor.clear_cache()
+    _invalidate_abbreviation_segments(row[1])
     
     return {"status": "ok", "id": row[0]}
 
 
 @router.delete("/abbreviations/{abbr_id}")
-async def delete_abbreviation(
+def delete_abbreviation(
     abbr_id: int,
     db: Session = Depends(get_db),
 ):
@@ -854,7 +914,7 @@ async def delete_abbreviation(
     result = db.execute(text("""
         DELETE FROM tts_abbreviations
         WHERE id = :id
-        RETURNING id
+        RETURNING id, category
     """), {"id": abbr_id})
     
     row = result.fetchone()
@@ -865,5 +925,6 @@ async def delete_abbreviation(
     
     # Clear the cache so changes take effect
     tts_preprocessor.clear_cache()
+    _invalidate_abbreviation_segments(row[1])
     
     return {"status": "ok"}
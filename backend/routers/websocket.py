@@ -7,6 +7,10 @@ Provides tenant-isolated WebSocket connections:
     - incident_created: New incident created
     - incident_updated: Incident data changed  
     - incident_closed: Incident status changed to CLOSED
+    - incident_snapshot: Reply to a client's {"type": "resync", "incident_id": N}
+    - resync_failed: No snapshot for that incident - the client GETs it instead
+    - reparse_progress: Full-reparse job progress (POST /api/backup/full-reparse-all)
+    Incident events are revisioned deltas - see incident_events.py.
 
 /ws/AValerts - Audio/Visual alerts for browser and device notifications
     - dispatch: New dispatch (play alert sound, TTS)
@@ -20,8 +24,9 @@ AV alert connections are tracked as ConnectedDevice instances,
 enabling device identification, targeted sends, and management.
 
 Phase D: Multi-worker support via LISTEN/NOTIFY.
-- Connected devices are tracked in PostgreSQL (connected_devices table)
-  so any worker can list all devices for the admin UI.
+- Connected devices are tracked in memory and flushed to PostgreSQL
+  (connected_devices table) in background batches, so any worker can list
+  all devices for the admin UI without blocking the loop (device_presence.py).
 - Targeted device commands (test, identify, disconnect) route through
   NOTIFY so the worker that owns the connection handles it.
 - Broadcasts go through NOTIFY so all workers deliver to their local connections.
@@ -30,7 +35,7 @@ Phase D: Multi-worker support via LISTEN/NOTIFY.
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect, Depends
 from sqlalchemy.orm import Session
 from sqlalchemy import text
-from typing import Dict, Set, Optional, List
+from typing import Dict, Set, Optional, List, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 import json
@@ -41,6 +46,13 @@ import os
 
 from jwt_auth import extract_token_from_websocket_params, validate_access_token
 from database import get_db_for_tenant
+from executors import run_blocking
+import incident_events
+import device_presence
+import tenant_registry
+import settings_cache
+import analytics_cache
+from services.reparse_job import REPARSE_JOB_EVENT
 
 # PostgreSQL connection info for direct LISTEN connection (bypasses PgBouncer)
 _PG_HOST = os.environ.get("PGHOST", "127.0.0.1")
@@ -58,8 +70,27 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 # Tenant-isolated connection pools for /ws/incidents
-# Key: tenant_slug, Value: set of WebSocket connections
-_connections: Dict[str, Set[WebSocket]] = {}
+# Key: tenant_slug, Value: { WebSocket: its _ClientSender }
+_connections: Dict[str, Dict[WebSocket, "_ClientSender"]] = {}
+
+# Outbound fan-out for /ws/incidents: each connection has a bounded queue
+# drained by its own writer task, so one stalled client can't delay the rest.
+SEND_QUEUE_SIZE = 64     # Messages buffered per client before it is evicted
+SEND_TIMEOUT = 10        # Seconds a single send may take before the client is evicted
+
+_fanout_stats = {
+    "broadcasts": 0,
+    "evicted_queue_full": 0,
+    "evicted_send_timeout": 0,
+    "send_failed": 0,
+}
+
+# Strong refs for fire-and-forget close tasks
+_close_tasks: Set[asyncio.Task] = set()
+
+# In-flight incident snapshot reads for resync, shared by all clients asking
+# for the same incident. Key: (tenant_slug, incident_id)
+_resync_reads: Dict[Tuple[str, int], asyncio.Task] = {}
 
 # =============================================================================
 # AV Alerts device registry (in-memory — used for actual WebSocket sends)
@@ -115,74 +146,6 @@ def _extract_tenant_from_host(host: str) -> Optional[str]:
 # Database device tracking (shared across workers via PostgreSQL)
 # =============================================================================
 
-def _db_register_device(tenant_slug: str, device: ConnectedDevice):
-    """Insert a connected device row into the tenant's connected_devices table."""
-    try:
-        db = next(get_db_for_tenant(tenant_slug))
-        try:
-            db.execute(text("""
-                INSERT INTO connected_devices 
-                    (connection_id, worker_pid, tenant_slug, device_type, device_name,
-                     device_id, ip_address, user_agent, connected_at)
-                VALUES (:cid, :pid, :tenant, :dtype, :dname, :did, :ip, :ua, :cat)
-                ON CONFLICT (connection_id) DO UPDATE SET
-                    worker_pid = :pid, device_type = :dtype, device_name = :dname,
-                    device_id = :did, ip_address = :ip, user_agent = :ua
-            """), {
-                "cid": device.connection_id,
-                "pid": _WORKER_PID,
-                "tenant": tenant_slug,
-                "dtype": device.device_type,
-                "dname": device.device_name,
-                "did": device.device_id,
-                "ip": device.ip_address,
-                "ua": device.user_agent,
-                "cat": device.connected_at,
-            })
-            db.commit()
-        finally:
-            db.close()
-    except Exception as e:
-        logger.warning(f"Failed to register device in DB: {e}")
-
-
-def _db_unregister_device(tenant_slug: str, connection_id: str):
-    """Remove a connected device row from the tenant's connected_devices table."""
-    try:
-        db = next(get_db_for_tenant(tenant_slug))
-        try:
-            db.execute(text(
-                "DELETE FROM connected_devices WHERE connection_id = :cid"
-            ), {"cid": connection_id})
-            db.commit()
-        finally:
-            db.close()
-    except Exception as e:
-        logger.warning(f"Failed to unregister device from DB: {e}")
-
-
-def _db_update_device_registration(tenant_slug: str, connection_id: str, device_type: str, device_name: str, device_id: Optional[str]):
-    """Update device registration info in the database after a register message."""
-    try:
-        db = next(get_db_for_tenant(tenant_slug))
-        try:
-            db.execute(text("""
-                UPDATE connected_devices 
-                SET device_type = :dtype, device_name = :dname, device_id = :did
-                WHERE connection_id = :cid
-            """), {
-                "cid": connection_id,
-                "dtype": device_type,
-                "dname": device_name,
-                "did": device_id,
-            })
-            db.commit()
-        finally:
-            db.close()
-    except Exception as e:
-        logger.warning(f"Failed to update device registration in DB: {e}")
-
-
 def _db_cleanup_stale_devices(tenant_slug: str):
     """Remove connected_devices rows for workers that are no longer running.
     Called on startup to clean up rows from previous workers that crashed."""
@@ -200,49 +163,51 @@ def _db_cleanup_stale_devices(tenant_slug: str):
         logger.warning(f"Failed to clean up stale devices: {e}")
 
 
-def db_get_connected_devices(tenant_slug: str) -> List[dict]:
-    """Query all connected devices from the database (cross-worker view)."""
-    try:
-        db = next(get_db_for_tenant(tenant_slug))
+# =============================================================================
+# /ws/incidents connection management
+# =============================================================================
+
+class _ClientSender:
+    """Bounded outbound queue for one /ws/incidents connection plus the writer task draining it."""
+
+    def __init__(self, tenant_slug: str, websocket: WebSocket):
+        self.tenant_slug = tenant_slug
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SEND_QUEUE_SIZE)
+        self.task = asyncio.create_task(self._run())
+
+    def offer(self, message_json: str) -> bool:
+        """Enqueue without waiting. False if the client's queue is full."""
         try:
-            result = db.execute(text("""
-                SELECT connection_id, device_type, device_name, device_id,
-                       ip_address, user_agent, connected_at, worker_pid
-                FROM connected_devices
-                WHERE tenant_slug = :tenant
-                ORDER BY connected_at
-            """), {"tenant": tenant_slug})
-            
-            devices = []
-            for row in result:
-                devices.append({
-                    "connection_id": row[0],
-                    "device_type": row[1],
-                    "device_name": row[2],
-                    "device_id": row[3],
-                    "ip_address": row[4],
-                    "user_agent": row[5],
-                    "connected_at": row[6].isoformat() if row[6] else None,
-                    "worker_pid": row[7],
-                })
-            return devices
-        finally:
-            db.close()
-    except Exception as e:
-        logger.warning(f"Failed to query connected devices from DB: {e}")
-        return []
+            self.queue.put_nowait(message_json)
+            return True
+        except asyncio.QueueFull:
+            return False
 
+    def stop(self):
+        if self.task is not asyncio.current_task():
+            self.task.cancel()
+
+    async def _run(self):
+        try:
+            while True:
+                message_json = await self.queue.get()
+                await asyncio.wait_for(self.websocket.send_text(message_json), SEND_TIMEOUT)
+        except asyncio.CancelledError:
+            raise
+        except asyncio.TimeoutError:
+            await _evict_connection(self.tenant_slug, self.websocket, "send_timeout")
+        except Exception as e:
+            logger.warning(f"Failed to send to /ws/incidents WebSocket: {e}")
+            await _evict_connection(self.tenant_slug, self.websocket, "send_failed")
 
-# =============================================================================
-# /ws/incidents connection management (unchanged)
-# =============================================================================
 
 async def _add_connection(tenant_slug: str, websocket: WebSocket):
     """Add a WebSocket connection to the tenant's pool"""
     async with _connections_lock:
         if tenant_slug not in _connections:
-            _connections[tenant_slug] = set()
-        _connections[tenant_slug].add(websocket)
+            _connections[tenant_slug] = {}
+        _connections[tenant_slug][websocket] = _ClientSender(tenant_slug, websocket)
         logger.info(f"WebSocket /ws/incidents connected: {tenant_slug} (total: {len(_connections[tenant_slug])})")
 
 
@@ -250,54 +215,130 @@ async def _remove_connection(tenant_slug: str, websocket: WebSocket):
     """Remove a WebSocket connection from the tenant's pool"""
     async with _connections_lock:
         if tenant_slug in _connections:
-            _connections[tenant_slug].discard(websocket)
+            sender = _connections[tenant_slug].pop(websocket, None)
+            if sender:
+                sender.stop()
             logger.info(f"WebSocket /ws/incidents disconnected: {tenant_slug} (total: {len(_connections[tenant_slug])})")
-            # Clean up empty sets
+            # Clean up empty pools
             if not _connections[tenant_slug]:
                 del _connections[tenant_slug]
 
 
+async def _evict_connection(tenant_slug: str, websocket: WebSocket, reason: str):
+    """
+    Drop a slow or broken client: out of the pool, writer stopped, socket
+    closed in the background. The endpoint's receive loop then sees the
+    disconnect and its _remove_connection is a no-op.
+    """
+    async with _connections_lock:
+        pool = _connections.get(tenant_slug)
+        sender = pool.pop(websocket, None) if pool else None
+        if pool is not None and not pool:
+            del _connections[tenant_slug]
+    if sender is None:
+        return  # Already removed
+
+    sender.stop()
+    key = reason if reason == "send_failed" else f"evicted_{reason}"
+    _fanout_stats[key] += 1
+    if reason != "send_failed":
+        logger.warning(f"Evicted slow /ws/incidents client: {tenant_slug} ({reason})")
+
+    async def close():
+        try:
+            await asyncio.wait_for(websocket.close(code=1013, reason="Client too slow"), SEND_TIMEOUT)
+        except Exception:
+            pass
+
+    task = asyncio.create_task(close())
+    _close_tasks.add(task)
+    task.add_done_callback(_close_tasks.discard)
+
+
+def _db_get_incident_snapshot(tenant_slug: str, incident_id: int):
+    """Latest (revision, snapshot) for an incident (sync DB work)."""
+    db = next(get_db_for_tenant(tenant_slug))
+    try:
+        return incident_events.get_snapshot(db, incident_id)
+    finally:
+        db.close()
+
+
+async def _handle_resync(tenant_slug: str, websocket: WebSocket, message: dict):
+    """
+    Answer a client that detected a revision gap with the incident's latest
+    snapshot, on that connection only. Concurrent requests for the same
+    incident share one DB read.
+    """
+    incident_id = message.get("incident_id")
+    if not isinstance(incident_id, int):
+        return
+
+    key = (tenant_slug, incident_id)
+    read = _resync_reads.get(key)
+    if read is None:
+        read = asyncio.create_task(run_blocking(_db_get_incident_snapshot, tenant_slug, incident_id))
+        _resync_reads[key] = read
+        read.add_done_callback(lambda _: _resync_reads.pop(key, None))
+
+    try:
+        state = await asyncio.shield(read)
+    except Exception as e:
+        logger.warning(f"Resync read failed for {tenant_slug} incident {incident_id}: {e}")
+        state = None
+
+    if state is None:
+        # Client falls back to GET /api/incidents/{id}
+        message_json = json.dumps({"type": "resync_failed", "incident_id": incident_id})
+    else:
+        revision, snapshot = state
+        message_json = json.dumps({
+            "type": "incident_snapshot",
+            "incident_id": incident_id,
+            "revision": revision,
+            "incident": snapshot,
+        })
+    async with _connections_lock:
+        sender = _connections.get(tenant_slug, {}).get(websocket)
+    if sender and not sender.offer(message_json):
+        await _evict_connection(tenant_slug, websocket, "queue_full")
+
+
 async def broadcast_to_tenant(tenant_slug: str, message: dict):
     """
     Broadcast a message to all /ws/incidents connections for a specific tenant.
-    
+
+    Serializes once and enqueues on each connection's outbound queue -
+    returns without waiting for any client. A client whose queue is full
+    is evicted; per-client writer tasks evict clients whose send exceeds
+    SEND_TIMEOUT. Benchmark: scripts/bench_ws_fanout.py.
+
     Args:
         tenant_slug: The tenant to broadcast to (e.g., 'glenmoorefc')
         message: Dict with 'type' and payload (will be JSON serialized)
-    
+
     Message types:
         - incident_created: New incident created
         - incident_updated: Incident data changed
         - incident_closed: Incident status changed to CLOSED
+        - reparse_progress: Full-reparse job progress (services/reparse_job.py)
     """
     async with _connections_lock:
         if tenant_slug not in _connections:
             return
-        
-        connections = _connections[tenant_slug].copy()
-    
-    if not connections:
+
+        senders = list(_connections[tenant_slug].values())
+
+    if not senders:
         return
-    
+
     # Serialize once
     message_json = json.dumps(message)
-    
-    # Track failed connections for removal
-    failed = []
-    
-    for websocket in connections:
-        try:
-            await websocket.send_text(message_json)
-        except Exception as e:
-            logger.warning(f"Failed to send to /ws/incidents WebSocket: {e}")
-            failed.append(websocket)
-    
-    # Remove failed connections
-    if failed:
-        async with _connections_lock:
-            if tenant_slug in _connections:
-                for ws in failed:
-                    _connections[tenant_slug].discard(ws)
+    _fanout_stats["broadcasts"] += 1
+
+    for sender in senders:
+        if not sender.offer(message_json):
+            await _evict_connection(tenant_slug, sender.websocket, "queue_full")
 
 
 # =============================================================================
@@ -322,8 +363,13 @@ async def _add_av_connection(tenant_slug: str, websocket: WebSocket) -> str:
         _av_devices[tenant_slug][connection_id] = device
         count = len(_av_devices[tenant_slug])
 
-    # Register in database for cross-worker visibility
-    _db_register_device(tenant_slug, device)
+    # Presence for cross-worker visibility (persisted by the background flusher)
+    device_presence.register(
+        tenant_slug, connection_id,
+        ip_address=device.ip_address,
+        user_agent=device.user_agent,
+        connected_at=device.connected_at,
+    )
 
     logger.info(f"WebSocket /ws/AValerts connected: {tenant_slug} [{connection_id}] from {device.ip_address} (total: {count})")
     return connection_id
@@ -340,8 +386,7 @@ async def _remove_av_connection(tenant_slug: str, connection_id: str):
             if not _av_devices[tenant_slug]:
                 del _av_devices[tenant_slug]
 
-    # Remove from database
-    _db_unregister_device(tenant_slug, connection_id)
+    device_presence.unregister(tenant_slug, connection_id)
 
 
 async def broadcast_av_alert(tenant_slug: str, alert_data: dict):
@@ -387,40 +432,38 @@ async def broadcast_av_alert(tenant_slug: str, alert_data: dict):
             if tenant_slug in _av_devices:
                 for conn_id in failed:
                     _av_devices[tenant_slug].pop(conn_id, None)
+        for conn_id in failed:
+            device_presence.unregister(tenant_slug, conn_id)
 
 
 # =============================================================================
 # Connection counts and device listing
 # =============================================================================
 
-def get_connection_count(tenant_slug: str = None) -> dict:
-    """Get connection counts for monitoring (this worker only for incidents, DB for AV)."""
-    if tenant_slug:
-        av_count = len(db_get_connected_devices(tenant_slug))
-        return {
-            "tenant": tenant_slug,
-            "incidents_connections": len(_connections.get(tenant_slug, set())),
-            "av_alerts_connections": av_count,
-        }
-    # For the summary view, use in-memory for incidents (approximate) and DB for AV
-    all_tenants = set(list(_connections.keys()))
-    # Add tenants that have AV devices in DB
-    for t in list(_connections.keys()):
-        all_tenants.add(t)
+def get_connection_count() -> dict:
+    """
+    Get connection counts for monitoring - this worker's connections only
+    (worker_pid says which). Cross-worker AV device lists for a tenant go
+    through the authenticated devices router (get_connected_av_devices).
+    """
+    all_tenants = set(_connections.keys()) | set(_av_devices.keys())
     return {
+        "worker_pid": os.getpid(),
         "total_tenants": len(all_tenants),
         "incidents_by_tenant": {k: len(v) for k, v in _connections.items()},
         "av_alerts_by_tenant": {k: len(v) for k, v in _av_devices.items()},
+        "incidents_fanout": dict(_fanout_stats),
+        "device_presence": device_presence.get_stats(),
     }
 
 
-def get_connected_av_devices(tenant_slug: str) -> List[dict]:
+async def get_connected_av_devices(tenant_slug: str) -> List[dict]:
     """Get list of connected AV alert devices for a tenant.
     
-    Queries the database for cross-worker visibility.
+    This worker's devices from memory, other workers' from the database.
     Called by devices router.
     """
-    return db_get_connected_devices(tenant_slug)
+    return await device_presence.list_devices(tenant_slug)
 
 
 # =============================================================================
@@ -552,12 +595,15 @@ async def _receive_loop(
     """Handle incoming messages from client.
     
     When tenant_slug and connection_id are provided (AV alerts path),
-    also handles 'register' messages to identify the device.
+    also handles 'register' messages to identify the device. With
+    tenant_slug alone (/ws/incidents), handles 'resync' requests.
     """
     try:
         while not stop_event.is_set():
             try:
                 data = await websocket.receive_text()
+                if connection_id:
+                    device_presence.touch(tenant_slug, connection_id)
                 message = json.loads(data)
                 msg_type = message.get("type")
                 
@@ -568,6 +614,8 @@ async def _receive_loop(
                     pass
                 elif msg_type == "register" and tenant_slug and connection_id:
                     await _handle_register(tenant_slug, connection_id, message)
+                elif msg_type == "resync" and tenant_slug and not connection_id:
+                    await _handle_resync(tenant_slug, websocket, message)
                     
             except json.JSONDecodeError as e:
                 logger.warning(f"Invalid JSON received: {e}")
@@ -587,7 +635,7 @@ async def _handle_register(tenant_slug: str, connection_id: str, message: dict):
         { "type": "register", "device_type": "stationbell_bay", "device_id": "AA:BB:CC", "name": "Bay 1" }
     
     Devices that never send register still work - they just show as "Unknown".
-    Updates both the in-memory dict and the database row.
+    Updates both the in-memory dict and device presence (flushed to the DB).
     """
     device_type = message.get("device_type", "unknown")
     device_name = message.get("name", "Unknown")
@@ -603,8 +651,10 @@ async def _handle_register(tenant_slug: str, connection_id: str, message: dict):
         device.device_name = device_name
         device.device_id = device_id
     
-    # Update database row
-    _db_update_device_registration(tenant_slug, connection_id, device_type, device_name, device_id)
+    device_presence.update(
+        tenant_slug, connection_id,
+        device_type=device_type, device_name=device_name, device_id=device_id,
+    )
 
     logger.info(
         f"WebSocket /ws/AValerts registered: {tenant_slug} [{connection_id}] "
@@ -635,7 +685,8 @@ async def notify_tenant_event(tenant_slug: str, event_type: str, payload: dict):
     
     Args:
         tenant_slug: Tenant to broadcast to
-        event_type: 'incident', 'av_alert', or 'device_command'
+        event_type: 'incident', 'av_alert', 'device_command', 'tenant_registry',
+                    'settings', 'analytics_cache' or 'reparse_job'
         payload: The message dict to broadcast
     """
     notify_data = json.dumps({
@@ -647,7 +698,9 @@ async def notify_tenant_event(tenant_slug: str, event_type: str, payload: dict):
     # PostgreSQL NOTIFY payload limit is 8000 bytes
     if len(notify_data) > 7500:
         logger.warning(f"NOTIFY payload too large ({len(notify_data)} bytes), truncating")
-        # For oversized payloads, strip large fields and send a refresh hint
+        # For oversized payloads, strip large fields and send a refresh hint.
+        # Incident events are delta-encoded upstream (incident_events.py)
+        # and only land here if revisions are unavailable.
         payload_slim = {"type": payload.get("type", event_type), "refresh": True}
         notify_data = json.dumps({
             "tenant": tenant_slug,
@@ -682,6 +735,14 @@ async def _dispatch_notification(tenant_slug: str, event_type: str, payload: dic
             await broadcast_av_alert(tenant_slug, payload)
         elif event_type == "device_command":
             await _handle_device_command(tenant_slug, payload)
+        elif event_type == tenant_registry.TENANT_REGISTRY_EVENT:
+            tenant_registry.invalidate(payload.get("slug"))
+        elif event_type == settings_cache.SETTINGS_EVENT:
+            settings_cache.invalidate(payload.get("database"))
+        elif event_type == analytics_cache.ANALYTICS_CACHE_EVENT:
+            analytics_cache.invalidate(payload.get("database"))
+        elif event_type == REPARSE_JOB_EVENT:
+            await broadcast_to_tenant(tenant_slug, payload)
         else:
             logger.warning(f"Unknown NOTIFY event_type: {event_type}")
     except Exception as e:
@@ -846,7 +907,7 @@ async def websocket_incidents(websocket: WebSocket):
     
     # Start server-side ping loop and receive loop concurrently
     ping_task = asyncio.create_task(_server_ping_loop(websocket, stop_event))
-    receive_task = asyncio.create_task(_receive_loop(websocket, stop_event))
+    receive_task = asyncio.create_task(_receive_loop(websocket, stop_event, tenant_slug=tenant_slug))
     
     try:
         # Wait for either task to complete (indicates disconnect)
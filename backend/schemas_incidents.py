@@ -218,3 +218,24 @@ class AttendanceSave(BaseModel):
 class IncidentDuplicate(BaseModel):
     """Request to duplicate an incident to a different category"""
     target_category: str  # FIRE, EMS, or DETAIL
+
+
+# =============================================================================
+# CAD INGEST SCHEMA
+# =============================================================================
+
+class CadIngest(BaseModel):
+    """
+    One parsed CAD report for POST /api/cad/ingest.
+    
+    `report` is cad_parser.report_to_dict() output. The optional overrides
+    let importers that parse dates their own way (adi_log_import) supply
+    them instead of the server parsing report['dispatch_time'].
+    """
+    report: Dict[str, Any]
+    raw_html: Optional[str] = None
+    timezone: Optional[str] = None          # IANA; defaults to station timezone setting
+    call_category: Optional[str] = None     # FIRE or EMS; defaults to force_category / auto-detect
+    incident_date: Optional[str] = None     # YYYY-MM-DD (local)
+    dispatch_time: Optional[str] = None     # HH:MM:SS (local), with incident_date
+    skip_existing: bool = False             # Leave an existing incident untouched
@@ -0,0 +1,74 @@
+"""
+Incident Metrics - shared helpers for the incident_metrics fact table
+
+incident_metrics (migration 051) holds one row per non-deleted incident
+with its category letter, station_responded flag, turnout / travel /
+response / on-scene / duration seconds, personnel counts, manhours and
+local dispatch hour. It is maintained by triggers on incidents and
+incident_personnel; analytics and report queries read it instead of
+expanding cad_units JSONB and counting incident_personnel per row.
+
+    FROM incident_metrics m
+    WHERE m.incident_date BETWEEN :start_date AND :end_date
+      {category_filter(category)}
+      AND m.station_responded
+
+Join incidents i ON i.id = m.incident_id only for columns the table
+doesn't carry (damage estimates, mutual aid departments, ...).
+"""
+
+import logging
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+
+def category_letter(category: Optional[str]) -> Optional[str]:
+    """'FIRE' -> 'F', 'EMS' -> 'E', anything else -> None."""
+    if category and category.upper() == 'FIRE':
+        return 'F'
+    if category and category.upper() == 'EMS':
+        return 'E'
+    return None
+
+
+def category_filter(category: Optional[str] = None, alias: str = "m") -> str:
+    """
+    SQL filter on the incident number category letter (F=Fire, E=EMS).
+    No category = Fire and EMS; Detail incidents (D) are always excluded.
+    """
+    letter = category_letter(category)
+    if letter:
+        return f"AND {alias}.category = '{letter}'"
+    return f"AND {alias}.category IN ('F', 'E')"
+
+
+def rebuild(db: Session, start_date: Optional[date] = None, end_date: Optional[date] = None) -> int:
+    """
+    Recompute metrics rows (all incidents, or an incident_date range).
+    Needed after changing the station timezone or an apparatus'
+    counts_for_response_times - neither fires the incident triggers.
+    Returns the number of incidents refreshed.
+    """
+    where = ["deleted_at IS NULL"]
+    params = {}
+    if start_date:
+        where.append("COALESCE(incident_date, created_at::date) >= :start_date")
+        params["start_date"] = start_date
+    if end_date:
+        where.append("COALESCE(incident_date, created_at::date) <= :end_date")
+        params["end_date"] = end_date
+
+    # One statement: the function runs once per selected row server-side
+    count = len(db.execute(text(f"""
+        SELECT refresh_incident_metrics(id) FROM incidents
+        WHERE {' AND '.join(where)}
+    """), params).fetchall())
+    db.commit()
+
+    logger.info(f"incident_metrics rebuilt for {count} incidents")
+    return count
@@ -1,5 +1,5 @@
 """
-Location Background Task — Geocode → Route → Proximity at CAD Ingest
+Location Background Task — Geocode → Route / Weather / Proximity at CAD Ingest
 
 Fires as a FastAPI BackgroundTask when:
     1. New incident created (POST /api/incidents)
@@ -8,13 +8,21 @@ Fires as a FastAPI BackgroundTask when:
 
 Logic:
     1. Read incident address, lat, lng, route_polyline, map_snapshot
-    2. If no coords → geocode (Google → Census → Geocodio)
-    3. If coords exist but no route → fetch route
-    4. If coords exist but no proximity → build proximity snapshot
+    2. If no coords → geocode (mile marker → geocode cache → Google → Census → Geocodio)
+    3. With coords, in parallel (services/location/enrichment.py):
+         - reverse geocode if geocode_data is missing address fields
+         - route if none cached
+         - weather if a snapshot is needed and none stored
+         - proximity queries (this thread) if no snapshot
+    4. Write everything in ONE transaction
     5. If everything exists → do nothing
 
 All failures are non-fatal. Geocode failure sets geocode_needs_review = true.
-Route/proximity failures log warnings but don't block each other.
+Route/weather/proximity failures log warnings but don't block each other.
+Per-stage timings are logged with the completion line.
+
+The final write is skipped if the incident's address changed while the
+lookups were running (the address change queued its own task).
 
 Database: Creates its own session via get_db_for_tenant() since background
 tasks run outside the request lifecycle.
@@ -22,12 +30,19 @@ tasks run outside the request lifecycle.
 
 import json
 import logging
-from typing import Optional
+import time
+from typing import Dict, Optional
 
 from sqlalchemy import text
 
 logger = logging.getLogger(__name__)
 
+# geocode_data fields filled by reverse geocoding when missing
+REVERSE_GEOCODE_FIELDS = (
+    "city", "state", "zip_code", "county", "county_subdivision",
+    "street_number", "street_name", "street_suffix", "street_prefix",
+)
+
 
 def process_incident_location(incident_id: int, tenant_slug: str):
     """
@@ -48,6 +63,10 @@ def process_incident_location(incident_id: int, tenant_slug: str):
         db.close()
 
 
+def _elapsed_ms(start: float) -> int:
+    return round((time.perf_counter() - start) * 1000)
+
+
 def _process(db, incident_id: int):
     """Core processing logic with its own DB session."""
 
@@ -56,6 +75,9 @@ def _process(db, incident_id: int):
         get_google_api_key, get_geocodio_api_key, get_default_state,
     )
 
+    started = time.perf_counter()
+    timings: Dict[str, int] = {}
+
     # ── Feature flag check ──────────────────────────────────────────────
     if not is_location_enabled(db):
         logger.debug(f"Location services disabled — skipping incident {incident_id}")
@@ -64,7 +86,7 @@ def _process(db, incident_id: int):
     # ── Read current incident state ─────────────────────────────────────
     row = db.execute(text("""
         SELECT address, latitude, longitude, route_polyline, map_snapshot,
-               geocode_data, geocode_needs_review
+               geocode_data, geocode_needs_review, weather_api_data, municipality_code
         FROM incidents
         WHERE id = :id AND deleted_at IS NULL
     """), {"id": incident_id}).fetchone()
@@ -78,8 +100,10 @@ def _process(db, incident_id: int):
     longitude = row[2]
     has_route = row[3] is not None
     has_snapshot = row[4] is not None
-    has_geocode_data = row[5] is not None
+    geocode_data = row[5]
     needs_review = row[6]
+    weather_data = row[7] or None
+    municipality = row[8]
 
     # Nothing to do without an address
     if not address or not address.strip():
@@ -103,7 +127,11 @@ def _process(db, incident_id: int):
         and str(latitude).strip() != '' and str(longitude).strip() != ''
     )
 
+    # Columns for the single final UPDATE
+    updates: Dict[str, object] = {}
+
     # ── Step 1: Geocode if needed ───────────────────────────────────────
+    # Everything else depends on the coordinates, so this stays first.
     if not has_coords:
         if station_lat is None or station_lng is None:
             logger.warning(f"Station coords not configured — cannot geocode incident {incident_id}")
@@ -111,6 +139,7 @@ def _process(db, incident_id: int):
 
         from services.location.mile_marker import geocode_with_mile_marker_fallback
 
+        stage = time.perf_counter()
         result = geocode_with_mile_marker_fallback(
             db=db,
             address=address,
@@ -119,33 +148,11 @@ def _process(db, incident_id: int):
             state=default_state or "PA",
             google_api_key=google_key,
             geocodio_api_key=geocodio_key,
+            municipality=municipality,
         )
+        timings["geocode"] = _elapsed_ms(stage)
 
-        if result:
-            latitude = str(result["latitude"])
-            longitude = str(result["longitude"])
-            db.execute(text("""
-                UPDATE incidents
-                SET latitude = :lat,
-                    longitude = :lng,
-                    geocode_data = :data,
-                    geocode_needs_review = false,
-                    updated_at = NOW()
-                WHERE id = :id
-            """), {
-                "lat": latitude,
-                "lng": longitude,
-                "data": json.dumps(result),
-                "id": incident_id,
-            })
-            db.commit()
-            has_coords = True
-            logger.info(
-                f"Geocoded incident {incident_id}: "
-                f"{result.get('matched_address')} ({result.get('provider')}, "
-                f"{result.get('distance_km')}km)"
-            )
-        else:
+        if not result:
             # Geocode failed — flag for review, stop processing
             db.execute(text("""
                 UPDATE incidents
@@ -156,142 +163,158 @@ def _process(db, incident_id: int):
             logger.warning(f"Geocode failed for incident {incident_id} ({address}) — flagged for review")
             return
 
+        latitude = str(result["latitude"])
+        longitude = str(result["longitude"])
+        geocode_data = dict(result)
+        updates["latitude"] = latitude
+        updates["longitude"] = longitude
+        updates["geocode_data"] = geocode_data
+        updates["geocode_needs_review"] = False
+        logger.info(
+            f"Geocoded incident {incident_id}: "
+            f"{result.get('matched_address')} ({result.get('provider')}, "
+            f"{result.get('distance_km')}km)"
+        )
+
     # From here we have coords — convert to float for service calls
     lat_f = float(latitude)
     lng_f = float(longitude)
 
-    # ── Step 1b: Reverse geocode if address fields missing ───────────
-    # If we have coords but geocode_data is missing key address fields
-    # (e.g. mile marker geocode, intersection, or incomplete result),
-    # reverse geocode the lat/lng to fill in county, state, zip, city.
-    if google_key:
-        _maybe_reverse_geocode(db, incident_id, lat_f, lng_f, google_key)
+    if isinstance(geocode_data, str):
+        geocode_data = json.loads(geocode_data)
 
-    # ── Step 2: Route if needed ─────────────────────────────────────────
-    if not has_route and google_key and station_lat is not None:
-        try:
-            from services.location.route import fetch_route
-
-            route_data = fetch_route(
-                origin_lat=station_lat,
-                origin_lng=station_lng,
-                dest_lat=lat_f,
-                dest_lng=lng_f,
-                google_api_key=google_key,
-            )
-            if route_data:
-                db.execute(text("""
-                    UPDATE incidents
-                    SET route_polyline = :polyline,
-                        route_geometry = ST_LineFromEncodedPolyline(:polyline),
-                        updated_at = NOW()
-                    WHERE id = :id
-                """), {"polyline": route_data["polyline"], "id": incident_id})
-                db.commit()
-                logger.info(
-                    f"Route cached for incident {incident_id}: "
-                    f"{route_data['distance_meters']}m, {route_data['duration_seconds']}s"
-                )
-        except Exception as e:
-            logger.warning(f"Route fetch failed for incident {incident_id}: {e}")
-            # Continue to proximity — map works without route
+    # ── Step 2: Fan out reverse geocode / route / weather ───────────────
+    from services.location.enrichment import start_lookups, wait_lookups
+
+    want_reverse = bool(google_key) and _missing_address_fields(geocode_data)
+    want_route = not has_route and bool(google_key) and station_lat is not None
+    want_weather = not has_snapshot and not weather_data
 
-    # ── Step 3: Proximity snapshot if needed ─────────────────────────────
+    pending = start_lookups(
+        lat_f, lng_f,
+        google_key=google_key,
+        reverse_geocode=want_reverse,
+        route_from=(station_lat, station_lng) if want_route else None,
+        weather=want_weather,
+    )
+
+    # ── Step 3: Proximity queries while the HTTP calls are in flight ────
+    proximity_parts = None
     if not has_snapshot:
-        try:
-            from services.location.proximity import build_proximity_snapshot
-
-            # Try to get weather data from incident (may have been auto-fetched)
-            weather_row = db.execute(text(
-                "SELECT weather_api_data FROM incidents WHERE id = :id"
-            ), {"id": incident_id}).fetchone()
-            weather_data = weather_row[0] if weather_row and weather_row[0] else None
-
-            # If no weather yet, try fetching
-            if not weather_data:
-                try:
-                    from weather_service import get_weather_for_incident
-                    from datetime import datetime, timezone as tz
-                    weather_data = get_weather_for_incident(
-                        timestamp=datetime.now(tz.utc),
-                        latitude=lat_f,
-                        longitude=lng_f,
-                    )
-                except Exception:
-                    pass  # Weather is optional
-
-            snapshot = build_proximity_snapshot(
-                db=db,
-                lat=lat_f,
-                lng=lng_f,
-                address=address,
-                weather_data=weather_data,
-            )
+        from services.location.proximity import query_proximity
 
-            db.execute(text(
-                "UPDATE incidents SET map_snapshot = :snapshot, updated_at = NOW() WHERE id = :id"
-            ), {"snapshot": json.dumps(snapshot), "id": incident_id})
-            db.commit()
-            logger.info(f"Proximity snapshot stored for incident {incident_id}")
+        stage = time.perf_counter()
+        try:
+            proximity_parts = query_proximity(db, lat_f, lng_f, address)
         except Exception as e:
             logger.warning(f"Proximity snapshot failed for incident {incident_id}: {e}")
+        timings["proximity"] = _elapsed_ms(stage)
+
+    # Nothing written yet — end the read transaction so a failed proximity
+    # query can't leave the session aborted for the write below
+    db.rollback()
+
+    stage = time.perf_counter()
+    lookups = wait_lookups(pending)
+    timings["lookups_wait"] = _elapsed_ms(stage)
+    timings.update(lookups.get("timings", {}))
+
+    # ── Merge results ───────────────────────────────────────────────────
+    reverse = lookups.get("reverse_geocode")
+    if want_reverse:
+        if reverse and _merge_reverse_geocode(geocode_data, reverse):
+            updates["geocode_data"] = geocode_data
+            logger.info(
+                f"Reverse geocode enriched incident {incident_id}: "
+                f"{reverse.get('city')}, {reverse.get('county')} Co, "
+                f"{reverse.get('state')} {reverse.get('zip_code')}"
+            )
+        elif not reverse:
+            logger.warning(f"Reverse geocode failed for incident {incident_id} at {lat_f},{lng_f}")
 
-    logger.info(f"Location processing complete for incident {incident_id}")
+    route_data = lookups.get("route")
+    if route_data:
+        updates["route_polyline"] = route_data["polyline"]
+        logger.info(
+            f"Route cached for incident {incident_id}: "
+            f"{route_data['distance_meters']}m, {route_data['duration_seconds']}s"
+        )
+    elif want_route:
+        logger.warning(f"Route fetch failed for incident {incident_id}")
+        # Continue — map works without route
+
+    if proximity_parts is not None:
+        from services.location.proximity import assemble_proximity_snapshot
+        updates["map_snapshot"] = assemble_proximity_snapshot(
+            proximity_parts, weather_data or lookups.get("weather")
+        )
 
+    # ── Step 4: One transaction ─────────────────────────────────────────
+    if updates:
+        stage = time.perf_counter()
+        written = _write_updates(db, incident_id, address, updates)
+        timings["write"] = _elapsed_ms(stage)
+        if not written:
+            logger.info(f"Incident {incident_id} address changed during location processing — results discarded")
+            return
 
-def _maybe_reverse_geocode(db, incident_id: int, lat: float, lng: float, google_key: str):
-    """
-    Check if geocode_data is missing key address fields (county, state, zip, city).
-    If so, reverse geocode the lat/lng via Google and merge the results.
-    """
-    row = db.execute(text(
-        "SELECT geocode_data FROM incidents WHERE id = :id"
-    ), {"id": incident_id}).fetchone()
+    timings["total"] = _elapsed_ms(started)
+    logger.info(
+        f"Location processing complete for incident {incident_id} "
+        f"({', '.join(f'{k}={v}ms' for k, v in timings.items())})"
+    )
 
-    if not row or not row[0]:
-        return
 
-    geocode_data = row[0] if isinstance(row[0], dict) else json.loads(row[0])
+def _write_updates(db, incident_id: int, address: str, updates: Dict[str, object]) -> bool:
+    """
+    Apply all location results in one UPDATE + commit.
 
-    # Check if key fields are already populated
-    has_county = bool(geocode_data.get("county"))
-    has_state = bool(geocode_data.get("state"))
-    has_zip = bool(geocode_data.get("zip_code"))
-    has_city = bool(geocode_data.get("city"))
+    Returns False if the incident's address no longer matches (changed while
+    lookups ran) — nothing is written in that case.
+    """
+    set_clauses = ["updated_at = NOW()"]
+    params = {"id": incident_id, "address": address}
+
+    for column in ("latitude", "longitude", "geocode_needs_review"):
+        if column in updates:
+            set_clauses.append(f"{column} = :{column}")
+            params[column] = updates[column]
+    if "geocode_data" in updates:
+        set_clauses.append("geocode_data = :geocode_data")
+        params["geocode_data"] = json.dumps(updates["geocode_data"])
+    if "route_polyline" in updates:
+        set_clauses.append("route_polyline = :polyline")
+        set_clauses.append("route_geometry = ST_LineFromEncodedPolyline(:polyline)")
+        params["polyline"] = updates["route_polyline"]
+    if "map_snapshot" in updates:
+        set_clauses.append("map_snapshot = :snapshot")
+        params["snapshot"] = json.dumps(updates["map_snapshot"])
 
-    if has_county and has_state and has_zip and has_city:
-        return  # All fields present, nothing to do
+    try:
+        result = db.execute(text(f"""
+            UPDATE incidents
+            SET {', '.join(set_clauses)}
+            WHERE id = :id AND deleted_at IS NULL AND address = :address
+        """), params)
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return result.rowcount > 0
 
-    logger.info(
-        f"Incident {incident_id}: geocode_data missing address fields "
-        f"(county={has_county}, state={has_state}, zip={has_zip}, city={has_city}) "
-        f"— running reverse geocode"
-    )
 
-    from services.location.geocoding import reverse_geocode_google
+def _missing_address_fields(geocode_data: Optional[dict]) -> bool:
+    """True if geocode_data lacks county, state, zip or city (needs reverse geocode)."""
+    if not geocode_data:
+        return False
+    return not all(geocode_data.get(f) for f in ("county", "state", "zip_code", "city"))
 
-    result = reverse_geocode_google(lat, lng, google_key)
-    if not result:
-        logger.warning(f"Reverse geocode failed for incident {incident_id} at {lat},{lng}")
-        return
 
-    # Merge: only fill in fields that are currently empty
+def _merge_reverse_geocode(geocode_data: dict, result: dict) -> bool:
+    """Fill empty geocode_data fields from a reverse geocode result. Returns True if changed."""
     updated = False
-    for field in ("city", "state", "zip_code", "county", "county_subdivision",
-                  "street_number", "street_name", "street_suffix", "street_prefix"):
+    for field in REVERSE_GEOCODE_FIELDS:
         if not geocode_data.get(field) and result.get(field):
             geocode_data[field] = result[field]
             updated = True
-
-    if updated:
-        db.execute(text("""
-            UPDATE incidents
-            SET geocode_data = :data, updated_at = NOW()
-            WHERE id = :id
-        """), {"data": json.dumps(geocode_data), "id": incident_id})
-        db.commit()
-        logger.info(
-            f"Reverse geocode enriched incident {incident_id}: "
-            f"{result.get('city')}, {result.get('county')} Co, "
-            f"{result.get('state')} {result.get('zip_code')}"
-        )
+    return updated
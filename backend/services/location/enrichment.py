@@ -0,0 +1,159 @@
+"""
+Location Enrichment — concurrent HTTP lookups once an incident has coordinates
+
+After geocoding, the remaining lookups only depend on lat/lng:
+
+    reverse geocode (Google)   ─┐
+    route (Google Directions)  ─┼─ HTTP, concurrently on the enrichment loop
+    weather (Open-Meteo)       ─┘
+    proximity queries (PostGIS)  ─ caller's thread, at the same time
+
+The HTTP calls run on one long-lived event loop in a daemon thread with one
+httpx.AsyncClient per provider, so TLS connections to Google / Open-Meteo
+are kept alive across incidents instead of re-handshaking on every call.
+Each provider has its own timeout; a slow provider only delays itself.
+
+Callers are sync (FastAPI BackgroundTasks run in the threadpool):
+
+    pending = start_lookups(lat, lng, route_from=(slat, slng), google_key=key, weather=True)
+    parts = query_proximity(db, lat, lng, address)     # overlaps the HTTP calls
+    results = wait_lookups(pending)
+    # {"reverse_geocode": ..., "route": ..., "weather": ..., "timings": {"route": 412, ...}}
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from typing import Dict, Optional, Tuple
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Per-provider timeouts (seconds): total per request, connect
+PROVIDER_TIMEOUTS = {
+    "google": httpx.Timeout(8.0, connect=3.0),
+    "open_meteo": httpx.Timeout(6.0, connect=3.0),
+}
+
+# Keep-alive pool per provider client
+PROVIDER_LIMITS = httpx.Limits(max_connections=20, max_keepalive_connections=10)
+
+# Upper bound for waiting on the whole fan-out (slowest provider + slack)
+ENRICHMENT_TIMEOUT = 12
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_loop_lock = threading.Lock()
+_clients: Dict[str, httpx.AsyncClient] = {}
+
+
+def _get_loop() -> asyncio.AbstractEventLoop:
+    """Start the enrichment loop thread on first use (after uvicorn forks)."""
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="location-enrichment", daemon=True
+            ).start()
+            _loop = loop
+            logger.info("Location enrichment loop started")
+    return _loop
+
+
+def _client(provider: str) -> httpx.AsyncClient:
+    """Shared AsyncClient for a provider. Only called on the enrichment loop."""
+    client = _clients.get(provider)
+    if client is None:
+        client = httpx.AsyncClient(timeout=PROVIDER_TIMEOUTS[provider], limits=PROVIDER_LIMITS)
+        _clients[provider] = client
+    return client
+
+
+async def _timed(name: str, coro, timings: Dict[str, int]):
+    start = time.perf_counter()
+    try:
+        return await coro
+    except Exception as e:
+        logger.warning(f"Location enrichment: {name} failed: {e}")
+        return None
+    finally:
+        timings[name] = round((time.perf_counter() - start) * 1000)
+
+
+async def _fan_out(
+    lat: float,
+    lng: float,
+    google_key: Optional[str],
+    reverse_geocode: bool,
+    route_from: Optional[Tuple[float, float]],
+    weather: bool,
+) -> Dict:
+    from services.location.geocoding import reverse_geocode_google_async
+    from services.location.route import fetch_route_async
+    from weather_service import fetch_weather_open_meteo_async
+
+    lookups = {}
+    if reverse_geocode and google_key:
+        lookups["reverse_geocode"] = reverse_geocode_google_async(
+            _client("google"), lat, lng, google_key
+        )
+    if route_from and google_key:
+        lookups["route"] = fetch_route_async(
+            _client("google"), route_from[0], route_from[1], lat, lng, google_key
+        )
+    if weather:
+        lookups["weather"] = fetch_weather_open_meteo_async(
+            _client("open_meteo"), lat, lng, datetime.now(timezone.utc)
+        )
+
+    timings: Dict[str, int] = {}
+    results = await asyncio.gather(*(_timed(name, coro, timings) for name, coro in lookups.items()))
+
+    out = dict(zip(lookups.keys(), results))
+    out["timings"] = timings
+    return out
+
+
+def start_lookups(
+    lat: float,
+    lng: float,
+    google_key: Optional[str] = None,
+    reverse_geocode: bool = False,
+    route_from: Optional[Tuple[float, float]] = None,
+    weather: bool = False,
+) -> Optional[Future]:
+    """
+    Start the requested lookups on the enrichment loop and return immediately.
+
+    Args:
+        lat, lng: Incident coordinates
+        google_key: Google Maps API key (reverse geocode + route need it)
+        reverse_geocode: Fetch address components for lat/lng
+        route_from: (lat, lng) origin for a driving route (the station)
+        weather: Fetch current weather at lat/lng
+
+    Returns:
+        Future for wait_lookups(), or None if nothing was requested
+    """
+    if not (reverse_geocode or route_from or weather):
+        return None
+    return asyncio.run_coroutine_threadsafe(
+        _fan_out(lat, lng, google_key, reverse_geocode, route_from, weather),
+        _get_loop(),
+    )
+
+
+def wait_lookups(pending: Optional[Future], timeout: float = ENRICHMENT_TIMEOUT) -> Dict:
+    """Block for start_lookups() results. Missing/failed lookups are None."""
+    if pending is None:
+        return {"timings": {}}
+    try:
+        return pending.result(timeout=timeout)
+    except Exception as e:
+        pending.cancel()
+        logger.warning(f"Location enrichment lookups did not finish: {e!r}")
+        return {"timings": {}}
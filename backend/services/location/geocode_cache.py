@@ -0,0 +1,238 @@
+"""
+Geocode Cache — per-tenant table of provider geocode results
+
+A fire company answers the same few thousand addresses for years (nursing
+homes, apartment complexes, highway interchanges), so most incidents repeat
+an address that was already geocoded. geocode_with_mile_marker_fallback()
+checks this table before calling Google / Census / Geocodio.
+
+Key:    normalized address | municipality code | state
+        ("123  Main St. " in WALLAC, pa  ->  "123 MAIN ST.|WALLAC|PA")
+Value:  the full geocode_address() result dict (JSONB)
+
+Expiry:
+    provider results   GEOCODE_CACHE_TTL_DAYS after they were stored
+    manual corrections never (picker in the run sheet, POST /set-coords)
+
+Invalidation:
+    - POST /api/location/set-coords/{id} overwrites the entry with the
+      coordinates the officer picked (clears geocode_needs_review)
+    - POST /api/location/geocode/{id} (re-geocode button) drops the entry
+      before geocoding fresh
+    - DELETE /api/location/geocode-cache/{id} drops the entry only
+
+Failed geocodes are not cached (a provider outage must not stick).
+Mile marker results are not cached either — they come from local tables.
+
+Hit / miss / provider latency counters are per process; see cache_stats()
+and GET /api/location/geocode-cache/stats.
+"""
+
+import json
+import logging
+import threading
+from typing import Dict, Optional
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+# Provider results are re-geocoded after this many days
+GEOCODE_CACHE_TTL_DAYS = 180
+
+# Process-local counters (reset on restart)
+_stats_lock = threading.Lock()
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "stores": 0,
+    "invalidations": 0,
+    "errors": 0,
+    "provider_calls": 0,
+    "provider_failures": 0,
+    "provider_ms_total": 0,
+    "provider_ms_max": 0,
+}
+_provider_ms: Dict[str, Dict[str, int]] = {}
+
+
+def normalize_address(address: Optional[str]) -> str:
+    """Uppercase and collapse whitespace (same as migration 050's backfill)."""
+    return " ".join((address or "").upper().split())
+
+
+def cache_key(address: str, municipality: Optional[str] = None, state: Optional[str] = None) -> str:
+    """Cache key for an address: 'ADDRESS|MUNICIPALITY|STATE'."""
+    return "|".join((
+        normalize_address(address),
+        normalize_address(municipality),
+        normalize_address(state),
+    ))
+
+
+def _count(name: str, amount: int = 1):
+    with _stats_lock:
+        _stats[name] += amount
+
+
+# =============================================================================
+# LOOKUP / STORE / INVALIDATE
+# =============================================================================
+
+def lookup(db, address: str, municipality: Optional[str] = None, state: Optional[str] = None) -> Optional[dict]:
+    """
+    Cached geocode result for an address, or None (missing or expired).
+    A hit bumps the row's hit_count / last_hit_at.
+    """
+    key = cache_key(address, municipality, state)
+    try:
+        row = db.execute(text("""
+            UPDATE geocode_cache
+            SET hit_count = hit_count + 1, last_hit_at = NOW()
+            WHERE cache_key = :key
+              AND (expires_at IS NULL OR expires_at > NOW())
+            RETURNING result
+        """), {"key": key}).fetchone()
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        _count("errors")
+        logger.warning(f"Geocode cache lookup failed for '{key}': {e}")
+        return None
+
+    if not row:
+        _count("misses")
+        return None
+
+    _count("hits")
+    result = row[0]
+    if isinstance(result, str):
+        result = json.loads(result)
+    logger.debug(f"Geocode cache hit: {key}")
+    return result
+
+
+def store(
+    db,
+    address: str,
+    result: dict,
+    municipality: Optional[str] = None,
+    state: Optional[str] = None,
+    manual: bool = False,
+):
+    """
+    Insert or replace the cached result for an address.
+
+    manual=True marks an officer correction: it never expires and is only
+    replaced by another correction or removed by invalidate().
+    """
+    key = cache_key(address, municipality, state)
+    try:
+        db.execute(text("""
+            INSERT INTO geocode_cache
+                (cache_key, address, municipality, state, result, provider,
+                 manual, created_at, expires_at)
+            VALUES
+                (:key, :address, :municipality, :state, :result, :provider,
+                 :manual, NOW(),
+                 CASE WHEN :manual THEN NULL
+                      ELSE NOW() + make_interval(days => :ttl_days) END)
+            ON CONFLICT (cache_key) DO UPDATE SET
+                address = EXCLUDED.address,
+                result = EXCLUDED.result,
+                provider = EXCLUDED.provider,
+                manual = EXCLUDED.manual,
+                created_at = EXCLUDED.created_at,
+                expires_at = EXCLUDED.expires_at
+            WHERE EXCLUDED.manual OR NOT geocode_cache.manual
+        """), {
+            "key": key,
+            "address": address.strip(),
+            "municipality": municipality,
+            "state": state,
+            "result": json.dumps(result),
+            "provider": result.get("provider"),
+            "manual": manual,
+            "ttl_days": GEOCODE_CACHE_TTL_DAYS,
+        })
+        db.commit()
+        _count("stores")
+    except Exception as e:
+        db.rollback()
+        _count("errors")
+        logger.warning(f"Geocode cache store failed for '{key}': {e}")
+
+
+def invalidate(db, address: str, municipality: Optional[str] = None, state: Optional[str] = None) -> bool:
+    """Drop the cached result for an address. Returns True if an entry existed."""
+    key = cache_key(address, municipality, state)
+    try:
+        deleted = db.execute(
+            text("DELETE FROM geocode_cache WHERE cache_key = :key"), {"key": key}
+        ).rowcount
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        _count("errors")
+        logger.warning(f"Geocode cache invalidate failed for '{key}': {e}")
+        return False
+
+    if deleted:
+        _count("invalidations")
+        logger.info(f"Geocode cache entry invalidated: {key}")
+    return bool(deleted)
+
+
+# =============================================================================
+# STATS
+# =============================================================================
+
+def record_provider_call(provider: Optional[str], elapsed_ms: int):
+    """Record one geocode_address() call (provider=None when every provider failed)."""
+    name = provider or "failed"
+    with _stats_lock:
+        _stats["provider_calls"] += 1
+        if provider is None:
+            _stats["provider_failures"] += 1
+        _stats["provider_ms_total"] += elapsed_ms
+        _stats["provider_ms_max"] = max(_stats["provider_ms_max"], elapsed_ms)
+        entry = _provider_ms.setdefault(name, {"calls": 0, "ms_total": 0, "ms_max": 0})
+        entry["calls"] += 1
+        entry["ms_total"] += elapsed_ms
+        entry["ms_max"] = max(entry["ms_max"], elapsed_ms)
+
+
+def cache_stats() -> dict:
+    """Counters for this process since startup."""
+    with _stats_lock:
+        stats = dict(_stats)
+        providers = {
+            name: dict(entry, ms_avg=round(entry["ms_total"] / entry["calls"]))
+            for name, entry in _provider_ms.items()
+        }
+
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else None
+    stats["provider_ms_avg"] = (
+        round(stats["provider_ms_total"] / stats["provider_calls"])
+        if stats["provider_calls"] else None
+    )
+    stats["providers"] = providers
+    return stats
+
+
+def table_stats(db) -> dict:
+    """Entry counts for the tenant's cache table."""
+    row = db.execute(text("""
+        SELECT COUNT(*),
+               COUNT(*) FILTER (WHERE manual),
+               COUNT(*) FILTER (WHERE expires_at IS NOT NULL AND expires_at <= NOW()),
+               COALESCE(SUM(hit_count), 0)
+        FROM geocode_cache
+    """)).fetchone()
+    return {
+        "entries": row[0],
+        "manual_entries": row[1],
+        "expired_entries": row[2],
+        "total_hits": row[3],
+    }
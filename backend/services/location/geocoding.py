@@ -406,6 +406,37 @@ def reverse_geocode_google(
         logger.error(f"Google reverse geocode error for {latitude},{longitude}: {e}")
         return None
 
+    return _parse_reverse_google(data, latitude, longitude)
+
+
+async def reverse_geocode_google_async(
+    client: httpx.AsyncClient,
+    latitude: float,
+    longitude: float,
+    api_key: str,
+) -> Optional[dict]:
+    """reverse_geocode_google() on a shared AsyncClient (location enrichment pipeline)."""
+    params = {
+        "latlng": f"{latitude},{longitude}",
+        "key": api_key,
+    }
+
+    try:
+        response = await client.get(GOOGLE_BASE, params=params)
+        response.raise_for_status()
+        data = response.json()
+    except httpx.TimeoutException:
+        logger.warning(f"Google reverse geocode timeout for: {latitude},{longitude}")
+        return None
+    except Exception as e:
+        logger.error(f"Google reverse geocode error for {latitude},{longitude}: {e}")
+        return None
+
+    return _parse_reverse_google(data, latitude, longitude)
+
+
+def _parse_reverse_google(data: dict, latitude: float, longitude: float) -> Optional[dict]:
+    """Google reverse geocode JSON -> normalized address fields."""
     status = data.get("status", "")
     if status != "OK":
         logger.info(f"Google reverse: status '{status}' for {latitude},{longitude}")
@@ -4,6 +4,12 @@ GIS Import Service — ArcGIS REST API
 Fetches feature data from public ArcGIS MapServer/FeatureServer endpoints.
 Handles pagination (ArcGIS limits to 1000-2000 features per request).
 
+Pages are fetched concurrently: the filtered count (_fetch_count) fixes the
+page offsets up front, PAGE_CONCURRENCY pages are in flight at a time and
+pages are yielded in order as an async stream (iter_arcgis_pages), so a
+large layer is never held in memory whole. Requests retry with exponential
+backoff on connection errors, 429 and 5xx (HTTP or ArcGIS JSON error body).
+
 For the shared import pipeline (import_features_to_layer), see import_pipeline.py.
 For file upload parsing (GeoJSON, KML, Shapefile, CSV), see file_parser.py.
 
@@ -12,13 +18,17 @@ Usage:
         fetch_arcgis_metadata,
         fetch_arcgis_features,
         fetch_arcgis_preview,
+        iter_arcgis_pages,
     )
     from services.location.import_pipeline import import_features_to_layer
 """
 
+import asyncio
 import json
 import logging
-from typing import Optional
+import random
+from collections import deque
+from typing import AsyncIterator, Optional
 
 import httpx
 
@@ -27,6 +37,14 @@ logger = logging.getLogger(__name__)
 ARCGIS_TIMEOUT = 30
 MAX_FEATURES_PER_REQUEST = 1000  # ArcGIS default limit
 
+# Pages in flight per layer fetch (also bounds pages buffered in memory)
+PAGE_CONCURRENCY = 4
+
+ARCGIS_MAX_RETRIES = 3
+ARCGIS_RETRY_BACKOFF = 0.5  # seconds, doubled per attempt
+
+_RETRY_STATUS = {429, 500, 502, 503, 504}
+
 
 # =============================================================================
 # ARCGIS REST — METADATA
@@ -85,48 +103,93 @@ async def fetch_arcgis_metadata(url: str) -> dict:
     }
 
 
-async def _fetch_count(rest_url: str) -> int:
+async def _fetch_count(rest_url: str, where: str = "1=1") -> int:
     """Get total feature count from ArcGIS endpoint."""
     async with httpx.AsyncClient(timeout=ARCGIS_TIMEOUT) as client:
-        resp = await client.get(
+        data = await _get_json(
+            client,
             f"{rest_url}/query",
-            params={"where": "1=1", "returnCountOnly": "true", "f": "json"},
+            {"where": where, "returnCountOnly": "true", "f": "json"},
         )
-        resp.raise_for_status()
-        data = resp.json()
     return data.get("count", 0)
 
 
+async def _get_json(client: httpx.AsyncClient, url: str, params: dict) -> dict:
+    """
+    GET an ArcGIS JSON response, retrying transient failures with
+    exponential backoff (plus jitter). ArcGIS reports many server errors as
+    HTTP 200 with an "error" body - those are retried by their code too.
+    Raises httpx errors or ValueError once retries are exhausted.
+    """
+    for attempt in range(ARCGIS_MAX_RETRIES + 1):
+        final = attempt == ARCGIS_MAX_RETRIES
+        try:
+            resp = await client.get(url, params=params)
+        except httpx.TransportError as e:
+            if final:
+                raise
+            reason = type(e).__name__
+        else:
+            if resp.status_code in _RETRY_STATUS and not final:
+                reason = f"HTTP {resp.status_code}"
+            else:
+                resp.raise_for_status()
+                data = resp.json()
+                error = data.get("error")
+                if not error:
+                    return data
+                if final or error.get("code") not in _RETRY_STATUS:
+                    raise ValueError(f"ArcGIS error: {error.get('message', str(error))}")
+                reason = f"ArcGIS error {error.get('code')}"
+
+        delay = ARCGIS_RETRY_BACKOFF * (2 ** attempt) * random.uniform(1.0, 1.5)
+        logger.warning(
+            f"ArcGIS request failed ({reason}), retry {attempt + 1}/{ARCGIS_MAX_RETRIES} "
+            f"in {delay:.1f}s: {url}"
+        )
+        await asyncio.sleep(delay)
+
+
 # =============================================================================
 # ARCGIS REST — FEATURE FETCHING (paginated)
 # =============================================================================
 
-async def fetch_arcgis_features(
+async def iter_arcgis_pages(
     url: str,
     where: str = "1=1",
     out_fields: str = "*",
     max_features: Optional[int] = None,
-) -> list:
+    concurrency: int = PAGE_CONCURRENCY,
+) -> AsyncIterator[list]:
     """
-    Fetch all features from an ArcGIS REST endpoint as GeoJSON features.
-    Handles pagination automatically using resultOffset.
-
-    Returns list of GeoJSON Feature dicts.
+    Yield pages (lists of GeoJSON Feature dicts) from an ArcGIS REST
+    endpoint, in offset order.
+
+    Pages up to the filtered feature count are fetched `concurrency` at a
+    time, ordered by the object ID field so concurrent offsets don't
+    overlap. Past the count (features added since it was taken, or the
+    count request failed) pages are fetched one at a time until a short
+    page, same as a plain resultOffset walk.
     """
     rest_url = _normalize_arcgis_url(url)
 
-    # Get max records per page from metadata
-    async with httpx.AsyncClient(timeout=ARCGIS_TIMEOUT) as client:
-        meta_resp = await client.get(rest_url, params={"f": "json"})
-        meta_resp.raise_for_status()
-        meta = meta_resp.json()
-
-    page_size = min(meta.get("maxRecordCount", MAX_FEATURES_PER_REQUEST), MAX_FEATURES_PER_REQUEST)
-    all_features = []
-    offset = 0
+    async with httpx.AsyncClient(
+        timeout=ARCGIS_TIMEOUT,
+        limits=httpx.Limits(max_connections=concurrency),
+    ) as client:
+        meta = await _get_json(client, rest_url, {"f": "json"})
+        page_size = min(meta.get("maxRecordCount") or MAX_FEATURES_PER_REQUEST, MAX_FEATURES_PER_REQUEST)
+        order_by = _object_id_field(meta)
 
-    async with httpx.AsyncClient(timeout=ARCGIS_TIMEOUT) as client:
-        while True:
+        try:
+            total = await _fetch_count(rest_url, where)
+        except Exception as e:
+            logger.warning(f"ArcGIS count failed, fetching pages sequentially: {e}")
+            total = 0
+        if max_features:
+            total = min(total, max_features)
+
+        def fetch_page(offset: int):
             params = {
                 "where": where,
                 "outFields": out_fields,
@@ -135,29 +198,63 @@ async def fetch_arcgis_features(
                 "resultRecordCount": str(page_size),
                 "outSR": "4326",  # WGS84
             }
+            if order_by:
+                params["orderByFields"] = order_by
+            return asyncio.ensure_future(_get_json(client, f"{rest_url}/query", params))
+
+        pending = deque()
+        next_offset = 0
+        fetched = 0
+        done = False
+        try:
+            while True:
+                # Keep the window full while below the known count
+                while (not done
+                       and len(pending) < (concurrency if next_offset < total else 1)
+                       and not (max_features and next_offset >= max_features)):
+                    pending.append((next_offset, fetch_page(next_offset)))
+                    next_offset += page_size
+                if not pending:
+                    break
+
+                offset, task = pending.popleft()
+                features = (await task).get("features", [])
+                if len(features) < page_size:
+                    done = True  # Last page
+                if max_features and fetched + len(features) >= max_features:
+                    features = features[:max_features - fetched]
+                    done = True
+                if features:
+                    fetched += len(features)
+                    logger.info(f"Fetched {len(features)} features (offset={offset}, total so far={fetched})")
+                    yield features
+                if done:
+                    break
+        finally:
+            for _, task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*(task for _, task in pending), return_exceptions=True)
+
+    logger.info(f"Total features fetched from ArcGIS: {fetched}")
 
-            resp = await client.get(f"{rest_url}/query", params=params)
-            resp.raise_for_status()
-            data = resp.json()
-
-            features = data.get("features", [])
-            if not features:
-                break
-
-            all_features.extend(features)
-            logger.info(f"Fetched {len(features)} features (offset={offset}, total so far={len(all_features)})")
-
-            # Check if we hit the limit
-            if max_features and len(all_features) >= max_features:
-                all_features = all_features[:max_features]
-                break
-
-            if len(features) < page_size:
-                break  # Last page
 
-            offset += len(features)
+async def fetch_arcgis_features(
+    url: str,
+    where: str = "1=1",
+    out_fields: str = "*",
+    max_features: Optional[int] = None,
+) -> list:
+    """
+    Fetch all features from an ArcGIS REST endpoint as GeoJSON features.
+    Collects iter_arcgis_pages into one list - imports should stream the
+    pages into BulkFeatureImport instead.
 
-    logger.info(f"Total features fetched from ArcGIS: {len(all_features)}")
+    Returns list of GeoJSON Feature dicts.
+    """
+    all_features = []
+    async for page in iter_arcgis_pages(url, where=where, out_fields=out_fields, max_features=max_features):
+        all_features.extend(page)
     return all_features
 
 
@@ -254,6 +351,18 @@ def _normalize_arcgis_url(url: str) -> str:
     return url
 
 
+def _object_id_field(meta: dict) -> Optional[str]:
+    """Object ID field to order pages by, if the layer supports orderByFields."""
+    if not (meta.get("advancedQueryCapabilities") or {}).get("supportsOrderBy", True):
+        return None
+    if meta.get("objectIdField"):
+        return meta["objectIdField"]
+    for f in meta.get("fields") or []:
+        if f.get("type") == "esriFieldTypeOID":
+            return f.get("name")
+    return None
+
+
 def _simplify_esri_type(esri_type: str) -> str:
     """Convert ESRI field type to simple type."""
     type_map = {
@@ -4,21 +4,50 @@ GIS Import Pipeline — Shared import logic
 Bulk import GeoJSON features into map_features table.
 Used by both ArcGIS REST import and file upload import.
 
+Features are mapped in Python (field_mapping -> title/description/address/
+external_id/properties), COPYed into a temp staging table in batches, then
+written with one set-based statement: a deduplicated ON CONFLICT upsert for
+keyed features, a plain INSERT for the rest. Geometry parsing and the
+imported/updated/skipped/error counts all happen in SQL
+(try_geom_from_geojson, migration 054) - a bad geometry is counted, not
+fatal. Everything commits as one transaction.
+
+Benchmark: scripts/bench_map_import.py (synthetic 200k-point layer).
+
 Usage:
     from services.location.import_pipeline import import_features_to_layer
+
+    # Or incrementally, for sources that arrive in pages
+    # (ArcGIS refreshes, see gis_import.iter_arcgis_pages):
+    bulk = BulkFeatureImport(db, layer_id, field_mapping)
+    bulk.add(page_of_features)
+    ...
+    stats = bulk.finish()
 """
 
+import io
 import json
 import logging
+from typing import Iterable, Optional
 from sqlalchemy import text
 
+from services.location.map_tiles import invalidate_layer
+
 logger = logging.getLogger(__name__)
 
+# Rows per COPY round trip
+COPY_BATCH_SIZE = 5000
+
+# Skip fields that are just geometry metadata or system IDs
+SKIP_FIELDS = {'OBJECTID', 'SHAPE', 'GlobalID', 'Shape__Area', 'Shape__Length'}
+
+_STAGING_COLUMNS = "(seq, title, description, address, external_id, properties, geojson)"
+
 
 def import_features_to_layer(
     db,
     layer_id: int,
-    features: list,
+    features: Iterable[dict],
     field_mapping: dict,
     import_source: str = "arcgis_rest",
     upsert: bool = True,
@@ -42,152 +71,256 @@ def import_features_to_layer(
 
     Returns: { imported, updated, skipped, errors }
     """
-    stats = {"imported": 0, "updated": 0, "skipped": 0, "errors": 0, "error_details": []}
+    bulk = BulkFeatureImport(db, layer_id, field_mapping, import_source, upsert, source_fields)
+    bulk.add(features)
+    return bulk.finish()
 
-    # Skip fields that are just geometry metadata or system IDs
-    skip_fields = {'OBJECTID', 'SHAPE', 'GlobalID', 'Shape__Area', 'Shape__Length'}
 
-    # Auto-generate property_schema from source field metadata
-    if source_fields:
-        _auto_generate_schema(db, layer_id, source_fields, skip_fields)
+class BulkFeatureImport:
+    """
+    One layer import: stage features with add() (any number of calls),
+    then finish() writes them to map_features and commits.
 
-    for i, feature in enumerate(features):
-        try:
-            geom = feature.get("geometry")
-            props = feature.get("properties", {})
+    Staged rows live in a temp table dropped at commit, so add() and
+    finish() must run on the same session with no commit in between.
+    source_fields (if given) auto-generates the layer's property_schema
+    first, in its own commit.
+    """
+
+    def __init__(self, db, layer_id: int, field_mapping: dict,
+                 import_source: str = "arcgis_rest", upsert: bool = True,
+                 source_fields: Optional[list] = None):
+        self.db = db
+        self.layer_id = layer_id
+        self.field_mapping = field_mapping or {}
+        self.import_source = import_source
+        self.upsert = upsert
+        self.count = 0
+        self.mapping_errors = 0
+        self.error_details = []
+
+        # Auto-generate property_schema from source field metadata
+        if source_fields:
+            _auto_generate_schema(db, layer_id, source_fields, SKIP_FIELDS)
+
+        db.execute(text("""
+            CREATE TEMP TABLE map_import_staging (
+                seq INTEGER NOT NULL,
+                title TEXT NOT NULL,
+                description TEXT,
+                address TEXT,
+                external_id TEXT,
+                properties JSONB NOT NULL,
+                geojson TEXT
+            ) ON COMMIT DROP
+        """))
 
-            if not geom:
-                stats["skipped"] += 1
+    def add(self, features: Iterable[dict]):
+        """Map and COPY features into the staging table in batches."""
+        buffer = io.StringIO()
+        rows = 0
+        for feature in features:
+            i = self.count
+            self.count += 1
+            try:
+                row = _map_feature(feature, i, self.field_mapping)
+            except Exception as e:
+                self.mapping_errors += 1
+                if len(self.error_details) < 10:
+                    self.error_details.append(f"Feature {i}: {str(e)[:200]}")
                 continue
+            buffer.write(_csv_row((i,) + row))
+            rows += 1
+            if rows >= COPY_BATCH_SIZE:
+                self._copy(buffer)
+                buffer = io.StringIO()
+                rows = 0
+        if rows:
+            self._copy(buffer)
+
+    def _copy(self, buffer: io.StringIO):
+        buffer.seek(0)
+        cursor = self.db.connection().connection.cursor()
+        try:
+            cursor.copy_expert(
+                f"COPY map_import_staging {_STAGING_COLUMNS} FROM STDIN WITH (FORMAT csv)",
+                buffer,
+            )
+        finally:
+            cursor.close()
+
+    def finish(self) -> dict:
+        """Upsert staged rows into map_features in one statement and commit."""
+        row = self.db.execute(text("""
+            WITH staged AS MATERIALIZED (
+                SELECT seq, title, description, address, external_id, properties,
+                       try_geom_from_geojson(geojson) AS geom,
+                       geojson IS NULL AS no_geometry
+                FROM map_import_staging
+            ),
+            keyed AS (
+                -- Last occurrence wins when a source repeats an external_id
+                SELECT DISTINCT ON (external_id) *
+                FROM staged
+                WHERE :upsert AND geom IS NOT NULL AND external_id IS NOT NULL
+                ORDER BY external_id, seq DESC
+            ),
+            upserted AS (
+                INSERT INTO map_features
+                    (layer_id, title, description, geometry, address,
+                     properties, external_id, import_source, imported_at)
+                SELECT :layer_id, title, description, geom, address,
+                       properties, external_id, :import_source, NOW()
+                FROM keyed
+                ON CONFLICT (layer_id, external_id) WHERE external_id IS NOT NULL
+                DO UPDATE SET
+                    title = EXCLUDED.title,
+                    description = EXCLUDED.description,
+                    geometry = EXCLUDED.geometry,
+                    address = EXCLUDED.address,
+                    properties = EXCLUDED.properties || map_features.properties,
+                    import_source = EXCLUDED.import_source,
+                    imported_at = NOW(),
+                    updated_at = NOW()
+                RETURNING (xmax = 0) AS is_insert
+            ),
+            appended AS (
+                INSERT INTO map_features
+                    (layer_id, title, description, geometry, address,
+                     properties, external_id, import_source, imported_at)
+                SELECT :layer_id, title, description, geom, address,
+                       properties, external_id, :import_source, NOW()
+                FROM staged
+                WHERE geom IS NOT NULL AND (external_id IS NULL OR NOT :upsert)
+                ORDER BY seq
+                ON CONFLICT DO NOTHING
+                RETURNING 1
+            )
+            SELECT
+                (SELECT COUNT(*) FROM upserted WHERE is_insert)
+                    + (SELECT COUNT(*) FROM appended) AS imported,
+                (SELECT COUNT(*) FROM upserted WHERE NOT is_insert)
+                    -- repeated external_ids updated the same row
+                    + (SELECT COUNT(*) FROM staged
+                       WHERE :upsert AND geom IS NOT NULL AND external_id IS NOT NULL)
+                    - (SELECT COUNT(*) FROM keyed) AS updated,
+                (SELECT COUNT(*) FROM staged WHERE no_geometry) AS skipped,
+                (SELECT COUNT(*) FROM staged WHERE geom IS NULL AND NOT no_geometry) AS invalid_geometry,
+                -- non-upsert rows whose external_id already exists
+                (SELECT COUNT(*) FROM staged
+                 WHERE geom IS NOT NULL AND (external_id IS NULL OR NOT :upsert))
+                    - (SELECT COUNT(*) FROM appended) AS conflicts,
+                (SELECT array_agg(seq) FROM (
+                    SELECT seq FROM staged
+                    WHERE geom IS NULL AND NOT no_geometry
+                    ORDER BY seq LIMIT 10
+                ) bad) AS invalid_seqs
+        """), {
+            "layer_id": self.layer_id,
+            "import_source": self.import_source,
+            "upsert": self.upsert,
+        }).fetchone()
+
+        self.db.commit()
+        invalidate_layer(self.db, self.layer_id)
 
-            # Start with ALL source fields in properties
-            all_properties = {}
-            title = None
-            description = None
-            address = None
-            external_id = None
-
-            for source_field, value in props.items():
-                # Skip system/geometry fields
-                if source_field in skip_fields:
-                    # But check if mapped to a special column first
-                    pass
-
-                target = field_mapping.get(source_field)
-
-                if target == "__title":
-                    title = str(value).strip() if value is not None else None
-                elif target == "__description":
-                    description = str(value).strip() if value is not None else None
-                elif target == "__address":
-                    address = str(value).strip() if value is not None else None
-                elif target == "__external_id":
-                    external_id = str(value).strip() if value is not None else None
-                elif target == "__skip":
-                    continue
-                elif source_field in skip_fields:
-                    # Use OBJECTID as external_id fallback if not explicitly mapped
-                    if source_field == 'OBJECTID' and not external_id and '__external_id' not in field_mapping.values():
-                        external_id = str(value).strip() if value is not None else None
-                    continue
-                elif target:
-                    # Renamed field
-                    all_properties[target] = value
-                else:
-                    # Unmapped — keep with original name
-                    all_properties[source_field] = value
-
-            # Fallback title from first non-null string property
-            if not title:
-                for key, val in props.items():
-                    if key not in skip_fields and val and isinstance(val, str) and len(val) > 1:
-                        title = val[:100]
-                        break
-                if not title:
-                    title = f"Feature {i + 1}"
-
-            geojson_str = json.dumps(geom)
-
-            if upsert and external_id:
-                result = db.execute(
-                    text("""
-                        INSERT INTO map_features
-                            (layer_id, title, description, geometry, address,
-                             properties, external_id, import_source, imported_at)
-                        VALUES
-                            (:layer_id, :title, :description,
-                             ST_SetSRID(ST_GeomFromGeoJSON(:geojson), 4326),
-                             :address, :properties, :external_id, :import_source, NOW())
-                        ON CONFLICT (layer_id, external_id) WHERE external_id IS NOT NULL
-                        DO UPDATE SET
-                            title = EXCLUDED.title,
-                            description = EXCLUDED.description,
-                            geometry = EXCLUDED.geometry,
-                            address = EXCLUDED.address,
-                            properties = EXCLUDED.properties || map_features.properties,
-                            import_source = EXCLUDED.import_source,
-                            imported_at = NOW(),
-                            updated_at = NOW()
-                        RETURNING (xmax = 0) AS is_insert
-                    """),
-                    {
-                        "layer_id": layer_id,
-                        "title": title,
-                        "description": description,
-                        "geojson": geojson_str,
-                        "address": address,
-                        "properties": json.dumps(all_properties),
-                        "external_id": external_id,
-                        "import_source": import_source,
-                    },
-                )
-                row = result.fetchone()
-                if row and row[0]:
-                    stats["imported"] += 1
-                else:
-                    stats["updated"] += 1
-            else:
-                db.execute(
-                    text("""
-                        INSERT INTO map_features
-                            (layer_id, title, description, geometry, address,
-                             properties, external_id, import_source, imported_at)
-                        VALUES
-                            (:layer_id, :title, :description,
-                             ST_SetSRID(ST_GeomFromGeoJSON(:geojson), 4326),
-                             :address, :properties, :external_id, :import_source, NOW())
-                    """),
-                    {
-                        "layer_id": layer_id,
-                        "title": title,
-                        "description": description,
-                        "geojson": geojson_str,
-                        "address": address,
-                        "properties": json.dumps(all_properties),
-                        "external_id": external_id,
-                        "import_source": import_source,
-                    },
-                )
-                stats["imported"] += 1
-
-            # Commit in batches of 100
-            if (stats["imported"] + stats["updated"]) % 100 == 0:
-                db.commit()
-
-        except Exception as e:
-            stats["errors"] += 1
-            if len(stats["error_details"]) < 10:
-                stats["error_details"].append(f"Feature {i}: {str(e)[:200]}")
+        error_details = list(self.error_details)
+        for seq in row.invalid_seqs or []:
+            if len(error_details) >= 10:
+                break
+            error_details.append(f"Feature {seq}: invalid geometry")
+
+        stats = {
+            "imported": row.imported,
+            "updated": row.updated,
+            "skipped": row.skipped,
+            "errors": self.mapping_errors + row.invalid_geometry + row.conflicts,
+            "error_details": error_details,
+        }
+        logger.info(
+            f"Import complete: {stats['imported']} new, {stats['updated']} updated, "
+            f"{stats['skipped']} skipped, {stats['errors']} errors"
+        )
+        return stats
+
+
+def _strip_nul(value):
+    """Remove NUL characters (rejected by text and jsonb) from strings, keys and nested values."""
+    if isinstance(value, str):
+        return value.replace("\x00", "")
+    if isinstance(value, dict):
+        return {_strip_nul(k): _strip_nul(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_strip_nul(v) for v in value]
+    return value
+
+
+def _map_feature(feature: dict, i: int, field_mapping: dict) -> tuple:
+    """
+    Apply field_mapping to one GeoJSON feature.
+    Returns (title, description, address, external_id, properties_json, geojson);
+    geojson is None for a feature without geometry (counted as skipped).
+    """
+    geom = feature.get("geometry")
+    props = _strip_nul(feature.get("properties") or {})
+
+    # Start with ALL source fields in properties
+    all_properties = {}
+    title = None
+    description = None
+    address = None
+    external_id = None
+
+    for source_field, value in props.items():
+        target = field_mapping.get(source_field)
+
+        if target == "__title":
+            title = str(value).strip() if value is not None else None
+        elif target == "__description":
+            description = str(value).strip() if value is not None else None
+        elif target == "__address":
+            address = str(value).strip() if value is not None else None
+        elif target == "__external_id":
+            external_id = str(value).strip() if value is not None else None
+        elif target == "__skip":
             continue
+        elif source_field in SKIP_FIELDS:
+            # Use OBJECTID as external_id fallback if not explicitly mapped
+            if source_field == 'OBJECTID' and not external_id and '__external_id' not in field_mapping.values():
+                external_id = str(value).strip() if value is not None else None
+            continue
+        elif target:
+            # Renamed field
+            all_properties[target] = value
+        else:
+            # Unmapped — keep with original name
+            all_properties[source_field] = value
+
+    # Fallback title from first non-null string property
+    if not title:
+        for key, val in props.items():
+            if key not in SKIP_FIELDS and val and isinstance(val, str) and len(val) > 1:
+                title = val[:100]
+                break
+        if not title:
+            title = f"Feature {i + 1}"
+
+    # jsonb rejects NaN - fail this feature here rather than the whole COPY
+    properties_json = json.dumps(all_properties, allow_nan=False, default=str)
+    geojson = json.dumps(geom) if geom else None
+
+    return (title, description, address, external_id or None, properties_json, geojson)
 
-    # Final commit
-    db.commit()
 
-    logger.info(
-        f"Import complete: {stats['imported']} new, {stats['updated']} updated, "
-        f"{stats['skipped']} skipped, {stats['errors']} errors"
-    )
-    return stats
+def _csv_row(values: tuple) -> str:
+    """One COPY CSV line: None -> unquoted empty (NULL), everything else quoted."""
+    fields = []
+    for value in values:
+        if value is None:
+            fields.append("")
+        else:
+            fields.append('"' + str(value).replace('"', '""') + '"')
+    return ",".join(fields) + "\n"
 
 
 def _auto_generate_schema(db, layer_id: int, source_fields: list, skip_fields: set):
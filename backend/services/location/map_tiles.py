@@ -0,0 +1,340 @@
+"""
+Map Vector Tiles — Mapbox Vector Tiles (MVT) for map layers
+
+The viewport endpoints (/layers/{id}/features/clustered, /layers/batch/
+clustered) re-query and re-serialize GeoJSON on every pan, cap results at
+2000 features (dense hydrant / address layers get truncated) and send the
+full properties of every feature. Tiles are rendered once per layer
+version in PostGIS (ST_AsMVTGeom / ST_AsMVT) and served from disk after:
+
+    GET /api/map/tiles/{layer}/{z}/{x}/{y}.mvt
+        layer = map_layers id, or a virtual incident layer ("incident_fire")
+
+Rendering:
+- Point layers below CLUSTER_MIN_ZOOM are grid-clustered inside the tile
+  (CLUSTER_CELL tile units per cell) - one point per cell with point_count,
+  single-feature cells keep title / address / radius_meters.
+- At PROPERTIES_MIN_ZOOM and above features also carry description, notes
+  and the properties JSONB; lower zooms stay lean.
+- No feature limit - a tile holds everything in it.
+
+Cache (shared by all uvicorn workers):
+    TILE_CACHE_DIR/<tenant db>/<layer>/v<version>/<z>/<x>/<y>.mvt
+
+Map layer versions are map_layers.tile_version (migration 058), bumped by
+triggers on every map_features write, so an edit from any worker - or an
+import, or manual SQL - moves the layer to a new directory. Versions are
+re-read at most every _VERSION_TTL seconds per worker; feature CRUD and
+import_pipeline call invalidate_layer() so the writing worker sees its own
+change immediately (and the old directory is removed). Superseded version
+directories are also pruned whenever a tile is rendered for a newer one.
+
+Incident layers change with every CAD event, so they are cached per date
+range under an INCIDENT_TILE_TTL-second time bucket instead of a version.
+
+Empty tiles are cached as zero-byte files and returned as 204.
+
+Clients: the frontend map (components/shared/GoogleMap.jsx) still uses the
+clustered GeoJSON endpoints - Google Maps can't draw MVT without an
+overlay renderer the frontend doesn't ship yet.
+
+Environment:
+    MAP_TILE_CACHE_DIR   tile cache directory (default /var/tmp/map_tiles)
+"""
+
+import logging
+import math
+import os
+import shutil
+import threading
+import time
+import uuid
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy import text
+
+logger = logging.getLogger(__name__)
+
+TILE_CACHE_DIR = Path(os.environ.get("MAP_TILE_CACHE_DIR") or "/var/tmp/map_tiles")
+
+MAX_ZOOM = 22
+
+# MVT tile coordinate space and the clip buffer around it (tile units)
+TILE_EXTENT = 4096
+TILE_BUFFER = 64
+
+# Point layers are clustered below this zoom (same threshold as the
+# clustered GeoJSON endpoint); 256 units = a 16 x 16 grid per tile
+CLUSTER_MIN_ZOOM = 16
+CLUSTER_CELL = 256
+
+# Zoom from which features carry description / notes / properties
+PROPERTIES_MIN_ZOOM = 15
+
+# Seconds an incident tile is reused
+INCIDENT_TILE_TTL = 60
+
+# Seconds a map layer's tile_version is trusted before re-reading
+_VERSION_TTL = 5
+
+MEDIA_TYPE = "application/vnd.mapbox-vector-tile"
+
+# (db_name, layer_id) -> (layer row dict, checked_at)
+_versions: Dict[Tuple[str, int], Tuple[dict, float]] = {}
+_lock = threading.Lock()
+
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "render_ms": 0.0,
+    "bytes_rendered": 0,
+    "invalidated": 0,
+    "pruned_versions": 0,
+}
+
+
+# =============================================================================
+# TILE MATH
+# =============================================================================
+
+def valid_tile(z: int, x: int, y: int) -> bool:
+    return 0 <= z <= MAX_ZOOM and 0 <= x < 2 ** z and 0 <= y < 2 ** z
+
+
+def _tile_lng(x: float, z: int) -> float:
+    return x / 2 ** z * 360.0 - 180.0
+
+
+def _tile_lat(y: float, z: int) -> float:
+    return math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y / 2 ** z))))
+
+
+def tile_bounds(z: int, x: int, y: int) -> Dict[str, float]:
+    """Lng/lat envelope of a tile including the clip buffer (for the && index filter)."""
+    pad = TILE_BUFFER / TILE_EXTENT
+    n = 2 ** z
+    return {
+        "west": _tile_lng(max(x - pad, 0), z),
+        "east": _tile_lng(min(x + 1 + pad, n), z),
+        "north": _tile_lat(max(y - pad, 0), z),
+        "south": _tile_lat(min(y + 1 + pad, n), z),
+    }
+
+
+# =============================================================================
+# RENDERING
+# =============================================================================
+
+def _feature_tile_sql(clustered: bool, detailed: bool) -> str:
+    detail_columns = "mf.description, mf.notes, mf.properties," if detailed else ""
+    rows = f"""
+        SELECT mf.id, mf.title, mf.address, mf.radius_meters, {detail_columns}
+               ST_AsMVTGeom(
+                   ST_Transform(mf.geometry, 3857),
+                   ST_TileEnvelope(:z, :x, :y), :extent, :buffer, true
+               ) AS geom
+        FROM map_features mf
+        WHERE mf.layer_id = :layer_id
+          AND mf.geometry && ST_MakeEnvelope(:west, :south, :east, :north, 4326)
+    """
+    if not clustered:
+        return f"""
+            WITH tile_rows AS ({rows})
+            SELECT ST_AsMVT(tile_rows.*, :name, :extent, 'geom', 'id')
+            FROM tile_rows
+            WHERE geom IS NOT NULL
+        """
+    return f"""
+        WITH tile_rows AS ({rows}),
+        clusters AS (
+            SELECT MIN(id) AS id,
+                   COUNT(*) AS point_count,
+                   CASE WHEN COUNT(*) = 1 THEN MIN(title) END AS title,
+                   CASE WHEN COUNT(*) = 1 THEN MIN(address) END AS address,
+                   CASE WHEN COUNT(*) = 1 THEN MIN(radius_meters) END AS radius_meters,
+                   ST_SnapToGrid(ST_Centroid(ST_Collect(geom)), 1) AS geom
+            FROM tile_rows
+            WHERE geom IS NOT NULL
+            GROUP BY FLOOR(ST_X(ST_Centroid(geom)) / :cell),
+                     FLOOR(ST_Y(ST_Centroid(geom)) / :cell)
+        )
+        SELECT ST_AsMVT(clusters.*, :name, :extent, 'geom', 'id')
+        FROM clusters
+    """
+
+
+INCIDENT_TILE_SQL = """
+    WITH tile_rows AS (
+        SELECT id, internal_incident_number AS incident_number, address,
+               cad_event_type, cad_event_subtype, incident_date::text AS incident_date,
+               call_category, location_name, municipality_code,
+               ST_AsMVTGeom(
+                   ST_Transform(geom, 3857),
+                   ST_TileEnvelope(:z, :x, :y), :extent, :buffer, true
+               ) AS geom
+        FROM incidents
+        WHERE call_category = :category
+          AND deleted_at IS NULL
+          AND incident_date >= :date_start
+          AND geom && ST_MakeEnvelope(:west, :south, :east, :north, 4326)
+    )
+    SELECT ST_AsMVT(tile_rows.*, :name, :extent, 'geom', 'id')
+    FROM tile_rows
+    WHERE geom IS NOT NULL
+"""
+
+
+def _tile_params(name: str, z: int, x: int, y: int) -> dict:
+    return {
+        "name": name,
+        "z": z, "x": x, "y": y,
+        "extent": TILE_EXTENT,
+        "buffer": TILE_BUFFER,
+        **tile_bounds(z, x, y),
+    }
+
+
+def _render_feature_tile(db, layer: dict, z: int, x: int, y: int) -> bytes:
+    clustered = layer["geometry_type"] in ("point", "point_radius") and z < CLUSTER_MIN_ZOOM
+    sql = _feature_tile_sql(clustered, detailed=z >= PROPERTIES_MIN_ZOOM)
+    params = _tile_params(str(layer["id"]), z, x, y)
+    params.update({"layer_id": layer["id"], "cell": CLUSTER_CELL})
+    tile = db.execute(text(sql), params).scalar()
+    return bytes(tile) if tile else b""
+
+
+def incident_date_start(date_range: str) -> date:
+    """Same windows as the incident GeoJSON layers: 90 days, otherwise YTD."""
+    now = datetime.now()
+    if date_range == "90days":
+        return (now - timedelta(days=90)).date()
+    return date(now.year, 1, 1)
+
+
+def _render_incident_tile(db, layer_key: str, category: str, date_range: str, z: int, x: int, y: int) -> bytes:
+    params = _tile_params(layer_key, z, x, y)
+    params.update({"category": category, "date_start": incident_date_start(date_range)})
+    tile = db.execute(text(INCIDENT_TILE_SQL), params).scalar()
+    return bytes(tile) if tile else b""
+
+
+# =============================================================================
+# CACHE
+# =============================================================================
+
+def _db_name(db) -> str:
+    return db.get_bind().url.database
+
+
+def _layer_dir(db_name: str, layer_key) -> Path:
+    return TILE_CACHE_DIR / db_name / str(layer_key)
+
+
+def _get_layer(db, db_name: str, layer_id: int) -> Optional[dict]:
+    """Active layer row with its tile_version (memoized for _VERSION_TTL)."""
+    key = (db_name, layer_id)
+    now = time.monotonic()
+    with _lock:
+        cached = _versions.get(key)
+    if cached and now - cached[1] < _VERSION_TTL:
+        return cached[0]
+
+    row = db.execute(text("""
+        SELECT id, layer_type, geometry_type, tile_version
+        FROM map_layers
+        WHERE id = :id AND is_active = true
+    """), {"id": layer_id}).fetchone()
+    if row is None:
+        with _lock:
+            _versions.pop(key, None)
+        return None
+
+    layer = {"id": row[0], "layer_type": row[1], "geometry_type": row[2], "version": row[3]}
+    with _lock:
+        _versions[key] = (layer, now)
+    return layer
+
+
+def _prune_versions(layer_dir: Path, current: str):
+    """Remove version directories other than current (best effort)."""
+    try:
+        entries = [entry for entry in layer_dir.iterdir() if entry.name != current]
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        shutil.rmtree(entry, ignore_errors=True)
+        _stats["pruned_versions"] += 1
+
+
+def _cached_tile(layer_dir: Path, version: str, z: int, x: int, y: int, render) -> bytes:
+    path = layer_dir / version / str(z) / str(x) / f"{y}.mvt"
+    try:
+        tile = path.read_bytes()
+        _stats["hits"] += 1
+        return tile
+    except FileNotFoundError:
+        pass
+
+    _stats["misses"] += 1
+    start = time.perf_counter()
+    tile = render()
+    _stats["render_ms"] += (time.perf_counter() - start) * 1000
+    _stats["bytes_rendered"] += len(tile)
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+        tmp.write_bytes(tile)
+        os.replace(tmp, path)
+    except OSError as e:
+        logger.warning(f"Tile cache write failed for {path}: {e}")
+    _prune_versions(layer_dir, version)
+    return tile
+
+
+def get_feature_tile(db, layer_id: int, z: int, x: int, y: int) -> Optional[Tuple[bytes, str]]:
+    """(tile, etag) for a map layer tile, or None if the layer doesn't exist / is inactive."""
+    db_name = _db_name(db)
+    layer = _get_layer(db, db_name, layer_id)
+    if layer is None:
+        return None
+    version = f"v{layer['version']}"
+    tile = _cached_tile(
+        _layer_dir(db_name, layer_id), version, z, x, y,
+        lambda: _render_feature_tile(db, layer, z, x, y),
+    )
+    return tile, f'"{layer_id}-{version}-{z}-{x}-{y}"'
+
+
+def get_incident_tile(
+    db, layer_key: str, category: str, date_range: str, z: int, x: int, y: int,
+) -> Tuple[bytes, str]:
+    """(tile, etag) for a virtual incident layer tile."""
+    version = f"t{int(time.time() // INCIDENT_TILE_TTL)}"
+    tile = _cached_tile(
+        _layer_dir(_db_name(db), f"{layer_key}-{date_range}"), version, z, x, y,
+        lambda: _render_incident_tile(db, layer_key, category, date_range, z, x, y),
+    )
+    return tile, f'"{layer_key}-{date_range}-{version}-{z}-{x}-{y}"'
+
+
+def invalidate_layer(db, layer_id: int):
+    """
+    Drop a layer's cached tiles after this worker changed its features.
+    Never raises - called after the feature write has committed, and
+    tile_version still retires the tiles if this fails.
+    """
+    try:
+        db_name = _db_name(db)
+        with _lock:
+            _versions.pop((db_name, layer_id), None)
+        shutil.rmtree(_layer_dir(db_name, layer_id), ignore_errors=True)
+        _stats["invalidated"] += 1
+    except Exception as e:
+        logger.warning(f"Tile cache invalidation failed for layer {layer_id}: {e}")
+
+
+def get_stats() -> dict:
+    return {**_stats, "render_ms": round(_stats["render_ms"], 1), "versions_cached": len(_versions)}
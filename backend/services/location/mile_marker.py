@@ -11,6 +11,7 @@ Uses Haversine formula for accurate distance calculations along route shape poin
 
 import re
 import math
+import time
 import logging
 from typing import Optional, Tuple, List
 from sqlalchemy.orm import Session
@@ -467,11 +468,18 @@ def geocode_with_mile_marker_fallback(
     state: str = "PA",
     google_api_key: Optional[str] = None,
     geocodio_api_key: Optional[str] = None,
+    municipality: Optional[str] = None,
+    use_cache: bool = True,
 ) -> Optional[dict]:
     """
-    Wrapper that tries mile marker geocoding first, then falls back to standard geocoding.
+    Wrapper that tries mile marker geocoding first, then the geocode cache,
+    then standard geocoding (result stored in the cache).
     
     Use this as the primary geocoding entry point for incidents.
+    
+    Args:
+        municipality: CAD municipality code, part of the cache key
+        use_cache: False skips the cache lookup (result is still stored)
     """
     # Try mile marker first
     if is_mile_marker_address(address):
@@ -482,9 +490,18 @@ def geocode_with_mile_marker_fallback(
         else:
             logger.info(f"Mile marker parse succeeded but geocode failed for: {address}")
     
+    from . import geocode_cache
+    cache_state = state or "PA"
+    
+    if use_cache:
+        cached = geocode_cache.lookup(db, address, municipality, cache_state)
+        if cached:
+            return cached
+    
     # Fall back to standard geocoding
     from .geocoding import geocode_address
-    return geocode_address(
+    started = time.perf_counter()
+    result = geocode_address(
         address=address,
         station_lat=station_lat,
         station_lng=station_lng,
@@ -492,3 +509,9 @@ def geocode_with_mile_marker_fallback(
         google_api_key=google_api_key,
         geocodio_api_key=geocodio_api_key,
     )
+    elapsed_ms = round((time.perf_counter() - started) * 1000)
+    geocode_cache.record_provider_call(result.get("provider") if result else None, elapsed_ms)
+    
+    if result:
+        geocode_cache.store(db, address, result, municipality, cache_state)
+    return result
@@ -16,6 +16,16 @@ Queries:
 The snapshot is what the RunSheet and IncidentHubModal display.
 No re-querying on every page load.
 
+query_proximity gathers all of these in ONE statement (PROXIMITY_SQL),
+run inside a savepoint, instead of seven or eight separate queries through
+PgBouncer on the dispatch hot path.
+Its first CTE checks each active layer's precomputed envelope
+(map_layer_extents, migration 057) against the layer's search radius, so
+layers nowhere near the incident are skipped before their features are
+touched. If the statement fails (e.g. 057 not applied yet) the individual
+query_* functions below are used instead; they also back the map API's
+per-section endpoints.
+
 Dependencies:
     - Phase 1 tables (map_layers, map_features, address_notes)
     - PostGIS extension (ST_DWithin, ST_Contains, ST_Intersects, ST_Distance)
@@ -54,6 +64,18 @@ FLOOD_TRIGGER_CODES = {
 WILDFIRE_WIND_THRESHOLD_KMH = 40
 WILDFIRE_HUMIDITY_THRESHOLD = 25
 
+# Fixed search radii (meters) used by the snapshot
+WATER_RADIUS_METERS = 2000
+CLOSURE_RADIUS_METERS = 3000
+PREPLAN_RADIUS_METERS = 200
+
+# Meters per degree of latitude (and of longitude at the equator) used to
+# grow layer envelopes in PROXIMITY_SQL - deliberately under the true
+# 110.6-111.7 km so the grown envelope over-covers
+ENVELOPE_METERS_PER_DEGREE = 110000.0
+
+WATER_LAYER_TYPES = ("hydrant", "dry_hydrant", "draft_point")
+
 
 # =============================================================================
 # PROXIMITY QUERIES
@@ -523,16 +545,14 @@ def query_scene_history(
                        incident_date, time_dispatched, status,
                        narrative,
                        ST_Distance(
-                           ST_SetSRID(ST_MakePoint(longitude::float, latitude::float), 4326)::geography,
+                           geom::geography,
                            ST_SetSRID(ST_MakePoint(:lng, :lat), 4326)::geography
                        ) as distance_meters
                 FROM incidents
-                WHERE latitude IS NOT NULL AND longitude IS NOT NULL
-                  AND latitude != '' AND longitude != ''
-                  AND id != :exclude_id
+                WHERE id != :exclude_id
                   AND deleted_at IS NULL
                   AND ST_DWithin(
-                      ST_SetSRID(ST_MakePoint(longitude::float, latitude::float), 4326)::geography,
+                      geom::geography,
                       ST_SetSRID(ST_MakePoint(:lng, :lat), 4326)::geography,
                       :radius
                   )
@@ -696,31 +716,309 @@ def build_proximity_snapshot(
         Dict matching the ProximitySnapshot schema from schemas_map.py
     """
     logger.info(f"Building proximity snapshot for ({lat}, {lng}), address={address}")
+    return assemble_proximity_snapshot(query_proximity(db, lat, lng, address), weather_data)
+
+
+# =============================================================================
+# SINGLE-STATEMENT PROXIMITY
+# =============================================================================
+
+# One row per hit: (kind, ord, data, ts). data holds the section's dict
+# fields, ts the address note timestamp (kept typed for isoformat()).
+#
+# "layers" keeps active snapshot layers whose envelope is within reach of
+# the incident: point_radius layers by their largest feature radius, water /
+# closures / preplans by their fixed search radius, boundaries and zones by
+# containment (reach 0). Layers without an extents row are kept.
+#
+# The envelope test is planar, in degrees: the envelope is grown by the
+# reach converted to degrees of latitude and of longitude at the incident
+# (ENVELOPE_METERS_PER_DEGREE is below the true ~111.3 km, plus a 10%
+# margin, so the growth always over-covers) and must contain the point.
+# Casting the envelope to geography instead would bow its east-west edges
+# along great circles and could drop a layer the incident is inside of.
+PROXIMITY_SQL = """
+    WITH pt AS (
+        SELECT ST_SetSRID(ST_MakePoint(:lng, :lat), 4326) AS geom,
+               ST_SetSRID(ST_MakePoint(:lng, :lat), 4326)::geography AS geog
+    ),
+    layers AS MATERIALIZED (
+        SELECT ml.id, ml.name, ml.icon, ml.color, ml.layer_type, ml.geometry_type, ml.sort_order
+        FROM map_layers ml
+        CROSS JOIN pt
+        LEFT JOIN map_layer_extents ext ON ext.layer_id = ml.id
+        CROSS JOIN LATERAL (
+            SELECT GREATEST(
+                CASE WHEN ml.geometry_type = 'point_radius' THEN ext.max_radius_meters ELSE 0 END,
+                CASE WHEN ml.layer_type IN ('hydrant', 'dry_hydrant', 'draft_point') THEN :water_radius ELSE 0 END,
+                CASE WHEN ml.layer_type = 'closure' THEN :closure_radius ELSE 0 END,
+                CASE WHEN ml.layer_type = 'preplan' THEN :preplan_radius ELSE 0 END
+            ) * 1.1 / :meters_per_degree AS deg
+        ) reach
+        WHERE ml.is_active = true
+          AND (ml.geometry_type = 'point_radius'
+               OR ml.layer_type IN ('hydrant', 'dry_hydrant', 'draft_point', 'closure',
+                                    'preplan', 'boundary', 'flood_zone', 'wildfire_risk'))
+          AND (ext.layer_id IS NULL OR ST_Intersects(
+              ST_Expand(
+                  ext.extent,
+                  reach.deg,
+                  reach.deg / GREATEST(cos(radians(:lat)), 0.01)
+              ),
+              pt.geom
+          ))
+    ),
+    point_radius AS (
+        SELECT mf.id, mf.title, mf.description, mf.properties, mf.radius_meters, mf.address,
+               l.name, l.icon, l.color, l.layer_type,
+               ST_Distance(mf.geometry::geography, pt.geog) AS distance_meters
+        FROM layers l
+        JOIN map_features mf ON mf.layer_id = l.id
+        CROSS JOIN pt
+        WHERE l.geometry_type = 'point_radius'
+          AND ST_DWithin(mf.geometry::geography, pt.geog, mf.radius_meters)
+    ),
+    water AS (
+        SELECT mf.id, mf.title, mf.description, mf.properties, mf.address,
+               l.name, l.icon, l.layer_type,
+               ST_Distance(mf.geometry::geography, pt.geog) AS distance_meters
+        FROM layers l
+        JOIN map_features mf ON mf.layer_id = l.id
+        CROSS JOIN pt
+        WHERE l.layer_type IN ('hydrant', 'dry_hydrant', 'draft_point')
+          AND ST_DWithin(mf.geometry::geography, pt.geog, :water_radius)
+        ORDER BY distance_meters
+        LIMIT 10
+    ),
+    notes AS (
+        SELECT id, address, note_type, content, priority, incident_id, created_at
+        FROM address_notes
+        WHERE address = :address
+    ),
+    boundary AS (
+        SELECT mf.title, l.name
+        FROM layers l
+        JOIN map_features mf ON mf.layer_id = l.id
+        CROSS JOIN pt
+        WHERE l.layer_type = 'boundary'
+          AND ST_Contains(mf.geometry, pt.geom)
+        ORDER BY l.sort_order ASC
+        LIMIT 1
+    ),
+    preplan_address AS (
+        -- Address match ignores distance, so it skips the envelope filter
+        SELECT mf.id, mf.title, mf.description, mf.properties, mf.address, ml.icon,
+               ST_Distance(mf.geometry::geography, pt.geog) AS distance_meters
+        FROM map_features mf
+        JOIN map_layers ml ON mf.layer_id = ml.id
+        CROSS JOIN pt
+        WHERE ml.layer_type = 'preplan'
+          AND ml.is_active = true
+          AND UPPER(mf.address) = :address
+    ),
+    preplan_nearby AS (
+        SELECT mf.id, mf.title, mf.description, mf.properties, mf.address, l.icon,
+               ST_Distance(mf.geometry::geography, pt.geog) AS distance_meters
+        FROM layers l
+        JOIN map_features mf ON mf.layer_id = l.id
+        CROSS JOIN pt
+        WHERE l.layer_type = 'preplan'
+          AND NOT EXISTS (SELECT 1 FROM preplan_address)
+          AND ST_DWithin(mf.geometry::geography, pt.geog, :preplan_radius)
+        ORDER BY distance_meters
+        LIMIT 5
+    ),
+    closures AS (
+        SELECT mf.id, mf.title, mf.description, mf.properties, mf.address, l.icon,
+               ST_Distance(mf.geometry::geography, pt.geog) AS distance_meters
+        FROM layers l
+        JOIN map_features mf ON mf.layer_id = l.id
+        CROSS JOIN pt
+        WHERE l.layer_type = 'closure'
+          AND ST_DWithin(mf.geometry::geography, pt.geog, :closure_radius)
+    ),
+    zones AS (
+        SELECT mf.id, mf.title, mf.properties, l.layer_type, l.name, l.icon
+        FROM layers l
+        JOIN map_features mf ON mf.layer_id = l.id
+        CROSS JOIN pt
+        WHERE l.layer_type IN ('flood_zone', 'wildfire_risk')
+          AND ST_Intersects(mf.geometry, pt.geom)
+    )
+    SELECT 'point_radius' AS kind, ROW_NUMBER() OVER (ORDER BY distance_meters) AS ord,
+           jsonb_build_object(
+               'feature_id', id, 'title', title, 'description', description,
+               'properties', properties, 'radius_meters', radius_meters, 'address', address,
+               'layer_name', name, 'icon', icon, 'color', color, 'layer_type', layer_type,
+               'distance_meters', distance_meters
+           ) AS data,
+           NULL::timestamptz AS ts
+    FROM point_radius
+    UNION ALL
+    SELECT 'water', ROW_NUMBER() OVER (ORDER BY distance_meters),
+           jsonb_build_object(
+               'feature_id', id, 'title', title, 'description', description,
+               'properties', properties, 'address', address,
+               'layer_name', name, 'icon', icon, 'layer_type', layer_type,
+               'distance_meters', distance_meters
+           ),
+           NULL
+    FROM water
+    UNION ALL
+    SELECT 'address_note',
+           ROW_NUMBER() OVER (ORDER BY
+               CASE priority
+                   WHEN 'critical' THEN 1
+                   WHEN 'high' THEN 2
+                   WHEN 'normal' THEN 3
+                   WHEN 'low' THEN 4
+                   ELSE 5
+               END,
+               created_at DESC),
+           jsonb_build_object(
+               'id', id, 'address', address, 'note_type', note_type, 'content', content,
+               'priority', priority, 'incident_id', incident_id
+           ),
+           created_at
+    FROM notes
+    UNION ALL
+    SELECT 'boundary', 1, jsonb_build_object('title', title, 'layer_name', name), NULL
+    FROM boundary
+    UNION ALL
+    SELECT 'preplan', ROW_NUMBER() OVER (ORDER BY distance_meters),
+           jsonb_build_object(
+               'feature_id', id, 'title', title, 'description', description,
+               'properties', properties, 'address', address, 'icon', icon,
+               'distance_meters', distance_meters, 'match_type', 'address'
+           ),
+           NULL
+    FROM preplan_address
+    UNION ALL
+    SELECT 'preplan', ROW_NUMBER() OVER (ORDER BY distance_meters),
+           jsonb_build_object(
+               'feature_id', id, 'title', title, 'description', description,
+               'properties', properties, 'address', address, 'icon', icon,
+               'distance_meters', distance_meters, 'match_type', 'proximity'
+           ),
+           NULL
+    FROM preplan_nearby
+    UNION ALL
+    SELECT 'closure', ROW_NUMBER() OVER (ORDER BY distance_meters),
+           jsonb_build_object(
+               'feature_id', id, 'title', title, 'description', description,
+               'properties', properties, 'address', address, 'icon', icon,
+               'distance_meters', distance_meters
+           ),
+           NULL
+    FROM closures
+    UNION ALL
+    SELECT 'zone', ROW_NUMBER() OVER (ORDER BY id),
+           jsonb_build_object(
+               'feature_id', id, 'title', title, 'properties', properties,
+               'layer_type', layer_type, 'layer_name', name, 'icon', icon
+           ),
+           NULL
+    FROM zones
+    ORDER BY kind, ord
+"""
+
+# Result row kind -> query_proximity() key
+_KIND_KEYS = {
+    "point_radius": "point_radius",
+    "water": "water",
+    "address_note": "address_notes",
+    "preplan": "preplans",
+    "closure": "closures",
+    "zone": "zones",
+}
+
+
+def _query_proximity_single(db: Session, lat: float, lng: float, address: Optional[str]) -> Dict[str, Any]:
+    """All snapshot sections from one PROXIMITY_SQL round trip."""
+    normalized = address.strip().upper() if address else None
+    # Savepoint: a failure must not discard the caller's pending writes
+    with db.begin_nested():
+        rows = db.execute(text(PROXIMITY_SQL), {
+            "lat": lat,
+            "lng": lng,
+            "address": normalized or None,
+            "water_radius": WATER_RADIUS_METERS,
+            "closure_radius": CLOSURE_RADIUS_METERS,
+            "preplan_radius": PREPLAN_RADIUS_METERS,
+            "meters_per_degree": ENVELOPE_METERS_PER_DEGREE,
+        }).fetchall()
+
+    parts = {key: [] for key in _KIND_KEYS.values()}
+    parts["boundary"] = None
+    for kind, _ord, data, ts in rows:
+        if kind == "boundary":
+            parts["boundary"] = data.get("title") or data.get("layer_name")
+            continue
+        if kind == "address_note":
+            data["created_at"] = ts.isoformat() if ts else None
+        if "properties" in data:
+            data["properties"] = data["properties"] or {}
+        if "distance_meters" in data:
+            distance = data["distance_meters"]
+            data["distance_meters"] = round(distance, 1) if distance else None
+        parts[_KIND_KEYS[kind]].append(data)
+    return parts
+
+
+def _query_proximity_each(db: Session, lat: float, lng: float, address: Optional[str]) -> Dict[str, Any]:
+    """All snapshot sections, one query per section."""
+    return {
+        # 1. Point-radius features (hazards, TRI, informational)
+        "point_radius": query_point_radius_features(db, lat, lng),
+        # 2. Nearby water sources (2km radius)
+        "water": query_nearby_water(db, lat, lng),
+        # 3. Address notes
+        "address_notes": query_address_notes(db, address),
+        # 4. Boundary check
+        "boundary": query_boundary(db, lat, lng),
+        # 5. Nearby preplans
+        "preplans": query_nearby_preplans(db, lat, lng, address),
+        # 6. Nearby closures (3km radius)
+        "closures": query_nearby_closures(db, lat, lng),
+        # 7. Flood/wildfire zones (evaluated against weather at assembly)
+        "zones": query_flood_wildfire_zones(db, lat, lng),
+    }
+
+
+def query_proximity(
+    db: Session,
+    lat: float,
+    lng: float,
+    address: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Run the snapshot's spatial queries (everything except weather).
     
-    # 1. Point-radius features (hazards, TRI, informational)
-    point_radius_features = query_point_radius_features(db, lat, lng)
-    classified = _classify_point_radius_features(point_radius_features)
-    
-    # 2. Nearby water sources (2km radius)
-    water_sources = query_nearby_water(db, lat, lng)
-    
-    # 3. Address notes
-    address_notes = query_address_notes(db, address)
-    
-    # 4. Boundary check
-    boundary = query_boundary(db, lat, lng)
-    
-    # 5. Nearby preplans
-    preplans = query_nearby_preplans(db, lat, lng, address)
+    Split from build_proximity_snapshot so the location enrichment pipeline
+    can run these while route/weather HTTP calls are in flight, then
+    assemble once weather is known.
     
-    # 6. Nearby closures (3km radius)
-    closures = query_nearby_closures(db, lat, lng)
+    One statement normally; falls back to one query per section if that
+    statement fails.
+    """
+    try:
+        return _query_proximity_single(db, lat, lng, address)
+    except Exception as e:
+        logger.warning(f"Single-statement proximity query failed, running per-section queries: {e}")
+        return _query_proximity_each(db, lat, lng, address)
+
+
+def assemble_proximity_snapshot(
+    parts: Dict[str, Any],
+    weather_data: Optional[Dict] = None,
+) -> Dict[str, Any]:
+    """Build the map_snapshot dict from query_proximity() results + weather."""
+    classified = _classify_point_radius_features(parts["point_radius"])
     
-    # 7. Flood/wildfire zones + weather-conditional evaluation
-    zones = query_flood_wildfire_zones(db, lat, lng)
+    # Flood/wildfire zones + weather-conditional evaluation
     flood_alerts = []
     wildfire_alerts = []
-    weather_alerts = evaluate_weather_alerts(zones, weather_data)
+    weather_alerts = evaluate_weather_alerts(parts["zones"], weather_data)
     for alert in weather_alerts:
         if alert.get("layer_type") == "flood_zone":
             flood_alerts.append(alert)
@@ -729,16 +1027,16 @@ def build_proximity_snapshot(
     
     # Assemble snapshot
     snapshot = {
-        "nearby_water": [_format_water_alert(w) for w in water_sources],
+        "nearby_water": [_format_water_alert(w) for w in parts["water"]],
         "hazards": classified["hazards"],
-        "closures": [_format_closure_alert(c) for c in closures],
-        "address_notes": address_notes,
-        "preplans": [_format_preplan_alert(p) for p in preplans],
+        "closures": [_format_closure_alert(c) for c in parts["closures"]],
+        "address_notes": parts["address_notes"],
+        "preplans": [_format_preplan_alert(p) for p in parts["preplans"]],
         "railroad_crossings": [],  # Populated by route planner (Phase 6), not proximity
         "tri_facilities": classified["tri_facilities"],
         "flood_zones": flood_alerts,
         "wildfire_risk": wildfire_alerts,
-        "boundary": boundary,
+        "boundary": parts["boundary"],
         "weather": weather_data,
         "generated_at": datetime.now(timezone.utc).isoformat(),
     }
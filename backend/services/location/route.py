@@ -80,30 +80,38 @@ def fetch_route(
         logger.warning("No Google API key — skipping route fetch")
         return None
 
-    params = {
-        "origin": f"{origin_lat},{origin_lng}",
-        "destination": f"{dest_lat},{dest_lng}",
-        "mode": "driving",
-        "key": google_api_key,
-    }
-
     try:
-        resp = httpx.get(DIRECTIONS_BASE, params=params, timeout=DIRECTIONS_TIMEOUT)
-        data = resp.json()
+        resp = httpx.get(DIRECTIONS_BASE, params=_directions_params(
+            origin_lat, origin_lng, dest_lat, dest_lng, google_api_key
+        ), timeout=DIRECTIONS_TIMEOUT)
+        return _parse_directions(resp.json())
 
-        if data.get("status") != "OK" or not data.get("routes"):
-            logger.warning(f"Directions API returned status={data.get('status')}")
-            return None
+    except httpx.TimeoutException:
+        logger.warning("Directions API timed out")
+        return None
+    except Exception as e:
+        logger.error(f"Directions API error: {e}")
+        return None
 
-        route = data["routes"][0]
-        leg = route["legs"][0]
 
-        return {
-            "polyline": route["overview_polyline"]["points"],
-            "distance_meters": leg["distance"]["value"],
-            "duration_seconds": leg["duration"]["value"],
-            "summary": route.get("summary", ""),
-        }
+async def fetch_route_async(
+    client: httpx.AsyncClient,
+    origin_lat: float,
+    origin_lng: float,
+    dest_lat: float,
+    dest_lng: float,
+    google_api_key: str,
+) -> Optional[Dict]:
+    """fetch_route() on a shared AsyncClient (location enrichment pipeline)."""
+    if not google_api_key:
+        logger.warning("No Google API key — skipping route fetch")
+        return None
+
+    try:
+        resp = await client.get(DIRECTIONS_BASE, params=_directions_params(
+            origin_lat, origin_lng, dest_lat, dest_lng, google_api_key
+        ))
+        return _parse_directions(resp.json())
 
     except httpx.TimeoutException:
         logger.warning("Directions API timed out")
@@ -111,3 +119,29 @@ def fetch_route(
     except Exception as e:
         logger.error(f"Directions API error: {e}")
         return None
+
+
+def _directions_params(origin_lat, origin_lng, dest_lat, dest_lng, google_api_key) -> Dict:
+    return {
+        "origin": f"{origin_lat},{origin_lng}",
+        "destination": f"{dest_lat},{dest_lng}",
+        "mode": "driving",
+        "key": google_api_key,
+    }
+
+
+def _parse_directions(data: Dict) -> Optional[Dict]:
+    """Directions API JSON -> route dict, or None if no route."""
+    if data.get("status") != "OK" or not data.get("routes"):
+        logger.warning(f"Directions API returned status={data.get('status')}")
+        return None
+
+    route = data["routes"][0]
+    leg = route["legs"][0]
+
+    return {
+        "polyline": route["overview_polyline"]["points"],
+        "distance_meters": leg["distance"]["value"],
+        "duration_seconds": leg["duration"]["value"],
+        "summary": route.get("summary", ""),
+    }
@@ -228,10 +228,11 @@ def _load_source_data(incident_id, db):
         data["apparatus"] = {}
 
     # settings — flatten category.key = value
-    rows = db.execute(text("SELECT category, key, value FROM settings")).fetchall()
+    from settings_cache import get_settings
     settings = {}
-    for r in rows:
-        settings[r[0] + "." + r[1]] = r[2]
+    for category, keys in get_settings(db).items():
+        for key, (value, _value_type) in keys.items():
+            settings[category + "." + key] = value
     data["settings"] = settings
 
     return data
@@ -516,6 +517,9 @@ def save_neris_data(incident_id, neris_data, db):
         ), {"data": json.dumps(existing_data), "id": incident_id})
 
     db.commit()
+    if "settings" in table_updates:
+        from settings_cache import settings_changed
+        settings_changed(db)
     return result
 
 
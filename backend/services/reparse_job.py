@@ -0,0 +1,416 @@
+"""
+Full Reparse Job for CADReport
+
+Year-wide "full reparse" (rebuild cad_units, mutual-aid flags and times
+from stored CAD HTML with the current apparatus config) as a background
+job instead of one long HTTP request.
+
+- Incidents are processed in id order, CHUNK_SIZE at a time. Each chunk's
+  HTML is parsed in the executors parse pool (BeautifulSoup is CPU-bound),
+  then written with routers.backup.build_reparse() / apply_reparse() - the
+  same steps as the single-incident reparse.
+- Incident updates, audit rows and the job's progress/cursor commit
+  together per chunk (reparse_jobs, migration 053). A job interrupted by a
+  restart is resumed from last_incident_id; nothing is redone or skipped.
+- diff_only skips the write (and the audit entry) for incidents whose
+  derived fields come out unchanged. dry_run computes the counts and rolls
+  every chunk back.
+- Progress is readable from any worker (GET /api/backup/reparse-jobs/{id})
+  and pushed to /ws/incidents clients as "reparse_progress" messages.
+
+Only one job per tenant runs at a time - enforced by a partial unique
+index on active reparse_jobs rows (migration 060). A running job whose
+heartbeat is older than STALE_AFTER seconds is treated as interrupted and
+may be resumed; the thread that claimed it holds a run_token, and a
+thread whose token was replaced by a resume stops at its next chunk.
+"""
+
+import json
+import logging
+import threading
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+import analytics_cache
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY event type for progress messages (routed to broadcast_to_tenant)
+REPARSE_JOB_EVENT = "reparse_job"
+
+CHUNK_SIZE = 100
+
+# Seconds without a heartbeat before a 'running' job counts as interrupted
+STALE_AFTER = 120
+
+# Errors kept on the job row (error_count keeps counting past this)
+MAX_STORED_ERRORS = 200
+
+_JOB_COLUMNS = """
+    id, year, status, dry_run, diff_only, edited_by,
+    total, processed, changed, unchanged, error_count, errors,
+    last_incident_id, message, created_at, started_at, heartbeat_at, finished_at,
+    (status IN ('running', 'cancelling')
+     AND heartbeat_at < NOW() - make_interval(secs => :stale_after)) as stale
+"""
+
+
+def _iso(value) -> Optional[str]:
+    return value.isoformat() if value else None
+
+
+def _job_dict(row, include_errors: bool = True) -> Dict[str, Any]:
+    job = {
+        "job_id": row.id,
+        "year": row.year,
+        "status": "interrupted" if row.stale else row.status,
+        "dry_run": row.dry_run,
+        "diff_only": row.diff_only,
+        "total": row.total,
+        "processed": row.processed,
+        "changed": row.changed,
+        "unchanged": row.unchanged,
+        "error_count": row.error_count,
+        "percent": round(row.processed / row.total * 100, 1) if row.total else 0,
+        "message": row.message,
+        "created_at": _iso(row.created_at),
+        "started_at": _iso(row.started_at),
+        "finished_at": _iso(row.finished_at),
+    }
+    if include_errors:
+        job["errors"] = row.errors or []
+    return job
+
+
+def get_job(db: Session, job_id: int, include_errors: bool = True) -> Optional[Dict[str, Any]]:
+    row = db.execute(text(f"SELECT {_JOB_COLUMNS} FROM reparse_jobs WHERE id = :id"), {
+        "id": job_id, "stale_after": STALE_AFTER,
+    }).fetchone()
+    return _job_dict(row, include_errors) if row else None
+
+
+def list_jobs(db: Session, limit: int = 20) -> list:
+    rows = db.execute(text(f"""
+        SELECT {_JOB_COLUMNS} FROM reparse_jobs ORDER BY id DESC LIMIT :limit
+    """), {"limit": limit, "stale_after": STALE_AFTER}).fetchall()
+    return [_job_dict(r, include_errors=False) for r in rows]
+
+
+def _active_job(db: Session, include_stale: bool = False) -> Optional[Dict[str, Any]]:
+    """The tenant's queued/running job with a live heartbeat, if any."""
+    row = db.execute(text(f"""
+        SELECT {_JOB_COLUMNS} FROM reparse_jobs
+        WHERE status IN ('queued', 'running', 'cancelling')
+        ORDER BY id DESC LIMIT 1
+    """), {"stale_after": STALE_AFTER}).fetchone()
+    if row and (include_stale or not row.stale):
+        return _job_dict(row, include_errors=False)
+    return None
+
+
+def _interrupt_stale(db: Session):
+    """Store 'interrupted' on active jobs without a heartbeat so they free the active slot."""
+    db.execute(text("""
+        UPDATE reparse_jobs
+        SET status = 'interrupted', run_token = NULL, message = 'Interrupted (no heartbeat)'
+        WHERE status IN ('queued', 'running', 'cancelling')
+          AND heartbeat_at < NOW() - make_interval(secs => :stale_after)
+    """), {"stale_after": STALE_AFTER})
+    db.commit()
+
+
+def start_job(
+    db: Session,
+    tenant_slug: str,
+    year: int,
+    dry_run: bool = False,
+    diff_only: bool = True,
+    edited_by: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Queue a reparse job for a year and start its thread.
+    Returns the already-active job instead if this tenant has one.
+    """
+    active = _active_job(db)
+    if active:
+        return active
+    _interrupt_stale(db)
+
+    total = db.execute(text("""
+        SELECT COUNT(*) FROM incidents WHERE year_prefix = :year AND deleted_at IS NULL
+    """), {"year": year}).scalar()
+    try:
+        job_id = db.execute(text("""
+            INSERT INTO reparse_jobs (year, dry_run, diff_only, edited_by, total, heartbeat_at, message)
+            VALUES (:year, :dry_run, :diff_only, :edited_by, :total, NOW(), 'Reparse queued')
+            RETURNING id
+        """), {
+            "year": year, "dry_run": dry_run, "diff_only": diff_only,
+            "edited_by": edited_by, "total": total,
+        }).scalar()
+        db.commit()
+    except IntegrityError:
+        # Another request started a job since the check above
+        db.rollback()
+        return _active_job(db, include_stale=True)
+
+    _spawn(tenant_slug, job_id)
+    return get_job(db, job_id)
+
+
+def resume_job(db: Session, tenant_slug: str, job_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Restart an interrupted or failed job from its last committed chunk.
+    Returns None if the job doesn't exist; a live or finished job is
+    returned unchanged.
+    """
+    job = get_job(db, job_id, include_errors=False)
+    if not job or job["status"] not in ("interrupted", "failed"):
+        return job
+
+    active = _active_job(db)
+    if active:
+        return active
+    _interrupt_stale(db)
+
+    # Conditional on the status read above still holding: of two concurrent
+    # resumes only one matches, the other sees the fresh 'queued' row
+    try:
+        resumed = db.execute(text("""
+            UPDATE reparse_jobs
+            SET status = 'queued', heartbeat_at = NOW(), finished_at = NULL,
+                run_token = NULL, message = 'Resume queued'
+            WHERE id = :id AND status IN ('interrupted', 'failed')
+            RETURNING id
+        """), {"id": job_id}).scalar()
+        db.commit()
+    except IntegrityError:
+        # Another job became active since the check above
+        db.rollback()
+        return _active_job(db, include_stale=True)
+    if not resumed:
+        return get_job(db, job_id, include_errors=False)
+
+    _spawn(tenant_slug, job_id)
+    return get_job(db, job_id)
+
+
+def cancel_job(db: Session, job_id: int) -> Optional[Dict[str, Any]]:
+    """Ask a running job to stop after its current chunk."""
+    db.execute(text("""
+        UPDATE reparse_jobs SET status = 'cancelling'
+        WHERE id = :id AND status IN ('queued', 'running')
+    """), {"id": job_id})
+    db.commit()
+    return get_job(db, job_id, include_errors=False)
+
+
+def _spawn(tenant_slug: str, job_id: int):
+    threading.Thread(
+        target=run_job, args=(tenant_slug, job_id),
+        name=f"reparse-{tenant_slug}-{job_id}", daemon=True,
+    ).start()
+
+
+def _publish(tenant_slug: str, job: Dict[str, Any]):
+    """Push job progress to the tenant's /ws/incidents clients on every worker."""
+    from master_database import get_master_db
+    from routers.websocket import _NOTIFY_CHANNEL
+
+    try:
+        with get_master_db() as master:
+            master.execute(text("SELECT pg_notify(:channel, :payload)"), {
+                "channel": _NOTIFY_CHANNEL,
+                "payload": json.dumps({
+                    "tenant": tenant_slug,
+                    "event_type": REPARSE_JOB_EVENT,
+                    "payload": {
+                        "type": "reparse_progress",
+                        "job": job,
+                        "timestamp": datetime.now(timezone.utc).isoformat(),
+                    },
+                }),
+            })
+            master.commit()
+    except Exception as e:
+        logger.warning(f"Reparse progress NOTIFY failed for {tenant_slug}: {e}")
+
+
+def _finish(db: Session, tenant_slug: str, job_id: int, run_token: str, status: str, message: str):
+    finished = db.execute(text("""
+        UPDATE reparse_jobs
+        SET status = :status, message = :message, finished_at = NOW(), heartbeat_at = NOW(),
+            run_token = NULL
+        WHERE id = :id AND run_token = :run_token
+    """), {"id": job_id, "run_token": run_token, "status": status, "message": message}).rowcount
+    db.commit()
+    if not finished:
+        logger.warning(f"Reparse job {job_id} [{tenant_slug}]: superseded, not marking {status}")
+        return
+    job = get_job(db, job_id, include_errors=False)
+    if job["changed"] and not job["dry_run"]:
+        # Reparsed years are usually closed analytics windows, which the
+        # cache never re-checks
+        analytics_cache.cache_cleared(db)
+    _publish(tenant_slug, job)
+    logger.info(f"Reparse job {job_id} [{tenant_slug}]: {status} - {message}")
+
+
+def run_job(tenant_slug: str, job_id: int):
+    """Thread target: work through the job's year chunk by chunk."""
+    from database import get_db_for_tenant
+    from executors import parse_cad_reports
+    from routers.backup import (
+        REPARSE_COLUMNS, find_cad_parser_path, get_full_unit_info,
+        build_reparse, apply_reparse, reparse_personnel_name, queue_reparse_geocode,
+    )
+
+    db = next(get_db_for_tenant(tenant_slug))
+    run_token = uuid.uuid4().hex
+    try:
+        job = db.execute(text("""
+            UPDATE reparse_jobs
+            SET status = 'running', started_at = COALESCE(started_at, NOW()),
+                heartbeat_at = NOW(), run_token = :run_token, message = 'Reparsing'
+            WHERE id = :id AND status = 'queued'
+            RETURNING year, dry_run, diff_only, edited_by, last_incident_id
+        """), {"id": job_id, "run_token": run_token}).fetchone()
+        db.commit()
+        if not job:
+            return
+
+        try:
+            cad_path = find_cad_parser_path()
+        except ImportError as e:
+            _finish(db, tenant_slug, job_id, run_token, "failed", f"CAD parser not available: {e}")
+            return
+
+        personnel_name = reparse_personnel_name(db, job.edited_by)
+
+        # Apparatus config is fixed for the job - look each CAD unit up once
+        unit_cache: Dict[str, Dict[str, Any]] = {}
+
+        def unit_info(unit_id: str) -> Dict[str, Any]:
+            key = unit_id.upper()
+            if key not in unit_cache:
+                unit_cache[key] = get_full_unit_info(db, unit_id)
+            return unit_cache[key]
+
+        last_id = job.last_incident_id
+        while True:
+            status = db.execute(text(
+                "SELECT status FROM reparse_jobs WHERE id = :id"
+            ), {"id": job_id}).scalar()
+            if status == "cancelling":
+                _finish(db, tenant_slug, job_id, run_token, "cancelled", "Cancelled")
+                return
+
+            rows = db.execute(text(f"""
+                SELECT {REPARSE_COLUMNS}
+                FROM incidents
+                WHERE year_prefix = :year AND deleted_at IS NULL AND id > :last_id
+                ORDER BY id
+                LIMIT :limit
+            """), {"year": job.year, "last_id": last_id, "limit": CHUNK_SIZE}).fetchall()
+            if not rows:
+                break
+
+            errors = []
+            parseable = []
+            for row in rows:
+                if not (row.cad_raw_clear or row.cad_raw_dispatch):
+                    errors.append((row, "No raw CAD HTML stored for this incident"))
+                elif not row.incident_date:
+                    errors.append((row, "No incident_date set - cannot calculate times"))
+                else:
+                    parseable.append(row)
+
+            reports = parse_cad_reports(
+                cad_path, [row.cad_raw_clear or row.cad_raw_dispatch for row in parseable]
+            )
+
+            changed = unchanged = 0
+            geocode_ids = []
+            for row, (report_dict, error) in zip(parseable, reports):
+                if error:
+                    errors.append((row, error))
+                    continue
+                try:
+                    plan = build_reparse(row, report_dict, unit_info)
+                    # Savepoint per incident - one bad row doesn't lose the chunk
+                    with db.begin_nested():
+                        result = apply_reparse(db, plan, personnel_name, job.edited_by, job.diff_only)
+                except Exception as e:
+                    errors.append((row, f"Reparse failed: {e}"))
+                    continue
+                if result is None:
+                    unchanged += 1
+                else:
+                    changed += 1
+                    if result:
+                        geocode_ids.append(row.id)
+
+            if job.dry_run:
+                db.rollback()
+                geocode_ids = []
+
+            last_id = rows[-1].id
+            owned = db.execute(text("""
+                UPDATE reparse_jobs SET
+                    processed = processed + :processed,
+                    changed = changed + :changed,
+                    unchanged = unchanged + :unchanged,
+                    error_count = error_count + :error_count,
+                    errors = CASE
+                        WHEN jsonb_array_length(errors) < :max_errors
+                        THEN errors || CAST(:errors AS jsonb)
+                        ELSE errors
+                    END,
+                    last_incident_id = :last_id,
+                    heartbeat_at = NOW()
+                WHERE id = :id AND run_token = :run_token
+            """), {
+                "id": job_id,
+                "run_token": run_token,
+                "processed": len(rows),
+                "changed": changed,
+                "unchanged": unchanged,
+                "error_count": len(errors),
+                "errors": json.dumps([
+                    {"incident_id": row.id, "incident_number": row.internal_incident_number, "error": error}
+                    for row, error in errors
+                ]),
+                "max_errors": MAX_STORED_ERRORS,
+                "last_id": last_id,
+            }).rowcount
+            if not owned:
+                # Resumed elsewhere after our heartbeat went stale - drop this chunk
+                db.rollback()
+                logger.warning(f"Reparse job {job_id} [{tenant_slug}]: superseded, stopping")
+                return
+            # Incident writes and the resume cursor land together
+            db.commit()
+
+            if geocode_ids:
+                queue_reparse_geocode(db, tenant_slug, geocode_ids)
+            _publish(tenant_slug, get_job(db, job_id, include_errors=False))
+
+        final = get_job(db, job_id, include_errors=False)
+        verb = "would change" if final["dry_run"] else "changed"
+        _finish(db, tenant_slug, job_id, run_token, "completed",
+                f"{final['processed']} incidents reparsed: {final['changed']} {verb}, "
+                f"{final['unchanged']} unchanged, {final['error_count']} errors")
+    except Exception as e:
+        logger.error(f"Reparse job {job_id} [{tenant_slug}] failed: {e}")
+        try:
+            db.rollback()
+            _finish(db, tenant_slug, job_id, run_token, "failed", f"Reparse failed: {e}")
+        except Exception:
+            pass
+    finally:
+        db.close()
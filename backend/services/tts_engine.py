@@ -0,0 +1,410 @@
+"""
+TTS Engine - warm Piper processes + in-process MP3 encoding
+
+The old path spawned `piper` per alert (reloading the ONNX voice model each
+time), wrote a WAV to /tmp, spawned `ffmpeg` to transcode it, then deleted
+the WAV. Now, per uvicorn worker:
+
+    PiperPool      long-lived `piper --json-input` processes, one per
+                   (voice, length_scale), model loaded once. Each request
+                   is one JSON line on stdin; piper writes the WAV to the
+                   tmpfs work dir and prints its path on stdout.
+    encode_mp3()   lameenc in-process when installed, otherwise one ffmpeg
+                   call over pipes (no temp files).
+    store_audio()  MP3 written once to ALERTS_DIR (tmpfs when /dev/shm
+                   exists) for any worker to serve, and kept in memory so
+                   this worker serves it without reading the file. The
+                   memory copy is only used while the file's mtime and
+                   size still match - alerts for one incident reuse its
+                   filename, and another worker may have rewritten it.
+
+If a warm process fails (crash, timeout, piper build without --json-input)
+the request falls back to a one-shot piper spawn, so an alert never loses
+its audio because of the pool.
+
+Environment:
+    TTS_ALERTS_DIR        MP3 output dir (default /dev/shm/tts_alerts, or
+                          /tmp/tts_alerts without /dev/shm)
+    TTS_PIPER_PROCESSES   warm piper processes per uvicorn worker (default 2)
+
+scripts/bench_tts.py measures dispatch-to-audio-URL latency for the old
+spawn path and this engine.
+"""
+
+import asyncio
+import io
+import json
+import logging
+import os
+import time
+import uuid
+import wave
+from collections import OrderedDict, deque
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import lameenc
+    HAS_LAMEENC = True
+except ImportError:
+    HAS_LAMEENC = False
+
+PIPER_PATH = "/home/dashboard/piper/piper/piper"
+FFMPEG_PATH = "/usr/bin/ffmpeg"
+
+MP3_BITRATE_KBPS = 64  # 64kbps is fine for speech
+
+_TMPFS = Path("/dev/shm")
+ALERTS_DIR = Path(os.environ.get("TTS_ALERTS_DIR") or (
+    _TMPFS / "tts_alerts" if _TMPFS.is_dir() else "/tmp/tts_alerts"
+))
+WORK_DIR = ALERTS_DIR / ".work"  # piper WAV output (read + deleted immediately)
+
+MAX_PIPER_PROCESSES = int(os.environ.get("TTS_PIPER_PROCESSES", "2"))
+SYNTH_TIMEOUT = 10.0  # seconds per utterance (same limit as the old spawn path)
+ENCODE_TIMEOUT = 10.0
+
+# Recently generated MP3s kept in memory by this worker
+AUDIO_MEMORY_ENTRIES = 64
+
+_stats = {
+    "requests": 0,
+    "spawns": 0,
+    "failures": 0,
+    "oneshot_fallbacks": 0,
+    "synth_ms_total": 0,
+    "encode_ms_total": 0,
+}
+
+
+def _elapsed_ms(start: float) -> int:
+    return round((time.perf_counter() - start) * 1000)
+
+
+# =============================================================================
+# WARM PIPER PROCESSES
+# =============================================================================
+
+class _PiperProcess:
+    """One `piper --json-input` process with its voice model loaded."""
+
+    def __init__(self, model_path: str, length_scale: float):
+        self.key = (model_path, length_scale)
+        self.proc: Optional[asyncio.subprocess.Process] = None
+        self.last_used = time.monotonic()
+        self._stderr_tail = deque(maxlen=20)
+        self._stderr_task = None
+
+    async def start(self):
+        WORK_DIR.mkdir(parents=True, exist_ok=True)
+        model_path, length_scale = self.key
+        self.proc = await asyncio.create_subprocess_exec(
+            PIPER_PATH,
+            "--model", model_path,
+            "--length_scale", str(length_scale),
+            "--json-input",
+            "--output_dir", str(WORK_DIR),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        # piper logs to stderr continuously - drain it so the pipe never fills
+        self._stderr_task = asyncio.create_task(self._drain_stderr())
+        _stats["spawns"] += 1
+        logger.info(f"Piper process started: pid={self.proc.pid} voice={Path(model_path).stem} speed={length_scale}")
+
+    async def _drain_stderr(self):
+        try:
+            while True:
+                line = await self.proc.stderr.readline()
+                if not line:
+                    return
+                self._stderr_tail.append(line.decode(errors="replace").rstrip())
+        except Exception:
+            return
+
+    @property
+    def alive(self) -> bool:
+        return self.proc is not None and self.proc.returncode is None
+
+    async def synthesize(self, text: str) -> bytes:
+        """Synthesize one utterance. Returns WAV bytes."""
+        out_path = WORK_DIR / f"{uuid.uuid4().hex}.wav"
+        written = out_path
+        line = json.dumps({"text": text, "output_file": str(out_path)}) + "\n"
+        try:
+            self.proc.stdin.write(line.encode())
+            await self.proc.stdin.drain()
+            done = await asyncio.wait_for(self.proc.stdout.readline(), timeout=SYNTH_TIMEOUT)
+            if not done:
+                raise RuntimeError(f"piper exited: {' | '.join(self._stderr_tail)}")
+            # piper prints the path it wrote (output_file, or a name in --output_dir)
+            written = Path(done.decode().strip() or out_path)
+            return written.read_bytes()
+        finally:
+            out_path.unlink(missing_ok=True)
+            if written != out_path and written.parent == WORK_DIR:
+                written.unlink(missing_ok=True)
+            self.last_used = time.monotonic()
+
+    async def close(self):
+        if self.proc is None:
+            return
+        if self.proc.returncode is None:
+            try:
+                self.proc.stdin.close()
+                await asyncio.wait_for(self.proc.wait(), timeout=2.0)
+            except Exception:
+                self.proc.kill()
+                await self.proc.wait()
+        if self._stderr_task:
+            self._stderr_task.cancel()
+        logger.info(f"Piper process stopped: pid={self.proc.pid}")
+        self.proc = None
+
+
+class PiperPool:
+    """
+    Warm piper processes for this worker, keyed by (voice model, length_scale).
+
+    At most MAX_PIPER_PROCESSES exist at once; they double as the
+    concurrency limit (the old service allowed 3 concurrent spawns).
+    A request for a voice/speed with no idle process evicts the least
+    recently used idle process of another voice.
+    """
+
+    def __init__(self, max_processes: int = MAX_PIPER_PROCESSES):
+        self.max_processes = max(1, max_processes)
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._idle: List[_PiperProcess] = []
+        self._total = 0
+
+    def _semaphore(self) -> asyncio.Semaphore:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_processes)
+        return self._slots
+
+    async def _acquire(self, key: Tuple[str, float]) -> _PiperProcess:
+        for i, proc in enumerate(self._idle):
+            if proc.key == key:
+                self._idle.pop(i)
+                if proc.alive:
+                    return proc
+                self._total -= 1
+                await proc.close()
+                break
+
+        # Make room: holding a slot guarantees an idle process exists when full
+        if self._total >= self.max_processes and self._idle:
+            oldest = min(self._idle, key=lambda p: p.last_used)
+            self._idle.remove(oldest)
+            self._total -= 1
+            await oldest.close()
+
+        proc = _PiperProcess(*key)
+        self._total += 1
+        try:
+            await proc.start()
+        except Exception:
+            self._total -= 1
+            raise
+        return proc
+
+    async def synthesize(self, model_path: str, length_scale: float, text: str) -> bytes:
+        """WAV bytes for text, from a warm process for this voice/speed."""
+        async with self._semaphore():
+            proc = await self._acquire((model_path, length_scale))
+            try:
+                wav = await proc.synthesize(text)
+            except BaseException:
+                self._total -= 1
+                await proc.close()
+                raise
+            self._idle.append(proc)
+            return wav
+
+    async def warm(self, model_path: str, length_scale: float):
+        """Start a process for a voice/speed ahead of the first alert."""
+        async with self._semaphore():
+            proc = await self._acquire((model_path, length_scale))
+            self._idle.append(proc)
+
+    async def shutdown(self):
+        idle, self._idle = self._idle, []
+        for proc in idle:
+            await proc.close()
+        self._total -= len(idle)
+
+    def info(self) -> dict:
+        return {
+            "max_processes": self.max_processes,
+            "processes": self._total,
+            "idle": [
+                {"voice": Path(p.key[0]).stem, "length_scale": p.key[1], "pid": p.proc.pid if p.proc else None}
+                for p in self._idle
+            ],
+        }
+
+
+piper_pool = PiperPool()
+
+
+async def _synthesize_oneshot(model_path: str, length_scale: float, text: str) -> bytes:
+    """Old path, kept as a fallback: spawn piper for one utterance (WAV on tmpfs)."""
+    WORK_DIR.mkdir(parents=True, exist_ok=True)
+    out_path = WORK_DIR / f"{uuid.uuid4().hex}.wav"
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            PIPER_PATH,
+            "--model", model_path,
+            "--length_scale", str(length_scale),
+            "--output_file", str(out_path),
+            stdin=asyncio.subprocess.PIPE,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+        )
+        _, stderr = await asyncio.wait_for(proc.communicate(input=text.encode()), timeout=SYNTH_TIMEOUT)
+        if proc.returncode != 0:
+            raise RuntimeError(f"piper failed: {stderr.decode(errors='replace')}")
+        return out_path.read_bytes()
+    finally:
+        out_path.unlink(missing_ok=True)
+
+
+# =============================================================================
+# MP3 ENCODING
+# =============================================================================
+
+def _encode_lameenc(wav_bytes: bytes) -> bytes:
+    with wave.open(io.BytesIO(wav_bytes)) as wav:
+        channels = wav.getnchannels()
+        rate = wav.getframerate()
+        pcm = wav.readframes(wav.getnframes())
+    encoder = lameenc.Encoder()
+    encoder.set_bit_rate(MP3_BITRATE_KBPS)
+    encoder.set_in_sample_rate(rate)
+    encoder.set_channels(channels)
+    encoder.set_quality(2)
+    return encoder.encode(pcm) + encoder.flush()
+
+
+async def encode_mp3(wav_bytes: bytes) -> bytes:
+    """WAV bytes -> MP3 bytes (lameenc in a thread, else ffmpeg over pipes)."""
+    if HAS_LAMEENC:
+        return await asyncio.to_thread(_encode_lameenc, wav_bytes)
+
+    proc = await asyncio.create_subprocess_exec(
+        FFMPEG_PATH, "-y", "-loglevel", "error",
+        "-f", "wav", "-i", "pipe:0",
+        "-codec:a", "libmp3lame",
+        "-b:a", f"{MP3_BITRATE_KBPS}k",
+        "-f", "mp3", "pipe:1",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE,
+    )
+    mp3, stderr = await asyncio.wait_for(proc.communicate(input=wav_bytes), timeout=ENCODE_TIMEOUT)
+    if proc.returncode != 0 or not mp3:
+        raise RuntimeError(f"ffmpeg failed: {stderr.decode(errors='replace') if stderr else 'no stderr'}")
+    return mp3
+
+
+async def synthesize_mp3(model_path: str, length_scale: float, text: str) -> bytes:
+    """
+    Text -> MP3 bytes using a warm piper process.
+    Falls back to a one-shot piper spawn if the pool fails.
+    """
+    _stats["requests"] += 1
+    start = time.perf_counter()
+    try:
+        wav = await piper_pool.synthesize(model_path, length_scale, text)
+    except Exception as e:
+        logger.warning(f"Warm piper synthesis failed ({e!r}) - falling back to one-shot spawn")
+        _stats["oneshot_fallbacks"] += 1
+        try:
+            wav = await _synthesize_oneshot(model_path, length_scale, text)
+        except Exception:
+            _stats["failures"] += 1
+            raise
+    _stats["synth_ms_total"] += _elapsed_ms(start)
+
+    start = time.perf_counter()
+    try:
+        mp3 = await encode_mp3(wav)
+    except Exception:
+        _stats["failures"] += 1
+        raise
+    _stats["encode_ms_total"] += _elapsed_ms(start)
+    return mp3
+
+
+# =============================================================================
+# AUDIO STORAGE
+# =============================================================================
+
+# (tenant, filename) -> (file mtime_ns, file size, MP3 bytes), most recent last
+_audio: "OrderedDict[Tuple[str, str], Tuple[int, int, bytes]]" = OrderedDict()
+
+
+def store_audio(tenant: str, filename: str, mp3: bytes) -> Path:
+    """
+    Publish an MP3: one atomic write to ALERTS_DIR (any worker can serve it)
+    plus an in-memory copy for this worker.
+    """
+    tenant_dir = ALERTS_DIR / tenant
+    tenant_dir.mkdir(parents=True, exist_ok=True)
+    path = tenant_dir / filename
+    tmp_path = tenant_dir / f".{filename}.{uuid.uuid4().hex}"
+    tmp_path.write_bytes(mp3)
+    os.replace(tmp_path, path)
+    st = path.stat()
+
+    key = (tenant, filename)
+    _audio[key] = (st.st_mtime_ns, st.st_size, mp3)
+    _audio.move_to_end(key)
+    while len(_audio) > AUDIO_MEMORY_ENTRIES:
+        _audio.popitem(last=False)
+    return path
+
+
+def get_audio(tenant: str, filename: str) -> Optional[bytes]:
+    """
+    MP3 bytes if this worker wrote the file's current contents, else None
+    (serve the file). One stat() catches rewrites and removals by other workers.
+    """
+    key = (tenant, filename)
+    entry = _audio.get(key)
+    if entry is None:
+        return None
+    try:
+        st = (ALERTS_DIR / tenant / filename).stat()
+    except OSError:
+        st = None
+    if st is None or (st.st_mtime_ns, st.st_size) != entry[:2]:
+        _audio.pop(key, None)
+        return None
+    return entry[2]
+
+
+def forget_audio(tenant: str, filename: str):
+    _audio.pop((tenant, filename), None)
+
+
+def get_engine_stats() -> Dict:
+    """Counters for this worker since startup."""
+    stats = dict(_stats)
+    ok = stats["requests"] - stats["failures"]
+    stats["synth_ms_avg"] = round(stats["synth_ms_total"] / ok) if ok > 0 else None
+    stats["encode_ms_avg"] = round(stats["encode_ms_total"] / ok) if ok > 0 else None
+    stats["encoder"] = "lameenc" if HAS_LAMEENC else "ffmpeg"
+    stats["alerts_dir"] = str(ALERTS_DIR)
+    stats["audio_in_memory"] = len(_audio)
+    stats["pool"] = piper_pool.info()
+    return stats
+
+
+async def shutdown():
+    """Stop warm piper processes (main.py lifespan shutdown)."""
+    await piper_pool.shutdown()
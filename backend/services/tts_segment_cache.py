@@ -0,0 +1,367 @@
+"""
+TTS Segment Cache - reusable audio clips for announcement fragments
+
+Dispatch announcements are mostly the same fragments in a new order: unit
+names (tts_unit_mappings.spoken_as), call types, municipalities, street
+names. Each fragment is synthesized once per (voice, length_scale), trimmed
+of leading/trailing silence and stored as raw 16-bit PCM; an announcement
+is assembled by splicing cached clips with the field pause lengths and
+only fragments never heard before go to Piper.
+
+    segments = [("Engine forty-eight one", "short", "units"),
+                ("and", "none", "units"),
+                ("Tower forty-eight", "medium", "units"),
+                ("Dwelling Fire", "medium", "call_type"), ...]
+    wav = await render(segments, model_path, voice_id, length_scale)
+
+Storage (shared by all uvicorn workers and tenants):
+    SEGMENT_DIR/index.sqlite3        key -> voice, length_scale, kind, text,
+                                     sample_rate, hits, last_used_at
+    SEGMENT_DIR/<key[:2]>/<key>.pcm  raw s16le mono samples
+
+Keys are a hash of voice + length_scale + text, so a changed pronunciation
+or voice setting simply misses. Clips that can no longer be hit are removed:
+    - unit mapping edited / regenerated / deleted  -> invalidate(text=old)
+    - abbreviation added / edited / deleted        -> invalidate(kind=...)
+    - DELETE /api/tts/segments                     -> invalidate(...)
+    - clips unused for PRUNE_IDLE_DAYS             -> prune() (hourly, from render)
+A tenant changing tts_voice / tts_speed does not invalidate anything - other
+tenants may share the voice; the old clips age out through prune().
+
+Environment:
+    TTS_SEGMENT_DIR   clip cache directory (default /var/tmp/tts_segments)
+"""
+
+import array
+import asyncio
+import hashlib
+import io
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+import wave
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_DIR = Path(os.environ.get("TTS_SEGMENT_DIR") or "/var/tmp/tts_segments")
+INDEX_PATH = SEGMENT_DIR / "index.sqlite3"
+
+# Silence between segments (ms) by field pause style. 'none' is a word gap,
+# the rest match the punctuation pauses in tts_preprocessing.
+PAUSE_MS = {
+    'none': 80,
+    'short': 200,
+    'medium': 400,
+    'long': 600,
+}
+
+# Trimming: samples quieter than this are silence; keep a little padding
+_SILENCE_THRESHOLD = 300
+_TRIM_PAD_MS = 20
+
+# Clips not used for this long are deleted
+PRUNE_IDLE_DAYS = 30
+_PRUNE_INTERVAL = 3600
+
+# (text, pause_after, kind)
+Segment = Tuple[str, str, str]
+
+_local = threading.local()
+_schema_ready = False
+_last_prune = 0.0
+_schema_lock = threading.Lock()
+
+_stats = {
+    "renders": 0,
+    "segments": 0,
+    "segment_hits": 0,
+    "segment_misses": 0,
+    "invalidated": 0,
+    "pruned": 0,
+}
+
+
+# =============================================================================
+# INDEX
+# =============================================================================
+
+def _connect() -> sqlite3.Connection:
+    """Per-thread connection to the shared index."""
+    global _schema_ready
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        SEGMENT_DIR.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(str(INDEX_PATH), timeout=5.0)
+        conn.execute("PRAGMA journal_mode=WAL")
+        _local.conn = conn
+    if not _schema_ready:
+        with _schema_lock:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS segments (
+                    key TEXT PRIMARY KEY,
+                    voice TEXT NOT NULL,
+                    length_scale REAL NOT NULL,
+                    kind TEXT,
+                    text TEXT NOT NULL,
+                    sample_rate INTEGER NOT NULL,
+                    samples INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used_at REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_segments_voice ON segments(voice, length_scale)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_segments_text ON segments(text)")
+            conn.commit()
+            _schema_ready = True
+    return conn
+
+
+def normalize_text(text: str) -> str:
+    return " ".join((text or "").split())
+
+
+def segment_key(voice: str, length_scale: float, text: str) -> str:
+    raw = f"{voice}|{length_scale:.3f}|{normalize_text(text)}"
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def _clip_path(key: str) -> Path:
+    return SEGMENT_DIR / key[:2] / f"{key}.pcm"
+
+
+def _load_clips(keys: List[str]) -> Dict[str, Tuple[bytes, int]]:
+    """Cached clips for keys -> (pcm, sample_rate). Bumps hit counters."""
+    conn = _connect()
+    placeholders = ",".join("?" * len(keys))
+    rows = conn.execute(
+        f"SELECT key, sample_rate FROM segments WHERE key IN ({placeholders})", keys
+    ).fetchall()
+
+    clips = {}
+    for key, sample_rate in rows:
+        try:
+            clips[key] = (_clip_path(key).read_bytes(), sample_rate)
+        except FileNotFoundError:
+            continue  # index row without a file - resynthesize
+
+    if clips:
+        now = time.time()
+        conn.executemany(
+            "UPDATE segments SET hits = hits + 1, last_used_at = ? WHERE key = ?",
+            [(now, key) for key in clips],
+        )
+        conn.commit()
+    return clips
+
+
+def _save_clip(key: str, voice: str, length_scale: float, kind: str, text: str, pcm: bytes, sample_rate: int):
+    path = _clip_path(key)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{uuid.uuid4().hex}")
+    tmp_path.write_bytes(pcm)
+    os.replace(tmp_path, path)
+
+    now = time.time()
+    conn = _connect()
+    conn.execute("""
+        INSERT OR REPLACE INTO segments
+            (key, voice, length_scale, kind, text, sample_rate, samples, created_at, last_used_at, hits)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
+    """, (key, voice, length_scale, kind, normalize_text(text), sample_rate, len(pcm) // 2, now, now))
+    conn.commit()
+
+
+# =============================================================================
+# AUDIO HELPERS
+# =============================================================================
+
+def _wav_to_pcm(wav_bytes: bytes) -> Tuple[bytes, int]:
+    """Piper WAV -> (s16le mono PCM, sample_rate)."""
+    with wave.open(io.BytesIO(wav_bytes)) as wav:
+        if wav.getsampwidth() != 2 or wav.getnchannels() != 1:
+            raise ValueError(
+                f"unexpected Piper WAV format: {wav.getnchannels()}ch {wav.getsampwidth() * 8}bit"
+            )
+        return wav.readframes(wav.getnframes()), wav.getframerate()
+
+
+def _trim_silence(pcm: bytes, sample_rate: int) -> bytes:
+    """Drop leading/trailing silence (Piper pads every utterance)."""
+    samples = array.array("h")
+    samples.frombytes(pcm)
+    start, end = 0, len(samples)
+    while start < end and abs(samples[start]) < _SILENCE_THRESHOLD:
+        start += 1
+    while end > start and abs(samples[end - 1]) < _SILENCE_THRESHOLD:
+        end -= 1
+    if start >= end:
+        return pcm
+    pad = sample_rate * _TRIM_PAD_MS // 1000
+    start = max(0, start - pad)
+    end = min(len(samples), end + pad)
+    return samples[start:end].tobytes()
+
+
+def _silence(ms: int, sample_rate: int) -> bytes:
+    return b"\x00\x00" * (sample_rate * ms // 1000)
+
+
+def _to_wav(pcm: bytes, sample_rate: int) -> bytes:
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(pcm)
+    return buf.getvalue()
+
+
+# =============================================================================
+# RENDER
+# =============================================================================
+
+async def _synthesize_clip(model_path: str, voice: str, length_scale: float, key: str, text: str, kind: str):
+    from services.tts_engine import piper_pool
+
+    wav = await piper_pool.synthesize(model_path, length_scale, text)
+    pcm, sample_rate = _wav_to_pcm(wav)
+    pcm = _trim_silence(pcm, sample_rate)
+    await asyncio.to_thread(_save_clip, key, voice, length_scale, kind, text, pcm, sample_rate)
+    return pcm, sample_rate
+
+
+async def render(segments: List[Segment], model_path: str, voice: str, length_scale: float) -> bytes:
+    """
+    Assemble an announcement from cached clips (synthesizing only unseen
+    segments). Returns WAV bytes. Raises if any segment can't be produced -
+    the caller falls back to whole-text synthesis.
+    """
+    segments = [(normalize_text(t), p, k) for t, p, k in segments if normalize_text(t)]
+    if not segments:
+        raise ValueError("no segments")
+
+    global _last_prune
+    if time.time() - _last_prune > _PRUNE_INTERVAL:
+        _last_prune = time.time()
+        await asyncio.to_thread(prune)
+
+    keys = [segment_key(voice, length_scale, text) for text, _, _ in segments]
+    unique_keys = list(dict.fromkeys(keys))
+    clips = await asyncio.to_thread(_load_clips, unique_keys)
+
+    missing = {}
+    for key, (text, _, kind) in zip(keys, segments):
+        if key not in clips and key not in missing:
+            missing[key] = (text, kind)
+
+    _stats["renders"] += 1
+    _stats["segments"] += len(segments)
+    _stats["segment_hits"] += len(segments) - sum(1 for k in keys if k in missing)
+    _stats["segment_misses"] += sum(1 for k in keys if k in missing)
+
+    if missing:
+        results = await asyncio.gather(*(
+            _synthesize_clip(model_path, voice, length_scale, key, text, kind)
+            for key, (text, kind) in missing.items()
+        ))
+        clips.update(zip(missing.keys(), results))
+
+    sample_rates = {clips[key][1] for key in keys}
+    if len(sample_rates) != 1:
+        raise ValueError(f"clips have mixed sample rates {sorted(sample_rates)}")
+    sample_rate = sample_rates.pop()
+
+    parts = []
+    for i, (key, (_, pause, _)) in enumerate(zip(keys, segments)):
+        parts.append(clips[key][0])
+        if i < len(segments) - 1:
+            parts.append(_silence(PAUSE_MS.get(pause, PAUSE_MS['medium']), sample_rate))
+    return _to_wav(b"".join(parts), sample_rate)
+
+
+# =============================================================================
+# INVALIDATION / STATS
+# =============================================================================
+
+def _delete(where: str, params: list) -> int:
+    """Delete index rows + clip files matching a WHERE clause. Returns count."""
+    try:
+        conn = _connect()
+        keys = [r[0] for r in conn.execute(f"SELECT key FROM segments {where}", params)]
+        conn.execute(f"DELETE FROM segments {where}", params)
+        conn.commit()
+    except Exception as e:
+        logger.warning(f"TTS segment cache delete failed: {e}")
+        return 0
+
+    for key in keys:
+        _clip_path(key).unlink(missing_ok=True)
+    return len(keys)
+
+
+def invalidate(
+    voice: Optional[str] = None,
+    length_scale: Optional[float] = None,
+    kind: Optional[str] = None,
+    text: Optional[str] = None,
+) -> int:
+    """
+    Delete cached clips matching every given filter (no filters = all).
+    Returns the number removed. Safe to call from sync routes.
+    """
+    clauses, params = [], []
+    if voice is not None:
+        clauses.append("voice = ?")
+        params.append(voice)
+    if length_scale is not None:
+        clauses.append("ABS(length_scale - ?) < 0.0005")
+        params.append(float(length_scale))
+    if kind is not None:
+        clauses.append("kind = ?")
+        params.append(kind)
+    if text is not None:
+        clauses.append("text = ?")
+        params.append(normalize_text(text))
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+
+    removed = _delete(where, params)
+    _stats["invalidated"] += removed
+    if removed:
+        logger.info(
+            f"TTS segment cache: removed {removed} clips "
+            f"(voice={voice}, length_scale={length_scale}, kind={kind}, text={text!r})"
+        )
+    return removed
+
+
+def prune(max_idle_days: float = PRUNE_IDLE_DAYS) -> int:
+    """Delete clips not used in max_idle_days. Returns the number removed."""
+    removed = _delete("WHERE last_used_at < ?", [time.time() - max_idle_days * 86400])
+    _stats["pruned"] += removed
+    if removed:
+        logger.info(f"TTS segment cache: pruned {removed} clips idle > {max_idle_days} days")
+    return removed
+
+
+def get_segment_stats() -> dict:
+    """Counters for this worker + clip totals from the shared index."""
+    stats = dict(_stats)
+    total = stats["segment_hits"] + stats["segment_misses"]
+    stats["hit_rate"] = round(stats["segment_hits"] / total, 4) if total else None
+    try:
+        row = _connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(samples), 0), COALESCE(SUM(hits), 0) FROM segments"
+        ).fetchone()
+        stats["clips"] = row[0]
+        stats["clip_samples"] = row[1]
+        stats["clip_hits_total"] = row[2]
+    except Exception as e:
+        stats["index_error"] = str(e)
+    stats["segment_dir"] = str(SEGMENT_DIR)
+    return stats
@@ -3,6 +3,9 @@ TTS Service - Text-to-Speech generation using Piper
 
 Generates MP3 announcements for dispatch alerts.
 Text formatting is configurable via admin settings.
+Synthesis runs on warm Piper processes (services/tts_engine.py); dispatch
+announcements are spliced from cached fragment clips
+(services/tts_segment_cache.py) so only new fragments are synthesized.
 Unit pronunciations are managed via tts_unit_mappings table.
 
 Usage:
@@ -34,14 +37,21 @@ from services.tts_preprocessing import (
     number_to_words,
     preprocess_for_tts,
 )
+from services.tts_engine import (
+    ALERTS_DIR,
+    PIPER_PATH,
+    encode_mp3,
+    forget_audio,
+    store_audio,
+    synthesize_mp3,
+)
+from services import tts_segment_cache
 
 logger = logging.getLogger(__name__)
 
-# Piper configuration
-PIPER_PATH = "/home/dashboard/piper/piper/piper"
+# Piper configuration (binary path + warm process pool: services/tts_engine.py)
 PIPER_MODELS_DIR = "/home/dashboard/piper"  # Directory containing .onnx voice models
 DEFAULT_MODEL = "en_US-ryan-medium"  # Default voice
-FFMPEG_PATH = "/usr/bin/ffmpeg"
 
 # Default speech rate (can be overridden by tenant settings)
 # 1.0 = normal speed
@@ -49,8 +59,7 @@ FFMPEG_PATH = "/usr/bin/ffmpeg"
 # < 1.0 = faster (e.g., 0.8 = 20% faster)
 DEFAULT_LENGTH_SCALE = 1.1  # Slightly slower for clarity
 
-# Output configuration
-ALERTS_DIR = "/tmp/tts_alerts"
+# Output configuration (ALERTS_DIR is tmpfs when available - see tts_engine)
 ALERT_TTL_MINUTES = 10  # Auto-cleanup after this time
 
 
@@ -97,11 +106,11 @@ def get_available_voices() -> List[Dict[str, str]]:
 
 def _get_tts_settings(db) -> Dict[str, Any]:
     """
-    Get TTS settings from database.
+    Get TTS settings from the tenant's settings snapshot (settings_cache,
+    invalidated on every settings write).
     Returns defaults merged with stored settings.
-    Always fetches fresh from DB - no caching.
     """
-    from sqlalchemy import text
+    from settings_cache import get_category
     import json
     
     defaults = {
@@ -111,6 +120,7 @@ def _get_tts_settings(db) -> Dict[str, Any]:
         'tts_pause_style': 'normal',  # 'minimal', 'normal', 'dramatic'
         'tts_announce_all_units': False,  # If True, announce all units; if False, only your department's
         'tts_voice': DEFAULT_MODEL,  # Piper voice model name
+        'tts_segment_cache': True,  # Splice cached fragment clips (services/tts_segment_cache.py)
         'settings_version': 0,
     }
     
@@ -119,14 +129,11 @@ def _get_tts_settings(db) -> Dict[str, Any]:
         return defaults
     
     try:
-        result = db.execute(text(
-            "SELECT key, value, value_type FROM settings WHERE category = 'av_alerts'"
-        ))
+        rows = get_category(db, 'av_alerts')
         
         rows_found = 0
-        for row in result:
+        for key, (value, value_type) in rows.items():
             rows_found += 1
-            key, value, value_type = row[0], row[1], row[2]
             if key in defaults:
                 # Parse value based on type
                 if value_type == 'boolean':
@@ -173,21 +180,14 @@ class TTSService:
     Text-to-Speech service using Piper.
     
     Generates MP3 audio files for dispatch alerts.
-    Thread-safe for concurrent generation.
+    Concurrency is bounded by the warm Piper pool (tts_engine.PiperPool).
     """
     
     def __init__(self):
         self.piper_path = PIPER_PATH
         self.models_dir = Path(PIPER_MODELS_DIR)
         self.alerts_dir = Path(ALERTS_DIR)
-        self._semaphore = asyncio.Semaphore(3)  # Max 3 concurrent generations
         self._initialized = False
-        
-    def _ensure_dirs(self, tenant: str) -> Path:
-        """Ensure tenant alert directory exists"""
-        tenant_dir = self.alerts_dir / tenant
-        tenant_dir.mkdir(parents=True, exist_ok=True)
-        return tenant_dir
     
     def _get_model_path(self, voice_id: str = None) -> Path:
         """Get the full path to a voice model."""
@@ -241,17 +241,62 @@ class TTSService:
         Format the announcement text based on settings.
         Uses tts_preprocessing for unit pronunciations and field pauses.
         """
+        fields = await self._build_fields(
+            units, call_type, address, subtype, cross_streets, box,
+            municipality, development, settings, db, incident_id,
+        )
+        return self._fields_text(fields)
+    
+    def _fields_text(self, fields: List[tuple]) -> str:
+        """Announcement text for _build_fields() output."""
+        if not fields:
+            return "Alert."
+        
+        # Format with pauses
+        return tts_preprocessor.format_with_pauses([(text, pause) for text, pause, _ in fields])
+    
+    def _fields_segments(self, fields: List[tuple]) -> List[tuple]:
+        """Flatten _build_fields() output into (text, pause_after, kind) segments."""
+        if not fields:
+            return [("Alert", "none", "other")]
+        segments = []
+        for _, pause_after, field_segments in fields:
+            segments.extend(field_segments[:-1])
+            text, _, kind = field_segments[-1]
+            segments.append((text, pause_after, kind))
+        return segments
+    
+    async def _build_fields(
+        self,
+        units: List[str],
+        call_type: str,
+        address: str,
+        subtype: Optional[str] = None,
+        cross_streets: Optional[str] = None,
+        box: Optional[str] = None,
+        municipality: Optional[str] = None,
+        development: Optional[str] = None,
+        settings: Optional[Dict[str, Any]] = None,
+        db=None,
+        incident_id: int = None,
+    ) -> List[tuple]:
+        """
+        Announcement fields in spoken order.
+        
+        Returns a list of (text, pause_after, segments) per field, where
+        segments are the reusable pieces of that field for the segment
+        audio cache: each unit name and join word, the house number and
+        the street, or the whole field text.
+        """
         if settings is None:
             settings = {'tts_field_order': ['units', 'call_type', 'address']}
         
         field_order = settings.get('tts_field_order', ['units', 'call_type', 'address'])
-        pause_style = settings.get('tts_pause_style', 'normal')
         
         # Get field settings from database
         field_settings = tts_preprocessor.get_field_settings(db)
         
-        # Build parts with pause info
-        parts = []  # List of (text, pause_style) tuples
+        fields = []  # List of (text, pause_style, segments) tuples
         
         for field_id in field_order:
             field_cfg = field_settings.get(field_id, {'pause_after': 'medium'})
@@ -259,6 +304,7 @@ class TTSService:
             prefix = field_cfg.get('prefix', '')
             
             text = None
+            segments = None
             
             if field_id == 'units' and units:
                 # Get spoken pronunciations for each unit
@@ -269,8 +315,15 @@ class TTSService:
                         text = spoken_units[0]
                     elif len(spoken_units) == 2:
                         text = f"{spoken_units[0]} {join_word} {spoken_units[1]}"
+                        segments = [
+                            (spoken_units[0], 'none', 'units'),
+                            (join_word, 'none', 'units'),
+                            (spoken_units[1], 'none', 'units'),
+                        ]
                     else:
                         text = ', '.join(spoken_units[:-1]) + f", {join_word} " + spoken_units[-1]
+                        segments = [(unit, 'short', 'units') for unit in spoken_units[:-1]]
+                        segments += [(join_word, 'none', 'units'), (spoken_units[-1], 'none', 'units')]
             
             elif field_id == 'call_type' and call_type:
                 # Preprocess: / -> space, <=3 caps spelled, >3 caps title case
@@ -291,6 +344,7 @@ class TTSService:
                 expand = field_cfg.get('options', {}).get('expand_street_types', True)
                 if expand:
                     text = tts_preprocessor.expand_address(db, address)
+                    segments = self._address_segments(db, address, text)
                 else:
                     text = address
             
@@ -306,13 +360,24 @@ class TTSService:
                 text = development.strip()
             
             if text:
-                parts.append((text, pause_after))
+                fields.append((text, pause_after, segments or [(text, pause_after, field_id)]))
         
-        if not parts:
-            return "Alert."
-        
-        # Format with pauses
-        return tts_preprocessor.format_with_pauses(parts)
+        return fields
+    
+    def _address_segments(self, db, address: str, spoken: str) -> Optional[List[tuple]]:
+        """
+        Split an expanded address into house number + street, so the street
+        clip is shared by every incident on that street. None if the address
+        doesn't start with a number (or the split wouldn't match the text).
+        """
+        words = address.split()
+        if len(words) < 2 or not words[0].split('-', 1)[0].isdigit():
+            return None
+        number = tts_preprocessor.expand_address(db, words[0])
+        street = spoken[len(number):].strip()
+        if not spoken.startswith(number) or not street:
+            return None
+        return [(number, 'none', 'address_number'), (street, 'none', 'address')]
     
     async def generate_alert_audio(
         self,
@@ -340,8 +405,8 @@ class TTSService:
         # Get settings from database
         settings = _get_tts_settings(db)
         
-        # Format the announcement text (now async due to DB lookups)
-        text = await self.format_announcement(
+        # Build the announcement fields (async due to DB lookups)
+        fields = await self._build_fields(
             units=units,
             call_type=call_type,
             address=address,
@@ -354,6 +419,7 @@ class TTSService:
             db=db,
             incident_id=incident_id,
         )
+        text = self._fields_text(fields)
         
         # Get speech rate from settings (Piper length_scale)
         length_scale = settings.get('tts_speed', DEFAULT_LENGTH_SCALE)
@@ -372,75 +438,63 @@ class TTSService:
         # Get model path for selected voice
         model_path = self._get_model_path(voice_id)
         
-        # Ensure directory exists
-        tenant_dir = self._ensure_dirs(tenant)
-        
-        # Use timestamp in filename for cache busting
+        # Use timestamp in URL for cache busting
         timestamp = int(time.time() * 1000)
         
-        # Output paths
-        wav_path = tenant_dir / f"{incident_id}.wav"
-        mp3_path = tenant_dir / f"{incident_id}.mp3"
-        
-        # Use semaphore to limit concurrent generations
-        async with self._semaphore:
-            try:
-                # Generate WAV with Piper
-                # --length_scale controls speed (>1 = slower, <1 = faster)
-                proc = await asyncio.create_subprocess_exec(
-                    self.piper_path,
-                    "--model", str(model_path),
-                    "--length_scale", str(length_scale),
-                    "--output_file", str(wav_path),
-                    stdin=asyncio.subprocess.PIPE,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                
-                stdout, stderr = await asyncio.wait_for(
-                    proc.communicate(input=text.encode()),
-                    timeout=10.0  # 10 second timeout
-                )
-                
-                if proc.returncode != 0:
-                    logger.error(f"Piper failed: {stderr.decode()}")
-                    return {"audio_url": None, "tts_text": text}
-                
-                # Convert WAV to MP3 with ffmpeg
-                proc = await asyncio.create_subprocess_exec(
-                    FFMPEG_PATH, "-y",
-                    "-i", str(wav_path),
-                    "-codec:a", "libmp3lame",
-                    "-b:a", "64k",  # 64kbps is fine for speech
-                    str(mp3_path),
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                
-                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=10.0)
-                
-                if proc.returncode != 0:
-                    logger.error(f"ffmpeg failed for {incident_id}: {stderr.decode() if stderr else 'no stderr'}")
-                    return {"audio_url": None, "tts_text": text}
-                
-                # Remove WAV file
-                wav_path.unlink(missing_ok=True)
-                
-                # Return URL path with cache-busting timestamp
-                url_path = f"/alerts/audio/{tenant}/{incident_id}.mp3?t={timestamp}"
-                logger.info(f"TTS generated: {url_path} ({mp3_path.stat().st_size} bytes)")
-                
-                return {
-                    "audio_url": url_path,
-                    "tts_text": text,
-                }
-                
-            except asyncio.TimeoutError:
-                logger.error(f"TTS generation timed out for {tenant}/{incident_id}")
-                return {"audio_url": None, "tts_text": text}
-            except Exception as e:
-                logger.error(f"TTS generation error: {e}")
-                return {"audio_url": None, "tts_text": text}
+        segments = self._fields_segments(fields) if settings.get('tts_segment_cache', True) else None
+        audio_url = await self._render(
+            tenant, f"{incident_id}.mp3", text, model_path, length_scale, timestamp,
+            label=f"{tenant}/{incident_id}", segments=segments,
+        )
+        return {
+            "audio_url": audio_url,
+            "tts_text": text,
+        }
+    
+    async def _render(
+        self,
+        tenant: str,
+        filename: str,
+        text: str,
+        model_path: Path,
+        length_scale: float,
+        timestamp: int,
+        label: str,
+        segments: Optional[List[tuple]] = None,
+    ) -> Optional[str]:
+        """
+        Synthesize text on a warm Piper process, encode to MP3 and publish it.
+        With segments, the audio is spliced from the segment cache instead
+        (whole-text synthesis if that fails).
+        Returns the audio URL (with cache-busting timestamp), or None on failure.
+        """
+        start = time.perf_counter()
+        try:
+            mp3 = None
+            if segments:
+                try:
+                    wav = await tts_segment_cache.render(
+                        segments, str(model_path), model_path.stem, length_scale
+                    )
+                    mp3 = await encode_mp3(wav)
+                except Exception as e:
+                    logger.warning(f"TTS segment assembly failed for {label} ({e}) - synthesizing whole text")
+            if mp3 is None:
+                mp3 = await synthesize_mp3(str(model_path), length_scale, text)
+            store_audio(tenant, filename, mp3)
+        except asyncio.TimeoutError:
+            logger.error(f"TTS generation timed out for {label}")
+            return None
+        except Exception as e:
+            logger.error(f"TTS generation error for {label}: {e}")
+            return None
+        
+        url_path = f"/alerts/audio/{tenant}/{filename}?t={timestamp}"
+        logger.info(
+            f"TTS generated: {url_path} ({len(mp3)} bytes, "
+            f"{round((time.perf_counter() - start) * 1000)}ms)"
+        )
+        return url_path
     
     async def generate_custom_announcement(
         self,
@@ -474,72 +528,18 @@ class TTSService:
         # Get model path for selected voice
         model_path = self._get_model_path(voice_id)
         
-        # Ensure directory exists
-        tenant_dir = self._ensure_dirs(tenant)
-        
         # Use timestamp as ID for custom messages
         timestamp = int(time.time() * 1000)
         msg_id = f"custom_{timestamp}"
         
-        wav_path = tenant_dir / f"{msg_id}.wav"
-        mp3_path = tenant_dir / f"{msg_id}.mp3"
-        
-        async with self._semaphore:
-            try:
-                # Generate WAV with Piper
-                # --length_scale controls speed (>1 = slower, <1 = faster)
-                proc = await asyncio.create_subprocess_exec(
-                    self.piper_path,
-                    "--model", str(model_path),
-                    "--length_scale", str(length_scale),
-                    "--output_file", str(wav_path),
-                    stdin=asyncio.subprocess.PIPE,
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                
-                stdout, stderr = await asyncio.wait_for(
-                    proc.communicate(input=text.encode()),
-                    timeout=10.0
-                )
-                
-                if proc.returncode != 0:
-                    logger.error(f"Piper failed: {stderr.decode()}")
-                    return {"audio_url": None, "tts_text": text}
-                
-                # Convert WAV to MP3
-                proc = await asyncio.create_subprocess_exec(
-                    FFMPEG_PATH, "-y",
-                    "-i", str(wav_path),
-                    "-codec:a", "libmp3lame",
-                    "-b:a", "64k",
-                    str(mp3_path),
-                    stdout=asyncio.subprocess.PIPE,
-                    stderr=asyncio.subprocess.PIPE
-                )
-                
-                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout=10.0)
-                
-                if proc.returncode != 0:
-                    logger.error(f"ffmpeg failed for custom message: {stderr.decode() if stderr else 'no stderr'}")
-                    return {"audio_url": None, "tts_text": text}
-                
-                wav_path.unlink(missing_ok=True)
-                
-                url_path = f"/alerts/audio/{tenant}/{msg_id}.mp3?t={timestamp}"
-                logger.info(f"TTS custom generated: {url_path}")
-                
-                return {
-                    "audio_url": url_path,
-                    "tts_text": text,
-                }
-                
-            except asyncio.TimeoutError:
-                logger.error(f"TTS custom generation timed out")
-                return {"audio_url": None, "tts_text": text}
-            except Exception as e:
-                logger.error(f"TTS custom generation error: {e}")
-                return {"audio_url": None, "tts_text": text}
+        audio_url = await self._render(
+            tenant, f"{msg_id}.mp3", text, model_path, length_scale, timestamp,
+            label=f"{tenant} custom message",
+        )
+        return {
+            "audio_url": audio_url,
+            "tts_text": text,
+        }
     
     async def cleanup_old_files(self, max_age_minutes: int = ALERT_TTL_MINUTES):
         """Remove alert audio files older than max_age_minutes"""
@@ -557,6 +557,7 @@ class TTSService:
                     mtime = datetime.fromtimestamp(mp3_file.stat().st_mtime)
                     if mtime < cutoff:
                         mp3_file.unlink()
+                        forget_audio(tenant_dir.name, mp3_file.name)
                         removed += 1
                 except Exception as e:
                     logger.warning(f"Failed to remove {mp3_file}: {e}")
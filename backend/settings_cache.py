@@ -0,0 +1,176 @@
+"""
+Settings Snapshot Cache for CADReport
+
+Process-local snapshot of each tenant database's settings table, loaded in
+one query (SELECT category, key, value, value_type FROM settings).
+
+get_setting_value() used to run one SELECT per key, and hot paths read many
+keys per request: map config feature flags, the location background task
+(station coords, API keys, state), AV alert / TTS settings on every
+dispatch, report branding (20+ keys per PDF). They are all served from the
+snapshot now.
+
+Lifecycle:
+- Loaded lazily per database on first read, keyed by database name (so the
+  default tenant and settings_helper's runsheet_db share one snapshot).
+- Invalidated over the shared cadreport_alerts LISTEN/NOTIFY channel
+  (event_type 'settings') — every settings write calls settings_changed(db)
+  after its commit, so every worker drops the snapshot at the same time.
+- Snapshots still expire after a TTL as a safety net (missed NOTIFY while
+  the LISTEN connection reconnects, manual SQL, migrations). Standalone
+  scripts have no LISTEN subscriber and pass a shorter TTL.
+
+Values are kept as raw (value, value_type) strings; callers parse them, so
+a caller mutating a parsed JSON value can't change the snapshot.
+
+Hit/miss counters are per worker — see get_cache_stats().
+"""
+
+import os
+import time
+import json
+import logging
+import threading
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY event type used for cross-worker invalidation
+SETTINGS_EVENT = "settings"
+
+# Safety-net TTL (NOTIFY is the primary invalidation path)
+_SNAPSHOT_TTL = 300
+
+# category -> key -> (value, value_type)
+Snapshot = Dict[str, Dict[str, Tuple[Optional[str], Optional[str]]]]
+
+# database name -> (snapshot, loaded_at)
+_snapshots: Dict[str, Tuple[Snapshot, float]] = {}
+_lock = threading.Lock()
+
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "invalidations": 0,
+    "load_errors": 0,
+}
+
+
+def _build_snapshot(rows: Iterable) -> Snapshot:
+    snapshot: Snapshot = {}
+    for category, key, value, value_type in rows:
+        snapshot.setdefault(category, {})[key] = (value, value_type)
+    return snapshot
+
+
+def get_snapshot(db_name: str, load_rows: Callable[[], Iterable], ttl: float = _SNAPSHOT_TTL) -> Snapshot:
+    """
+    Settings snapshot for one database, loading it with load_rows() on a
+    miss. load_rows returns (category, key, value, value_type) rows.
+
+    On load failure, returns the stale snapshot if there is one, else raises.
+    """
+    now = time.time()
+    cached = _snapshots.get(db_name)
+    if cached and now - cached[1] < ttl:
+        with _lock:
+            _stats["hits"] += 1
+        return cached[0]
+
+    with _lock:
+        _stats["misses"] += 1
+
+    try:
+        snapshot = _build_snapshot(load_rows())
+    except Exception as e:
+        with _lock:
+            _stats["load_errors"] += 1
+        if cached:
+            logger.warning(f"Settings snapshot reload failed for {db_name}, using stale copy: {e}")
+            return cached[0]
+        raise
+
+    with _lock:
+        _snapshots[db_name] = (snapshot, now)
+    return snapshot
+
+
+def _db_name(db) -> str:
+    return db.get_bind().url.database
+
+
+def get_settings(db) -> Snapshot:
+    """Settings snapshot for the tenant database behind a SQLAlchemy session."""
+    from sqlalchemy import text
+
+    return get_snapshot(
+        _db_name(db),
+        lambda: db.execute(text(
+            "SELECT category, key, value, value_type FROM settings"
+        )).fetchall(),
+    )
+
+
+def get_raw(db, category: str, key: str) -> Optional[Tuple[Optional[str], Optional[str]]]:
+    """(value, value_type) for one setting, or None if the row doesn't exist."""
+    return get_settings(db).get(category, {}).get(key)
+
+
+def get_category(db, category: str) -> Dict[str, Tuple[Optional[str], Optional[str]]]:
+    """{key: (value, value_type)} for every setting in a category (copy)."""
+    return dict(get_settings(db).get(category, {}))
+
+
+def invalidate(db_name: str = None):
+    """
+    Drop one database's snapshot (or all of them) from this worker.
+
+    Local only — use settings_changed() to invalidate every worker.
+    """
+    with _lock:
+        if db_name:
+            _snapshots.pop(db_name, None)
+        else:
+            _snapshots.clear()
+        _stats["invalidations"] += 1
+    logger.debug(f"Settings snapshot invalidated: {db_name or 'all'}")
+
+
+def settings_changed(db):
+    """
+    Invalidate a tenant's settings snapshot on every worker.
+
+    Call after committing any write to the settings table. Invalidates this
+    worker immediately, then NOTIFYs the others over cadreport_alerts (the
+    LISTEN handler calls invalidate()).
+    """
+    from sqlalchemy import text
+    from master_database import get_master_db
+    from routers.websocket import _NOTIFY_CHANNEL
+
+    db_name = _db_name(db)
+    invalidate(db_name)
+    try:
+        with get_master_db() as master:
+            master.execute(text("SELECT pg_notify(:channel, :payload)"), {
+                "channel": _NOTIFY_CHANNEL,
+                "payload": json.dumps({
+                    "tenant": db_name,
+                    "event_type": SETTINGS_EVENT,
+                    "payload": {"database": db_name},
+                }),
+            })
+            master.commit()
+    except Exception as e:
+        logger.error(f"Settings NOTIFY failed for {db_name}: {e}")
+
+
+def get_cache_stats() -> dict:
+    """Hit/miss counters and snapshot count for this worker."""
+    with _lock:
+        stats = dict(_stats)
+        stats["snapshots"] = len(_snapshots)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else None
+    stats["worker_pid"] = os.getpid()
+    return stats
@@ -17,17 +17,34 @@ def get_db_connection():
     return psycopg2.connect(DATABASE_URL)
 
 
-def get_setting(category: str, key: str, default: Any = None) -> Any:
-    """Get a single setting value"""
+# Snapshot TTL for settings_helper reads. Standalone scripts (cad_listener)
+# have no LISTEN subscriber, so this is their only invalidation; inside the
+# API the snapshot is also dropped by NOTIFY on every settings write.
+SETTINGS_SNAPSHOT_TTL = 30
+
+
+def _load_settings_rows():
+    """All settings rows for the snapshot (one connection, one query)."""
+    conn = get_db_connection()
     try:
-        conn = get_db_connection()
         cur = conn.cursor()
-        cur.execute(
-            "SELECT value, value_type FROM settings WHERE category = %s AND key = %s",
-            (category, key)
-        )
-        row = cur.fetchone()
+        cur.execute("SELECT category, key, value, value_type FROM settings")
+        return cur.fetchall()
+    finally:
         conn.close()
+
+
+def _settings_snapshot() -> dict:
+    from settings_cache import get_snapshot
+    return get_snapshot(
+        DATABASE_URL.rsplit('/', 1)[-1], _load_settings_rows, ttl=SETTINGS_SNAPSHOT_TTL
+    )
+
+
+def get_setting(category: str, key: str, default: Any = None) -> Any:
+    """Get a single setting value (served from the settings snapshot)"""
+    try:
+        row = _settings_snapshot().get(category, {}).get(key)
         
         if not row:
             return default
@@ -41,18 +58,14 @@ def get_setting(category: str, key: str, default: Any = None) -> Any:
 def get_all_settings() -> dict:
     """Get all settings grouped by category"""
     try:
-        conn = get_db_connection()
-        cur = conn.cursor(cursor_factory=RealDictCursor)
-        cur.execute("SELECT category, key, value, value_type FROM settings ORDER BY category, key")
-        rows = cur.fetchall()
-        conn.close()
+        snapshot = _settings_snapshot()
         
         settings = {}
-        for row in rows:
-            cat = row['category']
-            if cat not in settings:
-                settings[cat] = {}
-            settings[cat][row['key']] = _parse_value(row['value'], row['value_type'])
+        for cat in sorted(snapshot):
+            settings[cat] = {
+                key: _parse_value(value, value_type)
+                for key, (value, value_type) in sorted(snapshot[cat].items())
+            }
         
         return settings
     except Exception as e:
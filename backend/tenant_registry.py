@@ -0,0 +1,208 @@
+"""
+Tenant Registry Cache for CADReport
+
+Process-local cache of the cadreport_master tenants table
+(slug → id, name, database_name, status).
+
+Every tenant-subdomain request used to hit the master DB twice before any
+tenant work started (SuspendedTenantMiddleware status check, then
+TenantAuthMiddleware ORM lookup), and get_db kept its own separate cache.
+All three now read from this one registry.
+
+Lifecycle:
+- Loaded in full at startup (one query) from main.py lifespan.
+- Misses (new tenant, unknown subdomain) fall through to a single-slug
+  master query and are cached, including negative results.
+- Invalidated over the shared cadreport_alerts LISTEN/NOTIFY channel
+  (event_type 'tenant_registry') when master_admin changes a tenant, so
+  every worker drops the entry at the same time.
+- Entries still expire after a TTL as a safety net in case a NOTIFY is
+  missed while the LISTEN connection is reconnecting.
+
+Hit/miss counters are per worker — see get_registry_stats().
+"""
+
+import os
+import time
+import logging
+import threading
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# NOTIFY event type used for cross-worker invalidation
+TENANT_REGISTRY_EVENT = "tenant_registry"
+
+# Safety-net TTLs (NOTIFY is the primary invalidation path)
+_ENTRY_TTL = 300          # 5 minutes for known tenants
+_NEGATIVE_ENTRY_TTL = 60  # 1 minute for slugs with no tenant row
+
+
+@dataclass(frozen=True)
+class TenantInfo:
+    """Cached routing info for one tenant."""
+    id: int
+    slug: str
+    name: str
+    database_name: str
+    status: str  # Upper-cased: ACTIVE, SUSPENDED, PENDING, REJECTED, UNKNOWN
+
+    @property
+    def is_active(self) -> bool:
+        return self.status == 'ACTIVE'
+
+
+# slug (lower-cased) -> (TenantInfo or None for "no such tenant", cached_at)
+_entries: Dict[str, Tuple[Optional[TenantInfo], float]] = {}
+_lock = threading.Lock()
+
+_stats = {
+    "hits": 0,
+    "misses": 0,
+    "invalidations": 0,
+    "lookup_errors": 0,
+    "loaded_at": None,
+}
+
+
+def _row_to_info(row) -> TenantInfo:
+    return TenantInfo(
+        id=row[0],
+        slug=row[1],
+        name=row[2],
+        database_name=row[3],
+        status=row[4].upper() if row[4] else 'UNKNOWN',
+    )
+
+
+def load_registry() -> int:
+    """
+    Load every tenant from cadreport_master into the registry.
+
+    Called from main.py lifespan startup. Returns number of tenants loaded.
+    On failure the registry stays as-is and lookups fall back to per-slug queries.
+    """
+    from master_database import get_master_db
+    from sqlalchemy import text
+
+    try:
+        with get_master_db() as db:
+            rows = db.execute(text(
+                "SELECT id, slug, name, database_name, status FROM tenants"
+            )).fetchall()
+    except Exception as e:
+        logger.error(f"Tenant registry load failed: {e}")
+        return 0
+
+    now = time.time()
+    with _lock:
+        _entries.clear()
+        for row in rows:
+            info = _row_to_info(row)
+            _entries[info.slug.lower()] = (info, now)
+        _stats["loaded_at"] = now
+
+    logger.info(f"Tenant registry loaded: {len(rows)} tenants")
+    return len(rows)
+
+
+def _fetch_tenant(slug: str) -> Optional[TenantInfo]:
+    """Single-slug master lookup. Raises on DB error."""
+    from master_database import get_master_db
+    from sqlalchemy import text
+
+    with get_master_db() as db:
+        row = db.execute(text("""
+            SELECT id, slug, name, database_name, status
+            FROM tenants
+            WHERE LOWER(slug) = LOWER(:slug)
+        """), {"slug": slug}).fetchone()
+
+    return _row_to_info(row) if row else None
+
+
+def get_tenant(slug: str) -> Optional[TenantInfo]:
+    """
+    Get cached tenant info by slug (case-insensitive).
+
+    Returns None if no tenant exists with that slug. On master DB failure,
+    returns the stale cached entry if there is one.
+    """
+    if not slug:
+        return None
+
+    key = slug.lower()
+    now = time.time()
+
+    cached = _entries.get(key)
+    if cached:
+        info, cached_at = cached
+        ttl = _ENTRY_TTL if info else _NEGATIVE_ENTRY_TTL
+        if now - cached_at < ttl:
+            with _lock:
+                _stats["hits"] += 1
+            return info
+
+    with _lock:
+        _stats["misses"] += 1
+
+    try:
+        info = _fetch_tenant(slug)
+    except Exception as e:
+        logger.error(f"Tenant registry lookup failed for {slug}: {e}")
+        with _lock:
+            _stats["lookup_errors"] += 1
+        if cached:
+            logger.warning(f"Using stale registry entry for tenant {slug}")
+            return cached[0]
+        return None
+
+    with _lock:
+        _entries[key] = (info, now)
+    return info
+
+
+def invalidate(slug: str = None):
+    """
+    Drop one tenant (or the whole registry) from this worker's cache.
+
+    Local only — use notify_tenant_changed() to invalidate every worker.
+    """
+    with _lock:
+        if slug:
+            _entries.pop(slug.lower(), None)
+        else:
+            _entries.clear()
+        _stats["invalidations"] += 1
+    logger.info(f"Tenant registry invalidated: {slug or 'all'}")
+
+
+async def notify_tenant_changed(slug: str = None):
+    """
+    Invalidate a tenant across all workers via the cadreport_alerts channel.
+
+    Call after any master_admin write to the tenants table. The LISTEN
+    handler on each worker (including this one) calls invalidate().
+    """
+    from routers.websocket import notify_tenant_event
+
+    # Invalidate locally first so this worker never serves the old row,
+    # even if NOTIFY is unavailable.
+    invalidate(slug)
+    try:
+        await notify_tenant_event(slug or "*", TENANT_REGISTRY_EVENT, {"slug": slug})
+    except Exception as e:
+        logger.error(f"Tenant registry NOTIFY failed for {slug}: {e}")
+
+
+def get_registry_stats() -> dict:
+    """Hit/miss counters and size for this worker."""
+    with _lock:
+        stats = dict(_stats)
+        stats["size"] = len(_entries)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else None
+    stats["worker_pid"] = os.getpid()
+    return stats
+
@@ -42,6 +42,8 @@ WEATHER_CODES = {
     99: "Thunderstorm with Heavy Hail",
 }
 
+OPEN_METEO_ARCHIVE_URL = "https://archive-api.open-meteo.com/v1/archive"
+
 
 def celsius_to_fahrenheit(celsius: float) -> int:
     """Convert Celsius to Fahrenheit"""
@@ -65,55 +67,9 @@ def fetch_weather_open_meteo(
         Dict with weather data or None on error
     """
     try:
-        date_str = timestamp.strftime('%Y-%m-%d')
-        hour = timestamp.hour
-        
-        # Open-Meteo historical weather API
-        url = "https://archive-api.open-meteo.com/v1/archive"
-        params = {
-            "latitude": latitude,
-            "longitude": longitude,
-            "start_date": date_str,
-            "end_date": date_str,
-            "hourly": "temperature_2m,weathercode,relativehumidity_2m,windspeed_10m",
-            "timezone": "America/New_York",
-        }
-        
-        response = requests.get(url, params=params, timeout=10)
+        response = requests.get(OPEN_METEO_ARCHIVE_URL, params=_open_meteo_params(latitude, longitude, timestamp), timeout=10)
         response.raise_for_status()
-        data = response.json()
-        
-        hourly = data.get('hourly', {})
-        temps = hourly.get('temperature_2m', [])
-        codes = hourly.get('weathercode', [])
-        humidity = hourly.get('relativehumidity_2m', [])
-        wind = hourly.get('windspeed_10m', [])
-        
-        if hour < len(temps) and hour < len(codes):
-            temp_c = temps[hour]
-            temp_f = celsius_to_fahrenheit(temp_c)
-            code = codes[hour]
-            condition = WEATHER_CODES.get(code, "Unknown")
-            
-            result = {
-                "condition": condition,
-                "temperature_f": temp_f,
-                "temperature_c": round(temp_c, 1),
-                "humidity": humidity[hour] if hour < len(humidity) else None,
-                "wind_speed_kmh": wind[hour] if hour < len(wind) else None,
-                "weather_code": code,
-                "source": "open-meteo",
-                "fetched_at": datetime.now().isoformat(),
-                "for_datetime": timestamp.isoformat(),
-            }
-            
-            # Generate simple description
-            result["description"] = f"{condition}, {temp_f}°F"
-            
-            return result
-        
-        logger.warning(f"No weather data for hour {hour}")
-        return None
+        return _parse_open_meteo(response.json(), timestamp)
         
     except requests.RequestException as e:
         logger.error(f"Weather API error: {e}")
@@ -123,6 +79,74 @@ def fetch_weather_open_meteo(
         return None
 
 
+async def fetch_weather_open_meteo_async(
+    client,
+    latitude: float,
+    longitude: float,
+    timestamp: datetime
+) -> Optional[Dict]:
+    """
+    fetch_weather_open_meteo() on a shared httpx.AsyncClient
+    (location enrichment pipeline). Same result dict.
+    """
+    try:
+        response = await client.get(OPEN_METEO_ARCHIVE_URL, params=_open_meteo_params(latitude, longitude, timestamp))
+        response.raise_for_status()
+        return _parse_open_meteo(response.json(), timestamp)
+    except Exception as e:
+        logger.error(f"Weather API error: {e}")
+        return None
+
+
+def _open_meteo_params(latitude: float, longitude: float, timestamp: datetime) -> Dict:
+    date_str = timestamp.strftime('%Y-%m-%d')
+    return {
+        "latitude": latitude,
+        "longitude": longitude,
+        "start_date": date_str,
+        "end_date": date_str,
+        "hourly": "temperature_2m,weathercode,relativehumidity_2m,windspeed_10m",
+        "timezone": "America/New_York",
+    }
+
+
+def _parse_open_meteo(data: Dict, timestamp: datetime) -> Optional[Dict]:
+    """Open-Meteo archive JSON -> weather dict for the timestamp's hour."""
+    hour = timestamp.hour
+    
+    hourly = data.get('hourly', {})
+    temps = hourly.get('temperature_2m', [])
+    codes = hourly.get('weathercode', [])
+    humidity = hourly.get('relativehumidity_2m', [])
+    wind = hourly.get('windspeed_10m', [])
+    
+    if hour < len(temps) and hour < len(codes):
+        temp_c = temps[hour]
+        temp_f = celsius_to_fahrenheit(temp_c)
+        code = codes[hour]
+        condition = WEATHER_CODES.get(code, "Unknown")
+        
+        result = {
+            "condition": condition,
+            "temperature_f": temp_f,
+            "temperature_c": round(temp_c, 1),
+            "humidity": humidity[hour] if hour < len(humidity) else None,
+            "wind_speed_kmh": wind[hour] if hour < len(wind) else None,
+            "weather_code": code,
+            "source": "open-meteo",
+            "fetched_at": datetime.now().isoformat(),
+            "for_datetime": timestamp.isoformat(),
+        }
+        
+        # Generate simple description
+        result["description"] = f"{condition}, {temp_f}°F"
+        
+        return result
+    
+    logger.warning(f"No weather data for hour {hour}")
+    return None
+
+
 def fetch_weather_openweathermap(
     latitude: float,
     longitude: float,
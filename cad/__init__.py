@@ -9,6 +9,7 @@ This package handles:
 
 Modules:
 - cad_parser: Parse Chester County CAD HTML messages
+- cad_document: Parse-once HTML document (lxml / html.parser) shared by parser + comments
 - cad_listener: TCP listener for real-time CAD data
 - comment_processor: Process and categorize event comments
 - comcat_model: ML model for comment categorization
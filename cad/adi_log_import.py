@@ -28,7 +28,7 @@ import logging
 import requests
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any
 from zoneinfo import ZoneInfo
 
 from cad_parser import parse_cad_html, report_to_dict
@@ -187,8 +187,26 @@ class ADILogImporter:
                 self.stats['errors'] += 1
                 logger.error(f"Error processing {report.get('event_number')}: {e}")
         
+        self._clear_analytics_cache()
         logger.info(f"Import complete. Stats: {self.stats}")
     
+    def _clear_analytics_cache(self):
+        """Imported incidents land in closed analytics periods, which the server never re-checks."""
+        written = (self.stats['incidents_created'] + self.stats['incidents_updated']
+                   + self.stats['incidents_closed'])
+        if self.dry_run or not written:
+            return
+        try:
+            resp = requests.post(
+                f"{self.api_url}/api/analytics/v2/cache/clear",
+                headers=self.headers,
+                timeout=10
+            )
+            if resp.status_code != 200:
+                logger.warning(f"Analytics cache clear returned {resp.status_code}: {resp.text}")
+        except Exception as e:
+            logger.warning(f"Analytics cache clear failed: {e}")
+    
     def _process_report(self, report: dict):
         """Process a single parsed report."""
         report_type = report.get('report_type')
@@ -247,30 +265,10 @@ class ADILogImporter:
         return False, None
     
     def _handle_dispatch(self, report: dict, raw_html: str = None):
-        """Handle Dispatch Report."""
+        """Handle Dispatch Report via POST /api/cad/ingest (existing incidents are skipped)."""
         event_number = report['event_number']
-        
-        exists, existing = self._incident_exists(event_number)
-        if exists:
-            logger.debug(f"Skipping existing incident {event_number}")
-            self.stats['incidents_skipped'] += 1
-            return
-        
         event_type = report.get('event_type', '')
         event_subtype = report.get('event_subtype', '')
-        municipality_code = report.get('municipality')
-        
-        # Auto-create municipality
-        if municipality_code and not self.dry_run:
-            try:
-                requests.post(
-                    f"{self.api_url}/api/lookups/municipalities/auto-create",
-                    params={'code': municipality_code},
-                    headers=self.headers,
-                    timeout=10
-                )
-            except:
-                pass
         
         # Determine category
         call_category = self._determine_category(event_type, event_subtype)
@@ -283,12 +281,14 @@ class ADILogImporter:
         except:
             pass
         
-        # Parse incident date from dispatch_time
+        # Parse incident date from dispatch_time (handles MM-DD-YY and DD-MM-YY)
         incident_date = None
+        dispatch_time = None
         if report.get('dispatch_time'):
             dt = self._parse_dispatch_datetime_str(report['dispatch_time'])
             if dt:
                 incident_date = dt.strftime('%Y-%m-%d')
+                dispatch_time = dt.strftime('%H:%M:%S')
             else:
                 logger.warning(f"Could not parse dispatch_time '{report['dispatch_time']}' for {event_number}")
         
@@ -297,25 +297,25 @@ class ADILogImporter:
             incident_date = f"{fallback_year}-01-01"
             logger.warning(f"No date parsed for {event_number}, defaulting to {incident_date}")
         
-        create_data = {
-            'cad_event_number': event_number,
-            'cad_event_type': event_type,
-            'cad_event_subtype': event_subtype,
-            'call_category': call_category,
-            'address': report.get('address'),
-            'municipality_code': municipality_code,
-            'incident_date': incident_date,
-            'cad_raw_dispatch': raw_html,
-        }
-        
         if self.dry_run:
             logger.info(f"[DRY RUN] Would create: {event_number} - {event_type} - {report.get('address')}")
             self.stats['incidents_created'] += 1
             return
         
+        # Parser-internal keys (e.g. _raw_html) are not part of the report payload
+        payload_report = {k: v for k, v in report.items() if not k.startswith('_')}
+        
         resp = requests.post(
-            f"{self.api_url}/api/incidents",
-            json=create_data,
+            f"{self.api_url}/api/cad/ingest",
+            json={
+                'report': payload_report,
+                'raw_html': raw_html,
+                'timezone': self.timezone,
+                'call_category': call_category,
+                'incident_date': incident_date,
+                'dispatch_time': dispatch_time,
+                'skip_existing': True,
+            },
             headers=self.headers,
             timeout=10
         )
@@ -324,31 +324,13 @@ class ADILogImporter:
             raise Exception(f"API returned {resp.status_code}: {resp.text}")
         
         result = resp.json()
-        incident_id = result['id']
-        logger.info(f"Created incident {event_number} (ID: {incident_id})")
-        self.stats['incidents_created'] += 1
-        
-        # Build cad_units
-        cad_units = self._build_cad_units_from_dispatch(report, incident_date)
-        
-        # Update with additional fields
-        update_data = {
-            'cross_streets': report.get('cross_streets'),
-            'esz_box': report.get('esz'),
-            'caller_name': report.get('caller_name'),
-            'caller_phone': report.get('caller_phone'),
-            'cad_units': cad_units,
-        }
-        
-        if report.get('dispatch_time'):
-            update_data['time_dispatched'] = self._parse_cad_datetime(report['dispatch_time'])
+        if result.get('action') == 'skipped':
+            logger.debug(f"Skipping existing incident {event_number}")
+            self.stats['incidents_skipped'] += 1
+            return
         
-        requests.put(
-            f"{self.api_url}/api/incidents/{incident_id}",
-            json=update_data,
-            headers=self.headers,
-            timeout=10
-        )
+        logger.info(f"Created incident {event_number} (ID: {result['id']})")
+        self.stats['incidents_created'] += 1
     
     def _handle_clear(self, report: dict, raw_html: str = None):
         """Handle Clear Report."""
@@ -691,47 +673,6 @@ class ADILogImporter:
         )
         self.stats['incidents_closed'] += 1
     
-    def _build_cad_units_from_dispatch(self, report: dict, incident_date: str) -> List[dict]:
-        """Build cad_units list from dispatch report."""
-        cad_units = []
-        
-        dispatch_time_str = None
-        if report.get('dispatch_time'):
-            dt = self._parse_dispatch_datetime_str(report['dispatch_time'])
-            if dt:
-                dispatch_time_str = dt.strftime('%H:%M:%S')
-        
-        for unit in report.get('responding_units', []):
-            unit_id = unit.get('unit_id')
-            if not unit_id:
-                continue
-            
-            unit_info = self._get_unit_info(unit_id)
-            canonical_unit_id = unit_info['unit_designator'] or unit_id
-            
-            unit_dispatch_time = None
-            if unit.get('time') and incident_date:
-                unit_dispatch_time = self._parse_cad_time(
-                    unit.get('time'), incident_date, dispatch_time_str
-                )
-            
-            cad_units.append({
-                'unit_id': canonical_unit_id,
-                'station': unit.get('station'),
-                'agency': unit.get('agency'),
-                'is_mutual_aid': not unit_info['is_ours'],
-                'apparatus_id': unit_info['apparatus_id'],
-                'unit_category': unit_info['category'],
-                'counts_for_response_times': unit_info['counts_for_response_times'],
-                'time_dispatched': unit_dispatch_time,
-                'time_enroute': None,
-                'time_arrived': None,
-                'time_available': None,
-                'time_cleared': None,
-            })
-        
-        return cad_units
-    
     def _determine_category(self, event_type: str, event_subtype: str = None) -> str:
         """Determine call category."""
         if self.dry_run:
@@ -760,25 +701,6 @@ class ADILogImporter:
             return 'EMS'
         return 'FIRE'
     
-    def _parse_cad_datetime(self, dt_str: str) -> Optional[str]:
-        """Parse CAD datetime to UTC ISO format. Handles both MM-DD-YY and DD-MM-YY formats."""
-        if not dt_str:
-            return None
-        
-        dt = self._parse_dispatch_datetime_str(dt_str)
-        if not dt:
-            logger.warning(f"Could not parse datetime {dt_str}")
-            return None
-        
-        try:
-            local_tz = ZoneInfo(self.timezone)
-            local_dt = dt.replace(tzinfo=local_tz)
-            utc_dt = local_dt.astimezone(ZoneInfo("UTC"))
-            return utc_dt.strftime('%Y-%m-%dT%H:%M:%SZ')
-        except Exception as e:
-            logger.warning(f"Could not convert datetime {dt_str}: {e}")
-            return None
-    
     def _parse_cad_time(self, time_str: str, incident_date: str = None, dispatch_time_str: str = None) -> Optional[str]:
         """Parse CAD time (HH:MM:SS) to UTC ISO format with midnight detection."""
         if not time_str:
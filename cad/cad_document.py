@@ -0,0 +1,275 @@
+"""
+CAD HTML Document Engine for RunSheet
+
+Builds the parsed tree for one CAD report ONCE and indexes it in a single
+walk, so cad_parser and comment_processor don't each re-scan (or re-parse)
+the HTML:
+
+- every <table> in document order
+- the first table / td for each CSS class (EventInfo, EventUnits, twoCol,
+  UnitTimes, Title, ...)
+- each table's first td.Header text, for section lookup ("Location",
+  "Caller Information", ...)
+
+Engines:
+- lxml (fast path, C parser) when installed
+- BeautifulSoup html.parser (pure Python) otherwise
+
+Both engines produce identical ParsedCADReport output for well-formed CAD
+HTML (see scripts/bench_cad_parser.py, which checks this on cad/samples and
+the ADI log). On broken markup libxml2 and html.parser can repair the tree
+differently - set CAD_PARSER_ENGINE=html.parser to force the fallback.
+
+Usage:
+    doc = parse_document(html)
+    report = parse_cad_html(html, document=doc)
+    comments = CommentProcessor().process_clear_html(html, date, document=doc)
+"""
+
+import os
+import logging
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import lxml.html
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+ENGINE_LXML = 'lxml'
+ENGINE_SOUP = 'html.parser'
+
+# Engine override (lxml | html.parser); default = lxml when available
+DEFAULT_ENGINE = os.environ.get('CAD_PARSER_ENGINE') or (ENGINE_LXML if HAS_LXML else ENGINE_SOUP)
+
+# Elements whose text BeautifulSoup's get_text() leaves out
+# (Script / Stylesheet / TemplateString / Ruby string types)
+_NON_TEXT_TAGS = ('script', 'style', 'template', 'rt', 'rp')
+
+# Placeholder used to split a cell on <br> (same token the parser always used)
+BR_DELIMITER = '|||BR|||'
+
+
+class CADDocument:
+    """
+    Parsed + indexed CAD report. Engine-specific subclasses provide node access;
+    callers only use the methods below and never touch engine objects directly.
+    """
+    engine = None
+
+    def __init__(self):
+        self.tables: List = []
+        self._first_table_by_class: Dict[str, object] = {}
+        self._first_td_by_class: Dict[str, object] = {}
+        self._section_headers: List[tuple] = []  # (header text, table index)
+
+    # -- index lookups ------------------------------------------------------
+
+    def first_table(self, css_class: str):
+        """First <table> with this class (soup.find('table', class_=...))."""
+        return self._first_table_by_class.get(css_class)
+
+    def first_td(self, css_class: str):
+        """First <td> with this class (soup.find('td', class_=...))."""
+        return self._first_td_by_class.get(css_class)
+
+    def section_table(self, section_name: str):
+        """
+        The data table that follows a section header table.
+
+        <table><tr><td class="Header">Location</td></tr></table>
+        <table class="EventInfo">...actual data...</table>
+        """
+        for header_text, index in self._section_headers:
+            if section_name in header_text:
+                if index + 1 < len(self.tables):
+                    return self.tables[index + 1]
+                return None
+        return None
+
+    def comment_rows(self) -> Iterator[List]:
+        """
+        td.EventComment cells (3+) for every row of every table.
+
+        Rows inside nested tables are visited once per enclosing table,
+        same as the original find_all('table') / find_all('tr') loops.
+        """
+        for table in self.tables:
+            for row in self.rows(table):
+                cells = self.cells(row, 'EventComment')
+                if len(cells) >= 3:
+                    yield cells
+
+    # -- engine-specific ----------------------------------------------------
+
+    def rows(self, table, css_class: Optional[str] = None) -> List:
+        """Descendant <tr>s of a table, optionally only those with a class."""
+        raise NotImplementedError
+
+    def cells(self, row, css_class: Optional[str] = None) -> List:
+        """Descendant <td>s of a row, optionally only those with a class."""
+        raise NotImplementedError
+
+    def text(self, node) -> str:
+        """Concatenated text of a node (BeautifulSoup get_text())."""
+        raise NotImplementedError
+
+    def br_text(self, node) -> str:
+        """Node text with each <br> replaced by BR_DELIMITER."""
+        raise NotImplementedError
+
+
+# =============================================================================
+# LXML ENGINE
+# =============================================================================
+
+def _lxml_has_class(el, css_class: str) -> bool:
+    value = el.get('class')
+    return bool(value) and css_class in value.split()
+
+
+class _LxmlDocument(CADDocument):
+    engine = ENGINE_LXML
+
+    def __init__(self, html: str):
+        super().__init__()
+        root = lxml.html.document_fromstring(html)
+
+        # Match get_text(): drop script/style/etc. but keep the text after them
+        for el in list(root.iter(*_NON_TEXT_TAGS)):
+            el.drop_tree()
+
+        # Single walk: tables, first-by-class, first Header td per table
+        table_index = {}
+        headed = set()
+        for el in root.iter('table', 'td'):
+            classes = (el.get('class') or '').split()
+            if el.tag == 'table':
+                table_index[el] = len(self.tables)
+                self.tables.append(el)
+                for c in classes:
+                    self._first_table_by_class.setdefault(c, el)
+            else:
+                for c in classes:
+                    self._first_td_by_class.setdefault(c, el)
+                if 'Header' in classes:
+                    header_text = None
+                    for table in el.iterancestors('table'):
+                        if table not in headed:
+                            headed.add(table)
+                            if header_text is None:
+                                header_text = self.text(el)
+                            self._section_headers.append((header_text, table_index[table]))
+
+        # Header lookup scans tables in document order
+        self._section_headers.sort(key=lambda h: h[1])
+
+    def rows(self, table, css_class: Optional[str] = None) -> List:
+        if css_class is None:
+            return list(table.iter('tr'))
+        return [tr for tr in table.iter('tr') if _lxml_has_class(tr, css_class)]
+
+    def cells(self, row, css_class: Optional[str] = None) -> List:
+        if css_class is None:
+            return list(row.iter('td'))
+        return [td for td in row.iter('td') if _lxml_has_class(td, css_class)]
+
+    def text(self, node) -> str:
+        return ''.join(node.itertext())
+
+    def br_text(self, node) -> str:
+        parts = []
+        self._collect_br_text(node, parts, include_tail=False)
+        return ''.join(parts)
+
+    def _collect_br_text(self, el, parts: list, include_tail: bool):
+        if el.tag == 'br':
+            parts.append(BR_DELIMITER)
+        elif isinstance(el.tag, str) and el.text:
+            parts.append(el.text)
+        if isinstance(el.tag, str):
+            for child in el:
+                self._collect_br_text(child, parts, include_tail=True)
+        if include_tail and el.tail:
+            parts.append(el.tail)
+
+
+# =============================================================================
+# BEAUTIFULSOUP ENGINE (pure-Python fallback)
+# =============================================================================
+
+class _SoupDocument(CADDocument):
+    engine = ENGINE_SOUP
+
+    def __init__(self, html: str):
+        super().__init__()
+        from bs4 import BeautifulSoup
+
+        self.soup = BeautifulSoup(html, 'html.parser')
+
+        # Single walk: tables, first-by-class, first Header td per table
+        table_index = {}
+        headed = set()
+        for el in self.soup.find_all(['table', 'td']):
+            classes = el.get('class') or []
+            if el.name == 'table':
+                table_index[id(el)] = len(self.tables)
+                self.tables.append(el)
+                for c in classes:
+                    self._first_table_by_class.setdefault(c, el)
+            else:
+                for c in classes:
+                    self._first_td_by_class.setdefault(c, el)
+                if 'Header' in classes:
+                    header_text = None
+                    for table in el.find_parents('table'):
+                        if id(table) not in headed:
+                            headed.add(id(table))
+                            if header_text is None:
+                                header_text = el.get_text()
+                            self._section_headers.append((header_text, table_index[id(table)]))
+
+        self._section_headers.sort(key=lambda h: h[1])
+
+    def rows(self, table, css_class: Optional[str] = None) -> List:
+        if css_class is None:
+            return table.find_all('tr')
+        return table.find_all('tr', class_=css_class)
+
+    def cells(self, row, css_class: Optional[str] = None) -> List:
+        if css_class is None:
+            return row.find_all('td')
+        return row.find_all('td', class_=css_class)
+
+    def text(self, node) -> str:
+        return node.get_text()
+
+    def br_text(self, node) -> str:
+        # Work on a copy - the shared tree is read again by comment extraction
+        from copy import copy
+        node = copy(node)
+        for br in node.find_all('br'):
+            br.replace_with(BR_DELIMITER)
+        return node.get_text()
+
+
+# =============================================================================
+# ENTRY POINT
+# =============================================================================
+
+def parse_document(html: str, engine: Optional[str] = None) -> CADDocument:
+    """
+    Parse CAD HTML once with the requested engine (default: lxml if installed).
+
+    Falls back to html.parser if lxml is unavailable or rejects the input
+    (empty document, XML encoding declaration in a str, ...).
+    """
+    engine = engine or DEFAULT_ENGINE
+    if engine == ENGINE_LXML and HAS_LXML:
+        try:
+            return _LxmlDocument(html)
+        except Exception as e:
+            logger.debug(f"lxml could not parse CAD HTML ({e}) - using html.parser")
+    return _SoupDocument(html)
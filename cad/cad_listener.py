@@ -12,9 +12,22 @@ DATA PROTECTION:
 - If dispatch fails, clear can still create the incident
 - Failed API calls logged with reference to backup file
 
+CONCURRENCY:
+- Connections are handled by a bounded worker pool (--max-workers).
+- At most --max-inflight connections are accepted but unfinished at once.
+  When the limit is reached the accept loop waits, so further CAD
+  connections queue in the kernel listen backlog instead of spawning
+  unbounded threads (backpressure).
+- Reports for the same event number are processed one at a time (not
+  necessarily in arrival order), so a burst of updates for one event
+  can't race itself into duplicate incidents.
+- All API calls share one keep-alive requests.Session for this tenant,
+  so only the first call pays the TCP+TLS handshake.
+
 Usage:
     python cad_listener.py --port 19117 --tenant glenmoorefc --api-url https://glenmoorefc.cadreport.com
     python cad_listener.py --port 19118 --tenant otherdept --api-url https://otherdept.cadreport.com --timezone America/Chicago
+    python cad_listener.py --port 19117 --tenant glenmoorefc --api-url https://glenmoorefc.cadreport.com --max-workers 16 --max-inflight 64
 """
 
 import socket
@@ -24,6 +37,9 @@ import logging
 import json
 import requests
 import os
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from requests.adapters import HTTPAdapter
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any
 from zoneinfo import ZoneInfo
@@ -43,9 +59,18 @@ logger = logging.getLogger(__name__)
 # Base directory for tenant data
 DATA_BASE_DIR = '/opt/runsheet/data'
 
+# Concurrency defaults (override with --max-workers / --max-inflight)
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_INFLIGHT = 32
+
+# Socket read settings
+RECV_CHUNK_SIZE = 65536
+RECV_TIMEOUT = 30  # seconds - a stalled CAD connection must not pin a worker forever
+
 
 class CADListener:
-    def __init__(self, port: int, api_url: str, tenant: str, timezone: str = 'America/New_York'):
+    def __init__(self, port: int, api_url: str, tenant: str, timezone: str = 'America/New_York',
+                 max_workers: int = DEFAULT_MAX_WORKERS, max_inflight: int = DEFAULT_MAX_INFLIGHT):
         """
         Initialize CAD Listener.
         
@@ -54,6 +79,8 @@ class CADListener:
             api_url: Base URL for RunSheet API (REQUIRED) - e.g., https://glenmoorefc.cadreport.com
             tenant: Tenant slug for data directory (REQUIRED)
             timezone: IANA timezone for CAD timestamps (default: America/New_York)
+            max_workers: Connections processed concurrently
+            max_inflight: Connections accepted but not yet finished before accept() waits
         """
         self.port = port
         self.api_url = api_url.rstrip('/')  # Remove trailing slash if present
@@ -68,6 +95,20 @@ class CADListener:
         self.running = False
         self.server_socket = None
         
+        # Bounded worker pool + in-flight limit (see CONCURRENCY above)
+        self.max_workers = max(1, max_workers)
+        self.max_inflight = max(self.max_workers, max_inflight)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._inflight = threading.BoundedSemaphore(self.max_inflight)
+        
+        # Per-event locks so reports for one event are processed in order:
+        # event_number -> [lock, holders + waiters]; dropped when unused
+        self._event_locks: Dict[str, list] = {}
+        self._event_locks_guard = threading.Lock()
+        
+        # One keep-alive HTTP session for every API call to this tenant
+        self._session = self._create_session()
+        
         # Cache for unit info lookups (avoid repeated API calls)
         self._unit_cache: Dict[str, Dict[str, Any]] = {}
         self._unit_cache_time: Optional[datetime] = None
@@ -101,47 +142,106 @@ class CADListener:
             'incidents_closed': 0,
             'backups_saved': 0,
             'incidents_created_from_clear': 0,
+            'backpressure_waits': 0,
         }
     
+    def _create_session(self) -> requests.Session:
+        """
+        Build the shared HTTP session for this tenant's API.
+        
+        requests.Session is safe to share across worker threads for plain
+        request calls; the adapter's connection pool is sized to the worker
+        count so no worker has to open a throwaway connection.
+        """
+        session = requests.Session()
+        session.headers.update(self._api_headers)
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.max_workers, max_retries=0)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+    
     def start(self):
         """Start listening for connections"""
         self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
         self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
         self.server_socket.bind(('0.0.0.0', self.port))
-        self.server_socket.listen(5)
+        self.server_socket.listen(max(5, self.max_inflight))
         self.running = True
+        self._executor = ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix=f"cad-{self.tenant}",
+        )
         
         logger.info(f"CAD Listener started on port {self.port}")
         logger.info(f"API URL: {self.api_url}")
         logger.info(f"Tenant: {self.tenant}")
         logger.info(f"Timezone: {self.timezone}")
         logger.info(f"Backup directory: {self.backup_dir}")
+        logger.info(f"Workers: {self.max_workers}, max in-flight: {self.max_inflight}")
         
         while self.running:
+            # Backpressure: don't accept more than max_inflight connections.
+            # While we wait here, new CAD connections sit in the listen backlog.
+            if not self._inflight.acquire(blocking=False):
+                self.stats['backpressure_waits'] += 1
+                logger.warning(f"In-flight limit ({self.max_inflight}) reached - waiting for a worker")
+                self._inflight.acquire()
+            
             try:
                 client_socket, address = self.server_socket.accept()
-                self.stats['connections'] += 1
-                logger.info(f"Connection from {address[0]}:{address[1]}")
-                
-                # Handle in thread to allow multiple connections
-                thread = threading.Thread(
-                    target=self._handle_connection,
-                    args=(client_socket, address)
-                )
-                thread.daemon = True
-                thread.start()
-                
             except Exception as e:
+                self._inflight.release()
                 if self.running:
                     logger.error(f"Accept error: {e}")
+                continue
+            
+            self.stats['connections'] += 1
+            logger.info(f"Connection from {address[0]}:{address[1]}")
+            
+            try:
+                self._executor.submit(self._run_connection, client_socket, address)
+            except Exception as e:
+                # Executor shut down underneath us (stop() during accept)
+                logger.error(f"Could not queue connection: {e}")
+                client_socket.close()
+                self._inflight.release()
     
     def stop(self):
         """Stop the listener"""
         self.running = False
         if self.server_socket:
             self.server_socket.close()
+        if self._executor:
+            # Let queued reports finish - their raw data is already off the wire
+            self._executor.shutdown(wait=True)
+        self._session.close()
         logger.info("CAD Listener stopped")
     
+    def _run_connection(self, client_socket: socket.socket, address: tuple):
+        """Worker entry point - handle one connection and free its in-flight slot."""
+        try:
+            self._handle_connection(client_socket, address)
+        finally:
+            self._inflight.release()
+    
+    @contextmanager
+    def _event_lock(self, event_number: str):
+        """Hold the lock serializing processing of one CAD event number."""
+        with self._event_locks_guard:
+            entry = self._event_locks.get(event_number)
+            if entry is None:
+                entry = self._event_locks[event_number] = [threading.Lock(), 0]
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            # Remove only when no thread holds or waits for it
+            with self._event_locks_guard:
+                entry[1] -= 1
+                if entry[1] == 0:
+                    del self._event_locks[event_number]
+    
     def _get_unit_info(self, unit_id: str) -> Dict[str, Any]:
         """
         Look up unit info via API.
@@ -161,10 +261,9 @@ class CADListener:
         
         # Query API
         try:
-            resp = requests.get(
+            resp = self._session.get(
                 f"{self.api_url}/api/apparatus/lookup",
                 params={'unit_id': unit_id},
-                headers=self._api_headers,
                 timeout=5
             )
             if resp.status_code == 200:
@@ -249,12 +348,14 @@ class CADListener:
         """Handle a single connection - receive data, parse, process"""
         try:
             # Receive all data (CAD sends then disconnects)
-            raw_data = b''
+            client_socket.settimeout(RECV_TIMEOUT)
+            buffer = bytearray()
             while True:
-                chunk = client_socket.recv(4096)
+                chunk = client_socket.recv(RECV_CHUNK_SIZE)
                 if not chunk:
                     break
-                raw_data += chunk
+                buffer += chunk
+            raw_data = bytes(buffer)
             
             if not raw_data:
                 logger.warning("Empty connection received")
@@ -327,10 +428,11 @@ class CADListener:
         report_type = report.get('report_type')
         
         try:
-            if report_type == 'DISPATCH':
-                self._handle_dispatch(report, text_data)
-            elif report_type == 'CLEAR':
-                self._handle_clear(report, text_data)
+            with self._event_lock(event_number):
+                if report_type == 'DISPATCH':
+                    self._handle_dispatch(report, text_data)
+                elif report_type == 'CLEAR':
+                    self._handle_clear(report, text_data)
         except Exception as e:
             logger.error(f"Error processing report: {e}", exc_info=True)
             self.stats['errors'] += 1
@@ -364,182 +466,37 @@ class CADListener:
             logger.error(f"Could not log failed request: {e}")
     
     def _handle_dispatch(self, report: dict, raw_html: str = None):
-        """Handle Dispatch Report - create or update incident"""
+        """
+        Handle Dispatch Report - create or update incident.
         
+        One call to POST /api/cad/ingest: the server does the incident
+        lookup, municipality auto-create, unit resolution and cad_units
+        merge in a single transaction.
+        """
         event_number = report['event_number']
         
-        # Check if incident exists
-        try:
-            resp = requests.get(f"{self.api_url}/api/incidents/by-cad/{event_number}", headers=self._api_headers, timeout=10)
-            exists = resp.status_code == 200
-            existing_incident = resp.json() if exists else None
-        except Exception as e:
-            logger.error(f"API error checking incident: {e}")
-            raise
-        
-        event_type = report.get('event_type', '')
-        event_subtype = report.get('event_subtype', '')
-        
-        # Auto-create municipality if needed
-        municipality_code = report.get('municipality')
-        if municipality_code:
-            try:
-                requests.post(
-                    f"{self.api_url}/api/lookups/municipalities/auto-create",
-                    params={'code': municipality_code},
-                    headers=self._api_headers,
-                    timeout=10
-                )
-            except Exception as e:
-                logger.warning(f"Could not auto-create municipality: {e}")
-        
-        # Build cad_units from responding units
-        cad_units = []
-        existing_units = {}
-        
-        if existing_incident and existing_incident.get('cad_units'):
-            for u in existing_incident['cad_units']:
-                existing_units[u['unit_id']] = u
+        resp = self._session.post(
+            f"{self.api_url}/api/cad/ingest",
+            json={
+                'report': report,
+                'raw_html': raw_html,
+                'timezone': self.timezone,
+            },
+            timeout=10
+        )
         
-        # Get incident date from dispatch_time
-        incident_date_str = None
-        dispatch_time_str = None
-        if report.get('dispatch_time'):
-            try:
-                dt = datetime.strptime(report['dispatch_time'], '%m-%d-%y %H:%M:%S')
-                incident_date_str = dt.strftime('%Y-%m-%d')
-                dispatch_time_str = dt.strftime('%H:%M:%S')
-            except ValueError:
-                pass
-        
-        for unit in report.get('responding_units', []):
-            unit_id = unit.get('unit_id')
-            if not unit_id:
-                continue
-            
-            # Look up unit info via API
-            unit_info = self._get_unit_info(unit_id)
-            
-            canonical_unit_id = unit_info['unit_designator'] or unit_id
-            
-            unit_dispatch_time = None
-            if unit.get('time') and incident_date_str:
-                unit_dispatch_time = self._parse_cad_time(
-                    unit.get('time'), incident_date_str, dispatch_time_str
-                )
-            
-            if canonical_unit_id in existing_units:
-                unit_data = existing_units[canonical_unit_id]
-                unit_data['is_mutual_aid'] = not unit_info['is_ours']
-                unit_data['apparatus_id'] = unit_info['apparatus_id']
-                unit_data['unit_category'] = unit_info['category']
-                unit_data['counts_for_response_times'] = unit_info['counts_for_response_times']
-            else:
-                unit_data = {
-                    'unit_id': canonical_unit_id,
-                    'station': unit.get('station'),
-                    'agency': unit.get('agency'),
-                    'is_mutual_aid': not unit_info['is_ours'],
-                    'apparatus_id': unit_info['apparatus_id'],
-                    'unit_category': unit_info['category'],
-                    'counts_for_response_times': unit_info['counts_for_response_times'],
-                    'time_dispatched': unit_dispatch_time,
-                    'time_enroute': None,
-                    'time_arrived': None,
-                    'time_available': None,
-                    'time_cleared': None,
-                }
-            
-            cad_units.append(unit_data)
+        if resp.status_code != 200:
+            logger.error(f"Failed to ingest dispatch: {resp.text}")
+            raise Exception(f"API returned {resp.status_code}: {resp.text}")
         
-        if exists:
-            # Update existing incident
-            existing_updates = existing_incident.get('cad_raw_updates') or []
-            if raw_html:
-                existing_updates.append(raw_html)
-            
-            update_data = {
-                'cad_event_type': event_type,
-                'cad_event_subtype': event_subtype,
-                'address': report.get('address'),
-                'location_name': report.get('location_name'),
-                'municipality_code': municipality_code,
-                'cross_streets': report.get('cross_streets'),
-                'esz_box': report.get('esz'),
-                'caller_name': report.get('caller_name'),
-                'caller_phone': report.get('caller_phone'),
-                'cad_units': cad_units,
-                'cad_raw_updates': existing_updates,
-            }
-            
-            resp = requests.put(
-                f"{self.api_url}/api/incidents/{existing_incident['id']}",
-                json=update_data,
-                headers=self._api_headers,
-                timeout=10
-            )
-            
-            if resp.status_code == 200:
-                logger.info(f"Updated incident {event_number} - {len(cad_units)} units")
-                self.stats['incidents_updated'] += 1
-            else:
-                logger.error(f"Failed to update incident: {resp.text}")
-                raise Exception(f"API returned {resp.status_code}: {resp.text}")
+        result = resp.json()
+        units = len(result.get('cad_units') or [])
+        if result.get('action') == 'created':
+            logger.info(f"Created incident {event_number} (ID: {result['id']}) - {units} units")
+            self.stats['incidents_created'] += 1
         else:
-            # Determine call category
-            call_category = self._determine_category(event_type, event_subtype)
-            
-            # Create new incident
-            create_data = {
-                'cad_event_number': event_number,
-                'cad_event_type': event_type,
-                'cad_event_subtype': event_subtype,
-                'call_category': call_category,
-                'address': report.get('address'),
-                'location_name': report.get('location_name'),
-                'municipality_code': municipality_code,
-                'cad_raw_dispatch': raw_html,
-            }
-            
-            # Use incident_date_str (local date) computed earlier, NOT from UTC conversion
-            if incident_date_str:
-                create_data['incident_date'] = incident_date_str
-            
-            resp = requests.post(
-                f"{self.api_url}/api/incidents",
-                json=create_data,
-                headers=self._api_headers,
-                timeout=10
-            )
-            
-            if resp.status_code == 200:
-                result = resp.json()
-                incident_id = result['id']
-                logger.info(f"Created incident {event_number} (ID: {incident_id}) - {len(cad_units)} units")
-                self.stats['incidents_created'] += 1
-                
-                # Update with full details
-                update_data = {
-                    'cross_streets': report.get('cross_streets'),
-                    'esz_box': report.get('esz'),
-                    'caller_name': report.get('caller_name'),
-                    'caller_phone': report.get('caller_phone'),
-                    'cad_units': cad_units,
-                    'dispatched_units': cad_units,  # Write-once snapshot of original dispatch units
-                }
-                
-                if report.get('dispatch_time'):
-                    update_data['time_dispatched'] = self._parse_cad_datetime(report['dispatch_time'])
-                
-                requests.put(
-                    f"{self.api_url}/api/incidents/{incident_id}",
-                    json=update_data,
-                    headers=self._api_headers,
-                    timeout=10
-                )
-            else:
-                logger.error(f"Failed to create incident: {resp.text}")
-                raise Exception(f"API returned {resp.status_code}: {resp.text}")
+            logger.info(f"Updated incident {event_number} - {units} units")
+            self.stats['incidents_updated'] += 1
     
     def _handle_clear(self, report: dict, raw_html: str = None):
         """Handle Clear Report - update fields, times, and close incident"""
@@ -548,7 +505,7 @@ class CADListener:
         
         # Get incident
         try:
-            resp = requests.get(f"{self.api_url}/api/incidents/by-cad/{event_number}", headers=self._api_headers, timeout=10)
+            resp = self._session.get(f"{self.api_url}/api/incidents/by-cad/{event_number}", timeout=10)
             if resp.status_code != 200:
                 logger.warning(f"Incident {event_number} not found - creating from CLEAR report")
                 self._create_incident_from_clear(report, raw_html)
@@ -652,10 +609,9 @@ class CADListener:
             update_data['location_name'] = report['location_name']
         if report.get('municipality'):
             try:
-                requests.post(
+                self._session.post(
                     f"{self.api_url}/api/lookups/municipalities/auto-create",
                     params={'code': report['municipality']},
-                    headers=self._api_headers,
                     timeout=10
                 )
             except:
@@ -766,10 +722,9 @@ class CADListener:
         
         # Update incident
         if update_data:
-            resp = requests.put(
+            resp = self._session.put(
                 f"{self.api_url}/api/incidents/{incident_id}",
                 json=update_data,
-                headers=self._api_headers,
                 timeout=10
             )
             if resp.status_code == 200:
@@ -778,7 +733,7 @@ class CADListener:
                 raise Exception(f"API returned {resp.status_code}: {resp.text}")
         
         # Close incident
-        resp = requests.post(f"{self.api_url}/api/incidents/{incident_id}/close", headers=self._api_headers, timeout=10)
+        resp = self._session.post(f"{self.api_url}/api/incidents/{incident_id}/close", timeout=10)
         if resp.status_code == 200:
             logger.info(f"Closed incident {event_number}")
             self.stats['incidents_closed'] += 1
@@ -828,16 +783,15 @@ class CADListener:
         
         if report.get('municipality'):
             try:
-                requests.post(
+                self._session.post(
                     f"{self.api_url}/api/lookups/municipalities/auto-create",
                     params={'code': report['municipality']},
-                    headers=self._api_headers,
                     timeout=10
                 )
             except:
                 pass
         
-        resp = requests.post(f"{self.api_url}/api/incidents", json=create_data, headers=self._api_headers, timeout=10)
+        resp = self._session.post(f"{self.api_url}/api/incidents", json=create_data, timeout=10)
         
         if resp.status_code != 200:
             raise Exception(f"API returned {resp.status_code}: {resp.text}")
@@ -910,8 +864,8 @@ class CADListener:
             if cleared_times:
                 update_data['time_last_cleared'] = max(cleared_times)
         
-        requests.put(f"{self.api_url}/api/incidents/{incident_id}", json=update_data, headers=self._api_headers, timeout=10)
-        requests.post(f"{self.api_url}/api/incidents/{incident_id}/close", headers=self._api_headers, timeout=10)
+        self._session.put(f"{self.api_url}/api/incidents/{incident_id}", json=update_data, timeout=10)
+        self._session.post(f"{self.api_url}/api/incidents/{incident_id}/close", timeout=10)
         logger.info(f"Closed incident {event_number} (created from clear)")
         self.stats['incidents_closed'] += 1
     
@@ -935,9 +889,8 @@ class CADListener:
         
         # Fetch fresh settings
         try:
-            resp = requests.get(
+            resp = self._session.get(
                 f"{self.api_url}/api/settings/cad",
-                headers=self._api_headers,
                 timeout=5
             )
             if resp.status_code == 200:
@@ -998,22 +951,6 @@ class CADListener:
         """Get configured timezone."""
         return ZoneInfo(self.timezone)
     
-    def _parse_cad_datetime(self, dt_str: str) -> Optional[str]:
-        """Parse CAD datetime (MM-DD-YY HH:MM:SS) to UTC ISO format."""
-        if not dt_str:
-            return None
-        try:
-            dt = datetime.strptime(dt_str, '%m-%d-%y %H:%M:%S')
-            local_tz = self._get_local_timezone()
-            local_dt = dt.replace(tzinfo=local_tz)
-            utc_dt = local_dt.astimezone(ZoneInfo("UTC"))
-            return utc_dt.strftime('%Y-%m-%dT%H:%M:%SZ')
-        except ValueError:
-            return self._parse_cad_time(dt_str, None, None)
-        except Exception as e:
-            logger.error(f"Error parsing datetime {dt_str}: {e}")
-            return None
-    
     def _parse_cad_time(self, time_str: str, incident_date: str = None, dispatch_time_str: str = None) -> Optional[str]:
         """Parse CAD time (HH:MM:SS) to UTC ISO format with midnight detection."""
         if not time_str:
@@ -1056,6 +993,10 @@ def main():
     parser.add_argument('--api-url', required=True, help='RunSheet API URL (e.g., https://glenmoorefc.cadreport.com)')
     parser.add_argument('--tenant', required=True, help='Tenant slug for data directory')
     parser.add_argument('--timezone', default='America/New_York', help='IANA timezone for CAD timestamps (default: America/New_York)')
+    parser.add_argument('--max-workers', type=int, default=DEFAULT_MAX_WORKERS,
+                        help=f'Connections processed concurrently (default: {DEFAULT_MAX_WORKERS})')
+    parser.add_argument('--max-inflight', type=int, default=DEFAULT_MAX_INFLIGHT,
+                        help=f'Accepted-but-unfinished connections before accept() waits (default: {DEFAULT_MAX_INFLIGHT})')
     parser.add_argument('--debug', action='store_true', help='Enable debug logging')
     args = parser.parse_args()
     
@@ -1066,7 +1007,9 @@ def main():
         port=args.port,
         api_url=args.api_url,
         tenant=args.tenant,
-        timezone=args.timezone
+        timezone=args.timezone,
+        max_workers=args.max_workers,
+        max_inflight=args.max_inflight,
     )
     
     try:
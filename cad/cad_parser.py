@@ -4,14 +4,22 @@ CAD Parser for Chester County Emergency Services HTML format
 Handles two document types:
 1. Dispatch Report - Initial alert and updates
 2. Clear Report - Incident closes, contains unit times table
+
+The HTML is parsed once into a CADDocument (cad_document.py - lxml when
+installed, BeautifulSoup html.parser otherwise). Pass the same document to
+CommentProcessor.process_clear_html() to avoid parsing the report twice.
 """
 
 import re
 from datetime import datetime
 from typing import Optional, Dict, List, Any
-from bs4 import BeautifulSoup
 from dataclasses import dataclass, field
 
+try:
+    from cad_document import CADDocument, parse_document, BR_DELIMITER
+except ImportError:
+    from .cad_document import CADDocument, parse_document, BR_DELIMITER
+
 
 @dataclass
 class UnitTimes:
@@ -112,7 +120,7 @@ def parse_phone(text: Optional[str]) -> Optional[str]:
     return match.group(0) if match else clean_text(text)
 
 
-def find_section_table(soup: BeautifulSoup, section_name: str) -> Optional[BeautifulSoup]:
+def find_section_table(doc: CADDocument, section_name: str):
     """
     Find the data table that follows a section header.
     
@@ -120,28 +128,25 @@ def find_section_table(soup: BeautifulSoup, section_name: str) -> Optional[Beaut
     <table><tr><td class="Header">Section Name</td></tr></table>
     <table class="EventInfo">...actual data...</table>
     
-    This function finds the header, then returns the NEXT sibling table.
+    Headers are indexed when the document is built, so this is a lookup,
+    not a scan of every table.
     """
-    all_tables = soup.find_all('table')
-    
-    for i, table in enumerate(all_tables):
-        header_td = table.find('td', class_='Header')
-        if header_td and section_name in header_td.get_text():
-            # Found the header, return the next table
-            if i + 1 < len(all_tables):
-                return all_tables[i + 1]
-    return None
+    return doc.section_table(section_name)
 
 
-def parse_cad_html(html: str) -> ParsedCADReport:
+def parse_cad_html(html: str, document: Optional[CADDocument] = None) -> ParsedCADReport:
     """
     Parse Chester County CAD HTML into structured data.
+    
+    Args:
+        html: Raw report HTML
+        document: Already-parsed CADDocument for this HTML (optional)
     """
-    soup = BeautifulSoup(html, 'html.parser')
+    doc = document or parse_document(html)
     
     # Determine report type from title
-    title_td = soup.find('td', class_='Title')
-    title_text = title_td.get_text() if title_td else ''
+    title_td = doc.first_td('Title')
+    title_text = doc.text(title_td) if title_td is not None else ''
     
     if 'Clear Report' in title_text:
         report_type = 'CLEAR'
@@ -152,30 +157,30 @@ def parse_cad_html(html: str) -> ParsedCADReport:
     
     # Parse based on report type
     if report_type == 'CLEAR':
-        _parse_clear_report(soup, report)
+        _parse_clear_report(doc, report)
     else:
-        _parse_dispatch_report(soup, report)
+        _parse_dispatch_report(doc, report)
     
     # Parse sections by finding the right tables
-    _parse_location_section(soup, report)
-    _parse_caller_section(soup, report)
-    _parse_comments(soup, report)
+    _parse_location_section(doc, report)
+    _parse_caller_section(doc, report)
+    _parse_comments(doc, report)
     
     return report
 
 
-def _parse_dispatch_report(soup: BeautifulSoup, report: ParsedCADReport):
+def _parse_dispatch_report(doc: CADDocument, report: ParsedCADReport):
     """Parse Dispatch Report specific fields from the top EventInfo table"""
     
     # The first EventInfo table has event details
-    first_event_info = soup.find('table', class_='EventInfo')
-    if first_event_info:
-        rows = first_event_info.find_all('tr')
+    first_event_info = doc.first_table('EventInfo')
+    if first_event_info is not None:
+        rows = doc.rows(first_event_info)
         for row in rows:
-            cells = row.find_all('td')
+            cells = doc.cells(row)
             for i in range(0, len(cells) - 1, 2):
-                label = clean_text(cells[i].get_text())
-                value = clean_text(cells[i + 1].get_text()) if i + 1 < len(cells) else None
+                label = clean_text(doc.text(cells[i]))
+                value = clean_text(doc.text(cells[i + 1])) if i + 1 < len(cells) else None
                 
                 if not label:
                     continue
@@ -196,35 +201,35 @@ def _parse_dispatch_report(soup: BeautifulSoup, report: ParsedCADReport):
                     report.dispatch_group = value
     
     # Parse responding units from EventUnits table
-    units_table = soup.find('table', class_='EventUnits')
-    if units_table:
-        rows = units_table.find_all('tr')
+    units_table = doc.first_table('EventUnits')
+    if units_table is not None:
+        rows = doc.rows(units_table)
         for row in rows[1:]:  # Skip header
-            cells = row.find_all('td')
+            cells = doc.cells(row)
             if len(cells) >= 3:
                 unit = {
-                    'unit_id': clean_text(cells[0].get_text()),
-                    'station': clean_text(cells[1].get_text()) if len(cells) > 1 else None,
-                    'agency': clean_text(cells[2].get_text()) if len(cells) > 2 else None,
-                    'status': clean_text(cells[3].get_text()) if len(cells) > 3 else None,
-                    'time': clean_text(cells[4].get_text()) if len(cells) > 4 else None,
+                    'unit_id': clean_text(doc.text(cells[0])),
+                    'station': clean_text(doc.text(cells[1])) if len(cells) > 1 else None,
+                    'agency': clean_text(doc.text(cells[2])) if len(cells) > 2 else None,
+                    'status': clean_text(doc.text(cells[3])) if len(cells) > 3 else None,
+                    'time': clean_text(doc.text(cells[4])) if len(cells) > 4 else None,
                 }
                 if unit['unit_id']:
                     report.responding_units.append(unit)
 
 
-def _parse_clear_report(soup: BeautifulSoup, report: ParsedCADReport):
+def _parse_clear_report(doc: CADDocument, report: ParsedCADReport):
     """Parse Clear Report specific fields"""
     
     # Find the twoCol table with event summary
-    twocol_table = soup.find('table', class_='twoCol')
-    if twocol_table:
-        rows = twocol_table.find_all('tr')
+    twocol_table = doc.first_table('twoCol')
+    if twocol_table is not None:
+        rows = doc.rows(twocol_table)
         for row in rows:
-            cells = row.find_all('td')
+            cells = doc.cells(row)
             for i in range(0, len(cells) - 1, 2):
-                label = clean_text(cells[i].get_text())
-                value = clean_text(cells[i + 1].get_text()) if i + 1 < len(cells) else None
+                label = clean_text(doc.text(cells[i]))
+                value = clean_text(doc.text(cells[i + 1])) if i + 1 < len(cells) else None
                 
                 if not label:
                     continue
@@ -251,21 +256,21 @@ def _parse_clear_report(soup: BeautifulSoup, report: ParsedCADReport):
                     report.report_time = value
     
     # Parse unit times from UnitTimes table
-    times_table = soup.find('table', class_='UnitTimes')
-    if times_table:
-        rows = times_table.find_all('tr', class_='datarow')
+    times_table = doc.first_table('UnitTimes')
+    if times_table is not None:
+        rows = doc.rows(times_table, 'datarow')
         for row in rows:
-            cells = row.find_all('td')
+            cells = doc.cells(row)
             if len(cells) >= 8:
                 unit_times = UnitTimes(
-                    unit_id=clean_text(cells[0].get_text()),
-                    time_dispatched=clean_text(cells[1].get_text()) or None,
-                    time_enroute=clean_text(cells[2].get_text()) or None,
-                    time_arrived=clean_text(cells[3].get_text()) or None,
-                    time_transport=clean_text(cells[4].get_text()) or None,
-                    time_transport_arrive=clean_text(cells[5].get_text()) or None,
-                    time_available=clean_text(cells[6].get_text()) or None,
-                    time_at_quarters=clean_text(cells[7].get_text()) or None,
+                    unit_id=clean_text(doc.text(cells[0])),
+                    time_dispatched=clean_text(doc.text(cells[1])) or None,
+                    time_enroute=clean_text(doc.text(cells[2])) or None,
+                    time_arrived=clean_text(doc.text(cells[3])) or None,
+                    time_transport=clean_text(doc.text(cells[4])) or None,
+                    time_transport_arrive=clean_text(doc.text(cells[5])) or None,
+                    time_available=clean_text(doc.text(cells[6])) or None,
+                    time_at_quarters=clean_text(doc.text(cells[7])) or None,
                 )
                 if unit_times.unit_id:
                     report.unit_times.append(unit_times)
@@ -291,7 +296,7 @@ def _has_road_suffix(text: str) -> bool:
     return any(w in ROAD_SUFFIXES for w in words)
 
 
-def _split_address_location(cell) -> tuple:
+def _split_address_location(doc: CADDocument, cell) -> tuple:
     """
     Split a CAD address cell into (address, location_name).
     
@@ -308,15 +313,12 @@ def _split_address_location(cell) -> tuple:
     
     Returns (address, location_name) tuple.
     """
-    if not cell:
+    if cell is None:
         return (None, None)
     
     # Get raw lines split by <br> tags
-    # Replace <br> with a unique delimiter, then split
-    for br in cell.find_all('br'):
-        br.replace_with('|||BR|||')
-    raw_text = cell.get_text()
-    lines = [l.strip() for l in raw_text.split('|||BR|||') if l.strip()]
+    raw_text = doc.br_text(cell)
+    lines = [l.strip() for l in raw_text.split(BR_DELIMITER) if l.strip()]
     
     if not lines:
         return (None, None)
@@ -345,65 +347,65 @@ def _split_address_location(cell) -> tuple:
         return (line2, line1)
 
 
-def _parse_location_section(soup: BeautifulSoup, report: ParsedCADReport):
+def _parse_location_section(doc: CADDocument, report: ParsedCADReport):
     """Parse the Location section - finds header then parses next table"""
     
-    location_table = find_section_table(soup, 'Location')
-    if not location_table:
+    location_table = find_section_table(doc, 'Location')
+    if location_table is None:
         return
     
-    rows = location_table.find_all('tr')
+    rows = doc.rows(location_table)
     for row in rows:
-        cells = row.find_all('td')
+        cells = doc.cells(row)
         if len(cells) < 2:
             continue
         
-        label = clean_text(cells[0].get_text())
+        label = clean_text(doc.text(cells[0]))
         if not label:
             continue
         
         # Get value - split address/location_name for two-line CAD addresses
         if label == 'Address:':
-            report.address, report.location_name = _split_address_location(cells[1])
+            report.address, report.location_name = _split_address_location(doc, cells[1])
         elif 'Location Info' in label:
-            report.location_info = clean_text(cells[1].get_text())
+            report.location_info = clean_text(doc.text(cells[1]))
         elif 'Cross Street' in label:
-            report.cross_streets = clean_text(cells[1].get_text())
+            report.cross_streets = clean_text(doc.text(cells[1]))
         elif label == 'Municipality:':
-            report.municipality = clean_text(cells[1].get_text())
+            report.municipality = clean_text(doc.text(cells[1]))
             # ESZ is in same row, different cells
             for i, cell in enumerate(cells):
-                cell_text = cell.get_text()
+                cell_text = doc.text(cell)
                 if 'ESZ' in cell_text:
                     if i + 1 < len(cells):
-                        report.esz = clean_text(cells[i + 1].get_text())
+                        report.esz = clean_text(doc.text(cells[i + 1]))
         elif 'Development' in label:
-            report.development = clean_text(cells[1].get_text())
+            report.development = clean_text(doc.text(cells[1]))
             # Beat is in same row
             for i, cell in enumerate(cells):
-                cell_text = cell.get_text()
+                cell_text = doc.text(cell)
                 if 'Beat' in cell_text:
                     if i + 1 < len(cells):
-                        report.beat = clean_text(cells[i + 1].get_text())
+                        report.beat = clean_text(doc.text(cells[i + 1]))
 
 
-def _parse_caller_section(soup: BeautifulSoup, report: ParsedCADReport):
+def _parse_caller_section(doc: CADDocument, report: ParsedCADReport):
     """Parse the Caller Information section"""
     
-    caller_table = find_section_table(soup, 'Caller')
-    if not caller_table:
+    caller_table = find_section_table(doc, 'Caller')
+    if caller_table is None:
         return
     
-    rows = caller_table.find_all('tr')
+    rows = doc.rows(caller_table)
     for row in rows:
-        cells = row.find_all('td')
+        cells = doc.cells(row)
         if len(cells) < 2:
             continue
         
         # Process cells in pairs (label, value)
         for i in range(0, len(cells) - 1, 2):
-            label = clean_text(cells[i].get_text())
-            value = clean_text(cells[i + 1].get_text()) if i + 1 < len(cells) else None
+            label = clean_text(doc.text(cells[i]))
+            value = clean_text(doc.text(cells[i + 1])) if i + 1 < len(cells) else None
             
             if not label:
                 continue
@@ -418,21 +420,17 @@ def _parse_caller_section(soup: BeautifulSoup, report: ParsedCADReport):
                 report.caller_source = value
 
 
-def _parse_comments(soup: BeautifulSoup, report: ParsedCADReport):
+def _parse_comments(doc: CADDocument, report: ParsedCADReport):
     """Parse event comments"""
     
-    for table in soup.find_all('table'):
-        rows = table.find_all('tr')
-        for row in rows:
-            cells = row.find_all('td', class_='EventComment')
-            if len(cells) >= 3:
-                comment = {
-                    'time': clean_text(cells[0].get_text()),
-                    'operator': clean_text(cells[1].get_text()),
-                    'text': clean_text(cells[2].get_text()),
-                }
-                if comment['text']:
-                    report.event_comments.append(comment)
+    for cells in doc.comment_rows():
+        comment = {
+            'time': clean_text(doc.text(cells[0])),
+            'operator': clean_text(doc.text(cells[1])),
+            'text': clean_text(doc.text(cells[2])),
+        }
+        if comment['text']:
+            report.event_comments.append(comment)
 
 
 def report_to_dict(report: ParsedCADReport) -> Dict[str, Any]:
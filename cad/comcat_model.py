@@ -2,6 +2,8 @@
 ComCat ML Model - Random Forest Comment Categorizer
 Created: 2025-12-31
 Updated: 2025-12-31 - v2.0: Added operator_type as ML feature
+Updated: 2026-10 - Batched inference + prediction LRU cache
+Updated: 2026-10 - Atomic model file replace + hot-swap in get_model()
 
 Uses scikit-learn Random Forest with combined features:
 - TF-IDF for text (unigrams + bigrams)  
@@ -19,9 +21,33 @@ Usage:
     
     category, confidence = model.predict("HOUSE ON FIRE", "CALLTAKER")
     # -> ("CALLER", 0.92)
+
+    # One vectorized call per report (what comment_processor uses)
+    results = model.predict_batch([("HOUSE ON FIRE", "CALLTAKER"), ...])
+
+Inference:
+    predict() / predict_batch() share an LRU cache keyed by
+    (normalized text, operator_type) - dispatcher boilerplate ("Command
+    Established", "ENROUTE", ...) repeats on nearly every incident. Misses
+    are de-duplicated and scored in one TF-IDF transform + predict_proba.
+    Batches below PARALLEL_BATCH_MIN run the forest single-threaded; joblib
+    worker startup costs far more than 100 trees on a few dozen rows.
+
+Hot-swap:
+    save() writes a temp file and os.replace()s it over MODEL_FILE, so
+    readers only ever see a complete pickle. get_model() re-checks the file
+    every MODEL_RELOAD_INTERVAL seconds and, when it changed (a retrain in
+    any worker or process), loads it into a NEW instance and swaps the
+    module reference. Callers already holding the old instance finish on it.
 """
 
 import logging
+import os
+import re
+import tempfile
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
 from typing import Tuple, Optional, List, Dict, Any
 import pickle
@@ -35,6 +61,7 @@ try:
     from sklearn.preprocessing import OneHotEncoder
     from sklearn.compose import ColumnTransformer
     from sklearn.base import BaseEstimator, TransformerMixin
+    from joblib import parallel_backend
     import numpy as np
     from scipy.sparse import hstack
     SKLEARN_AVAILABLE = True
@@ -74,9 +101,34 @@ RF_PARAMS = {
     "min_samples_split": 2,
     "min_samples_leaf": 1,
     "random_state": 42,
-    "n_jobs": -1,
+    "n_jobs": -1,  # training only - see _set_inference_jobs()
 }
 
+# Batches at least this large use all cores for predict_proba; smaller
+# batches (a single report's comments) stay single-threaded
+PARALLEL_BATCH_MIN = 500
+
+# Cached (category, confidence) results per (normalized text, operator_type)
+PREDICTION_CACHE_SIZE = 4096
+
+# How often get_model() checks MODEL_FILE for a newer model (seconds)
+MODEL_RELOAD_INTERVAL = 10
+
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Cache key form of a comment. TF-IDF lowercases and tokenizes on word
+    boundaries, so case and whitespace runs never change the prediction.
+    """
+    return _WHITESPACE_RE.sub(" ", (text or "").strip()).lower()
+
+
+def normalize_operator_type(operator_type: Optional[str]) -> str:
+    """Operator types the featurizer doesn't know are encoded as UNKNOWN."""
+    return operator_type if operator_type in VALID_OPERATOR_TYPES else "UNKNOWN"
+
 
 # =============================================================================
 # CUSTOM TRANSFORMER FOR COMBINED FEATURES
@@ -160,6 +212,12 @@ class ComCatModel:
         self.training_stats: Dict[str, Any] = {}
         self.model_version = "2.0"
         
+        # LRU of (normalized text, operator_type) -> (category, confidence)
+        self._cache: "OrderedDict[Tuple[str, str], Tuple[str, float]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
         if not SKLEARN_AVAILABLE:
             logger.warning("scikit-learn not available - ML features disabled")
     
@@ -228,6 +286,9 @@ class ComCatModel:
             except Exception as e:
                 logger.warning(f"Cross-validation failed: {e}")
         
+        self._set_inference_jobs()
+        self.clear_cache()
+        
         seed_count = len(seed_examples) if include_seeds else 0
         
         self.training_stats = {
@@ -260,31 +321,15 @@ class ComCatModel:
         Returns:
             Tuple of (category, confidence)
         """
-        if not self.is_trained or self.featurizer is None or self.classifier is None:
-            return None, 0.0
-        
-        if not SKLEARN_AVAILABLE:
-            return None, 0.0
-        
-        try:
-            X = [(text, operator_type)]
-            X_features = self.featurizer.transform(X)
-            
-            proba = self.classifier.predict_proba(X_features)[0]
-            max_idx = np.argmax(proba)
-            category = self.classifier.classes_[max_idx]
-            confidence = float(proba[max_idx])
-            
-            return category, confidence
-            
-        except Exception as e:
-            logger.error(f"Prediction failed: {e}")
-            return None, 0.0
+        return self.predict_batch([(text, operator_type)])[0]
     
     def predict_batch(self, items: List[Tuple[str, str]]) -> List[Tuple[str, float]]:
         """
         Predict categories for multiple comments.
         
+        Cached items are answered from the LRU; the remaining unique
+        (text, operator_type) pairs are scored in one vectorized call.
+        
         Args:
             items: List of (text, operator_type) tuples
             
@@ -297,22 +342,81 @@ class ComCatModel:
         if not SKLEARN_AVAILABLE:
             return [(None, 0.0) for _ in items]
         
-        try:
-            X_features = self.featurizer.transform(items)
-            probas = self.classifier.predict_proba(X_features)
-            
-            results = []
-            for proba in probas:
-                max_idx = np.argmax(proba)
-                category = self.classifier.classes_[max_idx]
-                confidence = float(proba[max_idx])
-                results.append((category, confidence))
-            
-            return results
+        keys = [(normalize_text(text), normalize_operator_type(op)) for text, op in items]
+        results: Dict[Tuple[str, str], Tuple[str, float]] = {}
+        misses: List[Tuple[str, str]] = []
+        
+        with self._cache_lock:
+            for key in keys:
+                if key in results:
+                    continue
+                cached = self._cache.get(key)
+                if cached is not None:
+                    self._cache.move_to_end(key)
+                    results[key] = cached
+                    self.cache_hits += 1
+                else:
+                    results[key] = None
+                    misses.append(key)
+                    self.cache_misses += 1
+        
+        if misses:
+            try:
+                predicted = self._predict_uncached(misses)
+            except Exception as e:
+                logger.error(f"Batch prediction failed: {e}")
+                return [(None, 0.0) for _ in items]
             
-        except Exception as e:
-            logger.error(f"Batch prediction failed: {e}")
-            return [(None, 0.0) for _ in items]
+            with self._cache_lock:
+                for key, value in zip(misses, predicted):
+                    results[key] = value
+                    self._cache[key] = value
+                    self._cache.move_to_end(key)
+                while len(self._cache) > PREDICTION_CACHE_SIZE:
+                    self._cache.popitem(last=False)
+        
+        return [results[key] for key in keys]
+    
+    def _predict_uncached(self, keys: List[Tuple[str, str]]) -> List[Tuple[str, float]]:
+        """One TF-IDF transform + predict_proba over unique normalized keys."""
+        X_features = self.featurizer.transform(keys)
+        
+        if len(keys) >= PARALLEL_BATCH_MIN:
+            with parallel_backend("threading", n_jobs=-1):
+                probas = self.classifier.predict_proba(X_features)
+        else:
+            probas = self.classifier.predict_proba(X_features)
+        
+        max_idx = np.argmax(probas, axis=1)
+        classes = self.classifier.classes_
+        return [
+            (classes[idx], float(probas[row, idx]))
+            for row, idx in enumerate(max_idx)
+        ]
+    
+    def _set_inference_jobs(self):
+        """
+        Let predict_proba follow the active joblib backend (single-threaded by
+        default) instead of the n_jobs=-1 the forest was trained with.
+        Models pickled before this change still carry n_jobs=-1.
+        """
+        if self.classifier is not None:
+            self.classifier.n_jobs = None
+    
+    def clear_cache(self):
+        """Drop cached predictions (after training or loading a new model)."""
+        with self._cache_lock:
+            self._cache.clear()
+    
+    def cache_info(self) -> Dict[str, int]:
+        """Prediction cache counters."""
+        with self._cache_lock:
+            return {
+                "size": len(self._cache),
+                "max_size": PREDICTION_CACHE_SIZE,
+                "hits": self.cache_hits,
+                "misses": self.cache_misses,
+            }
     
     def needs_review(self, confidence: float) -> bool:
         """Check if prediction needs officer review."""
@@ -336,8 +440,18 @@ class ComCatModel:
                 "version": self.model_version,
             }
             
-            with open(save_path, 'wb') as f:
-                pickle.dump(save_data, f)
+            # Write beside the target, then atomically replace it - other
+            # workers reloading the model never read a half-written file
+            fd, tmp_path = tempfile.mkstemp(
+                dir=save_path.parent, prefix=save_path.name, suffix=".tmp"
+            )
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    pickle.dump(save_data, f)
+                os.replace(tmp_path, save_path)
+            except BaseException:
+                os.unlink(tmp_path)
+                raise
             
             logger.info(f"Model v{self.model_version} saved to {save_path}")
             return True
@@ -360,6 +474,8 @@ class ComCatModel:
                 self.training_stats = save_data.get("training_stats", {})
                 self.model_version = save_data.get("version", "1.0")
                 self.is_trained = self.featurizer is not None and self.classifier is not None
+                self._set_inference_jobs()
+                self.clear_cache()
                 
                 logger.info(f"Model v{self.model_version} loaded from {load_path}")
                 return self.is_trained
@@ -412,17 +528,63 @@ class ComCatModel:
 # =============================================================================
 
 _model_instance: Optional[ComCatModel] = None
+_model_file_signature: Optional[Tuple[int, int]] = None  # (mtime_ns, size) it was loaded from
+_model_checked_at = 0.0
+_model_lock = threading.Lock()
+
+
+def _file_signature(path: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = path.stat()
+        return st.st_mtime_ns, st.st_size
+    except OSError:
+        return None
+
+
+def _install_model(model: ComCatModel):
+    """Swap the process-wide model reference (caller holds _model_lock)."""
+    global _model_instance, _model_file_signature, _model_checked_at
+    _model_instance = model
+    _model_file_signature = _file_signature(model.model_path)
+    _model_checked_at = time.monotonic()
 
 
 def get_model() -> ComCatModel:
-    """Get singleton model instance."""
-    global _model_instance
-    
-    if _model_instance is None:
-        _model_instance = ComCatModel()
-        _model_instance.load()
+    """
+    Get the current model instance.
     
-    return _model_instance
+    Every MODEL_RELOAD_INTERVAL seconds, compares MODEL_FILE with the file
+    the current instance was loaded from; a newer file (saved by a retrain
+    in another worker) is loaded into a fresh instance and swapped in.
+    """
+    global _model_checked_at
+    
+    model = _model_instance
+    if model is not None and time.monotonic() - _model_checked_at < MODEL_RELOAD_INTERVAL:
+        return model
+    
+    with _model_lock:
+        if _model_instance is not None:
+            if time.monotonic() - _model_checked_at < MODEL_RELOAD_INTERVAL:
+                return _model_instance
+            signature = _file_signature(_model_instance.model_path)
+            if signature is None or signature == _model_file_signature:
+                _model_checked_at = time.monotonic()
+                return _model_instance
+        
+        new_model = ComCatModel()
+        new_model.load()
+        
+        if _model_instance is not None:
+            if not new_model.is_trained:
+                # Unreadable file - keep serving the model we have
+                _model_checked_at = time.monotonic()
+                return _model_instance
+            logger.info(f"ComCat model reloaded from {new_model.model_path} "
+                        f"(trained {new_model.training_stats.get('trained_at')})")
+        
+        _install_model(new_model)
+        return new_model
 
 
 def predict_category(text: str, operator_type: str = "UNKNOWN") -> Tuple[Optional[str], float]:
@@ -435,19 +597,22 @@ def retrain_model(officer_examples: List[Tuple[str, str, str]]) -> Dict[str, Any
     """
     Retrain model with officer corrections.
     
+    Trains a new instance off to the side, saves it (atomic file replace),
+    then swaps it in - predictions keep using the old model until then.
+    Other workers pick the new file up through get_model().
+    
     Args:
         officer_examples: List of (text, operator_type, category) tuples
         
     Returns:
         Training statistics
     """
-    global _model_instance
-    
-    if _model_instance is None:
-        _model_instance = ComCatModel()
+    model = ComCatModel()
+    stats = model.train(officer_examples, include_seeds=True)
+    model.save()
     
-    stats = _model_instance.train(officer_examples, include_seeds=True)
-    _model_instance.save()
+    with _model_lock:
+        _install_model(model)
     
     return stats
 
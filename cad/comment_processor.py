@@ -26,7 +26,11 @@ import logging
 from datetime import datetime, date
 from typing import List, Dict, Optional, Any, Tuple
 from dataclasses import dataclass, field, asdict
-from bs4 import BeautifulSoup
+
+try:
+    from cad_document import CADDocument, parse_document
+except ImportError:
+    from .cad_document import CADDocument, parse_document
 
 logger = logging.getLogger(__name__)
 
@@ -284,62 +288,114 @@ CREW_COUNT_PATTERN = re.compile(r'Enroute with a crew of\s*(\d+)', re.IGNORECASE
 # ML MODEL INTEGRATION (v2 - with operator_type)
 # =============================================================================
 
-# ML model - lazy loaded
+# ML model - lazy loaded. comcat_model.get_model() hot-swaps the instance
+# after a retrain, so it is asked again for every report.
 _ml_model = None
 _ml_available = False
+_ml_get_model = None
+_ml_import_failed = False
 
 
 def _get_ml_model():
     """
-    Lazy load the ML model.
+    Current ML model (lazy loaded on first use).
     Returns None if ML is not available (scikit-learn not installed).
     """
-    global _ml_model, _ml_available
+    global _ml_model, _ml_available, _ml_get_model, _ml_import_failed
     
-    if _ml_model is not None:
-        return _ml_model
+    if _ml_import_failed:
+        return None
     
     try:
-        from .comcat_model import get_model
-        _ml_model = get_model()
-        _ml_available = _ml_model.is_trained
-        if _ml_available:
-            logger.info(f"ComCat ML model v{_ml_model.model_version} loaded successfully")
-        else:
-            logger.warning("ComCat ML model not trained - categories may be inaccurate")
+        if _ml_get_model is None:
+            from .comcat_model import get_model
+            _ml_get_model = get_model
+        model = _ml_get_model()
     except ImportError as e:
         logger.warning(f"ComCat ML not available: {e}")
+        _ml_import_failed = True
         _ml_available = False
+        return None
     except Exception as e:
         logger.error(f"Failed to load ComCat ML model: {e}")
         _ml_available = False
+        return _ml_model
+    
+    if model is not _ml_model:
+        _ml_model = model
+        _ml_available = model.is_trained
+        if _ml_available:
+            logger.info(f"ComCat ML model v{model.model_version} loaded successfully")
+        else:
+            logger.warning("ComCat ML model not trained - categories may be inaccurate")
     
     return _ml_model
 
 
-def _predict_category_ml(text: str, operator_type: str = "UNKNOWN") -> Tuple[Optional[str], Optional[float]]:
+def _predict_categories_ml(items: List[Tuple[str, str]]) -> List[Tuple[Optional[str], Optional[float]]]:
     """
-    Get ML prediction for comment category.
+    Get ML predictions for all of a report's comments in one batch.
     
-    v2: Now includes operator_type as a feature for context-aware predictions.
+    v2: Includes operator_type as a feature for context-aware predictions.
+    The model answers repeated boilerplate from its LRU cache and scores the
+    rest in a single vectorized call (see ComCatModel.predict_batch).
     
     Args:
-        text: Comment text
-        operator_type: Who entered it (CALLTAKER, DISPATCHER, UNIT, SYSTEM, UNKNOWN)
+        items: List of (text, operator_type) tuples
     
     Returns:
-        (category, confidence) or (None, None) if ML unavailable
+        List of (category, confidence), (None, None) where ML is unavailable
     """
+    if not items:
+        return []
+    
     model = _get_ml_model()
     if model is None or not _ml_available:
-        return None, None
+        return [(None, None)] * len(items)
     
     try:
-        category, confidence = model.predict(text, operator_type)
-        return category, confidence
+        return model.predict_batch(items)
     except Exception as e:
         logger.error(f"ML prediction failed: {e}")
-        return None, None
+        return [(None, None)] * len(items)
+
+
+def _categorize_comments(items: List[Tuple[str, str]], use_ml: bool = True) -> List[Tuple[str, str, Optional[float]]]:
+    """
+    Categorize comments using ML with text + operator_type features.
+    
+    v2.0: Pure ML - no hardcoded pattern rules. The model learns from
+    officer corrections, considering both the comment text and who
+    entered it (calltaker, dispatcher, unit, etc).
+    
+    Args:
+        items: List of (text, operator_type) tuples
+        use_ml: Whether to use ML (False -> everything is FALLBACK)
+    
+    Returns:
+        List of (category, source, confidence)
+        - source: "ML" or "FALLBACK" (if ML unavailable)
+        - confidence: float for ML, None for fallback
+    """
+    predictions = _predict_categories_ml(items) if use_ml else [(None, None)] * len(items)
+    
+    results = []
+    for ml_category, ml_confidence in predictions:
+        if ml_category is not None:
+            results.append((ml_category, "ML", ml_confidence))
+        else:
+            # Fallback to OTHER only if ML unavailable
+            results.append(("OTHER", "FALLBACK", None))
+    return results
+
+
+def _apply_categories(comments: List[ParsedComment], use_ml: bool = True):
+    """Set category / source / confidence on a report's parsed comments (one batch)."""
+    categorized = _categorize_comments([(c.text, c.operator_type) for c in comments], use_ml)
+    for comment, (category, source, confidence) in zip(comments, categorized):
+        comment.category = category
+        comment.category_source = source
+        comment.category_confidence = confidence
 
 
 # =============================================================================
@@ -358,6 +414,9 @@ class CommentProcessor:
         processor = CommentProcessor()
         result = processor.process_clear_html(raw_html, incident_date)
         # result.to_dict() -> JSONB for cad_event_comments column
+    
+    Pass document= (the CADDocument cad_parser already built) to skip
+    parsing the HTML a second time.
     """
     
     def __init__(self, use_ml: bool = True):
@@ -370,13 +429,15 @@ class CommentProcessor:
         self.result = ProcessedComments()
         self.use_ml = use_ml
     
-    def process_clear_html(self, html: str, incident_date: Optional[date] = None) -> ProcessedComments:
+    def process_clear_html(self, html: str, incident_date: Optional[date] = None,
+                           document: Optional[CADDocument] = None) -> ProcessedComments:
         """
         Process a CAD Clear Report HTML to extract event comments.
         
         Args:
             html: Raw HTML from CAD Clear Report
             incident_date: Date of incident for timestamp conversion
+            document: Already-parsed CADDocument for this HTML (optional)
             
         Returns:
             ProcessedComments object ready for JSONB storage
@@ -388,10 +449,10 @@ class CommentProcessor:
         if not html:
             return self.result
             
-        soup = BeautifulSoup(html, 'html.parser')
+        doc = document or parse_document(html)
         
         # Parse comments from EventComments table
-        self._parse_comments(soup, incident_date)
+        self._parse_comments(doc, incident_date)
         
         # Detect tactical timestamps
         self._detect_timestamps()
@@ -401,61 +462,28 @@ class CommentProcessor:
         
         return self.result
     
-    def _parse_comments(self, soup: BeautifulSoup, incident_date: Optional[date]):
-        """Extract all event comments from HTML"""
-        for table in soup.find_all('table'):
-            # Look for EventComments table
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all('td', class_='EventComment')
-                if len(cells) >= 3:
-                    time_str = self._clean_text(cells[0].get_text())
-                    operator = self._clean_text(cells[1].get_text())
-                    text = self._clean_text(cells[2].get_text())
-                    
-                    if not text:
-                        continue
-                    
-                    # Get category with source tracking
-                    category, source, confidence = self._categorize_comment(text, operator)
-                    
-                    comment = ParsedComment(
-                        time=time_str,
-                        time_iso=self._to_iso_time(time_str, incident_date),
-                        operator=operator,
-                        operator_type=self._detect_operator_type(operator),
-                        text=text,
-                        is_noise=self._is_noise(text),
-                        category=category,
-                        category_source=source,
-                        category_confidence=confidence
-                    )
-                    
-                    self.result.comments.append(comment)
-    
-    def _categorize_comment(self, text: str, operator: str) -> Tuple[str, str, Optional[float]]:
-        """
-        Categorize a comment using ML with text + operator_type features.
-        
-        v2.0: Pure ML - no hardcoded pattern rules. The model learns from
-        officer corrections, considering both the comment text and who
-        entered it (calltaker, dispatcher, unit, etc).
-        
-        Returns:
-            (category, source, confidence)
-            - source: "ML" or "FALLBACK" (if ML unavailable)
-            - confidence: float for ML, None for fallback
-        """
-        operator_type = self._detect_operator_type(operator)
-        
-        # Use ML for all categorization
-        if self.use_ml:
-            ml_category, ml_confidence = _predict_category_ml(text, operator_type)
-            if ml_category is not None:
-                return ml_category, "ML", ml_confidence
+    def _parse_comments(self, doc: CADDocument, incident_date: Optional[date]):
+        """Extract all event comments from HTML, categorized in one ML batch"""
+        for cells in doc.comment_rows():
+            time_str = self._clean_text(doc.text(cells[0]))
+            operator = self._clean_text(doc.text(cells[1]))
+            text = self._clean_text(doc.text(cells[2]))
+            
+            if not text:
+                continue
+            
+            comment = ParsedComment(
+                time=time_str,
+                time_iso=self._to_iso_time(time_str, incident_date),
+                operator=operator,
+                operator_type=self._detect_operator_type(operator),
+                text=text,
+                is_noise=self._is_noise(text),
+            )
+            
+            self.result.comments.append(comment)
         
-        # Fallback to OTHER only if ML unavailable
-        return "OTHER", "FALLBACK", None
+        _apply_categories(self.result.comments, self.use_ml)
     
     def _detect_timestamps(self):
         """Scan comments for tactical timestamps and suggest NERIS mappings"""
@@ -555,7 +583,8 @@ class CommentProcessor:
 # HELPER FUNCTIONS
 # =============================================================================
 
-def process_cad_clear(html: str, incident_date: Optional[date] = None, use_ml: bool = True) -> Dict[str, Any]:
+def process_cad_clear(html: str, incident_date: Optional[date] = None, use_ml: bool = True,
+                      document: Optional[CADDocument] = None) -> Dict[str, Any]:
     """
     Convenience function to process CAD clear HTML and return dict.
     
@@ -563,12 +592,13 @@ def process_cad_clear(html: str, incident_date: Optional[date] = None, use_ml: b
         html: Raw HTML from CAD Clear Report
         incident_date: Date of incident
         use_ml: Whether to use ML for categorization (default: True)
+        document: Already-parsed CADDocument for this HTML (optional)
         
     Returns:
         Dictionary ready for JSONB storage in cad_event_comments
     """
     processor = CommentProcessor(use_ml=use_ml)
-    result = processor.process_clear_html(html, incident_date)
+    result = processor.process_clear_html(html, incident_date, document=document)
     return result.to_dict()
 
 
@@ -794,11 +824,6 @@ def process_clear_report_comments(
                 is_noise = True
                 break
         
-        # Categorize using hybrid approach
-        category, category_source, category_confidence = _categorize_comment_standalone(
-            text, operator, operator_type, use_ml
-        )
-        
         parsed = ParsedComment(
             time=time_str,
             time_iso=time_iso,
@@ -806,12 +831,12 @@ def process_clear_report_comments(
             operator_type=operator_type,
             text=text,
             is_noise=is_noise,
-            category=category,
-            category_source=category_source,
-            category_confidence=category_confidence
         )
         result.comments.append(parsed)
     
+    # Categorize all comments in one ML batch
+    _apply_categories(result.comments, use_ml)
+    
     # Detect tactical timestamps
     seen_types = set()
     for comment in result.comments:
@@ -874,26 +899,3 @@ def process_clear_report_comments(
         'crew_counts': crew_counts,
     }
 
-
-def _categorize_comment_standalone(
-    text: str, 
-    operator: str, 
-    operator_type: str,
-    use_ml: bool = True
-) -> Tuple[str, str, Optional[float]]:
-    """
-    Standalone categorization using pure ML.
-    
-    v2.0: No hardcoded rules - ML learns from text + operator_type.
-    
-    Returns:
-        (category, source, confidence)
-    """
-    # Use ML for all categorization
-    if use_ml:
-        ml_category, ml_confidence = _predict_category_ml(text, operator_type)
-        if ml_category is not None:
-            return ml_category, "ML", ml_confidence
-    
-    # Fallback to OTHER only if ML unavailable
-    return "OTHER", "FALLBACK", None
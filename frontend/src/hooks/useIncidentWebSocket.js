@@ -5,6 +5,12 @@
  * - Automatic connection to /ws/incidents
  * - Reconnection with exponential backoff
  * - Ping/pong keepalive
+ * - Revisioned incident deltas (backend/incident_events.py): JSON-patch
+ *   events are applied to the last snapshot seen for the incident; on a
+ *   revision gap or a "stale" event the hook asks the server for a resync
+ *   instead of every tab re-fetching the incident. Callbacks receive the
+ *   patched snapshot; only when the server has none to resync from does
+ *   onResyncFailed(incidentId) fire, so the caller can GET the incident.
  */
 
 import { useEffect, useRef, useState } from 'react';
@@ -14,10 +20,40 @@ const WS_RECONNECT_MAX_DELAY = 30000;
 const WS_PING_INTERVAL = 25000;
 const WS_PONG_TIMEOUT = 10000;
 
+const decodePointer = (path) =>
+  path.split('/').slice(1).map(seg => seg.replace(/~1/g, '/').replace(/~0/g, '~'));
+
+/**
+ * Apply JSON-patch ops (add / replace / remove) to a copy of doc.
+ * Returns null if an op's parent path doesn't exist.
+ */
+function applyPatch(doc, ops) {
+  const result = structuredClone(doc);
+  for (const op of ops) {
+    const keys = decodePointer(op.path);
+    const last = keys.pop();
+    let parent = result;
+    for (const key of keys) {
+      parent = parent?.[key];
+    }
+    if (parent === null || typeof parent !== 'object') return null;
+    if (op.op === 'remove') {
+      if (Array.isArray(parent)) parent.splice(Number(last), 1);
+      else delete parent[last];
+    } else if (Array.isArray(parent) && last === '-') {
+      parent.push(op.value);
+    } else {
+      parent[last] = op.value;
+    }
+  }
+  return result;
+}
+
 export function useIncidentWebSocket({
   onIncidentCreated,
   onIncidentUpdated,
   onIncidentClosed,
+  onResyncFailed,
   onMessage,
   enabled = true,
 }) {
@@ -27,6 +63,10 @@ export function useIncidentWebSocket({
   const reconnectTimeout = useRef(null);
   const reconnectAttempts = useRef(0);
   const enabledRef = useRef(enabled);
+  // incident_id -> { revision, incident } for the last snapshot seen
+  const snapshots = useRef(new Map());
+  // Incidents whose incident_created event arrived stale - resync reports them as created
+  const pendingCreated = useRef(new Set());
   const [connected, setConnected] = useState(false);
   const [lastMessage, setLastMessage] = useState(null);
   
@@ -35,6 +75,7 @@ export function useIncidentWebSocket({
     onIncidentCreated,
     onIncidentUpdated,
     onIncidentClosed,
+    onResyncFailed,
     onMessage,
   });
   
@@ -44,9 +85,10 @@ export function useIncidentWebSocket({
       onIncidentCreated,
       onIncidentUpdated,
       onIncidentClosed,
+      onResyncFailed,
       onMessage,
     };
-  }, [onIncidentCreated, onIncidentUpdated, onIncidentClosed, onMessage]);
+  }, [onIncidentCreated, onIncidentUpdated, onIncidentClosed, onResyncFailed, onMessage]);
 
   useEffect(() => {
     enabledRef.current = enabled;
@@ -97,10 +139,58 @@ export function useIncidentWebSocket({
       }, delay);
     };
 
+    const requestResync = (incidentId) => {
+      if (ws.current?.readyState === WebSocket.OPEN) {
+        ws.current.send(JSON.stringify({ type: 'resync', incident_id: incidentId }));
+      }
+    };
+
+    // Resolve a (possibly delta-encoded) incident event to an incident object
+    // for the callbacks. Returns null when the event can't be applied yet.
+    const resolveIncident = (data) => {
+      if (data.revision == null) return data.incident;  // Unversioned event
+
+      const id = data.incident_id;
+      const known = snapshots.current.get(id);
+      if (known && data.revision <= known.revision) return null;  // Already applied
+
+      if (data.incident) {
+        snapshots.current.set(id, { revision: data.revision, incident: data.incident });
+        return data.incident;
+      }
+      if (data.stale || (known && known.revision !== data.base_revision)) {
+        if (data.type === 'incident_created') pendingCreated.current.add(id);
+        requestResync(id);
+        return null;
+      }
+      if (known) {
+        const incident = applyPatch(known.incident, data.patch);
+        if (!incident) {
+          requestResync(id);
+          return null;
+        }
+        snapshots.current.set(id, { revision: data.revision, incident });
+        return incident;
+      }
+      // No snapshot yet (incident loaded over REST): pass top-level changes
+      // through as a partial update; nested changes need the full snapshot.
+      if (data.patch.some(op => decodePointer(op.path).length > 1)) {
+        requestResync(id);
+        return null;
+      }
+      return applyPatch({ id }, data.patch);
+    };
+
     const handleMessage = (event) => {
       try {
         const data = JSON.parse(event.data);
         setLastMessage(data);
+
+        if (data.type?.startsWith('incident_')) {
+          const incident = resolveIncident(data);
+          if (!incident) return;
+          data.incident = incident;
+        }
         
         switch (data.type) {
           case 'ping':
@@ -124,6 +214,14 @@ export function useIncidentWebSocket({
             callbacksRef.current.onIncidentCreated?.(data.incident);
             break;
             
+          case 'incident_snapshot':
+            if (pendingCreated.current.delete(data.incident_id)) {
+              callbacksRef.current.onIncidentCreated?.(data.incident);
+            } else {
+              callbacksRef.current.onIncidentUpdated?.(data.incident);
+            }
+            break;
+
           case 'incident_updated':
             callbacksRef.current.onIncidentUpdated?.(data.incident);
             break;
@@ -131,6 +229,11 @@ export function useIncidentWebSocket({
           case 'incident_closed':
             callbacksRef.current.onIncidentClosed?.(data.incident);
             break;
+
+          case 'resync_failed':
+            pendingCreated.current.delete(data.incident_id);
+            callbacksRef.current.onResyncFailed?.(data.incident_id);
+            break;
             
           default:
             callbacksRef.current.onMessage?.(data);
@@ -168,6 +271,9 @@ export function useIncidentWebSocket({
         console.log('WebSocket connected');
         setConnected(true);
         reconnectAttempts.current = 0;
+        // Events may have been missed while disconnected
+        snapshots.current.clear();
+        pendingCreated.current.clear();
         
         // Start ping interval
         pingInterval.current = setInterval(() => {
@@ -2138,10 +2138,34 @@ function ComCatTab() {
         throw new Error(err.detail || 'Retrain failed');
       }
       
-      const data = await res.json();
+      // Training runs in the background - poll until it finishes.
+      // Status is per server worker; if this poll lands on another worker
+      // ("idle"), watch for the hot-swapped model's new trained_at instead.
+      const previousTrainedAt = stats?.last_trained_at;
+      let data = await res.json();
+      for (let i = 0; i < 300 && ['queued', 'running', 'idle'].includes(data.status); i++) {
+        await new Promise(r => setTimeout(r, 2000));
+        const statusRes = await fetch('/api/comcat/retrain/status');
+        if (statusRes.ok) data = await statusRes.json();
+        if (data.status === 'idle') {
+          const statsRes = await fetch('/api/comcat/stats');
+          const latest = statsRes.ok ? await statsRes.json() : null;
+          if (latest?.last_trained_at && latest.last_trained_at !== previousTrainedAt) {
+            data = { status: 'completed', total_examples: latest.total_training_examples, cv_accuracy: latest.cv_accuracy };
+          }
+        }
+      }
+      
+      if (data.status === 'failed') {
+        throw new Error(data.message || 'Retrain failed');
+      }
+      if (data.status !== 'completed') {
+        throw new Error('Retrain is still running - check back in a few minutes');
+      }
+      
       setMessage({ 
         type: 'success', 
-        text: `Model retrained successfully! ${data.total_examples} examples, ${(data.cv_accuracy * 100).toFixed(1)}% accuracy` 
+        text: `Model retrained successfully! ${data.total_examples} examples, ${((data.cv_accuracy || 0) * 100).toFixed(1)}% accuracy` 
       });
       
       // Reload stats
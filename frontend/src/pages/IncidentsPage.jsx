@@ -101,7 +101,30 @@ function IncidentsPage({ userSession }) {
     return () => document.removeEventListener('mousedown', handleClickOutside);
   }, [showNewRecordMenu]);
 
-  // WebSocket handlers for real-time updates
+  // WebSocket handlers for real-time updates. Events carry the hook's
+  // patched incident snapshot (list fields, times, units, CAD comments);
+  // the hub modal loads the full run sheet for the incident it shows.
+  const incidentsRef = useRef(incidents);
+  useEffect(() => {
+    incidentsRef.current = incidents;
+  }, [incidents]);
+
+  // Pop the hub modal for an incident that now qualifies (skip DETAIL roll call records)
+  const showIfQualifying = useCallback((incident) => {
+    if (showForm || showHubModal || showDetailForm) return;
+    if (incidentQualifiesForModal(incident) && needsAutoShow(incident)) {
+      setQualifyingIncidents(prev => {
+        if (prev.some(i => i.id === incident.id)) {
+          return prev.map(i => i.id === incident.id ? incident : i);
+        }
+        return [incident, ...prev];
+      });
+      setModalIncidents([incident]);
+      setSelectedModalIncidentId(incident.id);
+      setShowHubModal(true);
+    }
+  }, [showForm, showHubModal, showDetailForm]);
+
   const handleIncidentCreated = useCallback((incident) => {
     // Add to list if current year matches
     const incidentYear = incident.incident_date ? new Date(incident.incident_date).getFullYear() : new Date().getFullYear();
@@ -113,88 +136,54 @@ function IncidentsPage({ userSession }) {
       });
     }
     
-    // Check if qualifies for modal auto-popup (skip DETAIL roll call records)
-    if (!showForm && !showHubModal && !showDetailForm) {
-      // Fetch full incident to check qualification
-      getIncident(incident.id).then(res => {
-        const fullIncident = res.data;
-        if (incidentQualifiesForModal(fullIncident) && needsAutoShow(fullIncident)) {
-          setQualifyingIncidents(prev => [fullIncident, ...prev.filter(i => i.id !== fullIncident.id)]);
-          setModalIncidents([fullIncident]);
-          setSelectedModalIncidentId(fullIncident.id);
-          setShowHubModal(true);
-        }
-      }).catch(err => console.error('Failed to fetch new incident:', err));
-    }
-  }, [year, showForm, showHubModal, showDetailForm]);
+    showIfQualifying(incident);
+  }, [year, showIfQualifying]);
 
   const handleIncidentUpdated = useCallback((incident) => {
+    // Partial updates (incident loaded over REST, no snapshot yet) merge onto the list row
+    const existing = incidentsRef.current.find(i => i.id === incident.id);
+    const merged = existing ? { ...existing, ...incident } : incident;
+
     // Update in list
     setIncidents(prev => prev.map(i => i.id === incident.id ? { ...i, ...incident } : i));
     
     // Update qualifying incidents list
-    setQualifyingIncidents(prev => {
-      const existing = prev.find(i => i.id === incident.id);
-      if (existing) {
-        return prev.map(i => i.id === incident.id ? { ...i, ...incident } : i);
-      }
-      return prev;
-    });
+    setQualifyingIncidents(prev => prev.map(i => i.id === incident.id ? { ...i, ...incident } : i));
     
     // Update modal incidents if showing
     setModalIncidents(prev => prev.map(i => i.id === incident.id ? { ...i, ...incident } : i));
     
     // Check if now qualifies for modal (e.g., CAD clear just received)
-    if (!showForm && !showHubModal && !showDetailForm) {
-      getIncident(incident.id).then(res => {
-        const fullIncident = res.data;
-        if (incidentQualifiesForModal(fullIncident) && needsAutoShow(fullIncident)) {
-          setQualifyingIncidents(prev => {
-            if (prev.some(i => i.id === fullIncident.id)) {
-              return prev.map(i => i.id === fullIncident.id ? fullIncident : i);
-            }
-            return [fullIncident, ...prev];
-          });
-          setModalIncidents([fullIncident]);
-          setSelectedModalIncidentId(fullIncident.id);
-          setShowHubModal(true);
-        }
-      }).catch(err => console.error('Failed to fetch updated incident:', err));
-    }
-  }, [showForm, showHubModal, showDetailForm]);
+    showIfQualifying(merged);
+  }, [showIfQualifying]);
 
   const handleIncidentClosed = useCallback((incident) => {
-    // Update status in list immediately for responsiveness
-    setIncidents(prev => prev.map(i => 
-      i.id === incident.id ? { ...i, status: 'CLOSED', ...incident } : i
-    ));
-    
-    // Fetch full incident to get unit times, narrative, etc.
-    getIncident(incident.id).then(res => {
-      const fullIncident = res.data;
-      
-      // Update list with full data
-      setIncidents(prev => prev.map(i => 
-        i.id === fullIncident.id ? fullIncident : i
-      ));
-      
-      // Update qualifying incidents with full data
-      setQualifyingIncidents(prev => prev.map(i => 
-        i.id === fullIncident.id ? fullIncident : i
-      ));
-      
-      // Update modal with full data (unit times, narrative, etc.)
-      setModalIncidents(prev => prev.map(i => 
-        i.id === fullIncident.id ? fullIncident : i
-      ));
-    }).catch(err => console.error('Failed to fetch closed incident:', err));
+    // Status, unit times and cad_clear_received_at arrive in the event;
+    // the hub modal refetches the run sheet when it sees the status change
+    const close = (i) => i.id === incident.id ? { ...i, status: 'CLOSED', ...incident } : i;
+    setIncidents(prev => prev.map(close));
+    setQualifyingIncidents(prev => prev.map(close));
+    setModalIncidents(prev => prev.map(close));
   }, []);
 
+  // The server had no snapshot to resync from - fall back to a full GET
+  const handleResyncFailed = useCallback((incidentId) => {
+    getIncident(incidentId).then(res => {
+      const fullIncident = res.data;
+      if (incidentsRef.current.some(i => i.id === fullIncident.id)) {
+        handleIncidentUpdated(fullIncident);
+      } else {
+        handleIncidentCreated(fullIncident);
+      }
+    }).catch(err => console.error('Failed to fetch incident after resync failure:', err));
+  }, [handleIncidentCreated, handleIncidentUpdated]);
+
   // WebSocket connection
   const { connected: wsConnected } = useIncidentWebSocket({
     onIncidentCreated: handleIncidentCreated,
     onIncidentUpdated: handleIncidentUpdated,
     onIncidentClosed: handleIncidentClosed,
+    onResyncFailed: handleResyncFailed,
     enabled: true,
   });
   
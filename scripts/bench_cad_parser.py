@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+CAD parser microbenchmark
+
+Times parse_cad_html() + comment extraction per report for each document
+engine (cad/cad_document.py), and checks that every engine produces a
+byte-identical ParsedCADReport (repr) and identical comment output.
+
+Modes per engine:
+    parse only        parse_cad_html(html)
+    parse + comments  parse_cad_html + CommentProcessor, each parsing the HTML
+                      (what callers did before the shared document)
+    shared document   parse_document once, passed to both
+
+Corpus: every file under cad/samples, plus each HTML report split out of
+an ADI log when --log is given (cad/test_incidents.txt is a real one).
+
+    python3 scripts/bench_cad_parser.py
+    python3 scripts/bench_cad_parser.py --log cad/test_incidents.txt --repeat 20
+
+ML categorization is disabled so the numbers are parser-only.
+Exit code 1 if any engine's output differs.
+
+Requires: beautifulsoup4 (lxml optional - skipped if not installed)
+"""
+
+import argparse
+import re
+import sys
+import time
+from pathlib import Path
+
+CAD_DIR = Path(__file__).resolve().parent.parent / "cad"
+sys.path.insert(0, str(CAD_DIR))
+
+from cad_document import parse_document, HAS_LXML, ENGINE_LXML, ENGINE_SOUP  # noqa: E402
+from cad_parser import parse_cad_html  # noqa: E402
+from comment_processor import CommentProcessor  # noqa: E402
+
+
+def _load_corpus(log_path):
+    docs = [p.read_text(encoding="utf-8", errors="replace")
+            for p in sorted((CAD_DIR / "samples").iterdir()) if p.is_file()]
+    if log_path:
+        content = Path(log_path).read_text(encoding="utf-8", errors="replace")
+        for part in re.split(r">>>[^\n]+\n", content):
+            part = part.strip()
+            if part and ("<style>" in part or "<table" in part):
+                docs.append(part)
+    return docs
+
+
+def _comments(html, document=None):
+    result = CommentProcessor(use_ml=False).process_clear_html(html, None, document=document).to_dict()
+    result.pop("parsed_at", None)
+    return result
+
+
+def _time_per_doc(func, docs, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for html in docs:
+            func(html)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(docs) * 1e6  # µs per report (best run)
+
+
+def _check_identical(docs, engines):
+    """Compare every engine against the first one. Returns number of mismatches."""
+    mismatches = 0
+    reference = engines[0]
+    for i, html in enumerate(docs):
+        ref_doc = parse_document(html, reference)
+        ref_report = repr(parse_cad_html(html, document=ref_doc))
+        ref_comments = _comments(html, ref_doc)
+        for engine in engines[1:]:
+            doc = parse_document(html, engine)
+            if repr(parse_cad_html(html, document=doc)) != ref_report:
+                print(f"  report {i}: ParsedCADReport differs ({engine} vs {reference})")
+                mismatches += 1
+            elif _comments(html, doc) != ref_comments:
+                print(f"  report {i}: comments differ ({engine} vs {reference})")
+                mismatches += 1
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--log", help="ADI .log file to add to the corpus")
+    parser.add_argument("--repeat", type=int, default=10, help="Timing runs per mode (best is reported)")
+    args = parser.parse_args()
+
+    docs = _load_corpus(args.log)
+    engines = [ENGINE_LXML, ENGINE_SOUP] if HAS_LXML else [ENGINE_SOUP]
+    print(f"{len(docs)} reports, engines: {', '.join(engines)}")
+
+    mismatches = _check_identical(docs, engines)
+    print(f"output identical across engines: {'yes' if not mismatches else f'NO ({mismatches})'}")
+
+    print(f"\n{'engine':<12} {'parse only':>12} {'parse+comments':>16} {'shared doc':>12}   (µs/report)")
+    for engine in engines:
+        parse_only = _time_per_doc(
+            lambda h: parse_cad_html(h, document=parse_document(h, engine)), docs, args.repeat)
+        separate = _time_per_doc(
+            lambda h: (parse_cad_html(h, document=parse_document(h, engine)),
+                       _comments(h, parse_document(h, engine))), docs, args.repeat)
+
+        def shared(h):
+            doc = parse_document(h, engine)
+            parse_cad_html(h, document=doc)
+            _comments(h, doc)
+
+        shared_us = _time_per_doc(shared, docs, args.repeat)
+        print(f"{engine:<12} {parse_only:>12.1f} {separate:>16.1f} {shared_us:>12.1f}")
+
+    return 1 if mismatches else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
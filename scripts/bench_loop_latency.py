@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Event-loop latency benchmark for CADReport
+
+Measures /api/incidents/by-cad/{n} latency (the dispatch-time lookup the CAD
+listener makes) on its own, then again while N concurrent PDF/report
+requests are in flight. With sync routes in the threadpool and WeasyPrint in
+the render pool (backend/executors.py), p99 should stay roughly flat.
+
+Runs against a live server from the LAN (internal IP → no auth needed):
+
+    python3 scripts/bench_loop_latency.py \\
+        --base http://127.0.0.1:8001 --tenant glenmoorefc \\
+        --cad-number F25012345 --year 2025 --pdf-concurrency 20
+
+Requires: httpx
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+
+def _percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    k = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+async def _probe(client, url, duration, interval, samples):
+    """Hit the by-cad lookup repeatedly for `duration` seconds."""
+    end = time.perf_counter() + duration
+    while time.perf_counter() < end:
+        start = time.perf_counter()
+        resp = await client.get(url)
+        samples.append((time.perf_counter() - start) * 1000)
+        if resp.status_code >= 500:
+            print(f"  probe error: {resp.status_code}")
+        await asyncio.sleep(interval)
+
+
+async def _pdf_load(client, urls, stop):
+    """Keep one report request in flight per URL until stopped."""
+    done = 0
+    while not stop.is_set():
+        await asyncio.gather(*(client.get(u) for u in urls), return_exceptions=True)
+        done += len(urls)
+    return done
+
+
+def _report(label, samples):
+    print(
+        f"{label:<22} n={len(samples):<5} "
+        f"p50={statistics.median(samples):7.1f}ms  "
+        f"p95={_percentile(samples, 95):7.1f}ms  "
+        f"p99={_percentile(samples, 99):7.1f}ms  "
+        f"max={max(samples):7.1f}ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base", default="http://127.0.0.1:8001")
+    parser.add_argument("--tenant", default="glenmoorefc")
+    parser.add_argument("--cad-number", required=True, help="Existing CAD event number to look up")
+    parser.add_argument("--year", type=int, default=time.localtime().tm_year)
+    parser.add_argument("--pdf-concurrency", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=20.0)
+    parser.add_argument("--interval", type=float, default=0.05)
+    args = parser.parse_args()
+
+    headers = {"X-Tenant": args.tenant}
+    probe_url = f"{args.base}/api/incidents/by-cad/{args.cad_number}"
+    report_urls = [
+        f"{args.base}/api/reports/admin/personnel/pdf?start_date={args.year}-01-01&end_date={args.year}-12-31",
+        f"{args.base}/api/reports/pdf/monthly-weasy?year={args.year}&month=1",
+    ]
+    pdf_urls = [report_urls[i % len(report_urls)] for i in range(args.pdf_concurrency)]
+
+    limits = httpx.Limits(max_connections=args.pdf_concurrency + 10)
+    async with httpx.AsyncClient(headers=headers, timeout=300, limits=limits) as client:
+        baseline = []
+        await _probe(client, probe_url, args.duration / 2, args.interval, baseline)
+        _report("baseline", baseline)
+
+        loaded = []
+        stop = asyncio.Event()
+        load_task = asyncio.create_task(_pdf_load(client, pdf_urls, stop))
+        await asyncio.sleep(1.0)  # let the report requests land first
+        await _probe(client, probe_url, args.duration, args.interval, loaded)
+        stop.set()
+        completed = await load_task
+        _report(f"with {args.pdf_concurrency} reports", loaded)
+        print(f"report requests completed: {completed}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+TTS dispatch-to-audio-URL benchmark
+
+Times how long an alert waits between "announcement text ready" and "MP3
+published, audio_url can be sent" for:
+
+    spawn   the old path: spawn piper (model load) -> WAV in /tmp ->
+            spawn ffmpeg -> MP3 -> delete WAV
+    pool    services/tts_engine.py: warm piper process (--json-input) ->
+            in-process MP3 encode (lameenc, else ffmpeg over pipes) ->
+            one write to the alerts dir + memory copy
+
+The first pool request includes starting the warm process (reported
+separately as "cold"); after that the model stays loaded.
+
+    python3 scripts/bench_tts.py
+    python3 scripts/bench_tts.py --model /home/dashboard/piper/en_US-ryan-medium.onnx --runs 20
+
+Requires the piper binary and a voice model; ffmpeg for the spawn path
+(and for the pool path when lameenc is not installed).
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+ANNOUNCEMENTS = [
+    "Engine forty-eight one, Tower forty-eight. Dwelling Fire. 123 Valley Road.",
+    "Medic ninety-four. Medical Emergency, Cardiac. 455 West Lincoln Highway.",
+    "Engine forty-eight one, Squad forty-eight. Vehicle Accident. Route 30 and Manor Avenue.",
+    "Engine forty-eight two. Fire Alarm, Commercial. Glenmoore Nursing Center, 3 Lyndell Road.",
+]
+
+
+async def _spawn_path(piper, ffmpeg, model, length_scale, text, work_dir, n):
+    """Old TTSService.generate_alert_audio body."""
+    wav_path = work_dir / f"{n}.wav"
+    mp3_path = work_dir / f"{n}.mp3"
+    proc = await asyncio.create_subprocess_exec(
+        piper, "--model", model, "--length_scale", str(length_scale),
+        "--output_file", str(wav_path),
+        stdin=asyncio.subprocess.PIPE, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await asyncio.wait_for(proc.communicate(input=text.encode()), timeout=10.0)
+    if proc.returncode != 0:
+        raise RuntimeError(f"piper failed: {stderr.decode()}")
+    proc = await asyncio.create_subprocess_exec(
+        ffmpeg, "-y", "-i", str(wav_path), "-codec:a", "libmp3lame", "-b:a", "64k", str(mp3_path),
+        stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE,
+    )
+    _, stderr = await asyncio.wait_for(proc.communicate(), timeout=10.0)
+    if proc.returncode != 0:
+        raise RuntimeError(f"ffmpeg failed: {stderr.decode()}")
+    wav_path.unlink(missing_ok=True)
+    return mp3_path.stat().st_size
+
+
+async def _pool_path(tts_engine, model, length_scale, text, n):
+    mp3 = await tts_engine.synthesize_mp3(model, length_scale, text)
+    tts_engine.store_audio("bench", f"{n}.mp3", mp3)
+    return len(mp3)
+
+
+async def _timed(coro):
+    start = time.perf_counter()
+    size = await coro
+    return (time.perf_counter() - start) * 1000, size
+
+
+def _summary(label, samples):
+    samples = sorted(samples)
+    p95 = samples[min(len(samples) - 1, round(0.95 * (len(samples) - 1)))]
+    print(f"{label:<8} median {statistics.median(samples):8.1f} ms   p95 {p95:8.1f} ms   "
+          f"min {samples[0]:8.1f} ms   (n={len(samples)})")
+
+
+async def main_async(args):
+    with tempfile.TemporaryDirectory(prefix="bench_tts_") as tmp:
+        tmp = Path(tmp)
+        # Engine reads these at import time
+        os.environ["TTS_ALERTS_DIR"] = str(tmp / "alerts")
+        os.environ["TTS_PIPER_PROCESSES"] = "1"
+        from services import tts_engine
+        tts_engine.PIPER_PATH = args.piper
+        tts_engine.FFMPEG_PATH = args.ffmpeg
+
+        spawn_dir = tmp / "spawn"
+        spawn_dir.mkdir()
+        texts = [ANNOUNCEMENTS[i % len(ANNOUNCEMENTS)] for i in range(args.runs)]
+
+        spawn = []
+        for i, text in enumerate(texts):
+            ms, _ = await _timed(_spawn_path(args.piper, args.ffmpeg, args.model, args.length_scale, text, spawn_dir, i))
+            spawn.append(ms)
+
+        cold, _ = await _timed(_pool_path(tts_engine, args.model, args.length_scale, texts[0], "cold"))
+        pool = []
+        for i, text in enumerate(texts):
+            ms, _ = await _timed(_pool_path(tts_engine, args.model, args.length_scale, text, i))
+            pool.append(ms)
+
+        stats = tts_engine.get_engine_stats()
+        await tts_engine.shutdown()
+
+    print(f"voice {Path(args.model).stem}, length_scale {args.length_scale}, encoder {stats['encoder']}")
+    _summary("spawn", spawn)
+    print(f"{'pool':<8} cold   {cold:8.1f} ms   (first request, starts the warm process)")
+    _summary("pool", pool)
+    print(f"speedup (median): {statistics.median(spawn) / statistics.median(pool):.1f}x")
+    if stats["oneshot_fallbacks"]:
+        print(f"WARNING: {stats['oneshot_fallbacks']} pool requests fell back to one-shot spawns")
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--piper", default="/home/dashboard/piper/piper/piper")
+    parser.add_argument("--ffmpeg", default="/usr/bin/ffmpeg")
+    parser.add_argument("--model", default="/home/dashboard/piper/en_US-ryan-medium.onnx")
+    parser.add_argument("--length-scale", type=float, default=1.1)
+    parser.add_argument("--runs", type=int, default=10, help="Alerts per path")
+    args = parser.parse_args()
+
+    for path in (args.piper, args.model):
+        if not os.path.exists(path):
+            print(f"not found: {path}")
+            return 2
+    return asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
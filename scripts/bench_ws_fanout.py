@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+WebSocket fan-out latency benchmark for CADReport
+
+Connects hundreds of in-process fake /ws/incidents clients to one tenant -
+most fast, some deliberately slow (every send takes --slow-delay seconds)
+and some stalled (sends never complete) - then broadcasts a stream of
+messages through routers.websocket.broadcast_to_tenant and reports:
+
+    broadcast   time for broadcast_to_tenant() to return
+    delivery    broadcast -> fast client send latency (p50/p95/p99)
+    evictions   slow / stalled clients dropped (queue full or send timeout)
+
+--sequential replays the same load through the previous one-await-per-client
+loop for comparison. With per-connection send queues, fast-client p99 should
+stay in the low milliseconds no matter how many clients are slow.
+
+    cd backend && python3 ../scripts/bench_ws_fanout.py \\
+        --clients 500 --slow 25 --stalled 5 --messages 200
+
+Requires: backend requirements (imports routers.websocket)
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+sys.path.insert(0, str(BACKEND_DIR))
+
+from routers import websocket as ws  # noqa: E402
+
+TENANT = "benchfd"
+
+
+class FakeWebSocket:
+    """Stands in for a Starlette WebSocket: send_text just sleeps `delay` (None = stall)."""
+
+    def __init__(self, delay, latencies=None):
+        self.delay = delay
+        self.latencies = latencies
+        self.closed = False
+
+    async def send_text(self, data):
+        if self.delay is None:
+            await asyncio.Event().wait()
+        await asyncio.sleep(self.delay)
+        if self.latencies is not None:
+            sent_at = json.loads(data)["sent_at"]
+            self.latencies.append((time.perf_counter() - sent_at) * 1000)
+
+    async def close(self, code=1000, reason=None):
+        self.closed = True
+
+
+def _percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    k = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[k]
+
+
+def _report(label, samples):
+    if not samples:
+        print(f"{label:<12} no samples")
+        return
+    print(
+        f"{label:<12} n={len(samples):<7} "
+        f"p50={statistics.median(samples):8.2f}ms  "
+        f"p95={_percentile(samples, 95):8.2f}ms  "
+        f"p99={_percentile(samples, 99):8.2f}ms  "
+        f"max={max(samples):8.2f}ms"
+    )
+
+
+async def _sequential_broadcast(clients, message):
+    """The previous fan-out: await each client's send in turn."""
+    message_json = json.dumps(message)
+    for client in clients:
+        try:
+            await client.send_text(message_json)
+        except Exception:
+            pass
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=500, help="Total fake clients")
+    parser.add_argument("--slow", type=int, default=25, help="Clients whose sends take --slow-delay")
+    parser.add_argument("--stalled", type=int, default=5, help="Clients whose sends never complete")
+    parser.add_argument("--slow-delay", type=float, default=0.5, help="Seconds per send for slow clients")
+    parser.add_argument("--messages", type=int, default=200)
+    parser.add_argument("--interval", type=float, default=0.02, help="Seconds between broadcasts")
+    parser.add_argument("--send-timeout", type=float, default=ws.SEND_TIMEOUT)
+    parser.add_argument("--sequential", action="store_true", help="Benchmark the old sequential loop")
+    args = parser.parse_args()
+
+    ws.SEND_TIMEOUT = args.send_timeout
+    fast_count = args.clients - args.slow - args.stalled
+    latencies = []
+    clients = (
+        [FakeWebSocket(random.uniform(0, 0.002), latencies) for _ in range(fast_count)]
+        + [FakeWebSocket(args.slow_delay) for _ in range(args.slow)]
+        + [FakeWebSocket(None) for _ in range(args.stalled)]
+    )
+    random.shuffle(clients)
+
+    if not args.sequential:
+        for client in clients:
+            await ws._add_connection(TENANT, client)
+
+    print(f"{args.clients} clients ({fast_count} fast, {args.slow} slow @ {args.slow_delay}s, "
+          f"{args.stalled} stalled), {args.messages} broadcasts every {args.interval * 1000:.0f}ms"
+          f"{' [sequential]' if args.sequential else ''}")
+
+    broadcast_ms = []
+    for i in range(args.messages):
+        message = {"type": "incident_updated", "incident_id": i, "sent_at": time.perf_counter()}
+        start = time.perf_counter()
+        if args.sequential:
+            # Stalled clients would hang the old loop forever - bound each broadcast
+            try:
+                await asyncio.wait_for(_sequential_broadcast(clients, message), args.send_timeout)
+            except asyncio.TimeoutError:
+                pass
+        else:
+            await ws.broadcast_to_tenant(TENANT, message)
+        broadcast_ms.append((time.perf_counter() - start) * 1000)
+        await asyncio.sleep(args.interval)
+
+    # Let fast-client queues drain
+    await asyncio.sleep(0.5)
+
+    _report("broadcast", broadcast_ms)
+    _report("delivery", latencies)
+    expected = fast_count * args.messages
+    print(f"{'delivered':<12} {len(latencies)}/{expected} fast-client messages")
+    if not args.sequential:
+        stats = ws._fanout_stats
+        print(f"{'evictions':<12} queue_full={stats['evicted_queue_full']} "
+              f"send_timeout={stats['evicted_send_timeout']} send_failed={stats['send_failed']} "
+              f"remaining={len(ws._connections.get(TENANT, {}))}/{args.clients}")
+        for client in list(ws._connections.get(TENANT, {})):
+            await ws._remove_connection(TENANT, client)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
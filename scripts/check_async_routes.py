@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+Event-loop lint for CADReport routers
+
+Fails when an `async def` route touches a synchronous SQLAlchemy session on
+the event loop. See backend/executors.py for the execution model:
+
+  - Routes that only do sync DB work must be plain `def` (FastAPI runs them
+    in its threadpool).
+  - `async def` routes that depend on get_db / get_master_session may only
+    use the session inside run_blocking(...) arguments, e.g.
+
+        layer = await run_blocking(_get_layer, db, layer_id)
+        stats = await run_blocking(lambda: db.execute(...).fetchall())
+
+Run from the repo root (CI / pre-commit):
+    python3 scripts/check_async_routes.py
+
+Exit code 0 = clean, 1 = violations found.
+"""
+
+import ast
+import sys
+from pathlib import Path
+
+ROUTERS_DIR = Path(__file__).resolve().parent.parent / "backend" / "routers"
+
+# Dependencies that hand out a synchronous Session
+SYNC_SESSION_DEPENDENCIES = {"get_db", "get_master_session"}
+
+# Offload helpers that make session use loop-safe
+OFFLOAD_CALLS = {"run_blocking", "run_in_threadpool"}
+
+# Known exceptions: (file relative to routers/, function name) -> reason.
+# Keep this short — every entry is a route that still blocks the loop.
+KNOWN_EXCEPTIONS = {
+    ("tts.py", "preview_tts_text"):
+        "tts_service.format_announcement is a coroutine that reads tts_unit_mappings "
+        "with the passed session; admin-only preview.",
+}
+
+
+def _is_route(func: ast.AsyncFunctionDef) -> bool:
+    for deco in func.decorator_list:
+        target = deco.func if isinstance(deco, ast.Call) else deco
+        if isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name):
+            if target.value.id == "router":
+                return True
+    return False
+
+
+def _session_params(func: ast.AsyncFunctionDef) -> set:
+    """Names of parameters whose default is Depends(<sync session dependency>)."""
+    args = func.args
+    positional = args.posonlyargs + args.args
+    pairs = list(zip(positional[len(positional) - len(args.defaults):], args.defaults))
+    pairs += [(a, d) for a, d in zip(args.kwonlyargs, args.kw_defaults) if d is not None]
+
+    names = set()
+    for arg, default in pairs:
+        if (
+            isinstance(default, ast.Call)
+            and isinstance(default.func, ast.Name)
+            and default.func.id == "Depends"
+            and default.args
+            and isinstance(default.args[0], ast.Name)
+            and default.args[0].id in SYNC_SESSION_DEPENDENCIES
+        ):
+            names.add(arg.arg)
+    return names
+
+
+def _offloaded_nodes(func: ast.AsyncFunctionDef) -> set:
+    """ids of every AST node that sits inside a run_blocking(...) argument list."""
+    inside = set()
+    for node in ast.walk(func):
+        if (
+            isinstance(node, ast.Call)
+            and isinstance(node.func, ast.Name)
+            and node.func.id in OFFLOAD_CALLS
+        ):
+            for arg in list(node.args) + [kw.value for kw in node.keywords]:
+                for sub in ast.walk(arg):
+                    inside.add(id(sub))
+    return inside
+
+
+def check_file(path: Path) -> list:
+    tree = ast.parse(path.read_text(), filename=str(path))
+    rel = path.relative_to(ROUTERS_DIR).as_posix()
+    violations = []
+
+    for node in tree.body:
+        if not isinstance(node, ast.AsyncFunctionDef) or not _is_route(node):
+            continue
+        params = _session_params(node)
+        if not params or (rel, node.name) in KNOWN_EXCEPTIONS:
+            continue
+
+        offloaded = _offloaded_nodes(node)
+        for sub in ast.walk(node):
+            if isinstance(sub, ast.Name) and sub.id in params and id(sub) not in offloaded:
+                violations.append(
+                    f"routers/{rel}:{sub.lineno}: async route '{node.name}' uses sync "
+                    f"session '{sub.id}' on the event loop — make the route `def` "
+                    f"or wrap the call in run_blocking()"
+                )
+                break
+    return violations
+
+
+def main() -> int:
+    violations = []
+    for path in sorted(ROUTERS_DIR.rglob("*.py")):
+        violations.extend(check_file(path))
+
+    for v in violations:
+        print(v)
+    if violations:
+        print(f"\n{len(violations)} async route(s) block the event loop")
+        return 1
+    print("check_async_routes: OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())